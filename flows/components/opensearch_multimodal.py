@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import copy
 import json
+from contextlib import contextmanager
+import threading
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable
 
+import numpy as np
 from opensearchpy import OpenSearch, helpers
-from opensearchpy.exceptions import OpenSearchException, RequestError
+from opensearchpy.exceptions import ConflictError, NotFoundError, OpenSearchException, RequestError
 
 from lfx.base.vectorstores.model import LCVectorStoreComponent, check_cached_vector_store
 from lfx.base.vectorstores.vector_store_connection_decorator import vector_store_connection
@@ -16,6 +20,7 @@ from lfx.base.vectorstores.vector_store_connection_decorator import vector_store
 from lfx.io import (
     BoolInput,
     DropdownInput,
+    FloatInput,
     HandleInput,
     IntInput,
     MultilineInput,
@@ -64,6 +69,252 @@ def get_embedding_field_name(model_name: str) -> str:
     return f"chunk_embedding_{normalize_model_name(model_name)}"
 
 
+# Vector storage profiles; keep in sync with src/utils/vector_profiles.py in the backend
+VECTOR_ENCODINGS = ["float32", "fp16", "int8"]
+VECTOR_PROFILES_META_KEY = "vector_profiles"
+MATRYOSHKA_MODELS = ("text-embedding-3-small", "text-embedding-3-large", "nomic-embed-text")
+VECTOR_CALIBRATION_SAMPLE = 1000
+# Lock documents serializing read-merge-put of the index _meta live in "<index><suffix>"
+META_LOCK_INDEX_SUFFIX = "_meta_locks"
+META_LOCK_SECONDS = 30.0
+META_LOCK_WAIT_SECONDS = 60.0
+
+
+def supports_truncation(model_name: str) -> bool:
+    """Whether a prefix of the model's vectors is a usable embedding (Matryoshka-trained)."""
+    return model_name.lower().strip().split(":")[0].split("/")[-1] in MATRYOSHKA_MODELS
+
+
+def vector_field_suffix(encoding: str, dimensions: int) -> str:
+    """Field name suffix for a vector profile ("" for full-precision, untruncated vectors)."""
+    suffix = "" if encoding == "float32" else f"_{encoding}"
+    if dimensions:
+        suffix += f"_d{dimensions}"
+    return suffix
+
+
+def _prepare_vectors(vectors: list[list[float]], dimensions: int) -> np.ndarray:
+    array = np.asarray(vectors, dtype=np.float32)
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+    if dimensions and dimensions < array.shape[1]:
+        array = array[:, :dimensions]
+        norms = np.linalg.norm(array, axis=1, keepdims=True)
+        array = array / np.where(norms == 0, 1.0, norms)
+    return array
+
+
+def calibrate_vectors(vectors: list[list[float]], dimensions: int) -> dict[str, float]:
+    """Min/max of the first vectors, used to map int8 values onto [-128, 127]."""
+    sample = _prepare_vectors(vectors[:VECTOR_CALIBRATION_SAMPLE], dimensions)
+    low, high = float(sample.min()), float(sample.max())
+    return {"min": low, "max": high if high > low else low + 1e-6}
+
+
+def encode_vectors(
+    vectors: list[list[float]], encoding: str, dimensions: int = 0, calibration: dict | None = None
+) -> list[list[float]]:
+    """Truncate and quantize vectors the same way for documents and queries."""
+    array = _prepare_vectors(vectors, dimensions)
+    if encoding == "fp16":
+        fp16_max = float(np.finfo(np.float16).max)
+        return np.clip(array, -fp16_max, fp16_max).astype(np.float16).astype(np.float32).tolist()
+    if encoding == "int8":
+        if not calibration:
+            msg = "int8 vectors cannot be encoded before the field is calibrated"
+            raise ValueError(msg)
+        scale = 255.0 / (calibration["max"] - calibration["min"])
+        quantized = np.rint((array - calibration["min"]) * scale - 128.0)
+        return np.clip(quantized, -128, 127).astype(np.int8).tolist()
+    return array.tolist()
+
+
+def knn_vector_definition(
+    dim: int, encoding: str, engine: str, space_type: str, ef_construction: int, m: int
+) -> dict[str, Any]:
+    """knn_vector mapping for a vector profile.
+
+    jvector stores full-precision vectors only, so fp16 uses the faiss scalar-quantization
+    encoder and int8 uses lucene byte vectors.
+    """
+    parameters: dict[str, Any] = {"ef_construction": ef_construction, "m": m}
+    if encoding == "fp16":
+        parameters["encoder"] = {"name": "sq", "parameters": {"type": "fp16", "clip": True}}
+        method = {"name": "hnsw", "space_type": space_type, "engine": "faiss", "parameters": parameters}
+        return {"type": "knn_vector", "dimension": dim, "method": method}
+    if encoding == "int8":
+        method = {"name": "hnsw", "space_type": space_type, "engine": "lucene", "parameters": parameters}
+        return {"type": "knn_vector", "dimension": dim, "data_type": "byte", "method": method}
+    method = {"name": "disk_ann", "space_type": space_type, "engine": engine, "parameters": parameters}
+    return {"type": "knn_vector", "dimension": dim, "method": method}
+
+
+# Client-side request rate per embedding provider (requests/second); providers not listed are not limited.
+# watsonx.ai allows 2 requests/second on the default plan.
+EMBEDDING_PROVIDER_RATE_LIMITS: dict[str, float] = {"watsonx": 1.6}
+# Bulk item statuses worth retrying; anything else (mapping errors, bad vectors) fails permanently
+RETRYABLE_BULK_STATUSES = {429, 502, 503, 504}
+
+
+def embedding_provider(model_name: str | None, embedding_obj: Any = None) -> str:
+    """Provider key for EMBEDDING_PROVIDER_RATE_LIMITS."""
+    type_name = type(embedding_obj).__name__.lower() if embedding_obj is not None else ""
+    if "ibm" in str(model_name or "").lower() or "watsonx" in type_name:
+        return "watsonx"
+    if "ollama" in type_name:
+        return "ollama"
+    return "openai" if "openai" in type_name else type_name or "unknown"
+
+
+class TokenBucket:
+    """Thread-safe token bucket: on average ``rate`` acquisitions per second, bursts of ``capacity``."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            self._sleep(wait_seconds)
+
+
+def _bulk_item_error(item: dict[str, Any]) -> tuple[Any, str]:
+    info = next(iter(item.values()), {}) if item else {}
+    error = info.get("error") or info.get("exception") or "unknown error"
+    return info.get("status"), error if isinstance(error, str) else json.dumps(error, default=str)
+
+
+def pipelined_bulk_ingest(
+    client: Any,
+    texts: list[str],
+    embed_batch: Callable[[list[str]], list[list[float]]],
+    build_actions: Callable[[int, list[list[float]]], list[dict[str, Any]]],
+    *,
+    batch_size: int = 16,
+    concurrency: int = 4,
+    max_in_flight: int | None = None,
+    chunk_size: int = 500,
+    max_chunk_bytes: int = 1024 * 1024,
+    max_retries: int = 3,
+    initial_backoff: float = 1.0,
+    max_backoff: float = 30.0,
+    sleep: Callable[[float], None] = time.sleep,
+    streaming_bulk: Callable[..., Any] | None = None,
+) -> dict[str, Any]:
+    """Embed texts in batches and stream them into OpenSearch as the batches finish.
+
+    ``embed_batch`` runs on up to ``concurrency`` threads; at most ``max_in_flight``
+    batches (default ``2 * concurrency``) are embedded but not yet handed to the bulk
+    writer, so memory is bounded by that window rather than by the document size.
+    ``build_actions(start, vectors)`` turns the vectors of ``texts[start:]`` into bulk
+    actions and runs on the calling thread, in completion order.
+
+    Bulk items rejected with a retryable status are retried with exponential backoff
+    up to ``max_retries`` times. Items that still fail, and batches whose embedding
+    failed, are reported instead of raised.
+
+    Returns:
+        ``{"indexed": [positions], "failed": [{"position", "stage", "status", "error"}]}``
+    """
+    streaming_bulk = streaming_bulk or helpers.streaming_bulk
+    window = max(1, max_in_flight or 2 * concurrency)
+    batch_starts = iter(range(0, len(texts), batch_size))
+    indexed: list[int] = []
+    failed: list[dict[str, Any]] = []
+    # (position, action, last status, last error) of items to send again
+    retry: list[tuple[int, dict[str, Any], Any, str]] = []
+
+    def write(actions, sent: deque) -> None:
+        results = streaming_bulk(
+            client,
+            actions,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+        for ok, item in results:
+            position, action = sent.popleft()
+            if ok:
+                indexed.append(position)
+                continue
+            status, error = _bulk_item_error(item)
+            if not isinstance(status, int) or status in RETRYABLE_BULK_STATUSES:
+                retry.append((position, action, status, error))
+            else:
+                failed.append({"position": position, "stage": "bulk", "status": status, "error": error})
+
+    def embedded_actions(executor: ThreadPoolExecutor, sent: deque):
+        pending: dict[Any, int] = {}
+
+        def submit() -> None:
+            while len(pending) < window:
+                start = next(batch_starts, None)
+                if start is None:
+                    return
+                pending[executor.submit(embed_batch, texts[start : start + batch_size])] = start
+
+        submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                stage = "embedding"
+                try:
+                    vectors = future.result()
+                    stage = "encoding"
+                    actions = build_actions(start, vectors)
+                except Exception as e:  # noqa: BLE001 - reported per item
+                    end = min(start + batch_size, len(texts))
+                    failed.extend(
+                        {"position": position, "stage": stage, "status": None, "error": str(e)}
+                        for position in range(start, end)
+                    )
+                    continue
+                for offset, action in enumerate(actions):
+                    sent.append((start + offset, action))
+                    yield action
+            submit()
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        sent: deque = deque()
+        write(embedded_actions(executor, sent), sent)
+
+    backoff = initial_backoff
+    for _ in range(max_retries):
+        if not retry:
+            break
+        sleep(min(backoff, max_backoff))
+        backoff *= 2
+        batch, retry[:] = list(retry), []
+        write((action for _, action, _, _ in batch), deque((position, action) for position, action, _, _ in batch))
+
+    failed.extend(
+        {"position": position, "stage": "bulk", "status": status, "error": error}
+        for position, _, status, error in retry
+    )
+    return {"indexed": indexed, "failed": sorted(failed, key=lambda entry: entry["position"])}
+
+
 @vector_store_connection
 class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreComponent):
     """OpenSearch Vector Store Component with Multi-Model Hybrid Search Capabilities.
@@ -124,6 +375,14 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         "ef_construction",
         "m",
         "num_candidates",
+        "vector_encoding",
+        "vector_dimensions",
+        "embedding_batch_size",
+        "embedding_concurrency",
+        "embedding_rate_limit",
+        "bulk_chunk_size",
+        "bulk_max_chunk_bytes",
+        "bulk_max_retries",
         "docs_metadata",
     ]
 
@@ -222,6 +481,78 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             ),
             advanced=True,
         ),
+        DropdownInput(
+            name="vector_encoding",
+            display_name="Vector Encoding",
+            options=VECTOR_ENCODINGS,
+            value="float32",
+            info=(
+                "How ingested vectors are stored. 'fp16' halves and 'int8' quarters vector storage "
+                "at a small recall cost. Each encoding is stored in its own field."
+            ),
+            advanced=True,
+        ),
+        IntInput(
+            name="vector_dimensions",
+            display_name="Vector Dimensions",
+            value=0,
+            info=(
+                "Keep only the first N dimensions of each vector (Matryoshka truncation). "
+                "Only applied to models that support it; 0 keeps every dimension."
+            ),
+            advanced=True,
+        ),
+        IntInput(
+            name="embedding_batch_size",
+            display_name="Embedding Batch Size",
+            value=16,
+            info="Number of chunks sent to the embedding model per request.",
+            advanced=True,
+        ),
+        IntInput(
+            name="embedding_concurrency",
+            display_name="Embedding Concurrency",
+            value=4,
+            info=(
+                "Embedding requests in flight at once. Finished batches are written to OpenSearch "
+                "while the next ones are embedded."
+            ),
+            advanced=True,
+        ),
+        FloatInput(
+            name="embedding_rate_limit",
+            display_name="Embedding Rate Limit",
+            value=0.0,
+            info=(
+                "Maximum embedding requests per second. 0 uses the provider default "
+                "(1.6/s for watsonx.ai, unlimited otherwise)."
+            ),
+            advanced=True,
+        ),
+        IntInput(
+            name="bulk_chunk_size",
+            display_name="Bulk Chunk Size",
+            value=500,
+            info="Maximum number of documents per bulk request.",
+            advanced=True,
+        ),
+        IntInput(
+            name="bulk_max_chunk_bytes",
+            display_name="Bulk Chunk Bytes",
+            value=1048576,
+            info="Maximum size of a bulk request in bytes.",
+            advanced=True,
+        ),
+        IntInput(
+            name="bulk_max_retries",
+            display_name="Bulk Retries",
+            value=3,
+            info=(
+                "Times a document rejected with a retryable status (429, 502, 503, 504) is sent again, "
+                "with exponential backoff. Documents that still fail are reported in the output."
+            ),
+            advanced=True,
+        ),
         *LCVectorStoreComponent.inputs,  # includes search_query, add_documents, etc.
         HandleInput(name="embedding", display_name="Embedding", input_types=["Embeddings"], is_list=True),
         StrInput(
@@ -465,6 +796,8 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         ef_construction: int = 100,
         m: int = 16,
         vector_field: str = "vector_field",
+        vector_encoding: str = "float32",
+        profile_meta: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Create the default OpenSearch index mapping for vector search.
 
@@ -480,6 +813,8 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             ef_construction: Size of dynamic list used during index construction
             m: Number of bidirectional links for each vector
             vector_field: Name of the field storing vector embeddings
+            vector_encoding: Vector storage encoding (float32, fp16, int8)
+            profile_meta: Vector profile recorded for the field in the mapping _meta
 
         Returns:
             Dictionary containing OpenSearch index mapping configuration
@@ -487,20 +822,12 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         return {
             "settings": {"index": {"knn": True, "knn.algo_param.ef_search": ef_search}},
             "mappings": {
+                "_meta": {VECTOR_PROFILES_META_KEY: {vector_field: profile_meta}} if profile_meta else {},
                 "properties": {
-                    vector_field: {
-                        "type": "knn_vector",
-                        "dimension": dim,
-                        "method": {
-                            "name": "disk_ann",
-                            "space_type": space_type,
-                            "engine": engine,
-                            "parameters": {"ef_construction": ef_construction, "m": m},
-                        },
-                    },
+                    vector_field: knn_vector_definition(dim, vector_encoding, engine, space_type, ef_construction, m),
                     "embedding_model": {"type": "keyword"},  # Track which model was used
                     "embedding_dimensions": {"type": "integer"},
-                }
+                },
             },
         }
 
@@ -514,6 +841,8 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         space_type: str,
         ef_construction: int,
         m: int,
+        vector_encoding: str = "float32",
+        profile_meta: dict[str, Any] | None = None,
     ) -> None:
         """Lazily add a dynamic embedding field to the index if it doesn't exist.
 
@@ -534,6 +863,8 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             space_type: Distance metric
             ef_construction: Construction parameter
             m: HNSW parameter
+            vector_encoding: Vector storage encoding (float32, fp16, int8)
+            profile_meta: Vector profile recorded for the field in the mapping _meta
         """
         # First, check if the field already exists and is properly mapped
         properties = self._get_index_properties(client)
@@ -556,22 +887,20 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         try:
             mapping = {
                 "properties": {
-                    field_name: {
-                        "type": "knn_vector",
-                        "dimension": dim,
-                        "method": {
-                            "name": "disk_ann",
-                            "space_type": space_type,
-                            "engine": engine,
-                            "parameters": {"ef_construction": ef_construction, "m": m},
-                        },
-                    },
+                    field_name: knn_vector_definition(dim, vector_encoding, engine, space_type, ef_construction, m),
                     # Also ensure the embedding_model tracking field exists as keyword
                     "embedding_model": {"type": "keyword"},
                     "embedding_dimensions": {"type": "integer"},
                 }
             }
-            client.indices.put_mapping(index=index_name, body=mapping)
+            if profile_meta:
+                # put_mapping replaces _meta as a whole, so merge with the recorded
+                # profiles while holding the _meta lock
+                with self._meta_lock(client):
+                    mapping["_meta"] = self._merged_index_meta(client, field_name, profile_meta)
+                    client.indices.put_mapping(index=index_name, body=mapping)
+            else:
+                client.indices.put_mapping(index=index_name, body=mapping)
             logger.info(f"Added/updated embedding field mapping: {field_name}")
         except Exception as e:
             # Check if this is the known OpenSearch k-NN NullPointerException issue
@@ -624,89 +953,66 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         """
         return http_auth is not None and hasattr(http_auth, "service") and http_auth.service == "aoss"
 
-    def _bulk_ingest_embeddings(
+    def _bulk_action(
         self,
-        client: OpenSearch,
         index_name: str,
-        embeddings: list[list[float]],
-        texts: list[str],
-        metadatas: list[dict] | None = None,
-        ids: list[str] | None = None,
+        vector: list[float],
+        text: str,
+        metadata: dict | None,
+        doc_id: str,
         vector_field: str = "vector_field",
         text_field: str = "text",
         embedding_model: str = "unknown",
-        mapping: dict | None = None,
-        max_chunk_bytes: int | None = 1 * 1024 * 1024,
         *,
         is_aoss: bool = False,
-    ) -> list[str]:
-        """Efficiently ingest multiple documents with embeddings into OpenSearch.
+    ) -> dict[str, Any]:
+        """Build the bulk index action for one document.
 
-        This method uses bulk operations to insert documents with their vector
-        embeddings and metadata into the specified OpenSearch index. Each document
-        is tagged with the embedding_model name for tracking.
+        Each document is tagged with the embedding_model name for tracking.
 
         Args:
-            client: OpenSearch client instance
             index_name: Target index for document storage
-            embeddings: List of vector embeddings for each document
-            texts: List of document texts
-            metadatas: Optional metadata dictionaries for each document
-            ids: Optional document IDs (UUIDs generated if not provided)
-            vector_field: Field name for storing vector embeddings
+            vector: Vector embedding of the document
+            text: Document text
+            metadata: Optional metadata dictionary for the document
+            doc_id: Document ID
+            vector_field: Field name for storing the vector embedding
             text_field: Field name for storing document text
             embedding_model: Name of the embedding model used
-            mapping: Optional index mapping configuration
-            max_chunk_bytes: Maximum size per bulk request chunk
             is_aoss: Whether using Amazon OpenSearch Serverless
 
         Returns:
-            List of document IDs that were successfully ingested
+            Action for helpers.streaming_bulk
         """
-        logger.debug(f"[OpenSearchMultimodal] Bulk ingesting embeddings for {index_name}")
-        if not mapping:
-            mapping = {}
-
-        requests = []
-        return_ids = []
-        vector_dimensions = len(embeddings[0]) if embeddings else None
-
-        for i, text in enumerate(texts):
-            metadata = metadatas[i] if metadatas else {}
-            if vector_dimensions is not None and "embedding_dimensions" not in metadata:
-                metadata = {**metadata, "embedding_dimensions": vector_dimensions}
-
-            # Normalize ACL fields that may arrive as JSON strings from flows
-            for key in ("allowed_users", "allowed_groups"):
-                value = metadata.get(key)
-                if isinstance(value, str):
-                    try:
-                        parsed = json.loads(value)
-                        if isinstance(parsed, list):
-                            metadata[key] = parsed
-                    except (json.JSONDecodeError, TypeError):
-                        # Leave value as-is if it isn't valid JSON
-                        pass
-
-            _id = ids[i] if ids else str(uuid.uuid4())
-            request = {
-                "_op_type": "index",
-                "_index": index_name,
-                vector_field: embeddings[i],
-                text_field: text,
-                "embedding_model": embedding_model,  # Track which model was used
-                **metadata,
-            }
-            if is_aoss:
-                request["id"] = _id
-            else:
-                request["_id"] = _id
-            requests.append(request)
-            return_ids.append(_id)
-        if metadatas:
-            self.log(f"Sample metadata: {metadatas[0] if metadatas else {}}")
-        helpers.bulk(client, requests, max_chunk_bytes=max_chunk_bytes)
-        return return_ids
+        metadata = dict(metadata or {})
+        if "embedding_dimensions" not in metadata:
+            metadata["embedding_dimensions"] = len(vector)
+
+        # Normalize ACL fields that may arrive as JSON strings from flows
+        for key in ("allowed_users", "allowed_groups"):
+            value = metadata.get(key)
+            if isinstance(value, str):
+                try:
+                    parsed = json.loads(value)
+                    if isinstance(parsed, list):
+                        metadata[key] = parsed
+                except (json.JSONDecodeError, TypeError):
+                    # Leave value as-is if it isn't valid JSON
+                    pass
+
+        request = {
+            "_op_type": "index",
+            "_index": index_name,
+            vector_field: vector,
+            text_field: text,
+            "embedding_model": embedding_model,  # Track which model was used
+            **metadata,
+        }
+        if is_aoss:
+            request["id"] = doc_id
+        else:
+            request["_id"] = doc_id
+        return request
 
     # ---------- auth / client ----------
     def _build_auth_kwargs(self) -> dict[str, Any]:
@@ -775,14 +1081,16 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
 
         This method handles the complete document ingestion pipeline:
         - Prepares document data and metadata
-        - Generates vector embeddings using the selected model
+        - Generates vector embeddings in rate-limited, concurrent batches
         - Creates appropriate index mappings with dynamic field names
-        - Bulk inserts documents with vectors and model tracking
+        - Streams each embedded batch into bulk requests with model tracking,
+          retrying rejected documents and recording the ones that still fail
 
         Args:
             client: OpenSearch client for performing operations
         """
         logger.debug("[OpenSearchMultimodal][INGESTION] _add_documents_to_vector_store called")
+        self.ingest_failures: list[dict[str, Any]] = []
         # Convert DataFrame to Data if needed using parent's method
         self.ingest_data = self._prepare_ingest_data()
 
@@ -1024,60 +1332,27 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             ),
         )
 
-        def embed_chunk_with_retry(chunk_text: str, chunk_idx: int) -> list[float]:
-            """Embed a single chunk with rate-limit-aware retry logic."""
-
-            @retry_on_rate_limit
-            @retry_on_other_errors
-            def _embed(text: str) -> list[float]:
-                return selected_embedding.embed_documents([text])[0]
-
-            try:
-                return _embed(chunk_text)
-            except Exception as e:
-                logger.error(
-                    f"Failed to embed chunk {chunk_idx} after all retries: {e}",
-                    error=str(e),
-                )
-                raise
-
-        # Restrict concurrency for IBM/Watsonx models to avoid rate limits
-        is_ibm = (embedding_model and "ibm" in str(embedding_model).lower()) or (
-            selected_embedding and "watsonx" in type(selected_embedding).__name__.lower()
-        )
-        logger.debug(f"Is IBM: {is_ibm}")
-
-        # For IBM models, use sequential processing with rate limiting
-        # For other models, use parallel processing
-        vectors: list[list[float]] = [None] * len(texts)
-
-        if is_ibm:
-            # Sequential processing with inter-request delay for IBM models
-            inter_request_delay = 0.6  # ~1.67 req/s, safely under 2 req/s limit
-            logger.info(f"Using sequential processing for IBM model with {inter_request_delay}s delay between requests")
-
-            for idx, chunk in enumerate(texts):
-                if idx > 0:
-                    # Add delay between requests (but not before the first one)
-                    time.sleep(inter_request_delay)
-                vectors[idx] = embed_chunk_with_retry(chunk, idx)
-        else:
-            # Parallel processing for non-IBM models
-            max_workers = min(max(len(texts), 1), 8)
-            logger.debug(f"Using parallel processing with {max_workers} workers")
-
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {executor.submit(embed_chunk_with_retry, chunk, idx): idx for idx, chunk in enumerate(texts)}
-                for future in as_completed(futures):
-                    idx = futures[future]
-                    vectors[idx] = future.result()
-
-        if not vectors:
-            self.log(f"No vectors generated from documents for model {embedding_model}.")
-            return
-
-        # Get vector dimension for mapping
-        dim = len(vectors[0]) if vectors else 768  # default fallback
+        # A provider-aware token bucket spaces out requests (including retries)
+        provider = embedding_provider(embedding_model, selected_embedding)
+        rate_limit = float(getattr(self, "embedding_rate_limit", 0) or 0) or EMBEDDING_PROVIDER_RATE_LIMITS.get(provider)
+        limiter = TokenBucket(rate_limit) if rate_limit else None
+        logger.info(f"Embedding provider '{provider}', rate limit: {rate_limit or 'none'} requests/s")
+
+        @retry_on_rate_limit
+        @retry_on_other_errors
+        def embed_batch(batch: list[str]) -> list[list[float]]:
+            if limiter is not None:
+                limiter.acquire()
+            return selected_embedding.embed_documents(batch)
+
+        # Vector storage profile: optional Matryoshka truncation, then quantization
+        vector_encoding = getattr(self, "vector_encoding", "float32") or "float32"
+        requested_dim = int(getattr(self, "vector_dimensions", 0) or 0)
+        if requested_dim and not supports_truncation(embedding_model):
+            logger.warning(
+                f"Embedding model '{embedding_model}' does not support dimension truncation; storing full vectors"
+            )
+            requested_dim = 0
 
         # Check for AOSS
         auth_kwargs = self._build_auth_kwargs()
@@ -1087,64 +1362,128 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         engine = getattr(self, "engine", "jvector")
         self._validate_aoss_with_engines(is_aoss=is_aoss, engine=engine)
 
-        # Create mapping with proper KNN settings
         space_type = getattr(self, "space_type", "l2")
         ef_construction = getattr(self, "ef_construction", 512)
         m = getattr(self, "m", 16)
 
-        mapping = self._default_text_mapping(
-            dim=dim,
-            engine=engine,
-            space_type=space_type,
-            ef_construction=ef_construction,
-            m=m,
-            vector_field=dynamic_field_name,  # Use dynamic field name
-        )
+        ids = [str(uuid.uuid4()) for _ in texts]
+        # Field, truncation and int8 calibration, set up once the first batch reveals the dimension
+        target: dict[str, Any] = {}
+
+        def prepare_field(vectors: list[list[float]]) -> None:
+            native_dim = len(vectors[0])
+            truncate_dim = requested_dim if requested_dim < native_dim else 0
+            field_name = get_embedding_field_name(embedding_model) + vector_field_suffix(vector_encoding, truncate_dim)
+            dim = truncate_dim or native_dim
+            profile_meta = {
+                "model": embedding_model,
+                "encoding": vector_encoding,
+                "dimensions": dim,
+                "truncated": bool(truncate_dim),
+            }
 
-        # Ensure index exists with baseline mapping
-        try:
-            if not client.indices.exists(index=self.index_name):
-                self.log(f"Creating index '{self.index_name}' with base mapping")
-                client.indices.create(index=self.index_name, body=mapping)
-        except RequestError as creation_error:
-            if creation_error.error != "resource_already_exists_exception":
-                logger.warning(f"Failed to create index '{self.index_name}': {creation_error}")
-
-        # Ensure the dynamic field exists in the index
-        self._ensure_embedding_field_mapping(
-            client=client,
-            index_name=self.index_name,
-            field_name=dynamic_field_name,
-            dim=dim,
-            engine=engine,
-            space_type=space_type,
-            ef_construction=ef_construction,
-            m=m,
-        )
+            # Create mapping with proper KNN settings
+            mapping = self._default_text_mapping(
+                dim=dim,
+                engine=engine,
+                space_type=space_type,
+                ef_construction=ef_construction,
+                m=m,
+                vector_field=field_name,  # Use dynamic field name
+                vector_encoding=vector_encoding,
+                profile_meta=profile_meta,
+            )
 
-        self.log(f"Indexing {len(texts)} documents into '{self.index_name}' with model '{embedding_model}'...")
-        logger.info(f"Will store embeddings in field: {dynamic_field_name}")
-        logger.info(f"Will tag documents with embedding_model: {embedding_model}")
-
-        # Use the bulk ingestion with model tracking
-        return_ids = self._bulk_ingest_embeddings(
-            client=client,
-            index_name=self.index_name,
-            embeddings=vectors,
-            texts=texts,
-            metadatas=metadatas,
-            vector_field=dynamic_field_name,  # Use dynamic field name
-            text_field="text",
-            embedding_model=embedding_model,  # Track the model
-            mapping=mapping,
-            is_aoss=is_aoss,
+            # Ensure index exists with baseline mapping
+            try:
+                if not client.indices.exists(index=self.index_name):
+                    self.log(f"Creating index '{self.index_name}' with base mapping")
+                    client.indices.create(index=self.index_name, body=mapping)
+            except RequestError as creation_error:
+                if creation_error.error != "resource_already_exists_exception":
+                    logger.warning(f"Failed to create index '{self.index_name}': {creation_error}")
+
+            # Ensure the dynamic field exists in the index
+            self._ensure_embedding_field_mapping(
+                client=client,
+                index_name=self.index_name,
+                field_name=field_name,
+                dim=dim,
+                engine=engine,
+                space_type=space_type,
+                ef_construction=ef_construction,
+                m=m,
+                vector_encoding=vector_encoding,
+                profile_meta=profile_meta,
+            )
+
+            calibration = None
+            if vector_encoding == "int8":
+                # The first batch calibrates a new field; later runs reuse the recorded range
+                calibration = self._get_or_store_calibration(client, field_name, vectors, truncate_dim)
+            target.update(field=field_name, dimensions=truncate_dim, calibration=calibration)
+
+            self.log(f"Indexing {len(texts)} documents into '{self.index_name}' with model '{embedding_model}'...")
+            logger.info(f"Will store embeddings in field: {field_name}")
+            logger.info(f"Will tag documents with embedding_model: {embedding_model}")
+
+        def build_actions(start: int, vectors: list[list[float]]) -> list[dict[str, Any]]:
+            if not target:
+                prepare_field(vectors)
+            encoded = encode_vectors(vectors, vector_encoding, target["dimensions"], target["calibration"])
+            return [
+                self._bulk_action(
+                    index_name=self.index_name,
+                    vector=vector,
+                    text=texts[start + offset],
+                    metadata=metadatas[start + offset],
+                    doc_id=ids[start + offset],
+                    vector_field=target["field"],  # Use dynamic field name
+                    text_field="text",
+                    embedding_model=embedding_model,  # Track the model
+                    is_aoss=is_aoss,
+                )
+                for offset, vector in enumerate(encoded)
+            ]
+
+        # Embed with bounded concurrency and stream each finished batch into the bulk writer
+        report = pipelined_bulk_ingest(
+            client,
+            texts,
+            embed_batch,
+            build_actions,
+            batch_size=max(1, int(getattr(self, "embedding_batch_size", 16) or 16)),
+            concurrency=max(1, int(getattr(self, "embedding_concurrency", 4) or 4)),
+            chunk_size=max(1, int(getattr(self, "bulk_chunk_size", 500) or 500)),
+            max_chunk_bytes=max(1, int(getattr(self, "bulk_max_chunk_bytes", 1048576) or 1048576)),
+            max_retries=max(0, int(getattr(self, "bulk_max_retries", 3) or 0)),
         )
-        self.log(metadatas)
+
+        self.ingest_failures = [
+            {
+                "id": ids[entry["position"]],
+                "text": texts[entry["position"]],
+                "filename": metadatas[entry["position"]].get("filename"),
+                "stage": entry["stage"],
+                "status": entry["status"],
+                "error": entry["error"],
+            }
+            for entry in report["failed"]
+        ]
+        if self.ingest_failures and not report["indexed"]:
+            msg = f"Ingestion failed for all {len(texts)} documents: {self.ingest_failures[0]['error']}"
+            raise ValueError(msg)
+        if self.ingest_failures:
+            logger.warning(
+                f"Ingestion skipped {len(self.ingest_failures)} of {len(texts)} documents "
+                f"(first error: {self.ingest_failures[0]['error']})"
+            )
+            self.log(f"Failed to index {len(self.ingest_failures)} documents: {self.ingest_failures}")
 
         logger.info(
-            f"Ingestion complete: Successfully indexed {len(return_ids)} documents with model '{embedding_model}'"
+            f"Ingestion complete: Successfully indexed {len(report['indexed'])} documents with model '{embedding_model}'"
         )
-        self.log(f"Successfully indexed {len(return_ids)} documents with model {embedding_model}.")
+        self.log(f"Successfully indexed {len(report['indexed'])} documents with model {embedding_model}.")
 
     # ---------- helpers for filters ----------
     def _is_placeholder_term(self, term_obj: dict) -> bool:
@@ -1269,6 +1608,112 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         else:
             return models
 
+    def _get_index_meta(self, client: OpenSearch, *, strict: bool = False) -> dict[str, Any]:
+        """Retrieve the mapping _meta of the current index.
+
+        Empty if unavailable, unless ``strict``: a _meta about to be written back must
+        not be rebuilt from nothing.
+        """
+        try:
+            mapping = client.indices.get_mapping(index=self.index_name)
+        except OpenSearchException as e:
+            if strict:
+                raise
+            logger.warning(f"Failed to fetch mapping _meta for index '{self.index_name}': {e}")
+            return {}
+        for index_data in mapping.values():
+            meta = index_data.get("mappings", {}).get("_meta")
+            if isinstance(meta, dict):
+                return meta
+        return {}
+
+    @staticmethod
+    def _merged_meta(meta: dict[str, Any], field_name: str, entry: dict[str, Any]) -> dict[str, Any]:
+        """``meta`` with ``entry`` merged into the recorded profile of ``field_name``."""
+        meta = dict(meta)
+        profiles = dict(meta.get(VECTOR_PROFILES_META_KEY) or {})
+        profiles[field_name] = {**profiles.get(field_name, {}), **entry}
+        meta[VECTOR_PROFILES_META_KEY] = profiles
+        return meta
+
+    def _merged_index_meta(self, client: OpenSearch, field_name: str, entry: dict[str, Any]) -> dict[str, Any]:
+        """Index _meta with ``entry`` merged into the recorded profile of ``field_name``; hold the _meta lock."""
+        return self._merged_meta(self._get_index_meta(client, strict=True), field_name, entry)
+
+    @contextmanager
+    def _meta_lock(self, client: OpenSearch):
+        """Hold the index _meta lock shared with the backend (see src/utils/vector_profiles.py).
+
+        The lock is a document created only if absent; one older than META_LOCK_SECONDS
+        belongs to a dead process and is removed.
+        """
+        lock_index = self.index_name + META_LOCK_INDEX_SUFFIX
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + META_LOCK_WAIT_SECONDS
+        while True:
+            try:
+                created = client.index(
+                    index=lock_index,
+                    id=self.index_name,
+                    body={"owner": owner, "expires_at": time.time() + META_LOCK_SECONDS},
+                    op_type="create",
+                )
+                break
+            except ConflictError:
+                pass
+            try:
+                held = client.get(index=lock_index, id=self.index_name)
+                if held["_source"].get("expires_at", 0) < time.time():
+                    client.delete(
+                        index=lock_index,
+                        id=self.index_name,
+                        if_seq_no=held["_seq_no"],
+                        if_primary_term=held["_primary_term"],
+                    )
+                    continue
+            except (ConflictError, NotFoundError):
+                continue
+            if time.monotonic() > deadline:
+                msg = f"Timed out waiting for the _meta lock of index '{self.index_name}'"
+                raise TimeoutError(msg)
+            time.sleep(0.1)
+        try:
+            yield
+        finally:
+            try:
+                client.delete(
+                    index=lock_index,
+                    id=self.index_name,
+                    if_seq_no=created["_seq_no"],
+                    if_primary_term=created["_primary_term"],
+                )
+            except (ConflictError, NotFoundError):
+                logger.warning(f"The _meta lock of index '{self.index_name}' expired before it was released")
+
+    def _get_or_store_calibration(
+        self, client: OpenSearch, field_name: str, vectors: list[list[float]], dimensions: int
+    ) -> dict[str, float]:
+        """Int8 range of a field; the first batch written to the field calibrates it.
+
+        The range is only computed under the _meta lock after re-reading _meta, so
+        concurrent ingestions all encode with the one recorded range.
+        """
+        profiles = self._get_index_meta(client).get(VECTOR_PROFILES_META_KEY) or {}
+        calibration = (profiles.get(field_name) or {}).get("calibration")
+        if calibration:
+            return calibration
+
+        with self._meta_lock(client):
+            meta = self._get_index_meta(client, strict=True)
+            calibration = ((meta.get(VECTOR_PROFILES_META_KEY) or {}).get(field_name) or {}).get("calibration")
+            if calibration:
+                return calibration
+            calibration = calibrate_vectors(vectors, dimensions)
+            meta = self._merged_meta(meta, field_name, {"calibration": calibration})
+            client.indices.put_mapping(index=self.index_name, body={"_meta": meta})
+        logger.info(f"Calibrated int8 field '{field_name}': {calibration}")
+        return calibration
+
     def _get_index_properties(self, client: OpenSearch) -> dict[str, Any] | None:
         """Retrieve flattened mapping properties for the current index."""
         try:
@@ -1550,6 +1995,7 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             raise ValueError(msg)
 
         index_properties = self._get_index_properties(client)
+        vector_profiles = self._get_index_meta(client).get(VECTOR_PROFILES_META_KEY) or {}
         legacy_vector_field = getattr(self, "vector_field", "chunk_embedding")
 
         # Build KNN queries for each model
@@ -1564,9 +2010,26 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             num_candidates = 0
         use_num_candidates = num_candidates > 0
 
-        for model_name, embedding_vector in query_embeddings.items():
+        # Each model may have fields stored with different vector profiles (recorded in
+        # the mapping _meta); the query vector is encoded to match each field
+        field_candidates: list[tuple[str, str, list[float]]] = []
+        for model_name, raw_vector in query_embeddings.items():
             field_name = get_embedding_field_name(model_name)
-            selected_field = field_name
+            profiled_fields = [
+                (name, entry)
+                for name, entry in vector_profiles.items()
+                if entry.get("model") == model_name and name != field_name
+            ]
+            for candidate_field, entry in [(field_name, vector_profiles.get(field_name) or {}), *profiled_fields]:
+                encoding = entry.get("encoding", "float32")
+                if encoding == "int8" and not entry.get("calibration"):
+                    continue  # Nothing has been written to this field yet
+                truncate_dim = entry.get("dimensions", 0) if entry.get("truncated") else 0
+                encoded = encode_vectors([raw_vector], encoding, truncate_dim, entry.get("calibration"))[0]
+                field_candidates.append((model_name, candidate_field, encoded))
+
+        for model_name, selected_field, embedding_vector in field_candidates:
+            field_name = selected_field
             vector_dim = len(embedding_vector)
 
             # Only use the expected dynamic field - no legacy fallback
@@ -1782,7 +2245,8 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
         search only if a query is provided.
 
         Returns:
-            List of Data objects containing search results with text and metadata
+            List of Data objects containing search results with text and metadata.
+            Without a search query, the documents that could not be ingested.
 
         Raises:
             Exception: If search operation fails
@@ -1796,8 +2260,10 @@ class OpenSearchVectorStoreComponentMultimodalMultiEmbedding(LCVectorStoreCompon
             # Only perform search if query is provided
             search_query = (self.search_query or "").strip()
             if not search_query:
-                self.log("No search query provided - ingestion completed, returning empty results")
-                return []
+                # Documents that could not be indexed are the only output of an ingestion run
+                failures = getattr(self, "ingest_failures", None) or []
+                self.log(f"No search query provided - ingestion completed, {len(failures)} documents failed")
+                return [Data(**failure) for failure in failures]
 
             # Perform search with the provided query
             raw = self.search(search_query)
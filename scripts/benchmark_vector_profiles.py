@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline recall and storage benchmark for vector storage profiles.
+
+Encodes a synthetic corpus with each profile (float32, fp16, int8, optionally
+truncated) and compares exact search over the encoded vectors against exact
+float32 search, so the numbers isolate the encoding loss from ANN graph recall.
+
+Usage:
+    uv run python scripts/benchmark_vector_profiles.py
+    uv run python scripts/benchmark_vector_profiles.py --vectors 50000 --dimensions 1536 --truncate 512 256
+
+Options:
+    --vectors N         Corpus size (default: 50000)
+    --queries N         Number of queries (default: 200)
+    --dimensions N      Native embedding dimensions (default: 1536)
+    --truncate N [N...] Matryoshka prefix lengths to include (default: 512)
+    --k N               Neighbours compared for recall@k (default: 10)
+
+The synthetic vectors have per-dimension variance decaying like Matryoshka-trained
+embeddings; truncation recall on real embeddings depends on the model.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src directory to path to import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.vector_profiles import VectorCodec, VectorProfile
+
+
+def synthetic_embeddings(count: int, dimensions: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    scale = 1.0 / np.sqrt(1.0 + np.arange(dimensions) / 16.0)
+    vectors = rng.standard_normal((count, dimensions)).astype(np.float32) * scale
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def top_k(queries: np.ndarray, vectors: np.ndarray, k: int, chunk: int = 64) -> np.ndarray:
+    """Exact inner-product top-k, computed in query chunks to bound memory"""
+    results = []
+    for start in range(0, len(queries), chunk):
+        scores = queries[start:start + chunk] @ vectors.T
+        candidates = np.argpartition(-scores, k, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+        results.append(np.take_along_axis(candidates, order, axis=1))
+    return np.vstack(results)
+
+
+def benchmark(profile: VectorProfile, vectors: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    started = time.perf_counter()
+    codec = VectorCodec(profile)
+    codec.calibrate(vectors)
+    stored = np.asarray(codec.encode(vectors), dtype=np.float32)
+    encoded_queries = np.asarray(codec.encode(queries), dtype=np.float32)
+    found = top_k(encoded_queries, stored, k)
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return {
+        "profile": f"{profile.encoding}" + (f"/d{profile.dimensions}" if profile.dimensions else ""),
+        "recall": hits / truth.size,
+        "bytes": profile.bytes_per_vector(vectors.shape[1]),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall and storage of vector profiles")
+    parser.add_argument("--vectors", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--truncate", type=int, nargs="*", default=[512])
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Generating {args.vectors} x {args.dimensions} vectors...")
+    vectors = synthetic_embeddings(args.vectors, args.dimensions, seed=7)
+    queries = synthetic_embeddings(args.queries, args.dimensions, seed=11)
+    truth = top_k(queries, vectors, args.k)
+
+    profiles = [VectorProfile("float32"), VectorProfile("fp16"), VectorProfile("int8")]
+    for dimensions in args.truncate:
+        profiles += [VectorProfile("float32", dimensions), VectorProfile("int8", dimensions)]
+
+    baseline = profiles[0].bytes_per_vector(args.dimensions)
+    print(f"\n{'profile':<16}{'recall@' + str(args.k):>12}{'bytes/vector':>15}{'vs float32':>12}{'seconds':>10}")
+    for profile in profiles:
+        result = benchmark(profile, vectors, queries, truth, args.k)
+        print(
+            f"{result['profile']:<16}{result['recall']:>12.3f}{result['bytes']:>15}"
+            f"{result['bytes'] / baseline:>12.2%}{result['seconds']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
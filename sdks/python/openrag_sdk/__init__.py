@@ -23,6 +23,12 @@ Usage:
         # Ingest document
         await client.documents.ingest(file_path="./report.pdf")
 
+        # Ingest a directory, resuming from a previous run
+        async for result in client.documents.ingest_many(
+            Path("./reports").glob("*.pdf"), concurrency=8, manifest="ingested.jsonl"
+        ):
+            print(result.path, result.status)
+
         # Get settings
         settings = await client.settings.get()
 """
@@ -50,7 +56,9 @@ from .models import (
     DeleteKnowledgeFilterResponse,
     DoneEvent,
     GetKnowledgeFilterResponse,
+    IngestFileResult,
     IngestResponse,
+    IngestTaskStatus,
     KnowledgeFilter,
     KnowledgeFilterQueryData,
     KnowledgeFilterSearchResponse,
@@ -93,6 +101,8 @@ __all__ = [
     "SearchResult",
     "SearchFilters",
     "IngestResponse",
+    "IngestTaskStatus",
+    "IngestFileResult",
     "DeleteDocumentResponse",
     "Conversation",
     "ConversationDetail",
@@ -1,6 +1,8 @@
 """OpenRAG SDK client."""
 
 import os
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import httpx
@@ -19,6 +21,23 @@ from .knowledge_filters import KnowledgeFiltersClient
 from .search import SearchClient
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
 class ModelsClient:
     """Client for listing available models per provider."""
 
@@ -215,6 +234,7 @@ class OpenRAGClient:
             message = response.text or f"HTTP {response.status_code}"
 
         status_code = response.status_code
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
 
         if status_code == 401:
             raise AuthenticationError(message, status_code)
@@ -225,9 +245,9 @@ class OpenRAGClient:
         elif status_code == 400:
             raise ValidationError(message, status_code)
         elif status_code == 429:
-            raise RateLimitError(message, status_code)
+            raise RateLimitError(message, status_code, retry_after)
         elif status_code >= 500:
-            raise ServerError(message, status_code)
+            raise ServerError(message, status_code, retry_after)
         else:
             raise OpenRAGError(message, status_code)
 
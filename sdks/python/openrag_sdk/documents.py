@@ -1,14 +1,256 @@
 """OpenRAG SDK documents client."""
 
 import asyncio
+import hashlib
+import json
+import random
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
 from pathlib import Path
-from typing import TYPE_CHECKING, BinaryIO
+from typing import TYPE_CHECKING, Any, BinaryIO
 
-from .models import DeleteDocumentResponse, IngestResponse, IngestTaskStatus
+import httpx
+
+from .exceptions import NotFoundError, OpenRAGError
+from .models import (
+    DeleteDocumentResponse,
+    IngestFileResult,
+    IngestResponse,
+    IngestTaskStatus,
+)
 
 if TYPE_CHECKING:
     from .client import OpenRAGClient
 
+# Upload responses worth retrying; connection errors are retried as well
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+TERMINAL_TASK_STATUSES = frozenset({"completed", "failed"})
+
+
+def _retry_delay(
+    attempt: int,
+    retry_after: float | None,
+    base: float,
+    cap: float,
+) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based).
+
+    Full-jitter exponential backoff. A Retry-After from the server is a floor,
+    with a little jitter on top so that rejected clients do not return in step.
+    """
+    backoff = random.uniform(0, min(cap, base * 2**attempt))
+    if retry_after is not None:
+        return retry_after + min(backoff, base)
+    return backoff
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    Local JSONL record of files already ingested, keyed by content hash.
+
+    One line is appended (and flushed) per completed file, so a batch that was
+    interrupted can be re-run and only the remaining files are uploaded.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._hashes: set[str] = set()
+        self._file = None
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._hashes.add(json.loads(line)["sha256"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # e.g. a line cut short by an interrupted run
+
+    def __contains__(self, content_hash: object) -> bool:
+        return content_hash in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def record(self, result: IngestFileResult) -> None:
+        if result.content_hash is None or result.content_hash in self._hashes:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            # Start on a new line if an interrupted run left a partial one
+            if self._file.tell() > 0 and not self._ends_with_newline():
+                self._file.write("\n")
+        entry = {
+            "sha256": result.content_hash,
+            "path": result.path,
+            "task_id": result.task_id,
+        }
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self._hashes.add(result.content_hash)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, 2)
+            return f.read(1) == b"\n"
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _TaskPoller:
+    """
+    Tracks the ingestion tasks of a bulk ingest with a single polling loop.
+
+    Statuses are fetched in batches of ``batch_size`` task IDs per request. The
+    interval starts at ``min_interval`` and grows by ``backoff`` each round up to
+    ``max_interval``; it starts over once every tracked task has finished.
+    """
+
+    def __init__(
+        self,
+        documents: "DocumentsClient",
+        on_done: Callable[[IngestFileResult], Any],
+        *,
+        batch_size: int,
+        min_interval: float,
+        max_interval: float,
+        backoff: float = 1.5,
+    ):
+        self._documents = documents
+        self._on_done = on_done
+        self._batch_size = batch_size
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._pending: dict[str, tuple[IngestFileResult, float]] = {}
+        self._wake = asyncio.Event()
+        self._closed = False
+        self._batch_supported = True
+        self.requests = 0  # Status requests made so far
+
+    def track(self, result: IngestFileResult, timeout: float) -> None:
+        deadline = asyncio.get_running_loop().time() + timeout
+        self._pending[result.task_id] = (result, deadline)
+        self._wake.set()
+
+    def close(self) -> None:
+        """No more tasks will be tracked; run() returns once the pending ones finish."""
+        self._closed = True
+        self._wake.set()
+
+    async def run(self) -> None:
+        interval = self._min_interval
+        while True:
+            if not self._pending:
+                if self._closed:
+                    return
+                self._wake.clear()
+                await self._wake.wait()
+                interval = self._min_interval
+                continue
+
+            await asyncio.sleep(interval)
+            statuses = await self._fetch(list(self._pending))
+            now = asyncio.get_running_loop().time()
+            for task_id, (_, deadline) in list(self._pending.items()):
+                if task_id in statuses and statuses[task_id] is None:
+                    self._finish(task_id, status="failed", error="Task not found")
+                elif task_id in statuses and (
+                    statuses[task_id].status in TERMINAL_TASK_STATUSES
+                ):
+                    self._finish(task_id, task=statuses[task_id])
+                elif now >= deadline:
+                    self._finish(
+                        task_id,
+                        status="failed",
+                        error=f"Ingestion task {task_id} did not complete in time",
+                    )
+            interval = min(self._max_interval, interval * self._backoff)
+
+    def _finish(
+        self,
+        task_id: str,
+        *,
+        task: IngestTaskStatus | None = None,
+        status: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        result, _ = self._pending.pop(task_id)
+        if task is not None:
+            result.task = task
+            if task.status == "failed" or task.failed_files:
+                status = "failed"
+                error = next(
+                    (
+                        str(f["error"])
+                        for f in task.files.values()
+                        if isinstance(f, dict) and f.get("error")
+                    ),
+                    "Ingestion failed",
+                )
+            else:
+                status = "completed"
+        result.status = status or "failed"
+        result.error = error
+        self._on_done(result)
+
+    async def _fetch(self, task_ids: list[str]) -> dict[str, IngestTaskStatus | None]:
+        """
+        Current status per task ID: an IngestTaskStatus, or None if the server
+        does not know the task. IDs that could not be queried are left out.
+        """
+        statuses: dict[str, IngestTaskStatus | None] = {}
+        for start in range(0, len(task_ids), self._batch_size):
+            batch = task_ids[start : start + self._batch_size]
+            if self._batch_supported:
+                try:
+                    statuses.update(await self._fetch_batch(batch))
+                    continue
+                except OpenRAGError as e:
+                    if e.status_code not in (404, 405):
+                        continue
+                    # Server without the batch endpoint: query tasks one by one
+                    self._batch_supported = False
+                except httpx.TransportError:
+                    continue
+            for task_id in batch:
+                self.requests += 1
+                try:
+                    statuses[task_id] = await self._documents.get_task_status(task_id)
+                except NotFoundError:
+                    statuses[task_id] = None
+                except (OpenRAGError, httpx.TransportError):
+                    pass
+        return statuses
+
+    async def _fetch_batch(
+        self, task_ids: list[str]
+    ) -> dict[str, IngestTaskStatus | None]:
+        self.requests += 1
+        response = await self._documents._client._request(
+            "POST",
+            "/api/v1/tasks/status",
+            json={"task_ids": task_ids},
+        )
+        data = response.json()
+        statuses: dict[str, IngestTaskStatus | None] = {
+            task_id: IngestTaskStatus(**task)
+            for task_id, task in data.get("tasks", {}).items()
+        }
+        for task_id in data.get("missing", []):
+            statuses[task_id] = None
+        return statuses
+
 
 class DocumentsClient:
     """Client for document operations."""
@@ -79,6 +321,171 @@ class DocumentsClient:
             timeout=timeout,
         )
 
+    async def ingest_many(
+        self,
+        paths: Iterable[str | Path] | AsyncIterable[str | Path],
+        *,
+        concurrency: int = 4,
+        manifest: str | Path | None = None,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+        status_batch_size: int = 100,
+        timeout: float = 3600.0,
+    ) -> AsyncIterator[IngestFileResult]:
+        """
+        Ingest many files, yielding a result per file as it finishes.
+
+        Up to ``concurrency`` uploads run at once over the client's shared HTTP
+        connection pool, each streaming the file from disk. The resulting tasks
+        are tracked by a single poller that queries their status in batches.
+        Uploads rejected with 429 or a 5xx status, or dropped by the connection,
+        are retried with jittered exponential backoff, waiting at least as long
+        as the server's Retry-After.
+
+        Args:
+            paths: Paths of the files to ingest (any iterable, or async iterable).
+            concurrency: Maximum number of uploads in flight.
+            manifest: Optional JSONL file of completed content hashes. Files
+                recorded there are skipped, and completed files are appended.
+            max_retries: Retries per upload after the first attempt.
+            retry_backoff: Base delay in seconds of the retry backoff.
+            max_retry_backoff: Upper bound in seconds of a single backoff delay.
+            poll_interval: Initial seconds between task status rounds.
+            max_poll_interval: Upper bound of the growing poll interval.
+            status_batch_size: Task IDs per status request.
+            timeout: Maximum seconds to wait for each task after its upload.
+
+        Yields:
+            IngestFileResult per file, with status "completed", "failed" or
+            "skipped" (already in the manifest), in completion order.
+
+        Example:
+            async for result in client.documents.ingest_many(
+                Path("./reports").glob("*.pdf"), concurrency=8, manifest="done.jsonl"
+            ):
+                print(result.path, result.status)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        done = IngestManifest(manifest) if manifest is not None else None
+        results: asyncio.Queue[IngestFileResult | None] = asyncio.Queue()
+        queue: asyncio.Queue[Path | None] = asyncio.Queue(maxsize=concurrency * 2)
+
+        def finish(result: IngestFileResult) -> None:
+            if done is not None and result.status == "completed":
+                done.record(result)
+            results.put_nowait(result)
+
+        poller = _TaskPoller(
+            self,
+            finish,
+            batch_size=status_batch_size,
+            min_interval=poll_interval,
+            max_interval=max_poll_interval,
+        )
+
+        async def feed() -> None:
+            if isinstance(paths, AsyncIterable):
+                async for path in paths:
+                    await queue.put(Path(path))
+            else:
+                for path in paths:
+                    await queue.put(Path(path))
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        async def upload_worker() -> None:
+            while (path := await queue.get()) is not None:
+                result = await self._upload_one(
+                    path,
+                    done,
+                    max_retries=max_retries,
+                    retry_backoff=retry_backoff,
+                    max_retry_backoff=max_retry_backoff,
+                )
+                if result.status == "running":
+                    poller.track(result, timeout)
+                else:
+                    finish(result)
+
+        async def supervise() -> None:
+            try:
+                workers = [upload_worker() for _ in range(concurrency)]
+                await asyncio.gather(feed(), *workers)
+                poller.close()
+                await poller_task
+            finally:
+                results.put_nowait(None)
+
+        poller_task = asyncio.create_task(poller.run())
+        supervisor = asyncio.create_task(supervise())
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+            await supervisor
+        finally:
+            for task in (supervisor, poller_task):
+                task.cancel()
+            await asyncio.gather(supervisor, poller_task, return_exceptions=True)
+            if done is not None:
+                done.close()
+
+    async def _upload_one(
+        self,
+        path: Path,
+        manifest: IngestManifest | None,
+        *,
+        max_retries: int,
+        retry_backoff: float,
+        max_retry_backoff: float,
+    ) -> IngestFileResult:
+        """Upload one file with retries; status "running" means a task to poll."""
+        result = IngestFileResult(path=str(path), status="failed")
+        try:
+            if manifest is not None:
+                result.content_hash = await asyncio.to_thread(_file_sha256, path)
+                if result.content_hash in manifest:
+                    result.status = "skipped"
+                    return result
+
+            while True:
+                result.attempts += 1
+                try:
+                    with open(path, "rb") as f:
+                        response = await self._client._request(
+                            "POST",
+                            "/api/v1/documents/ingest",
+                            files={"file": (path.name, f)},
+                        )
+                    break
+                except (OpenRAGError, httpx.TransportError) as e:
+                    retryable = isinstance(e, httpx.TransportError) or (
+                        e.status_code in RETRYABLE_STATUS_CODES
+                    )
+                    if not retryable or result.attempts > max_retries:
+                        raise
+                    await asyncio.sleep(
+                        _retry_delay(
+                            result.attempts - 1,
+                            getattr(e, "retry_after", None),
+                            retry_backoff,
+                            max_retry_backoff,
+                        )
+                    )
+        except (OpenRAGError, httpx.TransportError, OSError) as e:
+            result.error = str(e) or type(e).__name__
+            return result
+
+        data = response.json()
+        result.task_id = data.get("task_id")
+        # Without a task ID the server processed the file synchronously
+        result.status = "running" if result.task_id else "completed"
+        return result
+
     async def get_task_status(self, task_id: str) -> IngestTaskStatus:
         """
         Get the status of an ingestion task.
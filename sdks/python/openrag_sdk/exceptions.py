@@ -4,10 +4,17 @@
 class OpenRAGError(Exception):
     """Base exception for OpenRAG SDK."""
 
-    def __init__(self, message: str, status_code: int | None = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+    ):
         super().__init__(message)
         self.message = message
         self.status_code = status_code
+        # Seconds the server asked the client to wait (Retry-After header), if any
+        self.retry_after = retry_after
 
 
 class AuthenticationError(OpenRAGError):
@@ -90,6 +90,18 @@ class IngestTaskStatus(BaseModel):
     files: dict = {}  # Detailed per-file status
 
 
+class IngestFileResult(BaseModel):
+    """Outcome of one file in a bulk ingestion (documents.ingest_many)."""
+
+    path: str
+    status: str  # "completed", "failed", "skipped"
+    task_id: str | None = None
+    content_hash: str | None = None
+    attempts: int = 0  # Upload attempts, including retries
+    error: str | None = None
+    task: IngestTaskStatus | None = None
+
+
 class DeleteDocumentResponse(BaseModel):
     """Response from document deletion."""
 
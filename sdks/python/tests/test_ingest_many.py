@@ -0,0 +1,218 @@
+"""
+Tests for bulk ingestion (documents.ingest_many) against an in-process fake server.
+
+Run with: pytest sdks/python/tests/test_ingest_many.py -v
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from contextlib import aclosing
+from pathlib import Path
+
+import httpx
+import pytest
+
+from openrag_sdk import OpenRAGClient
+from openrag_sdk.documents import _retry_delay
+
+
+class FakeServer:
+    """Ingest and task endpoints of an OpenRAG instance, served over MockTransport."""
+
+    def __init__(self, *, upload_latency=0.002, polls_to_complete=2, batch_endpoint=True):
+        self.upload_latency = upload_latency
+        self.polls_to_complete = polls_to_complete
+        self.batch_endpoint = batch_endpoint
+        # filename -> list of responses for successive attempts (then 202)
+        self.failures: dict[str, list] = {}
+        self.failed_files: set[str] = set()
+        self.tasks: dict[str, dict] = {}
+        self.uploads: list[str] = []
+        self.attempt_times: dict[str, list[float]] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.status_requests = 0
+        self.task_requests = 0
+        self.ids_queried = 0
+
+    def client(self) -> OpenRAGClient:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        return OpenRAGClient(api_key="orag_test", base_url="http://openrag.test", http_client=http)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/v1/documents/ingest":
+            return await self.ingest(request)
+        if path == "/api/v1/tasks/status" and self.batch_endpoint:
+            self.status_requests += 1
+            task_ids = json.loads(request.content)["task_ids"]
+            self.ids_queried += len(task_ids)
+            tasks = {t: self.poll(t) for t in task_ids if t in self.tasks}
+            missing = [t for t in task_ids if t not in self.tasks]
+            return httpx.Response(200, json={"tasks": tasks, "missing": missing})
+        match = re.fullmatch(r"/api/v1/tasks/([^/]+)", path)
+        if match and request.method == "GET" and match.group(1) in self.tasks:
+            self.task_requests += 1
+            return httpx.Response(200, json=self.poll(match.group(1)))
+        return httpx.Response(404, json={"error": "Not found"})
+
+    async def ingest(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        filename = re.search(rb'filename="([^"]+)"', body).group(1).decode()
+        assert f"content of {filename}".encode() in body
+        self.attempt_times.setdefault(filename, []).append(time.monotonic())
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.upload_latency)
+        finally:
+            self.in_flight -= 1
+
+        planned = self.failures.get(filename)
+        if planned:
+            failure = planned.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+
+        self.uploads.append(filename)
+        task_id = uuid.uuid4().hex
+        self.tasks[task_id] = {"filename": filename, "polls": 0}
+        return httpx.Response(
+            202, json={"task_id": task_id, "status": "accepted", "filename": filename}
+        )
+
+    def poll(self, task_id: str) -> dict:
+        task = self.tasks[task_id]
+        task["polls"] += 1
+        done = task["polls"] >= self.polls_to_complete
+        failed = done and task["filename"] in self.failed_files
+        file_status = {"status": "failed", "error": "Unsupported file"} if failed else {}
+        return {
+            "task_id": task_id,
+            "status": "completed" if done else "running",
+            "total_files": 1,
+            "processed_files": int(done),
+            "successful_files": int(done and not failed),
+            "failed_files": int(failed),
+            "files": {task["filename"]: file_status},
+        }
+
+
+@pytest.fixture
+def files(tmp_path) -> list[Path]:
+    paths = []
+    for i in range(500):
+        path = tmp_path / "docs" / f"doc-{i:03d}.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"content of {path.name}\n")
+        paths.append(path)
+    return paths
+
+
+async def ingest_all(server, paths, **kwargs):
+    kwargs.setdefault("poll_interval", 0.01)
+    kwargs.setdefault("max_poll_interval", 0.05)
+    kwargs.setdefault("retry_backoff", 0.001)
+    async with server.client() as client:
+        return [r async for r in client.documents.ingest_many(paths, **kwargs)]
+
+
+async def test_bounded_concurrency_and_batched_polling(files, tmp_path):
+    server = FakeServer()
+    manifest = tmp_path / "manifest.jsonl"
+
+    results = await ingest_all(server, iter(files), concurrency=8, manifest=manifest)
+
+    assert len(results) == 500
+    assert {r.status for r in results} == {"completed"}
+    assert sorted(r.path for r in results) == sorted(map(str, files))
+    assert 1 < server.peak_in_flight <= 8
+    # One poller querying many tasks per request, not a polling loop per file
+    assert server.task_requests == 0
+    assert server.status_requests <= 50
+    assert server.ids_queried / server.status_requests > 10
+
+    # A rerun with the manifest uploads nothing
+    rerun = FakeServer()
+    again = await ingest_all(rerun, files, concurrency=8, manifest=manifest)
+    assert rerun.uploads == []
+    assert {r.status for r in again} == {"skipped"}
+    assert len(again) == 500
+
+
+async def test_interrupted_batch_resumes_from_the_manifest(files, tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    server = FakeServer()
+
+    async with server.client() as client:
+        stream = client.documents.ingest_many(
+            files, concurrency=4, manifest=manifest, poll_interval=0.01
+        )
+        async with aclosing(stream):
+            seen = 0
+            async for _ in stream:
+                seen += 1
+                if seen == 200:
+                    break
+
+    recorded = len(manifest.read_text().splitlines())
+    assert recorded >= 200
+    # A line cut short by the interruption is ignored
+    with open(manifest, "a") as f:
+        f.write('{"sha256": "ab')
+
+    rerun = FakeServer()
+    results = await ingest_all(rerun, files, concurrency=4, manifest=manifest)
+    assert len(rerun.uploads) == 500 - recorded
+    assert sum(r.status == "skipped" for r in results) == recorded
+    assert len(manifest.read_text().splitlines()) == 501
+
+
+async def test_retryable_failures_are_retried_with_backoff(files):
+    server = FakeServer()
+    paths = files[:20]
+    server.failures = {
+        "doc-000.md": [httpx.Response(429, headers={"Retry-After": "0.2"}, json={"error": "Slow down"})],
+        "doc-001.md": [httpx.Response(503, json={"error": "Unavailable"})] * 2,
+        "doc-002.md": [httpx.ReadError("Connection reset by peer")],
+        "doc-003.md": [httpx.Response(400, json={"error": "Invalid file"})],
+        "doc-004.md": [httpx.Response(502, json={"error": "Bad gateway"})] * 10,
+    }
+    server.failed_files = {"doc-005.md"}
+
+    results = {Path(r.path).name: r for r in await ingest_all(server, paths, max_retries=3)}
+
+    assert len(results) == 20
+    assert (results["doc-000.md"].status, results["doc-000.md"].attempts) == ("completed", 2)
+    first, second = server.attempt_times["doc-000.md"]
+    assert second - first >= 0.2  # Retry-After honoured
+    assert (results["doc-001.md"].status, results["doc-001.md"].attempts) == ("completed", 3)
+    assert (results["doc-002.md"].status, results["doc-002.md"].attempts) == ("completed", 2)
+    assert (results["doc-003.md"].status, results["doc-003.md"].attempts) == ("failed", 1)
+    assert results["doc-003.md"].error == "Invalid file"
+    assert (results["doc-004.md"].status, results["doc-004.md"].attempts) == ("failed", 4)
+    assert results["doc-005.md"].status == "failed"
+    assert results["doc-005.md"].error == "Unsupported file"
+    assert results["doc-005.md"].task.failed_files == 1
+    assert sum(r.status == "completed" for r in results.values()) == 17
+
+
+async def test_falls_back_to_per_task_status_without_the_batch_endpoint(files):
+    server = FakeServer(batch_endpoint=False)
+
+    results = await ingest_all(server, files[:10], concurrency=2)
+
+    assert {r.status for r in results} == {"completed"}
+    assert server.status_requests == 0
+    assert server.task_requests >= 10
+
+
+def test_retry_delay():
+    for attempt in range(10):
+        assert 0 <= _retry_delay(attempt, None, 0.5, 8.0) <= 8.0
+    assert 3.0 <= _retry_delay(0, 3.0, 0.5, 30.0) <= 3.5
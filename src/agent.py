@@ -1,35 +1,37 @@
 from http.client import HTTPException
 
 from utils.logging_config import get_logger
+from utils.stream_events import STREAM_DEBUG, StreamEvent, StreamMetrics, delta_text, event_data
 
 logger = get_logger(__name__)
 
 # Import persistent storage
+from services.conversation_cache import ConversationCache
 from services.conversation_persistence_service import conversation_persistence
+from services.shared_state import is_multi_worker
 
-# In-memory storage for active conversation threads (preserves function calls)
-active_conversations = {}
+# Memory-bounded storage for active conversation threads (preserves function calls).
+# Cold threads spill to the conversation store and are rehydrated on access.
+active_conversations = ConversationCache(write_through=is_multi_worker())
 
 
-def get_user_conversations(user_id: str):
+async def get_user_conversations(user_id: str):
     """Get conversation metadata for a user from persistent storage"""
-    return conversation_persistence.get_user_conversations(user_id)
+    return await conversation_persistence.aget_user_conversations(user_id)
 
 
-def get_conversation_thread(user_id: str, previous_response_id: str = None):
+async def get_conversation_thread(user_id: str, previous_response_id: str = None):
     """Get or create a specific conversation thread with function call preservation"""
     from datetime import datetime
 
-    # Create user namespace if it doesn't exist
-    if user_id not in active_conversations:
-        active_conversations[user_id] = {}
-
     # If we have a previous_response_id, try to get the existing conversation
-    if previous_response_id and previous_response_id in active_conversations[user_id]:
-        logger.debug(
-            f"Retrieved existing conversation for user {user_id}, response_id {previous_response_id}"
-        )
-        return active_conversations[user_id][previous_response_id]
+    if previous_response_id:
+        existing = await active_conversations.get(user_id, previous_response_id)
+        if existing is not None:
+            logger.debug(
+                f"Retrieved existing conversation for user {user_id}, response_id {previous_response_id}"
+            )
+            return existing
 
     # Create new conversation thread
     new_conversation = {
@@ -50,9 +52,7 @@ def get_conversation_thread(user_id: str, previous_response_id: str = None):
 async def store_conversation_thread(user_id: str, response_id: str, conversation_state: dict):
     """Store conversation both in memory (with function calls) and persist metadata to disk (async, non-blocking)"""
     # 1. Store full conversation in memory for function call preservation
-    if user_id not in active_conversations:
-        active_conversations[user_id] = {}
-    active_conversations[user_id][response_id] = conversation_state
+    await active_conversations.put(user_id, response_id, conversation_state)
 
     # 2. Store only essential metadata to disk (simplified JSON)
     messages = conversation_state.get("messages", [])
@@ -80,22 +80,32 @@ async def store_conversation_thread(user_id: str, response_id: str, conversation
         user_id, response_id, metadata_only
     )
 
+    # 3. New turn - drop cached Langflow messages for this thread
+    try:
+        from services.langflow_history_service import langflow_history_service
+
+        langflow_history_service.invalidate_session(response_id)
+        langflow_history_service.invalidate_session(conversation_state.get("previous_response_id"))
+    except Exception as e:
+        logger.warning(f"Failed to invalidate Langflow history cache: {e}")
+
 
 # Legacy function for backward compatibility
-def get_user_conversation(user_id: str):
+async def get_user_conversation(user_id: str):
     """Get the most recent conversation for a user (for backward compatibility)"""
     # Check in-memory conversations first (with function calls)
-    if user_id in active_conversations and active_conversations[user_id]:
+    user_threads = active_conversations.user_conversations(user_id)
+    if user_threads:
         latest_response_id = max(
-            active_conversations[user_id].keys(),
-            key=lambda k: active_conversations[user_id][k]["last_activity"],
+            user_threads.keys(),
+            key=lambda k: user_threads[k]["last_activity"],
         )
-        return active_conversations[user_id][latest_response_id]
+        return user_threads[latest_response_id]
 
     # Fallback to metadata-only conversations
-    conversations = get_user_conversations(user_id)
+    conversations = await get_user_conversations(user_id)
     if not conversations:
-        return get_conversation_thread(user_id)
+        return await get_conversation_thread(user_id)
 
     # Return the most recently active conversation metadata
     latest_conversation = max(conversations.values(), key=lambda c: c["last_activity"])
@@ -113,6 +123,8 @@ async def async_response_stream(
 ):
     logger.info("User prompt received", prompt=prompt)
 
+    metrics = None
+    completed = False
     try:
         # Build request parameters
         request_params = {
@@ -131,119 +143,62 @@ async def async_response_stream(
         if extra_headers:
             request_params["extra_headers"] = extra_headers
 
+        metrics = StreamMetrics(log_prefix)
         response = await client.responses.create(**request_params)
 
         full_response = ""
-        chunk_count = 0
         detected_tool_call = False  # Track if we've detected a tool call
         async for chunk in response:
-            chunk_count += 1
-            logger.debug(
-                "Stream chunk received", chunk_count=chunk_count, chunk=str(chunk)
-            )
-
-            # Yield the raw event as JSON for the UI to process
-            import json
+            # Serialize the event once; downstream consumers read StreamEvent.data
+            if hasattr(chunk, "model_dump"):
+                chunk_data = chunk.model_dump()
+            elif hasattr(chunk, "__dict__"):
+                chunk_data = chunk.__dict__
+            else:
+                chunk_data = str(chunk)
 
             # Also extract text content for logging
-            if hasattr(chunk, "output_text") and chunk.output_text:
-                full_response += chunk.output_text
-            elif hasattr(chunk, "delta") and chunk.delta:
-                # Handle delta properly - it might be a dict or string
-                if isinstance(chunk.delta, dict):
-                    delta_text = (
-                        chunk.delta.get("content", "")
-                        or chunk.delta.get("text", "")
-                        or str(chunk.delta)
+            text = ""
+            if isinstance(chunk_data, dict):
+                text = chunk_data.get("output_text") or delta_text(chunk_data)
+            full_response += text
+            metrics.observe(text)
+
+            if STREAM_DEBUG:
+                _log_chunk_diagnostics(metrics.chunks, chunk, chunk_data)
+
+            # Middleware: Detect implicit tool calls and inject standardized events
+            # This helps Granite 3.3 8b and other models that don't emit standard markers
+            if isinstance(chunk_data, dict) and not detected_tool_call:
+                results = _implicit_tool_results(chunk_data)
+                if results is not None:
+                    logger.debug(
+                        "Detected implicit tool call in backend, injecting synthetic event",
+                        chunk_fields=list(chunk_data.keys())
                     )
-                else:
-                    delta_text = str(chunk.delta)
-                full_response += delta_text
-            
-            # Enhanced logging for tool call detection (Granite 3.3 8b investigation)
-            chunk_attrs = dir(chunk) if hasattr(chunk, '__dict__') else []
-            tool_related_attrs = [attr for attr in chunk_attrs if 'tool' in attr.lower() or 'call' in attr.lower() or 'retrieval' in attr.lower()]
-            if tool_related_attrs:
-                logger.info(
-                    "Tool-related attributes found in chunk",
-                    chunk_count=chunk_count,
-                    attributes=tool_related_attrs,
-                    chunk_type=type(chunk).__name__
-                )
+                    # Send the synthetic event first
+                    yield StreamEvent({
+                        "type": "response.output_item.done",
+                        "item": {
+                            "type": "retrieval_call",
+                            "id": f"synthetic_{metrics.chunks}",
+                            "name": "Retrieval",
+                            "tool_name": "Retrieval",
+                            "status": "completed",
+                            "inputs": {"implicit": True, "backend_detected": True},
+                            "results": results,
+                        }
+                    })
+                    detected_tool_call = True  # Mark that we've injected a tool call
 
-            # Send the raw event as JSON followed by newline for easy parsing
             try:
-                # Try to serialize the chunk object
-                if hasattr(chunk, "model_dump"):
-                    # Pydantic model
-                    chunk_data = chunk.model_dump()
-                elif hasattr(chunk, "__dict__"):
-                    chunk_data = chunk.__dict__
-                else:
-                    chunk_data = str(chunk)
-                
-                # Log detailed chunk structure for investigation (especially for Granite 3.3 8b)
-                if isinstance(chunk_data, dict):
-                    # Check for any fields that might indicate tool usage
-                    potential_tool_fields = {
-                        k: v for k, v in chunk_data.items() 
-                        if any(keyword in str(k).lower() for keyword in ['tool', 'call', 'retrieval', 'function', 'result', 'output'])
-                    }
-                    if potential_tool_fields:
-                        logger.info(
-                            "Potential tool-related fields in chunk",
-                            chunk_count=chunk_count,
-                            fields=list(potential_tool_fields.keys()),
-                            sample_data=str(potential_tool_fields)[:500]
-                        )
-
-                # Middleware: Detect implicit tool calls and inject standardized events
-                # This helps Granite 3.3 8b and other models that don't emit standard markers
-                if isinstance(chunk_data, dict) and not detected_tool_call:
-                    # Check if this chunk contains retrieval results
-                    has_results = any([
-                        'results' in chunk_data and isinstance(chunk_data.get('results'), list),
-                        'outputs' in chunk_data and isinstance(chunk_data.get('outputs'), list),
-                        'retrieved_documents' in chunk_data,
-                        'retrieval_results' in chunk_data,
-                    ])
-                    
-                    if has_results:
-                        logger.info(
-                            "Detected implicit tool call in backend, injecting synthetic event",
-                            chunk_fields=list(chunk_data.keys())
-                        )
-                        # Inject a synthetic tool call event before this chunk
-                        synthetic_event = {
-                            "type": "response.output_item.done",
-                            "item": {
-                                "type": "retrieval_call",
-                                "id": f"synthetic_{chunk_count}",
-                                "name": "Retrieval",
-                                "tool_name": "Retrieval",
-                                "status": "completed",
-                                "inputs": {"implicit": True, "backend_detected": True},
-                                "results": chunk_data.get('results') or chunk_data.get('outputs') or 
-                                         chunk_data.get('retrieved_documents') or 
-                                         chunk_data.get('retrieval_results') or []
-                            }
-                        }
-                        # Send the synthetic event first
-                        yield (json.dumps(synthetic_event, default=str) + "\n").encode("utf-8")
-                        detected_tool_call = True  # Mark that we've injected a tool call
-                
-                yield (json.dumps(chunk_data, default=str) + "\n").encode("utf-8")
+                yield StreamEvent(chunk_data)
             except Exception as e:
                 # Fallback to string representation
                 logger.warning("JSON serialization failed", error=str(e))
-                yield (
-                    json.dumps(
-                        {"error": f"Serialization failed: {e}", "raw": str(chunk)}
-                    )
-                    + "\n"
-                ).encode("utf-8")
+                yield StreamEvent({"error": f"Serialization failed: {e}", "raw": str(chunk)})
 
-        logger.debug("Stream complete", total_chunks=chunk_count)
+        completed = True
         logger.info("Response generated", log_prefix=log_prefix, response=full_response)
 
     except Exception as e:
@@ -252,6 +207,59 @@ async def async_response_stream(
 
         traceback.print_exc()
         raise
+    finally:
+        # Also record streams that failed or were closed by a disconnected client
+        if metrics is not None:
+            metrics.finish(completed=completed)
+
+
+def _implicit_tool_results(chunk_data: dict):
+    """Retrieval results carried by a chunk without standard tool call markers, if any"""
+    if not any((
+        isinstance(chunk_data.get("results"), list),
+        isinstance(chunk_data.get("outputs"), list),
+        "retrieved_documents" in chunk_data,
+        "retrieval_results" in chunk_data,
+    )):
+        return None
+    return (
+        chunk_data.get("results")
+        or chunk_data.get("outputs")
+        or chunk_data.get("retrieved_documents")
+        or chunk_data.get("retrieval_results")
+        or []
+    )
+
+
+def _log_chunk_diagnostics(chunk_count: int, chunk, chunk_data):
+    """Tool call detection diagnostics (Granite 3.3 8b investigation); only with STREAM_DEBUG"""
+    logger.debug("Stream chunk received", chunk_count=chunk_count, chunk=str(chunk))
+
+    chunk_attrs = dir(chunk) if hasattr(chunk, "__dict__") else []
+    tool_related_attrs = [
+        attr for attr in chunk_attrs
+        if "tool" in attr.lower() or "call" in attr.lower() or "retrieval" in attr.lower()
+    ]
+    if tool_related_attrs:
+        logger.debug(
+            "Tool-related attributes found in chunk",
+            chunk_count=chunk_count,
+            attributes=tool_related_attrs,
+            chunk_type=type(chunk).__name__
+        )
+
+    if isinstance(chunk_data, dict):
+        potential_tool_fields = {
+            k: v for k, v in chunk_data.items()
+            if any(keyword in str(k).lower() for keyword in ["tool", "call", "retrieval", "function", "result", "output"])
+        }
+        if potential_tool_fields:
+            logger.debug(
+                "Potential tool-related fields in chunk",
+                chunk_count=chunk_count,
+                fields=list(potential_tool_fields.keys()),
+                sample_data=str(potential_tool_fields)[:500]
+            )
 
 
 # Generic async response function for non-streaming
@@ -373,10 +381,11 @@ async def async_langflow_stream(
             previous_response_id=previous_response_id,
                 log_prefix="langflow",
         ):
-            logger.debug(
-                "Yielding chunk from langflow stream",
-                chunk_preview=chunk[:100].decode("utf-8", errors="replace"),
-            )
+            if STREAM_DEBUG:
+                logger.debug(
+                    "Yielding chunk from langflow stream",
+                    chunk_preview=chunk[:100].decode("utf-8", errors="replace"),
+                )
             yield chunk
         logger.debug("Langflow stream completed")
     except Exception as e:
@@ -401,7 +410,7 @@ async def async_chat(
     )
 
     # Get the specific conversation thread (or create new one)
-    conversation_state = get_conversation_thread(user_id, previous_response_id)
+    conversation_state = await get_conversation_thread(user_id, previous_response_id)
     logger.debug(
         "Got conversation state", message_count=len(conversation_state["messages"])
     )
@@ -454,7 +463,7 @@ async def async_chat(
         )
 
         # Debug: Check what's in user_conversations now
-        conversations = get_user_conversations(user_id)
+        conversations = await get_user_conversations(user_id)
         logger.debug(
             "User conversations updated",
             user_id=user_id,
@@ -477,7 +486,7 @@ async def async_chat_stream(
     filter_id: str = None,
 ):
     # Get the specific conversation thread (or create new one)
-    conversation_state = get_conversation_thread(user_id, previous_response_id)
+    conversation_state = await get_conversation_thread(user_id, previous_response_id)
 
     # Add user message to conversation with timestamp
     from datetime import datetime
@@ -499,19 +508,14 @@ async def async_chat_stream(
         log_prefix="agent",
     ):
         # Extract text content to build full response for history
-        try:
-            import json
-
-            chunk_data = json.loads(chunk.decode("utf-8"))
-            if "delta" in chunk_data and "content" in chunk_data["delta"]:
-                full_response += chunk_data["delta"]["content"]
+        chunk_data = event_data(chunk)
+        if chunk_data is not None:
+            full_response += delta_text(chunk_data)
             # Extract response_id from chunk
             if "id" in chunk_data:
                 response_id = chunk_data["id"]
             elif "response_id" in chunk_data:
                 response_id = chunk_data["response_id"]
-        except:
-            pass
         yield chunk
 
     # Add the complete assistant response to message history with response_id and timestamp
@@ -552,7 +556,7 @@ async def async_langflow_chat(
 
     if store_conversation:
         # Get the specific conversation thread (or create new one)
-        conversation_state = get_conversation_thread(user_id, previous_response_id)
+        conversation_state = await get_conversation_thread(user_id, previous_response_id)
         logger.debug(
             "Got langflow conversation state",
             message_count=len(conversation_state["messages"]),
@@ -636,7 +640,7 @@ async def async_langflow_chat(
         )
 
         # Debug: Check what's in user_conversations now
-        conversations = get_user_conversations(user_id)
+        conversations = await get_user_conversations(user_id)
         logger.debug(
             "User conversations updated",
             user_id=user_id,
@@ -666,7 +670,7 @@ async def async_langflow_chat_stream(
     )
 
     # Get the specific conversation thread (or create new one)
-    conversation_state = get_conversation_thread(user_id, previous_response_id)
+    conversation_state = await get_conversation_thread(user_id, previous_response_id)
 
     # Add user message to conversation with timestamp
     from datetime import datetime
@@ -691,21 +695,16 @@ async def async_langflow_chat_stream(
         log_prefix="langflow",
     ):
         # Extract text content to build full response for history
-        try:
-            import json
-
-            chunk_data = json.loads(chunk.decode("utf-8"))
+        chunk_data = event_data(chunk)
+        if chunk_data is not None:
             collected_chunks.append(chunk_data)  # Collect all chunk data
 
-            if "delta" in chunk_data and "content" in chunk_data["delta"]:
-                full_response += chunk_data["delta"]["content"]
+            full_response += delta_text(chunk_data)
             # Extract response_id from chunk
             if "id" in chunk_data:
                 response_id = chunk_data["id"]
             elif "response_id" in chunk_data:
                 response_id = chunk_data["response_id"]
-        except:
-            pass
         yield chunk
 
     # Add the complete assistant response to message history with response_id, timestamp, and function call data
@@ -743,9 +742,8 @@ async def delete_user_conversation(user_id: str, response_id: str) -> bool:
     deleted = False
 
     try:
-        # Delete from in-memory storage
-        if user_id in active_conversations and response_id in active_conversations[user_id]:
-            del active_conversations[user_id][response_id]
+        # Delete from in-memory storage (and any spilled copy)
+        if await active_conversations.pop(user_id, response_id):
             logger.debug(f"Deleted conversation {response_id} from memory for user {user_id}")
             deleted = True
 
@@ -757,7 +755,9 @@ async def delete_user_conversation(user_id: str, response_id: str) -> bool:
 
         # Release session ownership
         try:
+            from services.langflow_history_service import langflow_history_service
             from services.session_ownership_service import session_ownership_service
+            langflow_history_service.invalidate_session(response_id)
             session_ownership_service.release_session(user_id, response_id)
             logger.debug(f"Released session ownership for {response_id} for user {user_id}")
         except Exception as e:
@@ -155,7 +155,16 @@ async def langflow_history_endpoint(request: Request, chat_service, session_mana
     user_id = user.user_id
 
     try:
-        history = await chat_service.get_langflow_history(user_id)
+        page = int(request.query_params.get("page", "1"))
+        page_size = request.query_params.get("page_size")
+        page_size = int(page_size) if page_size else None
+    except ValueError:
+        return JSONResponse({"error": "page and page_size must be integers"}, status_code=400)
+
+    try:
+        history = await chat_service.get_langflow_history(
+            user_id, page=page, page_size=page_size
+        )
         return JSONResponse(history)
     except Exception as e:
         return JSONResponse(
@@ -1,6 +1,5 @@
 from starlette.requests import Request
 from starlette.responses import JSONResponse, PlainTextResponse
-from connectors.sharepoint.utils import is_valid_sharepoint_url
 from config.settings import get_index_name
 from utils.logging_config import get_logger
 from utils.telemetry import TelemetryClient, Category, MessageId
@@ -83,7 +82,7 @@ async def list_connectors(request: Request, connector_service, session_manager):
     """List available connector types with metadata"""
     try:
         connector_types = (
-            connector_service.connection_manager.get_available_connector_types()
+            await connector_service.connection_manager.get_available_connector_types()
         )
         return JSONResponse({"connectors": connector_types})
     except Exception as e:
@@ -334,8 +333,12 @@ async def connector_status(request: Request, connector_service, session_manager)
     )
 
 
-async def connector_webhook(request: Request, connector_service, session_manager):
-    """Handle webhook notifications from any connector type"""
+async def connector_webhook(request: Request, connector_service, session_manager, webhook_intake=None):
+    """Handle webhook notifications from any connector type
+
+    With a webhook intake, the affected files are buffered and synced in coalesced
+    batches; the response only reports what was enqueued.
+    """
     connector_type = request.path_params.get("connector_type")
     if connector_type is None:
         connector_type = "unknown"
@@ -352,7 +355,7 @@ async def connector_webhook(request: Request, connector_service, session_manager
     )
     try:
         await TelemetryClient.send_event(Category.CONNECTOR_OPERATIONS, MessageId.ORB_CONN_WEBHOOK_RECV)
-        temp_connector = connector_service.connection_manager._create_connector(
+        temp_connector = await connector_service.connection_manager._create_connector(
             temp_connection
         )
         validation_response = temp_connector.handle_webhook_validation(
@@ -389,7 +392,7 @@ async def connector_webhook(request: Request, connector_service, session_manager
 
         # Extract channel/subscription ID using connector-specific method
         try:
-            temp_connector = connector_service.connection_manager._create_connector(
+            temp_connector = await connector_service.connection_manager._create_connector(
                 temp_connection
             )
             channel_id = temp_connector.extract_webhook_channel_id(payload, headers)
@@ -429,6 +432,24 @@ async def connector_webhook(request: Request, connector_service, session_manager
                     {"status": "error", "reason": "connector_not_found"}
                 )
 
+            if webhook_intake is not None:
+                changes = await connector.webhook_changes(payload)
+                counts = webhook_intake.enqueue(connection.connection_id, changes)
+                logger.info(
+                    "Webhook changes enqueued",
+                    connection_id=connection.connection_id,
+                    **counts,
+                )
+                return JSONResponse(
+                    {
+                        "status": "queued",
+                        "connector_type": connector_type,
+                        "channel_id": channel_id,
+                        "connection_id": connection.connection_id,
+                        **counts,
+                    }
+                )
+
             # Let the connector handle the webhook and return affected file IDs
             affected_files = await connector.handle_webhook(payload)
 
@@ -820,6 +841,8 @@ async def connector_token(request: Request, connector_service, session_manager):
                 # The File Picker requires a token with SharePoint as the audience, not Graph
                 resource = request.query_params.get("resource")
 
+                from connectors.sharepoint.utils import is_valid_sharepoint_url
+
                 if resource and is_valid_sharepoint_url(resource):
                     # SharePoint File Picker v8 needs a SharePoint-scoped token
                     logger.info(f"Acquiring SharePoint-scoped token for resource: {resource}")
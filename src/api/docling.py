@@ -14,6 +14,7 @@ from utils.container_utils import (
     get_container_host,
     guess_host_ip_for_containers,
 )
+from utils.http_clients import shared_http_client
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -92,7 +93,7 @@ async def health(request: Request) -> JSONResponse:
     """
     health_url = f"{DOCLING_SERVICE_URL}/health"
     try:
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("docling") as client:
             response = await client.get(
                 health_url,
                 timeout=2.0
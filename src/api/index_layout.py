@@ -0,0 +1,40 @@
+"""
+Index layout endpoint.
+
+Reports the effective settings of the OpenRAG indices against the configured
+layout profile and flags drift.
+"""
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def layout_endpoint(request: Request, index_layout_service):
+    """
+    Effective index settings compared with the layout profile.
+
+    GET /index-layout
+
+    Response:
+        {
+            "profile": "single-node",
+            "expected": {"index.number_of_replicas": "0", "index.refresh_interval": "1s", ...},
+            "template": {"name": "openrag-index-layout", "installed": true, "up_to_date": true},
+            "indices": {
+                "documents": {
+                    "settings": {...},
+                    "bulk_load": false,
+                    "drift": [{"setting": "index.number_of_replicas", "expected": "0", "actual": "1"}]
+                }
+            },
+            "drift": true
+        }
+    """
+    try:
+        return JSONResponse(await index_layout_service.drift_report())
+    except Exception as e:
+        logger.error("Failed to build index layout report", error=str(e))
+        return JSONResponse({"error": str(e)}, status_code=500)
@@ -3,47 +3,12 @@ from starlette.responses import JSONResponse
 import uuid
 import json
 from datetime import datetime
+from services.knowledge_filter_service import normalize_query_data
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
-def normalize_query_data(query_data: str | dict) -> str:
-    """
-    Normalize query_data to ensure all required fields exist with defaults.
-    This prevents frontend crashes when API-created filters have incomplete data.
-    """
-    # Parse if string
-    if isinstance(query_data, str):
-        try:
-            data = json.loads(query_data)
-        except json.JSONDecodeError:
-            data = {}
-    else:
-        data = query_data or {}
-
-    # Ensure filters object exists with all required fields
-    filters = data.get("filters") or {}
-    normalized_filters = {
-        "data_sources": filters.get("data_sources", ["*"]),
-        "document_types": filters.get("document_types", ["*"]),
-        "owners": filters.get("owners", ["*"]),
-        "connector_types": filters.get("connector_types", ["*"]),
-    }
-
-    # Build normalized query_data with defaults
-    normalized = {
-        "query": data.get("query", ""),
-        "filters": normalized_filters,
-        "limit": data.get("limit", 10),
-        "scoreThreshold": data.get("scoreThreshold", 0),
-        "color": data.get("color", "zinc"),
-        "icon": data.get("icon", "filter"),
-    }
-
-    return json.dumps(normalized)
-
-
 async def create_knowledge_filter(
     request: Request, knowledge_filter_service, session_manager
 ):
@@ -228,6 +193,7 @@ async def update_knowledge_filter(
         ),
         "created_at": existing_filter["created_at"],  # Preserve original creation time
         "updated_at": datetime.utcnow().isoformat(),
+        "subscriptions": existing_filter.get("subscriptions", []),
     }
 
     # Recreate the knowledge filter
@@ -283,9 +249,15 @@ async def delete_knowledge_filter(
 
 
 async def subscribe_to_knowledge_filter(
-    request: Request, knowledge_filter_service, monitor_service, session_manager
+    request: Request, knowledge_filter_service, session_manager
 ):
-    """Create a subscription to a knowledge filter"""
+    """Create a subscription to a knowledge filter
+
+    Newly indexed chunks, from the backend ingest path and from Langflow
+    ingestion flow runs, are matched against the filter in-process
+    (services/knowledge_filter_matcher.py); matches are delivered as one
+    notification per subscription and window.
+    """
     filter_id = request.path_params.get("filter_id")
     if not filter_id:
         return JSONResponse(
@@ -307,29 +279,15 @@ async def subscribe_to_knowledge_filter(
 
     filter_doc = filter_result["filter"]
 
-    # Create the monitor for this subscription
-    monitor_result = await monitor_service.create_knowledge_filter_monitor(
-        filter_id=filter_id,
-        filter_name=filter_doc["name"],
-        query_data=filter_doc["query_data"],
-        user_id=user.user_id,
-        jwt_token=jwt_token,
-        notification_config=payload.get("notification_config"),
-    )
-
-    if not monitor_result.get("success"):
-        return JSONResponse(monitor_result, status_code=500)
-
-    # Store subscription info in the knowledge filter document
+    # Store the subscription in the knowledge filter document; the matcher picks it up
+    subscription_id = str(uuid.uuid4())
     subscription_data = {
-        "subscription_id": monitor_result["subscription_id"],
-        "monitor_id": monitor_result["monitor_id"],
-        "webhook_url": monitor_result["webhook_url"],
+        "subscription_id": subscription_id,
+        "user_id": user.user_id,
         "created_at": datetime.utcnow().isoformat(),
         "notification_config": payload.get("notification_config", {}),
     }
 
-    # Add subscription to the filter document
     update_result = await knowledge_filter_service.add_subscription(
         filter_id, subscription_data, user_id=user.user_id, jwt_token=jwt_token
     )
@@ -338,18 +296,12 @@ async def subscribe_to_knowledge_filter(
         return JSONResponse(
             {
                 "success": True,
-                "subscription_id": monitor_result["subscription_id"],
-                "monitor_id": monitor_result["monitor_id"],
-                "webhook_url": monitor_result["webhook_url"],
+                "subscription_id": subscription_id,
                 "message": f"Successfully subscribed to knowledge filter: {filter_doc['name']}",
             },
             status_code=201,
         )
     else:
-        # If we can't update the filter doc, clean up the monitor
-        await monitor_service.delete_monitor(
-            monitor_result["monitor_id"], user.user_id, jwt_token
-        )
         return JSONResponse({"error": "Failed to create subscription"}, status_code=500)
 
 
@@ -417,10 +369,11 @@ async def cancel_knowledge_filter_subscription(
     if not subscription:
         return JSONResponse({"error": "Subscription not found"}, status_code=404)
 
-    # Delete the monitor
-    monitor_result = await monitor_service.delete_monitor(
-        subscription["monitor_id"], user.user_id, jwt_token
-    )
+    # Subscriptions created before in-process matching also have an alerting monitor
+    if subscription.get("monitor_id"):
+        await monitor_service.delete_monitor(
+            subscription["monitor_id"], user.user_id, jwt_token
+        )
 
     # Remove subscription from the filter document
     remove_result = await knowledge_filter_service.remove_subscription(
@@ -439,7 +392,7 @@ async def cancel_knowledge_filter_subscription(
 async def knowledge_filter_webhook(
     request: Request, knowledge_filter_service, session_manager
 ):
-    """Handle webhook notifications from OpenSearch monitors"""
+    """Handle webhook notifications from OpenSearch monitors of older subscriptions"""
     filter_id = request.path_params.get("filter_id")
     subscription_id = request.path_params.get("subscription_id")
 
@@ -1,10 +1,12 @@
 """Provider validation utilities for testing API keys and models during onboarding."""
 
+import functools
 import json
 import httpx
 import os
 import ssl
 from utils.container_utils import transform_localhost_url
+from utils.http_clients import shared_http_client
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -20,8 +22,9 @@ WATSONX_USERNAME = os.getenv("WATSONX_USERNAME", "")
 WATSONX_PASSWORD = os.getenv("WATSONX_PASSWORD", "")
 
 
+@functools.lru_cache(maxsize=1)
 def _build_ssl_context() -> bool | ssl.SSLContext:
-    """環境設定に基づいて SSL コンテキストを構築する。"""
+    """環境設定に基づいて SSL コンテキストを構築する（共有 HTTP クライアントのキーになるためキャッシュする）。"""
     if not WATSONX_SSL_VERIFY:
         return False
     if WATSONX_CA_BUNDLE_PATH:
@@ -278,7 +281,7 @@ async def _test_openai_lightweight_health(api_key: str) -> None:
             "Content-Type": "application/json",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("openai") as client:
             # Use /v1/models endpoint which validates the key without consuming credits
             response = await client.get(
                 "https://api.openai.com/v1/models",
@@ -336,7 +339,7 @@ async def _test_openai_completion_with_tools(api_key: str, llm_model: str) -> No
             ],
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("openai") as client:
             # Try with max_tokens first
             payload = {**base_payload, "max_tokens": 50}
             response = await client.post(
@@ -385,7 +388,7 @@ async def _test_openai_embedding(api_key: str, embedding_model: str) -> None:
             "input": "test embedding",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("openai") as client:
             response = await client.post(
                 "https://api.openai.com/v1/embeddings",
                 headers=headers,
@@ -432,7 +435,7 @@ async def _test_watsonx_lightweight_health(
         if is_cp4d and WATSONX_AUTH_URL and WATSONX_USERNAME and WATSONX_PASSWORD:
             # CP4D認証（オンプレミス）
             logger.info("Using CP4D authentication for on-premise watsonx")
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 auth_payload = {
                     "username": WATSONX_USERNAME,
                     "password": WATSONX_PASSWORD
@@ -457,7 +460,7 @@ async def _test_watsonx_lightweight_health(
         else:
             # IBM Cloud IAM認証
             logger.info("Using IBM Cloud IAM authentication")
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 token_response = await client.post(
                     "https://iam.cloud.ibm.com/identity/token",
                     headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -501,7 +504,7 @@ async def _test_watsonx_completion_with_tools(
         
         if is_cp4d and WATSONX_AUTH_URL and WATSONX_USERNAME and WATSONX_PASSWORD:
             # CP4D認証（オンプレミス）
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 auth_payload = {
                     "username": WATSONX_USERNAME,
                     "password": WATSONX_PASSWORD
@@ -523,7 +526,7 @@ async def _test_watsonx_completion_with_tools(
                     raise Exception("No token received from CP4D")
         else:
             # IBM Cloud IAM認証
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 token_response = await client.post(
                     "https://iam.cloud.ibm.com/identity/token",
                     headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -579,7 +582,7 @@ async def _test_watsonx_completion_with_tools(
             "max_tokens": 50,
         }
 
-        async with httpx.AsyncClient(verify=verify_ssl) as client:
+        async with shared_http_client("watsonx", verify=verify_ssl) as client:
             response = await client.post(
                 url,
                 headers=headers,
@@ -626,7 +629,7 @@ async def _test_watsonx_embedding(
         
         if is_cp4d and WATSONX_AUTH_URL and WATSONX_USERNAME and WATSONX_PASSWORD:
             # CP4D認証（オンプレミス）
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 auth_payload = {
                     "username": WATSONX_USERNAME,
                     "password": WATSONX_PASSWORD
@@ -648,7 +651,7 @@ async def _test_watsonx_embedding(
                     raise Exception("No token received from CP4D")
         else:
             # IBM Cloud IAM認証
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 token_response = await client.post(
                     "https://iam.cloud.ibm.com/identity/token",
                     headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -682,7 +685,7 @@ async def _test_watsonx_embedding(
             "inputs": ["test embedding"],
         }
 
-        async with httpx.AsyncClient(verify=verify_ssl) as client:
+        async with shared_http_client("watsonx", verify=verify_ssl) as client:
             response = await client.post(
                 url,
                 headers=headers,
@@ -728,7 +731,7 @@ async def _test_ollama_lightweight_health(endpoint: str) -> None:
     try:
         ollama_url = transform_localhost_url(endpoint)
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("ollama") as client:
             response = await client.get(
                 ollama_url,
                 timeout=10.0,  # Short timeout for lightweight check
@@ -782,7 +785,7 @@ async def _test_ollama_completion_with_tools(llm_model: str, endpoint: str) -> N
             "stream": False,
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("ollama") as client:
             response = await client.post(
                 url,
                 json=payload,
@@ -815,7 +818,7 @@ async def _test_ollama_embedding(embedding_model: str, endpoint: str) -> None:
             "prompt": "test embedding",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("ollama") as client:
             response = await client.post(
                 url,
                 json=payload,
@@ -862,7 +865,7 @@ async def _test_anthropic_lightweight_health(api_key: str) -> None:
             "messages": [{"role": "user", "content": "test"}],
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("anthropic") as client:
             response = await client.post(
                 "https://api.anthropic.com/v1/messages",
                 headers=headers,
@@ -919,7 +922,7 @@ async def _test_anthropic_completion_with_tools(api_key: str, llm_model: str) ->
             ],
         }
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client("anthropic") as client:
             response = await client.post(
                 "https://api.anthropic.com/v1/messages",
                 headers=headers,
@@ -0,0 +1,132 @@
+"""
+Re-embedding endpoints.
+
+Start, pause, resume and cancel the background migration of the documents index
+to a new embedding model, and report its progress.
+"""
+import json
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from services.reembedding_service import ReembeddingError
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _read_json(request: Request) -> dict:
+    body = await request.body()
+    if not body:
+        return {}
+    data = json.loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("JSON body must be an object")
+    return data
+
+
+def _docs_per_second(data: dict):
+    value = data.get("docs_per_second")
+    if value is None:
+        return None
+    value = float(value)
+    if value < 0:
+        raise ValueError("docs_per_second must be 0 (unlimited) or greater")
+    return value
+
+
+async def progress_endpoint(request: Request, reembedding_service):
+    """
+    Progress of the current or last re-embedding job.
+
+    GET /reembedding
+
+    Response:
+        {
+            "status": "running",
+            "job_id": "...",
+            "target_model": "text-embedding-3-large",
+            "total": 10000,
+            "processed": 2500,
+            "updated": 2490,
+            "failed": 0,
+            "coverage": 0.249,
+            "eta_seconds": 150,
+            ...
+        }
+    """
+    return JSONResponse(reembedding_service.progress())
+
+
+async def start_endpoint(request: Request, reembedding_service):
+    """
+    Start re-embedding the documents index.
+
+    POST /reembedding/start
+    Body (all optional):
+        {
+            "model": "text-embedding-3-large",   // defaults to the configured embedding model
+            "remove_old_fields": false,          // drop other models' vectors at 100% coverage
+            "docs_per_second": 50                // throughput budget, 0 = unlimited
+        }
+    """
+    user_id = request.state.user.user_id
+    try:
+        data = await _read_json(request)
+        progress = await reembedding_service.start(
+            user_id=user_id,
+            target_model=data.get("model"),
+            remove_old_fields=bool(data.get("remove_old_fields", False)),
+            docs_per_second=_docs_per_second(data),
+        )
+    except (json.JSONDecodeError, ValueError) as e:
+        return JSONResponse({"error": f"Invalid request: {e}"}, status_code=400)
+    except ReembeddingError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except Exception as e:
+        logger.error("Failed to start re-embedding", error=str(e), user_id=user_id)
+        return JSONResponse({"error": str(e)}, status_code=500)
+    return JSONResponse(progress, status_code=202)
+
+
+async def pause_endpoint(request: Request, reembedding_service):
+    """
+    Pause the running job after its current batch.
+
+    POST /reembedding/pause
+    """
+    try:
+        return JSONResponse(await reembedding_service.pause())
+    except ReembeddingError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+
+
+async def resume_endpoint(request: Request, reembedding_service):
+    """
+    Resume a paused or interrupted job from its checkpoint.
+
+    POST /reembedding/resume
+    Body (optional): {"docs_per_second": 100}
+    """
+    try:
+        data = await _read_json(request)
+        return JSONResponse(
+            await reembedding_service.resume(docs_per_second=_docs_per_second(data)),
+            status_code=202,
+        )
+    except (json.JSONDecodeError, ValueError) as e:
+        return JSONResponse({"error": f"Invalid request: {e}"}, status_code=400)
+    except ReembeddingError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+
+
+async def cancel_endpoint(request: Request, reembedding_service):
+    """
+    Cancel the job. Vectors already written are kept; a new start skips them.
+
+    POST /reembedding/cancel
+    """
+    try:
+        return JSONResponse(await reembedding_service.cancel())
+    except ReembeddingError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
@@ -3,6 +3,8 @@ import platform
 import time
 from starlette.responses import JSONResponse
 from utils.container_utils import transform_localhost_url
+from utils.embedding_fields import invalidate_embedding_field_cache
+from utils.vector_profiles import VECTOR_ENCODINGS
 from utils.logging_config import get_logger
 from utils.telemetry import TelemetryClient, Category, MessageId
 from config.settings import (
@@ -109,6 +111,8 @@ async def get_settings(request, session_manager):
                 "ocr": knowledge_config.ocr,
                 "picture_descriptions": knowledge_config.picture_descriptions,
                 "index_name": knowledge_config.index_name,
+                "vector_encoding": knowledge_config.vector_encoding,
+                "vector_dimensions": knowledge_config.vector_dimensions,
             },
             "agent": {
                 "llm_model": agent_config.llm_model,
@@ -224,6 +228,8 @@ async def update_settings(request, session_manager):
             "embedding_model",
             "embedding_provider",
             "index_name",
+            "vector_encoding",
+            "vector_dimensions",
             # Provider-specific fields (structured as provider_name.field_name)
             "openai_api_key",
             "anthropic_api_key",
@@ -293,6 +299,24 @@ async def update_settings(request, session_manager):
                     status_code=400,
                 )
 
+        if "vector_encoding" in body:
+            if body["vector_encoding"] not in VECTOR_ENCODINGS:
+                return JSONResponse(
+                    {"error": f"vector_encoding must be one of: {', '.join(VECTOR_ENCODINGS)}"},
+                    status_code=400,
+                )
+
+        if "vector_dimensions" in body:
+            if (
+                not isinstance(body["vector_dimensions"], int)
+                or isinstance(body["vector_dimensions"], bool)
+                or body["vector_dimensions"] < 0
+            ):
+                return JSONResponse(
+                    {"error": "vector_dimensions must be 0 (all dimensions) or a positive integer"},
+                    status_code=400,
+                )
+
         if "llm_provider" in body:
             if (
                 not isinstance(body["llm_provider"], str)
@@ -558,6 +582,29 @@ async def update_settings(request, session_manager):
                 # Don't fail the entire settings update if flow update fails
                 # The config will still be saved
 
+        if "vector_encoding" in body or "vector_dimensions" in body:
+            knowledge = current_config.knowledge
+            knowledge.vector_encoding = body.get("vector_encoding", knowledge.vector_encoding)
+            knowledge.vector_dimensions = body.get("vector_dimensions", knowledge.vector_dimensions)
+            config_updated = True
+            # New chunks go to the profile's own field; existing chunks stay searchable
+            # and can be moved with the re-embedding job
+            logger.info(
+                "Vector storage profile changed",
+                vector_encoding=knowledge.vector_encoding,
+                vector_dimensions=knowledge.vector_dimensions,
+            )
+
+            # Also update the ingest flow's OpenSearch component
+            try:
+                flows_service = _get_flows_service()
+                await flows_service.update_ingest_flow_vector_profile(
+                    knowledge.vector_encoding, knowledge.vector_dimensions
+                )
+            except Exception as e:
+                logger.error(f"Failed to update ingest flow vector profile: {str(e)}")
+                # Don't fail the entire settings update if flow update fails
+
         if "chunk_overlap" in body:
             current_config.knowledge.chunk_overlap = body["chunk_overlap"]
             config_updated = True
@@ -588,6 +635,7 @@ async def update_settings(request, session_manager):
                 MessageId.ORB_SETTINGS_INDEX_NAME_UPDATED
             )
             logger.info(f"Index name changed from {old_index_name} to {new_index_name}")
+            invalidate_embedding_field_cache(old_index_name)
 
             # Also update global variable with new index name
             try:
@@ -1536,7 +1584,7 @@ async def rollback_onboarding(request, session_manager, task_service):
         logger.info("Rolling back onboarding configuration due to file failures")
 
         # Get all tasks for the user
-        all_tasks = task_service.get_all_tasks(user.user_id)
+        all_tasks = await task_service.get_all_tasks(user.user_id)
 
         cancelled_tasks = []
         deleted_files = []
@@ -1592,6 +1640,9 @@ async def rollback_onboarding(request, session_manager, task_service):
                                 except Exception as e:
                                     logger.error(f"Failed to delete documents for {filename}: {str(e)}")
 
+        # The index may be re-created with another model after onboarding again
+        invalidate_embedding_field_cache()
+
         # Clear embedding provider and model settings
         current_config.knowledge.embedding_provider = "openai"  # Reset to default
         current_config.knowledge.embedding_model = ""
@@ -8,7 +8,7 @@ async def task_status(request: Request, task_service, session_manager):
     task_id = request.path_params.get("task_id")
     user = request.state.user
 
-    task_status_result = task_service.get_task_status(user.user_id, task_id)
+    task_status_result = await task_service.get_task_status(user.user_id, task_id)
     if not task_status_result:
         return JSONResponse({"error": "Task not found"}, status_code=404)
 
@@ -18,7 +18,7 @@ async def task_status(request: Request, task_service, session_manager):
 async def all_tasks(request: Request, task_service, session_manager):
     """Get all tasks for the authenticated user"""
     user = request.state.user
-    tasks = task_service.get_all_tasks(user.user_id)
+    tasks = await task_service.get_all_tasks(user.user_id)
     return JSONResponse({"tasks": tasks})
 
 
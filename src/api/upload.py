@@ -1,8 +1,8 @@
 import os
 from urllib.parse import urlparse
-import boto3
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from utils.subsystems import subsystems
 
 
 async def upload(request: Request, document_service, session_manager):
@@ -158,7 +158,7 @@ async def upload_bucket(request: Request, task_service, session_manager):
     bucket = parsed.netloc
     prefix = parsed.path.lstrip("/")
 
-    s3_client = boto3.client("s3")
+    s3_client = (await subsystems.aget("s3")).client("s3")
     keys = []
     paginator = s3_client.get_paginator("list_objects_v2")
     for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
@@ -8,11 +8,25 @@ import json
 from starlette.requests import Request
 from starlette.responses import JSONResponse, StreamingResponse
 from utils.logging_config import get_logger
+from utils.stream_events import StreamEvent, delta_text, event_data
 from auth_context import set_search_filters, set_search_limit, set_score_threshold, set_auth_context
 
 logger = get_logger(__name__)
 
 
+def _is_json(text: str) -> bool:
+    """True if *text* parses as JSON
+
+    Only called for chunks that did not decode to a JSON object, so a match is a
+    non-object value (e.g. an array), which carries no content to forward.
+    """
+    try:
+        json.loads(text)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
 async def _transform_stream_to_sse(raw_stream, chat_id_container: dict):
     """
     Transform the raw Langflow streaming format to clean SSE events for v1 API.
@@ -27,54 +41,39 @@ async def _transform_stream_to_sse(raw_stream, chat_id_container: dict):
 
     async for chunk in raw_stream:
         try:
-            if isinstance(chunk, bytes):
-                chunk_str = chunk.decode("utf-8").strip()
-            else:
-                chunk_str = str(chunk).strip()
-
-            if not chunk_str:
+            # StreamEvents carry their decoded payload; only raw chunks are parsed
+            chunk_data = event_data(chunk)
+
+            if chunk_data is None:
+                # Raw text without JSON wrapper
+                if isinstance(chunk, StreamEvent):
+                    continue
+                raw_text = chunk.decode("utf-8") if isinstance(chunk, bytes) else str(chunk)
+                raw_text = raw_text.strip()
+                if raw_text and not _is_json(raw_text):
+                    yield f"data: {json.dumps({'type': 'content', 'delta': raw_text})}\n\n"
+                    full_text += raw_text
                 continue
 
-            chunk_data = json.loads(chunk_str)
-
-            # Extract text from various possible formats
-            delta_text = ""
-
-            # Format 1: delta.content (OpenAI-style)
-            if "delta" in chunk_data:
-                delta = chunk_data["delta"]
-                if isinstance(delta, dict):
-                    delta_text = delta.get("content", "") or delta.get("text", "")
-                elif isinstance(delta, str):
-                    delta_text = delta
-
-            # Format 2: output_text (Langflow-style)
-            if not delta_text and chunk_data.get("output_text"):
-                delta_text = chunk_data["output_text"]
-
-            # Format 3: text field directly
-            if not delta_text and chunk_data.get("text"):
-                delta_text = chunk_data["text"]
-
-            # Format 4: content field directly
-            if not delta_text and chunk_data.get("content"):
-                delta_text = chunk_data["content"]
+            # Extract text from various possible formats:
+            # delta.content (OpenAI-style), output_text (Langflow-style), text, content
+            text = (
+                delta_text(chunk_data)
+                or chunk_data.get("output_text")
+                or chunk_data.get("text")
+                or chunk_data.get("content")
+            )
 
-            if delta_text:
-                full_text += delta_text
-                yield f"data: {json.dumps({'type': 'content', 'delta': delta_text})}\n\n"
+            if text and isinstance(text, str):
+                full_text += text
+                yield f"data: {json.dumps({'type': 'content', 'delta': text})}\n\n"
 
             # Extract chat_id/response_id from various fields
             if not chat_id:
                 chat_id = chunk_data.get("id") or chunk_data.get("response_id")
 
-        except json.JSONDecodeError:
-            # Raw text without JSON wrapper
-            if chunk_str:
-                yield f"data: {json.dumps({'type': 'content', 'delta': chunk_str})}\n\n"
-                full_text += chunk_str
         except Exception as e:
-            logger.warning("Error processing stream chunk", error=str(e), chunk=chunk_str[:100] if chunk_str else "")
+            logger.warning("Error processing stream chunk", error=str(e), chunk=bytes(chunk[:100]) if isinstance(chunk, bytes) else str(chunk)[:100])
 
     yield f"data: {json.dumps({'type': 'done', 'chat_id': chat_id})}\n\n"
     chat_id_container["chat_id"] = chat_id
@@ -221,8 +220,8 @@ async def chat_get_endpoint(request: Request, chat_service, session_manager):
         )
 
     try:
-        # Get Langflow chat history and find the specific conversation
-        history = await chat_service.get_langflow_history(user_id)
+        # Get only this conversation from Langflow (ownership is checked by the service)
+        history = await chat_service.get_langflow_history(user_id, session_id=chat_id)
 
         conversation = None
         for conv in history.get("conversations", []):
@@ -73,13 +73,66 @@ async def task_status_endpoint(request: Request, task_service, session_manager):
     task_id = request.path_params.get("task_id")
     user = request.state.user
 
-    task_status = task_service.get_task_status(user.user_id, task_id)
+    task_status = await task_service.get_task_status(user.user_id, task_id)
     if not task_status:
         return JSONResponse({"error": "Task not found"}, status_code=404)
 
     return JSONResponse(task_status)
 
 
+MAX_TASK_STATUS_BATCH = 500
+
+
+async def task_statuses_endpoint(request: Request, task_service, session_manager):
+    """
+    Get the status of several ingestion tasks in one request.
+
+    POST /v1/tasks/status
+
+    Request body:
+        {
+            "task_ids": ["...", "..."]
+        }
+
+    Response:
+        {
+            "tasks": {"<task_id>": {"task_id": "...", "status": "running", ...}},
+            "missing": ["<task_id>"]
+        }
+    """
+    try:
+        data = await request.json()
+    except Exception:
+        return JSONResponse(
+            {"error": "Invalid JSON in request body"},
+            status_code=400,
+        )
+
+    task_ids = data.get("task_ids") if isinstance(data, dict) else None
+    if not isinstance(task_ids, list) or not all(isinstance(t, str) for t in task_ids):
+        return JSONResponse(
+            {"error": "task_ids must be a list of strings"},
+            status_code=400,
+        )
+    if len(task_ids) > MAX_TASK_STATUS_BATCH:
+        return JSONResponse(
+            {"error": f"At most {MAX_TASK_STATUS_BATCH} task_ids per request"},
+            status_code=400,
+        )
+
+    user = request.state.user
+    statuses = await task_service.get_task_statuses(user.user_id, task_ids)
+    tasks = {}
+    missing = []
+    for task_id in dict.fromkeys(task_ids):
+        if task_id in statuses:
+            tasks[task_id] = statuses[task_id]
+        else:
+            missing.append(task_id)
+
+    return JSONResponse({"tasks": tasks, "missing": missing})
+
+
 async def delete_document_endpoint(request: Request, document_service, session_manager):
     """
     Delete a document from the knowledge base.
@@ -91,6 +91,8 @@ async def search_articles(request: Request) -> JSONResponse:
         return _json(result.model_dump())
     except json.JSONDecodeError:
         return _error("Invalid JSON body", 400)
+    except ValueError as exc:
+        return _error(str(exc), 400)
     except Exception as exc:
         logger.error("Error searching articles", error=str(exc))
         return _error(str(exc), 500)
@@ -75,6 +75,10 @@ class KnowledgeConfig:
     ocr: bool = False
     picture_descriptions: bool = False
     index_name: str = "documents"  # OpenSearch インデックス名
+    # ベクトルの保存形式（float32 / fp16 / int8）
+    vector_encoding: str = "float32"
+    # Matryoshka 対応モデルで先頭から保持する次元数（0 = 全次元）
+    vector_dimensions: int = 0
 
 
 @dataclass
@@ -252,6 +256,10 @@ class ConfigManager:
             config_data["knowledge"]["chunk_overlap"] = int(os.getenv("CHUNK_OVERLAP"))
         if os.getenv("OPENSEARCH_INDEX_NAME"):
             config_data["knowledge"]["index_name"] = os.getenv("OPENSEARCH_INDEX_NAME")
+        if os.getenv("VECTOR_ENCODING"):
+            config_data["knowledge"]["vector_encoding"] = os.getenv("VECTOR_ENCODING")
+        if os.getenv("VECTOR_DIMENSIONS"):
+            config_data["knowledge"]["vector_dimensions"] = int(os.getenv("VECTOR_DIMENSIONS"))
         if os.getenv("OCR_ENABLED"):
             config_data["knowledge"]["ocr"] = os.getenv("OCR_ENABLED").lower() in (
                 "true",
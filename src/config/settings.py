@@ -8,11 +8,11 @@ from agentd.patch import patch_openai_with_mcp
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from opensearchpy import AsyncOpenSearch
-from opensearchpy._async.http_aiohttp import AIOHttpConnection
 
 from utils.container_utils import get_container_host
-from utils.document_processing import create_document_converter
 from utils.logging_config import get_logger
+from utils.metrics import LANGFLOW_SECONDS, timed
+from utils.opensearch_connection import TimedAIOHttpConnection
 
 load_dotenv(override=False)
 load_dotenv("../", override=False)
@@ -131,11 +131,10 @@ WATSONX_EMBEDDING_DIMENSIONS = {
 "sentence-transformers/all-minilm-l6-v2": 384,
 }
 
+# シャード数・レプリカ数などのレイアウトはインデックステンプレート（services/index_layout_service.py）で決まる
 INDEX_BODY = {
     "settings": {
         "index": {"knn": True},
-        "number_of_shards": 1,
-        "number_of_replicas": 0,
     },
     "mappings": {
         "properties": {
@@ -176,10 +175,6 @@ INDEX_BODY = {
 # パブリック API 認証用の APIキーインデックス
 API_KEYS_INDEX_NAME = "api_keys"
 API_KEYS_INDEX_BODY = {
-    "settings": {
-        "number_of_shards": 1,
-        "number_of_replicas": 0,
-    },
     "mappings": {
         "properties": {
             "key_id": {"type": "keyword"},
@@ -324,13 +319,26 @@ class AppClients:
         self.langflow_http_client = None
         self._patched_async_client = None  # プライベート属性 - 全プロバイダー共通のシングルクライアント
         self._client_init_lock = __import__('threading').Lock()  # スレッドセーフな初期化のためのロック
-        self.converter = None
+
+    @property
+    def converter(self):
+        """Docling ドキュメントコンバーター（初回アクセス時に読み込む）。
+
+        イベントループ上では読み込み中にブロックしないよう get_converter() を使う。
+        """
+        from utils.subsystems import subsystems
+        return subsystems.get("docling")
+
+    async def get_converter(self):
+        """Docling ドキュメントコンバーターを取得する（読み込みはワーカースレッドで行う）。"""
+        from utils.subsystems import subsystems
+        return await subsystems.aget("docling")
 
     async def initialize(self):
         # OpenSearch クライアントを初期化する
         self.opensearch = AsyncOpenSearch(
             hosts=[{"host": OPENSEARCH_HOST, "port": OPENSEARCH_PORT}],
-            connection_class=AIOHttpConnection,
+            connection_class=TimedAIOHttpConnection,
             scheme="https",
             use_ssl=True,
             verify_certs=False,
@@ -349,8 +357,7 @@ class AppClients:
         else:
             logger.info("環境変数に OpenAI API キーが見つかりません。必要に応じて初回使用時に初期化します")
 
-        # ドキュメントコンバーターを初期化する
-        self.converter = create_document_converter(ocr_engine=DOCLING_OCR_ENGINE)
+        # ドキュメントコンバーターは初回使用時に読み込む（PRELOAD_SUBSYSTEMS で起動後に事前読み込み可能）
 
         # 大容量ドキュメント向けに拡張タイムアウトで Langflow HTTP クライアントを初期化する
         # wait_for_langflow / get_langflow_api_key より前に作成する必要がある
@@ -621,9 +628,10 @@ class AppClients:
 
         url = f"{LANGFLOW_URL}{endpoint}"
 
-        response = await self.langflow_http_client.request(
-            method=method, url=url, headers=headers, **kwargs
-        )
+        with timed(LANGFLOW_SECONDS, method=method.upper()):
+            response = await self.langflow_http_client.request(
+                method=method, url=url, headers=headers, **kwargs
+            )
 
         # 認証失敗時はフレッシュな API キーで1回リトライする
         if response.status_code in (401, 403):
@@ -635,9 +643,10 @@ class AppClients:
             api_key = await get_langflow_api_key(force_regenerate=True)
             if api_key:
                 headers["x-api-key"] = api_key
-                response = await self.langflow_http_client.request(
-                    method=method, url=url, headers=headers, **kwargs
-                )
+                with timed(LANGFLOW_SECONDS, method=method.upper()):
+                    response = await self.langflow_http_client.request(
+                        method=method, url=url, headers=headers, **kwargs
+                    )
 
         return response
 
@@ -759,7 +768,7 @@ class AppClients:
 
         return AsyncOpenSearch(
             hosts=[{"host": OPENSEARCH_HOST, "port": OPENSEARCH_PORT}],
-            connection_class=AIOHttpConnection,
+            connection_class=TimedAIOHttpConnection,
             scheme="https",
             use_ssl=True,
             verify_certs=False,
@@ -821,6 +830,11 @@ OLLAMA_LLM_COMPONENT_DISPLAY_NAME = os.getenv("OLLAMA_LLM_COMPONENT_DISPLAY_NAME
 # 取り込みフロー用の Docling コンポーネント表示名
 DOCLING_COMPONENT_DISPLAY_NAME = os.getenv("DOCLING_COMPONENT_DISPLAY_NAME", "Docling Serve")
 
+# 取り込みフロー用の OpenSearch コンポーネント表示名
+OPENSEARCH_COMPONENT_DISPLAY_NAME = os.getenv(
+    "OPENSEARCH_COMPONENT_DISPLAY_NAME", "OpenSearch (Multi-Model Multi-Embedding)"
+)
+
 LOCALHOST_URL = get_container_host() or "localhost"
 
 # グローバルクライアントインスタンス
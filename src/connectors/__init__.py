@@ -1,7 +1,21 @@
 from .base import BaseConnector
-from .google_drive import GoogleDriveConnector
-from .sharepoint import SharePointConnector
-from .onedrive import OneDriveConnector
+
+# Cloud connectors pull in the Google / Microsoft SDKs, so they are only
+# imported when first accessed (see utils.subsystems "connectors")
+_LAZY_CONNECTORS = {
+    "GoogleDriveConnector": "google_drive",
+    "SharePointConnector": "sharepoint",
+    "OneDriveConnector": "onedrive",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CONNECTORS:
+        from utils.subsystems import subsystems
+
+        return subsystems.get("connectors")[_LAZY_CONNECTORS[name]][0]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseConnector",
@@ -39,6 +39,20 @@ class ConnectorDocument:
             self.metadata = {}
 
 
+# Kinds of change reported by a webhook notification
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+CHANGE_FOLDER = "folder"  # Something changed inside a folder; sync its contents
+
+
+@dataclass(frozen=True)
+class WebhookChange:
+    """A file (or folder) affected by a webhook notification"""
+
+    file_id: str
+    kind: str = CHANGE_UPDATE
+
+
 class BaseConnector(ABC):
     """Base class for all document connectors"""
 
@@ -110,6 +124,11 @@ class BaseConnector(ABC):
         """Handle webhook notification. Returns list of affected file IDs."""
         pass
 
+    async def webhook_changes(self, payload: Dict[str, Any]) -> List[WebhookChange]:
+        """Handle webhook notification. Returns the affected files with their kind of change.
+        Default implementation reports every file from handle_webhook() as updated."""
+        return [WebhookChange(file_id) for file_id in await self.handle_webhook(payload)]
+
     def handle_webhook_validation(
         self, request_method: str, headers: Dict[str, str], query_params: Dict[str, str]
     ) -> Optional[str]:
@@ -10,7 +10,15 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
-from connectors.base import BaseConnector, ConnectorDocument, DocumentACL
+from connectors.base import (
+    CHANGE_DELETE,
+    CHANGE_FOLDER,
+    CHANGE_UPDATE,
+    BaseConnector,
+    ConnectorDocument,
+    DocumentACL,
+    WebhookChange,
+)
 from connectors.box.oauth import BoxOAuth
 from utils.logging_config import get_logger
 
@@ -86,6 +94,19 @@ class BoxConnector(BaseConnector):
         file_id = source.get("id")
         return [file_id] if file_id else []
 
+    async def webhook_changes(self, payload: Dict[str, Any]) -> List[WebhookChange]:
+        """Handle Box webhook events; trashed/deleted files and folder events are told apart."""
+        source = payload.get("source", {})
+        file_id = source.get("id")
+        if not file_id:
+            return []
+        if source.get("type") == "folder":
+            return [WebhookChange(file_id, CHANGE_FOLDER)]
+        trigger = payload.get("trigger") or ""
+        if trigger.endswith((".TRASHED", ".DELETED")):
+            return [WebhookChange(file_id, CHANGE_DELETE)]
+        return [WebhookChange(file_id, CHANGE_UPDATE)]
+
     async def cleanup_subscription(self, subscription_id: str) -> bool:
         return True
 
@@ -10,9 +10,15 @@ from utils.logging_config import get_logger
 logger = get_logger(__name__)
 
 from .base import BaseConnector
-from .google_drive import GoogleDriveConnector
-from .sharepoint import SharePointConnector
-from .onedrive import OneDriveConnector
+from utils.subsystems import subsystems
+
+
+async def _connector_classes() -> Dict[str, Any]:
+    """Connector classes by type (the provider SDKs are imported on first use, off the event loop)"""
+    return {
+        connector_type: classes[0]
+        for connector_type, classes in (await subsystems.aget("connectors")).items()
+    }
 
 
 @dataclass
@@ -204,7 +210,7 @@ class ConnectionManager:
         if existing_connection:
             # Check if the existing connection has a valid token
             try:
-                connector = self._create_connector(existing_connection)
+                connector = await self._create_connector(existing_connection)
                 if await connector.authenticate():
                     logger.info(
                         f"Using existing valid connection for {connector_type}",
@@ -316,7 +322,7 @@ class ConnectionManager:
             return None
 
         logger.debug(f"Creating connector for {connection_config.connector_type}")
-        connector = self._create_connector(connection_config)
+        connector = await self._create_connector(connection_config)
         
         logger.debug(f"Attempting authentication for {connection_id}")
         auth_result = await connector.authenticate()
@@ -330,30 +336,19 @@ class ConnectionManager:
             logger.warning(f"Authentication failed for {connection_id}")
             return None
 
-    def get_available_connector_types(self) -> Dict[str, Dict[str, Any]]:
+    async def get_available_connector_types(self) -> Dict[str, Dict[str, Any]]:
         """Get available connector types with their metadata"""
         return {
-            "google_drive": {
-                "name": GoogleDriveConnector.CONNECTOR_NAME,
-                "description": GoogleDriveConnector.CONNECTOR_DESCRIPTION,
-                "icon": GoogleDriveConnector.CONNECTOR_ICON,
-                "available": self._is_connector_available("google_drive"),
-            },
-            "sharepoint": {
-                "name": SharePointConnector.CONNECTOR_NAME,
-                "description": SharePointConnector.CONNECTOR_DESCRIPTION,
-                "icon": SharePointConnector.CONNECTOR_ICON,
-                "available": self._is_connector_available("sharepoint"),
-            },
-            "onedrive": {
-                "name": OneDriveConnector.CONNECTOR_NAME,
-                "description": OneDriveConnector.CONNECTOR_DESCRIPTION,
-                "icon": OneDriveConnector.CONNECTOR_ICON,
-                "available": self._is_connector_available("onedrive"),
-            },
+            connector_type: {
+                "name": connector_class.CONNECTOR_NAME,
+                "description": connector_class.CONNECTOR_DESCRIPTION,
+                "icon": connector_class.CONNECTOR_ICON,
+                "available": await self._is_connector_available(connector_type),
+            }
+            for connector_type, connector_class in (await _connector_classes()).items()
         }
 
-    def _is_connector_available(self, connector_type: str) -> bool:
+    async def _is_connector_available(self, connector_type: str) -> bool:
         """Check if a connector type is available (has required env vars)"""
         try:
             temp_config = ConnectionConfig(
@@ -362,7 +357,7 @@ class ConnectionManager:
                 name="temp",
                 config={},
             )
-            connector = self._create_connector(temp_config)
+            connector = await self._create_connector(temp_config)
             # Try to get credentials to check if env vars are set
             connector.get_client_id()
             connector.get_client_secret()
@@ -370,15 +365,12 @@ class ConnectionManager:
         except (ValueError, NotImplementedError):
             return False
 
-    def _create_connector(self, config: ConnectionConfig) -> BaseConnector:
+    async def _create_connector(self, config: ConnectionConfig) -> BaseConnector:
         """Factory method to create connector instances"""
         try:
-            if config.connector_type == "google_drive":
-                return GoogleDriveConnector(config.config)
-            elif config.connector_type == "sharepoint":
-                return SharePointConnector(config.config)
-            elif config.connector_type == "onedrive":
-                return OneDriveConnector(config.config)
+            connector_class = (await _connector_classes()).get(config.connector_type)
+            if connector_class is not None:
+                return connector_class(config.config)
             elif config.connector_type == "box":
                 raise NotImplementedError("Box connector not implemented yet")
             elif config.connector_type == "dropbox":
@@ -499,7 +491,7 @@ class ConnectionManager:
             )
 
             # Create and authenticate connector
-            connector = self._create_connector(connection_config)
+            connector = await self._create_connector(connection_config)
             if not await connector.authenticate():
                 logger.error(
                     "Failed to authenticate connector for webhook setup",
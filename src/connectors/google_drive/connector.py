@@ -11,7 +11,15 @@ from googleapiclient.http import MediaIoBaseDownload
 
 from utils.logging_config import get_logger
 
-from ..base import BaseConnector, ConnectorDocument, DocumentACL
+from ..base import (
+    CHANGE_DELETE,
+    CHANGE_FOLDER,
+    CHANGE_UPDATE,
+    BaseConnector,
+    ConnectorDocument,
+    DocumentACL,
+    WebhookChange,
+)
 from .oauth import GoogleDriveOAuth
 
 logger = get_logger(__name__)
@@ -900,6 +908,17 @@ class GoogleDriveConnector(BaseConnector):
     async def handle_webhook(self, payload: Dict[str, Any]) -> List[str]:
         """
         Process a Google Drive Changes webhook.
+
+        Returns:
+            List[str]: unique list of affected (not deleted) file and folder IDs,
+            filtered to our selected scope.
+        """
+        changes = await self.webhook_changes(payload)
+        return [change.file_id for change in changes if change.kind != CHANGE_DELETE]
+
+    async def webhook_changes(self, payload: Dict[str, Any]) -> List[WebhookChange]:
+        """
+        Process a Google Drive Changes webhook.
         Drive push notifications do NOT include the changed files themselves; they merely tell us
         "there are changes". We must pull them using the Changes API with our saved page token.
 
@@ -908,9 +927,11 @@ class GoogleDriveConnector(BaseConnector):
                     X-Goog-Resource-State / X-Goog-Message-Number if present, but we don't rely on them.
 
         Returns:
-            List[str]: unique list of affected file IDs (filtered to our selected scope).
+            List[WebhookChange]: one change per affected file ID (the last one reported wins).
+            Updates are filtered to our selected scope; trashed or removed files are
+            reported as deletions, folders as folder changes.
         """
-        affected: List[str] = []
+        affected: List[WebhookChange] = []
         try:
             # 1) Ensure we're authenticated / service ready
             ok = await self.authenticate()
@@ -950,7 +971,7 @@ class GoogleDriveConnector(BaseConnector):
                         pageToken=page_token,
                         fields=(
                             "nextPageToken, newStartPageToken, "
-                            "changes(fileId, file(id, name, mimeType, trashed, parents, "
+                            "changes(fileId, removed, file(id, name, mimeType, trashed, parents, "
                             "shortcutDetails, driveId, modifiedTime, webViewLink))"
                         ),
                         supportsAllDrives=True,
@@ -963,9 +984,13 @@ class GoogleDriveConnector(BaseConnector):
                     fid = ch.get("fileId")
                     fobj = ch.get("file") or {}
 
-                    # Skip if no file or explicitly trashed (you can choose to still return these IDs)
-                    if not fid or fobj.get("trashed"):
-                        # If you want to *include* deletions, collect fid here instead of skipping.
+                    if not fid:
+                        continue
+
+                    # Trashed or removed files: their chunks are deleted (no scope filter,
+                    # as they no longer show up in the selected items)
+                    if ch.get("removed") or fobj.get("trashed"):
+                        affected.append(WebhookChange(fid, CHANGE_DELETE))
                         continue
 
                     # Resolve shortcuts to target
@@ -983,7 +1008,8 @@ class GoogleDriveConnector(BaseConnector):
                         if not (tgt and tgt in selected_ids):
                             continue
 
-                    affected.append(rid)
+                    is_folder = resolved.get("mimeType") == "application/vnd.google-apps.folder"
+                    affected.append(WebhookChange(rid, CHANGE_FOLDER if is_folder else CHANGE_UPDATE))
 
                 # Handle pagination of the changes feed
                 next_token = resp.get("nextPageToken")
@@ -1000,14 +1026,12 @@ class GoogleDriveConnector(BaseConnector):
                     self.cfg.changes_page_token = page_token
                 break
 
-            # Deduplicate while preserving order
-            seen = set()
-            deduped: List[str] = []
-            for x in affected:
-                if x not in seen:
-                    seen.add(x)
-                    deduped.append(x)
-            return deduped
+            # Deduplicate while preserving order; the latest change of a file wins
+            latest: Dict[str, WebhookChange] = {}
+            for change in affected:
+                latest.pop(change.file_id, None)
+                latest[change.file_id] = change
+            return list(latest.values())
 
         except Exception as e:
             try:
@@ -5,7 +5,7 @@ from urllib.parse import urlparse
 from datetime import datetime
 import httpx
 
-from ..base import BaseConnector, ConnectorDocument, DocumentACL
+from ..base import CHANGE_DELETE, CHANGE_UPDATE, BaseConnector, ConnectorDocument, DocumentACL, WebhookChange
 from .oauth import SharePointOAuth
 
 logger = logging.getLogger(__name__)
@@ -824,6 +824,17 @@ class SharePointConnector(BaseConnector):
                 affected_files.append(file_id)
         
         return affected_files
+
+    async def webhook_changes(self, payload: Dict[str, Any]) -> List[WebhookChange]:
+        """Handle webhook notification; Graph reports deletions with changeType "deleted"."""
+        changes: List[WebhookChange] = []
+        for notification in payload.get("value", []):
+            resource = notification.get("resource")
+            if resource and "/drive/items/" in resource:
+                file_id = resource.split("/drive/items/")[-1]
+                deleted = "deleted" in (notification.get("changeType") or "").split(",")
+                changes.append(WebhookChange(file_id, CHANGE_DELETE if deleted else CHANGE_UPDATE))
+        return changes
     
     async def cleanup_subscription(self, subscription_id: str) -> bool:
         """Clean up subscription - BaseConnector interface"""
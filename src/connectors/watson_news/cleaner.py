@@ -1,13 +1,18 @@
-"""クリーニング処理: HTML 除去、重複排除、言語検出。"""
+"""クリーニング処理: HTML 除去、重複排除、言語検出。
+
+HTML は :mod:`connectors.watson_news.html_extractor` で 1 回だけパースされ、
+タイトルと本文テキストを同時に取り出す。CPU バウンドな処理のため、
+ETL パイプラインはこのモジュールの関数をプロセスプール経由で呼び出す。
+"""
 
 import re
 import unicodedata
 from typing import Any
 
-import html2text
 from langdetect import LangDetectException, detect
 
 from connectors.base import ConnectorDocument
+from connectors.watson_news.html_extractor import extract_page
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -17,18 +22,15 @@ _MIN_BODY_CHARS = 100
 
 
 def _strip_html(raw: str) -> str:
-    """HTML をプレーンテキストに変換し、タグを除去してリンクを Markdown 形式にする。"""
-    converter = html2text.HTML2Text()
-    converter.ignore_links = True
-    converter.ignore_images = True
-    converter.body_width = 0
-    return converter.handle(raw)
+    """HTML をプレーンテキストに変換し、タグとスクリプト・ナビゲーション要素を除去する。"""
+    return extract_page(raw).text
 
 
 def _normalize_whitespace(text: str) -> str:
     text = unicodedata.normalize("NFC", text)
     text = re.sub(r"\r\n|\r", "\n", text)
     text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
     text = re.sub(r"\n{3,}", "\n\n", text)
     return text.strip()
 
@@ -48,9 +50,14 @@ def clean_news_article(doc: ConnectorDocument) -> dict[str, Any] | None:
     """
     mimetype = doc.mimetype or ""
     raw = doc.content.decode(errors="replace")
+    title = doc.metadata.get("title", "")
 
     if "html" in mimetype:
-        body = _strip_html(raw)
+        page = extract_page(raw, base_url=doc.source_url)
+        body = page.text
+        # クローラーは <title> が無いと URL を入れるので、見出しから取れればそちらを使う
+        if not title or title == doc.source_url:
+            title = page.title or title
     else:
         body = raw
 
@@ -65,8 +72,6 @@ def clean_news_article(doc: ConnectorDocument) -> dict[str, Any] | None:
         logger.debug("Non-target language, skipping", lang=lang, url=doc.source_url)
         return None
 
-    title = doc.metadata.get("title", "")
-
     return {
         "id": doc.id,
         "url": doc.source_url,
@@ -1,29 +1,27 @@
 """ETL オーケストレーター: 取得 → クリーニング → エンリッチ → 埋め込み → インデックス登録。"""
 
 import asyncio
-import os
 from datetime import datetime, timezone
 from typing import Any
 
 from opensearchpy import AsyncOpenSearch
-from opensearchpy._async.http_aiohttp import AIOHttpConnection
 
 from connectors.watson_news.cleaner import clean_box_document, clean_news_article
 from connectors.watson_news.enricher import enrich_article, enrich_box_chunk
 from connectors.watson_news.gdelt_connector import GdeltConnector
-from connectors.watson_news.ibm_crawl_connector import crawl_target, load_crawl_targets
+from connectors.watson_news.html_extractor import run_cpu_bound
+from connectors.watson_news.ibm_crawl_connector import (
+    CrawlEngine,
+    CrawlTarget,
+    HostPolitenessScheduler,
+    crawl_target,
+    load_crawl_targets,
+)
+from connectors.watson_news.opensearch_client import get_opensearch
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# ---------------------------------------------------------------------------
-# OpenSearch 設定
-# ---------------------------------------------------------------------------
-OPENSEARCH_HOST = os.getenv("OPENSEARCH_HOST", "localhost")
-OPENSEARCH_PORT = int(os.getenv("OPENSEARCH_PORT", "9200"))
-OPENSEARCH_USERNAME = os.getenv("OPENSEARCH_USERNAME", "admin")
-OPENSEARCH_PASSWORD = os.getenv("OPENSEARCH_PASSWORD", "")
-
 # Watson News の OpenSearch インデックス名
 IDX_NEWS_RAW = "watson_news_raw"
 IDX_NEWS_CLEAN = "watson_news_clean"
@@ -31,18 +29,22 @@ IDX_NEWS_ENRICHED = "watson_news_enriched"
 IDX_BOX_RAW = "watson_box_raw"
 IDX_BOX_ENRICHED = "watson_box_enriched"
 
+# パイプライン実行をまたいで共有するホストキュー（同一ホストへの同時アクセスを直列化する）
+_crawl_hosts = HostPolitenessScheduler()
 
-def _make_opensearch() -> AsyncOpenSearch:
-    return AsyncOpenSearch(
-        hosts=[{"host": OPENSEARCH_HOST, "port": OPENSEARCH_PORT}],
-        connection_class=AIOHttpConnection,
-        scheme="https",
-        use_ssl=True,
-        verify_certs=False,
-        ssl_assert_fingerprint=None,
-        http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
-        http_compress=True,
-    )
+
+class CrawlPipelineError(RuntimeError):
+    """1 つ以上のクロールターゲットが失敗したことを表す。
+
+    成功したターゲットの処理件数は ``processed`` に、失敗したターゲットとエラーは
+    ``failed_targets`` に保持する。
+    """
+
+    def __init__(self, processed: int, failed_targets: dict[str, str]) -> None:
+        self.processed = processed
+        self.failed_targets = failed_targets
+        details = "; ".join(f"{name}: {error}" for name, error in failed_targets.items())
+        super().__init__(f"{len(failed_targets)} crawl target(s) failed ({details})")
 
 
 async def _get_known_urls(os_client: AsyncOpenSearch, index: str) -> set[str]:
@@ -65,6 +67,13 @@ async def _upsert_doc(os_client: AsyncOpenSearch, index: str, doc_id: str, body:
         logger.warning("OpenSearch upsert failed", index=index, id=doc_id, error=str(exc))
 
 
+async def _clean_articles(docs: list[Any]) -> list[dict[str, Any] | None]:
+    """HTML 抽出とクリーニングをプロセスプールで並列実行する（結果は *docs* と同順）。"""
+    return list(
+        await asyncio.gather(*(run_cpu_bound(clean_news_article, doc) for doc in docs))
+    )
+
+
 # ---------------------------------------------------------------------------
 # パイプライン処理ステップ
 # ---------------------------------------------------------------------------
@@ -75,18 +84,18 @@ async def run_gdelt_pipeline() -> int:
     処理した記事数を返す。
     """
     logger.info("Starting GDELT pipeline")
-    os_client = _make_opensearch()
+    os_client = get_opensearch()
     connector = GdeltConnector()
 
     try:
         docs = await connector.fetch_articles()
         known_urls = await _get_known_urls(os_client, IDX_NEWS_RAW)
 
-        processed = 0
-        for doc in docs:
-            if doc.source_url in known_urls:
-                continue
+        new_docs = [doc for doc in docs if doc.source_url not in known_urls]
+        cleaned = await _clean_articles(new_docs)
 
+        processed = 0
+        for doc, clean in zip(new_docs, cleaned):
             # 生データレイヤー
             raw_body = {
                 "id": doc.id,
@@ -100,7 +109,6 @@ async def run_gdelt_pipeline() -> int:
             await _upsert_doc(os_client, IDX_NEWS_RAW, doc.id, raw_body)
 
             # クリーニング + エンリッチ
-            clean = clean_news_article(doc)
             if not clean:
                 continue
 
@@ -114,53 +122,89 @@ async def run_gdelt_pipeline() -> int:
         return processed
     finally:
         await connector.close()
-        await os_client.close()
 
 
-async def run_ibm_crawl_pipeline() -> int:
+async def _index_crawled_docs(os_client: AsyncOpenSearch, docs: list[Any]) -> int:
+    """クロール済みドキュメントの生データ・クリーニング済み・エンリッチ済みレコードを保存する。"""
+    # HTML のパースはここで 1 回だけ行い、タイトルと本文を同時に得る
+    cleaned = await _clean_articles(docs)
+
+    processed = 0
+    for doc, clean in zip(docs, cleaned):
+        raw_body = {
+            "id": doc.id,
+            "url": doc.source_url,
+            "body": doc.content.decode(errors="replace"),
+            "source_type": "ibm_crawl",
+            "crawled_at": datetime.now(tz=timezone.utc).isoformat(),
+            **doc.metadata,
+            "title": doc.metadata.get("title") or (clean or {}).get("title", ""),
+        }
+        await _upsert_doc(os_client, IDX_NEWS_RAW, doc.id, raw_body)
+
+        if not clean:
+            continue
+
+        await _upsert_doc(os_client, IDX_NEWS_CLEAN, doc.id, clean)
+
+        enriched = await enrich_article(clean)
+        await _upsert_doc(os_client, IDX_NEWS_ENRICHED, doc.id, enriched)
+        processed += 1
+    return processed
+
+
+async def run_ibm_crawl_pipeline(targets: list[CrawlTarget] | None = None) -> int:
     """IBM 公式サイトをクロールし、生データとエンリッチ済みレコードを保存する。
 
-    処理した記事数を返す。
+    ターゲットは 1 つの :class:`CrawlEngine` を共有して並列にクロールされる。
+    同一ホストへのリクエストはプロセス共有のホストキューで間隔を守って直列化されるため、
+    ターゲットごとのスケジューラージョブが同時に走ってもポライトネスは維持される。
+
+    Args:
+        targets: クロールするターゲット。省略時は設定ファイルの全ターゲット。
+
+    Returns:
+        処理した記事数。
+
+    Raises:
+        CrawlPipelineError: いずれかのターゲットが失敗した場合（他のターゲットは最後まで処理する）。
     """
-    logger.info("Starting IBM crawl pipeline")
-    os_client = _make_opensearch()
+    logger.info(
+        "Starting IBM crawl pipeline",
+        targets=[t.name for t in targets] if targets is not None else "all",
+    )
+    os_client = get_opensearch()
 
-    try:
+    if targets is None:
         targets = load_crawl_targets()
-        known_urls = await _get_known_urls(os_client, IDX_NEWS_RAW)
+    known_urls = await _get_known_urls(os_client, IDX_NEWS_RAW)
 
-        total = 0
-        for target in targets:
-            docs = await crawl_target(target, known_urls)
-            for doc in docs:
-                raw_body = {
-                    "id": doc.id,
-                    "url": doc.source_url,
-                    "title": doc.metadata.get("title", ""),
-                    "body": doc.content.decode(errors="replace"),
-                    "source_type": "ibm_crawl",
-                    "crawled_at": datetime.now(tz=timezone.utc).isoformat(),
-                    **doc.metadata,
-                }
-                await _upsert_doc(os_client, IDX_NEWS_RAW, doc.id, raw_body)
-
-                clean = clean_news_article(doc)
-                if not clean:
-                    continue
-
-                await _upsert_doc(os_client, IDX_NEWS_CLEAN, doc.id, clean)
-
-                enriched = await enrich_article(clean)
-                await _upsert_doc(os_client, IDX_NEWS_ENRICHED, doc.id, enriched)
-                total += 1
-
-            # 同一実行内での再処理を防ぐため、新たにクロールした URL を既知セットに追加
-            known_urls.update(doc.source_url for doc in docs)
-
-        logger.info("IBM crawl pipeline complete", processed=total)
-        return total
-    finally:
-        await os_client.close()
+    async with CrawlEngine(hosts=_crawl_hosts) as engine:
+
+        async def _crawl_and_index(target: CrawlTarget) -> int:
+            docs = await crawl_target(target, known_urls, engine=engine)
+            return await _index_crawled_docs(os_client, docs)
+
+        results = await asyncio.gather(
+            *(_crawl_and_index(target) for target in targets),
+            return_exceptions=True,
+        )
+
+    total = 0
+    failed_targets: dict[str, str] = {}
+    for target, result in zip(targets, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                "IBM crawl target failed", target=target.name, error=str(result)
+            )
+            failed_targets[target.name] = str(result) or type(result).__name__
+            continue
+        total += result
+
+    logger.info("IBM crawl pipeline complete", processed=total, failed=len(failed_targets))
+    if failed_targets:
+        raise CrawlPipelineError(total, failed_targets)
+    return total
 
 
 async def run_box_pipeline(box_documents: list[Any]) -> int:
@@ -173,35 +217,32 @@ async def run_box_pipeline(box_documents: list[Any]) -> int:
         処理したチャンク数。
     """
     logger.info("Starting Box pipeline", doc_count=len(box_documents))
-    os_client = _make_opensearch()
-
-    try:
-        total_chunks = 0
-        for doc in box_documents:
-            # 生データレイヤー
-            raw_body = {
-                "id": doc.id,
-                "box_file_id": doc.metadata.get("box_file_id", doc.id),
-                "filename": doc.filename,
-                "mimetype": doc.mimetype,
-                "updated_at": doc.modified_time.isoformat(),
-                "source_type": "box",
-            }
-            await _upsert_doc(os_client, IDX_BOX_RAW, doc.id, raw_body)
-
-            # クリーニング（チャンク分割）
-            chunks = clean_box_document(doc)
-            for chunk in chunks:
-                enriched_chunk = await enrich_box_chunk(chunk)
-                await _upsert_doc(
-                    os_client, IDX_BOX_ENRICHED, enriched_chunk["id"], enriched_chunk
-                )
-                total_chunks += 1
-
-        logger.info("Box pipeline complete", total_chunks=total_chunks)
-        return total_chunks
-    finally:
-        await os_client.close()
+    os_client = get_opensearch()
+
+    total_chunks = 0
+    for doc in box_documents:
+        # 生データレイヤー
+        raw_body = {
+            "id": doc.id,
+            "box_file_id": doc.metadata.get("box_file_id", doc.id),
+            "filename": doc.filename,
+            "mimetype": doc.mimetype,
+            "updated_at": doc.modified_time.isoformat(),
+            "source_type": "box",
+        }
+        await _upsert_doc(os_client, IDX_BOX_RAW, doc.id, raw_body)
+
+        # クリーニング（チャンク分割）
+        chunks = clean_box_document(doc)
+        for chunk in chunks:
+            enriched_chunk = await enrich_box_chunk(chunk)
+            await _upsert_doc(
+                os_client, IDX_BOX_ENRICHED, enriched_chunk["id"], enriched_chunk
+            )
+            total_chunks += 1
+
+    logger.info("Box pipeline complete", total_chunks=total_chunks)
+    return total_chunks
 
 
 async def run_full_pipeline() -> dict[str, int]:
@@ -217,6 +258,8 @@ async def run_full_pipeline() -> dict[str, int]:
 
     gdelt_count, ibm_count = await asyncio.gather(gdelt_task, ibm_task, return_exceptions=True)
 
+    if isinstance(ibm_count, CrawlPipelineError):
+        ibm_count = ibm_count.processed
     return {
         "gdelt": gdelt_count if isinstance(gdelt_count, int) else 0,
         "ibm_crawl": ibm_count if isinstance(ibm_count, int) else 0,
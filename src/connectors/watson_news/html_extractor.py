@@ -0,0 +1,248 @@
+"""ニュース記事 HTML のシングルパス抽出ステージ。
+
+各 HTML ドキュメントを 1 回だけパースし、タイトル・本文テキスト・リンクをまとめて取り出す。
+パーサーは利用可能な中で最も速いものを選ぶ（``lxml`` → BeautifulSoup ``html.parser``）。
+
+HTML のパースとクリーニングは CPU バウンドなため、:func:`run_cpu_bound` で専用の
+プロセスプールに逃がしてイベントループを塞がないようにする。
+"""
+
+import asyncio
+import html as html_lib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import lxml.html as _lxml_html
+except ImportError:  # pragma: no cover - lxml は docling 経由で通常インストールされる
+    _lxml_html = None
+
+# 本文抽出前に取り除く非コンテンツ要素
+_DROP_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "form",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+)
+
+# テキスト化の際に前後で改行を入れるブロック要素
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "blockquote", "dd", "div", "dl", "dt", "figcaption",
+        "figure", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "li", "main", "ol",
+        "p", "pre", "section", "table", "td", "th", "tr", "ul",
+    }
+)
+
+
+# <title> 要素（DOM を組み立てずに取り出す）
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class ExtractedPage:
+    """1 回のパースで得られる記事情報。"""
+
+    title: str = ""
+    text: str = ""
+    links: list[str] = field(default_factory=list)
+
+
+def extract_title(html: str) -> str:
+    """``<title>`` のテキストだけを正規表現で取り出す（パースなしの軽量版）。
+
+    クリーニングで記事が除外された場合もメタデータにタイトルを残すために使う。
+    """
+    match = _TITLE_RE.search(html)
+    if not match:
+        return ""
+    return " ".join(html_lib.unescape(match.group(1)).split())
+
+
+def _normalize_links(hrefs: list[str], base_url: str | None) -> list[str]:
+    """href を絶対 URL にし、クエリとフラグメントを除去して重複排除する（出現順を維持）。"""
+    seen: set[str] = set()
+    links: list[str] = []
+    for href in hrefs:
+        full = urljoin(base_url, href) if base_url else href
+        parsed = urlparse(full)
+        if parsed.scheme not in {"http", "https"}:
+            continue
+        clean = parsed._replace(query="", fragment="").geturl()
+        if clean not in seen:
+            seen.add(clean)
+            links.append(clean)
+    return links
+
+
+def _extract_with_lxml(html: str, base_url: str | None, link_selector: str | None) -> ExtractedPage:
+    root = _lxml_html.document_fromstring(html)
+
+    title = (root.findtext(".//title") or "").strip()
+    if not title:
+        h1 = root.find(".//h1")
+        title = h1.text_content().strip() if h1 is not None else ""
+
+    if link_selector:
+        # CSS セレクタ評価には cssselect が必要（未導入なら呼び出し側で bs4 にフォールバック）
+        elements = root.cssselect(link_selector)
+    else:
+        elements = root.iter("a")
+    hrefs = [el.get("href") for el in elements if el.get("href")]
+
+    for el in list(root.iter(*_DROP_TAGS)):
+        el.drop_tree()
+
+    main = root.find(".//article")
+    if main is None:
+        main = root.find(".//main")
+    if main is None:
+        main = root.find(".//body")
+    if main is None:
+        main = root
+
+    for el in main.iter():
+        if not isinstance(el.tag, str):
+            continue
+        if el.tag == "br":
+            el.tail = "\n" + (el.tail or "")
+        elif el.tag in _BLOCK_TAGS:
+            el.text = "\n" + (el.text or "")
+            el.tail = "\n" + (el.tail or "")
+
+    return ExtractedPage(
+        title=title,
+        text=main.text_content(),
+        links=_normalize_links(hrefs, base_url),
+    )
+
+
+def _extract_with_bs4(html: str, base_url: str | None, link_selector: str | None) -> ExtractedPage:
+    soup = BeautifulSoup(html, "html.parser")
+
+    title_tag = soup.find("title")
+    title = title_tag.get_text(strip=True) if title_tag else ""
+    if not title:
+        h1 = soup.find("h1")
+        title = h1.get_text(strip=True) if h1 else ""
+
+    if link_selector:
+        elements = soup.select(link_selector)
+    else:
+        elements = soup.find_all("a", href=True)
+    hrefs = [el.get("href") for el in elements if el.get("href")]
+
+    for tag in soup.find_all(_DROP_TAGS):
+        tag.decompose()
+
+    main = soup.find("article") or soup.find("main") or soup.body or soup
+
+    for br in main.find_all("br"):
+        br.replace_with("\n")
+    for tag in main.find_all(_BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+
+    return ExtractedPage(
+        title=title,
+        text=main.get_text(),
+        links=_normalize_links(hrefs, base_url),
+    )
+
+
+def extract_page(
+    html: str,
+    base_url: str | None = None,
+    link_selector: str | None = None,
+) -> ExtractedPage:
+    """HTML を 1 回パースしてタイトル・本文テキスト・リンクを返す。
+
+    Args:
+        html: HTML 文字列。
+        base_url: 相対リンクを解決する基準 URL。
+        link_selector: リンク抽出に使う CSS セレクタ。省略時は全 ``<a href>`` を対象にする。
+
+    Returns:
+        :class:`ExtractedPage`。本文は ``<article>`` → ``<main>`` → ``<body>`` の順で
+        最初に見つかった要素から、スクリプトやナビゲーションを除いて抽出する。
+    """
+    if _lxml_html is not None and html.strip():
+        try:
+            return _extract_with_lxml(html, base_url, link_selector)
+        except ImportError:
+            # cssselect 未導入でセレクタが指定された場合
+            pass
+        except Exception as exc:
+            logger.debug("lxml extraction failed, falling back to html.parser", error=str(exc))
+    return _extract_with_bs4(html, base_url, link_selector)
+
+
+# ---------------------------------------------------------------------------
+# CPU バウンド処理用プロセスプール
+# ---------------------------------------------------------------------------
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _clean_worker_count() -> int:
+    """``WATSON_NEWS_CLEAN_WORKERS`` のワーカー数を返す（0 = イベントループのスレッドで直接実行）。"""
+    default = max(1, min(2, multiprocessing.cpu_count() // 2))
+    return max(0, int(os.getenv("WATSON_NEWS_CLEAN_WORKERS") or default))
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    if _pool is None:
+        workers = _clean_worker_count()
+        if workers == 0:
+            return None
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        logger.info("Watson News clean pool initialized", max_workers=workers)
+    return _pool
+
+
+async def run_cpu_bound(fn: Callable[..., Any], *args: Any) -> Any:
+    """*fn* をクリーニング用プロセスプールで実行する。
+
+    *fn* と引数はプロセス間で pickle 可能である必要がある。プールが無効化されている場合
+    （ワーカー数 0）や壊れている場合は、その場で同期実行する。
+    """
+    global _pool
+    pool = _get_pool()
+    if pool is None:
+        return fn(*args)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        logger.warning("Watson News clean pool is broken, recreating")
+        pool.shutdown(wait=False)
+        _pool = None
+        return fn(*args)
+
+
+def shutdown_pool() -> None:
+    """クリーニング用プロセスプールを停止する。"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -2,27 +2,38 @@
 
 watson-news/ibm_crawl_targets.yaml からクロール対象を読み込み、
 OpenSearch に既にインデックスされた URL と比較して新しい記事 URL を検出する。
+
+クロールは :class:`CrawlEngine` が実行する。エンジンは単一のコネクションプール付き
+HTTP クライアントを共有し、ホストごとにリクエストを直列化してポライトネス間隔
+（``request_interval_seconds`` と robots.txt の ``Crawl-delay`` の大きい方）を守る。
+異なるホストへのリクエストは互いを待たずに並列で進む。
 """
 
 import asyncio
 import os
 import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from typing import AsyncIterator
+from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
 import httpx
 import yaml
-from bs4 import BeautifulSoup
 
 from connectors.base import ConnectorDocument, DocumentACL
+from connectors.watson_news.html_extractor import extract_page, extract_title, run_cpu_bound
+from utils.http_clients import get_http_client
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 IBM_CRAWL_USER_AGENT = os.getenv("IBM_CRAWL_USER_AGENT", "WatsonNewsBot/1.0")
+# 共有 HTTP クライアントの同時接続数の上限（全ホスト合計）
+IBM_CRAWL_MAX_CONNECTIONS = int(os.getenv("IBM_CRAWL_MAX_CONNECTIONS", "10"))
 _DEFAULT_CONFIG_PATH = (
     Path(__file__).parents[3] / "watson-news" / "ibm_crawl_targets.yaml"
 )
@@ -76,57 +87,194 @@ def load_crawl_targets(config_path: str | None = None) -> list[CrawlTarget]:
 
 
 class RobotsTxtCache:
-    """robots.txt ファイルのシンプルなインプロセスキャッシュ（TTL: 1時間）。"""
+    """robots.txt ファイルのシンプルなインプロセスキャッシュ（TTL: 1時間）。
+
+    同じホストへの並行呼び出しは 1 つの取得処理を共有するため、robots.txt への
+    リクエストはホストごとに TTL あたり 1 回に抑えられる。
+    """
 
     _TTL_SECONDS = 3600
 
     def __init__(self) -> None:
         self._cache: dict[str, tuple[RobotFileParser, float]] = {}
-
-    async def can_fetch(self, url: str, user_agent: str) -> bool:
+        # robots.txt URL ごとの取得中タスク
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def _get_parser(
+        self,
+        url: str,
+        user_agent: str,
+        client: httpx.AsyncClient | None = None,
+    ) -> RobotFileParser:
         parsed = urlparse(url)
         robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-        now = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
 
         if robots_url in self._cache:
             parser, ts = self._cache[robots_url]
-            if now - ts < self._TTL_SECONDS:
-                return parser.can_fetch(user_agent, url)
-
+            if loop.time() - ts < self._TTL_SECONDS:
+                return parser
+
+        task = self._inflight.get(robots_url)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._load(robots_url, user_agent, client))
+            self._inflight[robots_url] = task
+            task.add_done_callback(partial(self._forget, robots_url))
+        # 待機側がキャンセルされても共有の取得処理は止めない
+        return await asyncio.shield(task)
+
+    def _forget(self, robots_url: str, task: asyncio.Task) -> None:
+        if self._inflight.get(robots_url) is task:
+            del self._inflight[robots_url]
+
+    async def _load(
+        self,
+        robots_url: str,
+        user_agent: str,
+        client: httpx.AsyncClient | None,
+    ) -> RobotFileParser:
+        fetched_at = asyncio.get_running_loop().time()
         parser = RobotFileParser(robots_url)
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(robots_url, headers={"User-Agent": user_agent})
-                if resp.status_code == 200:
-                    parser.parse(resp.text.splitlines())
-                else:
-                    parser.allow_all = True
+            if client is not None:
+                resp = await client.get(
+                    robots_url, headers={"User-Agent": user_agent}, timeout=10.0
+                )
+            else:
+                resp = await get_http_client("robots").get(
+                    robots_url, headers={"User-Agent": user_agent}, timeout=10.0
+                )
+            if resp.status_code == 200:
+                parser.parse(resp.text.splitlines())
+            else:
+                parser.allow_all = True
         except Exception:
             parser.allow_all = True  # type: ignore[attr-defined]
 
-        self._cache[robots_url] = (parser, now)
+        self._cache[robots_url] = (parser, fetched_at)
+        return parser
+
+    async def can_fetch(
+        self,
+        url: str,
+        user_agent: str,
+        client: httpx.AsyncClient | None = None,
+    ) -> bool:
+        parser = await self._get_parser(url, user_agent, client)
         return parser.can_fetch(user_agent, url)
 
+    async def crawl_delay(
+        self,
+        url: str,
+        user_agent: str,
+        client: httpx.AsyncClient | None = None,
+    ) -> float | None:
+        """robots.txt の ``Crawl-delay``（秒）を返す。指定がなければ ``None``。"""
+        parser = await self._get_parser(url, user_agent, client)
+        delay = parser.crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
+
 
 _robots_cache = RobotsTxtCache()
 
 
-async def _fetch_html(
+@dataclass
+class _IndexPageEntry:
+    etag: str | None
+    last_modified: str | None
+    body: str
+
+
+class IndexPageCache:
+    """インデックスページの条件付き GET 用キャッシュ。
+
+    前回レスポンスの ``ETag`` / ``Last-Modified`` と本文を URL ごとに保持し、
+    サーバーが ``304 Not Modified`` を返した場合は保持済みの本文を再利用する。
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _IndexPageEntry] = {}
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def get_body(self, url: str) -> str | None:
+        entry = self._entries.get(url)
+        return entry.body if entry else None
+
+    def store(self, url: str, resp: httpx.Response) -> None:
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._entries[url] = _IndexPageEntry(etag, last_modified, resp.text)
+        else:
+            self._entries.pop(url, None)
+
+
+_index_page_cache = IndexPageCache()
+
+
+@dataclass
+class _HostState:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_request_at: float | None = None
+
+
+class HostPolitenessScheduler:
+    """ホスト単位のリクエストキューとポライトネス間隔を管理する。
+
+    同一ホストへのリクエストは到着順に 1 件ずつ処理され、前回リクエスト完了から
+    指定秒数が経過するまで待機する。異なるホストは独立したキューで並列に進む。
+    """
+
+    def __init__(self) -> None:
+        self._hosts: dict[str, _HostState] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str, delay: float) -> AsyncIterator[None]:
+        host = urlparse(url).netloc
+        state = self._hosts.setdefault(host, _HostState())
+        async with state.lock:
+            loop = asyncio.get_running_loop()
+            if state.last_request_at is not None and delay > 0:
+                wait = state.last_request_at + delay - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                state.last_request_at = loop.time()
+
+
+async def _fetch(
     client: httpx.AsyncClient,
     url: str,
     max_retries: int = 3,
     timeout: float = 30.0,
-) -> str | None:
+    headers: dict[str, str] | None = None,
+) -> httpx.Response | None:
+    """*url* を取得する。``304 Not Modified`` はそのまま返し、失敗時は ``None``。"""
+    request_headers = {"User-Agent": IBM_CRAWL_USER_AGENT, **(headers or {})}
     for attempt in range(1, max_retries + 1):
         try:
             resp = await client.get(
                 url,
-                headers={"User-Agent": IBM_CRAWL_USER_AGENT},
+                headers=request_headers,
                 timeout=timeout,
                 follow_redirects=True,
             )
+            if resp.status_code == 304:
+                return resp
             resp.raise_for_status()
-            return resp.text
+            return resp
         except (httpx.HTTPStatusError, httpx.RequestError) as exc:
             logger.warning(
                 "Fetch error", url=url, attempt=attempt, error=str(exc)
@@ -136,65 +284,150 @@ async def _fetch_html(
     return None
 
 
+async def _fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
+    max_retries: int = 3,
+    timeout: float = 30.0,
+) -> str | None:
+    resp = await _fetch(client, url, max_retries=max_retries, timeout=timeout)
+    if resp is None or resp.status_code == 304:
+        return None
+    return resp.text
+
+
 def _extract_article_urls(
     html: str,
     base_url: str,
     selector: str | None,
 ) -> list[str]:
     """インデックスページの HTML 文字列から記事 URL を抽出する。"""
-    soup = BeautifulSoup(html, "html.parser")
     base_domain = urlparse(base_url).netloc
-
-    if selector:
-        elements = soup.select(selector)
-        hrefs = [el.get("href") for el in elements if el.get("href")]
-    else:
-        hrefs = [a.get("href") for a in soup.find_all("a", href=True)]
-
-    urls: list[str] = []
-    for href in hrefs:
-        full = urljoin(base_url, href)
-        parsed = urlparse(full)
-        if parsed.netloc.endswith(base_domain) and parsed.scheme in {"http", "https"}:
-            # クエリパラメーターとフラグメントを除去して正規化
-            clean = parsed._replace(query="", fragment="").geturl()
-            if clean not in urls:
-                urls.append(clean)
-    return urls
+    page = extract_page(html, base_url=base_url, link_selector=selector)
+    # クエリパラメーターとフラグメントは extract_page 側で除去・正規化済み
+    return [u for u in page.links if urlparse(u).netloc.endswith(base_domain)]
 
 
-async def crawl_target(
-    target: CrawlTarget,
-    known_urls: set[str],
-) -> list[ConnectorDocument]:
-    """単一の IBM サイト対象をクロールし、新しい記事を返す。
+class CrawlEngine:
+    """共有 HTTP クライアントとホスト単位のポライトネス制御でクロール対象を実行する。
 
     Args:
-        target: クロール対象の設定。
-        known_urls: 既にインデックスされた URL のセット（差分検出用）。
-
-    Returns:
-        新しい :class:`ConnectorDocument` インスタンスのリスト。
+        client: 使用する :class:`httpx.AsyncClient`。省略時はエンジンが接続プール付きの
+            クライアントを作成し、:meth:`close` で破棄する。
+        index_cache: インデックスページの条件付き GET キャッシュ。省略時はプロセス共有の
+            キャッシュを使用するため、スケジューラーの実行をまたいで再利用される。
+        hosts: ホストキュー。複数のエンジン（例: ターゲットごとのスケジューラージョブ）が
+            同じホストへ同時にアクセスする場合は、同じインスタンスを共有して間隔を守る。
     """
-    async with httpx.AsyncClient() as client:
-        # 1. インデックスページを取得
-        html = await _fetch_html(
-            client,
-            target.index_url,
-            max_retries=target.max_retries,
-            timeout=float(target.request_timeout_seconds),
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        index_cache: IndexPageCache | None = None,
+        max_connections: int = IBM_CRAWL_MAX_CONNECTIONS,
+        hosts: HostPolitenessScheduler | None = None,
+    ) -> None:
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=True,
         )
+        self._index_cache = index_cache if index_cache is not None else _index_page_cache
+        self._hosts = hosts if hosts is not None else HostPolitenessScheduler()
+        # 同一実行内で複数ターゲットが同じ記事を指す場合の重複取得を防ぐ
+        self._claimed_urls: set[str] = set()
+
+    async def __aenter__(self) -> "CrawlEngine":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._owns_client and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def _politeness_delay(self, target: CrawlTarget, url: str) -> float:
+        delay = float(target.request_interval_seconds)
+        if target.respect_robots_txt:
+            crawl_delay = await _robots_cache.crawl_delay(
+                url, IBM_CRAWL_USER_AGENT, client=self._client
+            )
+            if crawl_delay is not None:
+                delay = max(delay, crawl_delay)
+        return delay
+
+    async def fetch_index(self, target: CrawlTarget) -> str | None:
+        """インデックスページを条件付き GET で取得する。未変更ならキャッシュ済み本文を返す。"""
+        url = target.index_url
+        delay = await self._politeness_delay(target, url)
+        async with self._hosts.slot(url, delay):
+            resp = await _fetch(
+                self._client,
+                url,
+                max_retries=target.max_retries,
+                timeout=float(target.request_timeout_seconds),
+                headers=self._index_cache.conditional_headers(url),
+            )
+        if resp is None:
+            return None
+        if resp.status_code == 304:
+            logger.debug("Index page not modified", target=target.name)
+            return self._index_cache.get_body(url)
+        self._index_cache.store(url, resp)
+        return resp.text
+
+    async def fetch_article(self, target: CrawlTarget, url: str) -> ConnectorDocument | None:
+        if target.respect_robots_txt:
+            if not await _robots_cache.can_fetch(
+                url, IBM_CRAWL_USER_AGENT, client=self._client
+            ):
+                logger.info("robots.txt disallows", url=url)
+                return None
+
+        delay = await self._politeness_delay(target, url)
+        async with self._hosts.slot(url, delay):
+            article_html = await _fetch_html(
+                self._client,
+                url,
+                max_retries=target.max_retries,
+                timeout=float(target.request_timeout_seconds),
+            )
+        if not article_html:
+            return None
+        return _html_to_connector_document(article_html, url, target)
+
+    async def crawl(
+        self,
+        target: CrawlTarget,
+        known_urls: set[str],
+    ) -> list[ConnectorDocument]:
+        """単一の対象をクロールし、新しい記事を返す。
+
+        記事の取得はまとめてホストキューに投入されるため、同一ホストでは間隔を守って
+        直列に、別ホストのターゲットとは並列に処理される。
+        """
+        # 1. インデックスページを取得
+        html = await self.fetch_index(target)
         if not html:
             logger.warning("Failed to fetch index page", target=target.name)
             return []
 
         # 2. 記事 URL を抽出
-        all_urls = _extract_article_urls(html, target.index_url, target.article_link_selector)
+        all_urls = await run_cpu_bound(
+            _extract_article_urls, html, target.index_url, target.article_link_selector
+        )
 
         # 3. 差分: 新しい URL のみを残す
-        new_urls = [u for u in all_urls if u not in known_urls]
+        new_urls = [
+            u for u in all_urls if u not in known_urls and u not in self._claimed_urls
+        ]
         if target.max_articles_per_run > 0:
             new_urls = new_urls[: target.max_articles_per_run]
+        self._claimed_urls.update(new_urls)
 
         logger.info(
             "IBM crawl differential",
@@ -204,30 +437,31 @@ async def crawl_target(
         )
 
         # 4. 各新規記事をクロール
-        documents: list[ConnectorDocument] = []
-        for url in new_urls:
-            if target.respect_robots_txt:
-                if not await _robots_cache.can_fetch(url, IBM_CRAWL_USER_AGENT):
-                    logger.info("robots.txt disallows", url=url)
-                    continue
+        results = await asyncio.gather(
+            *(self.fetch_article(target, url) for url in new_urls)
+        )
+        return [doc for doc in results if doc is not None]
 
-            await asyncio.sleep(target.request_interval_seconds)
 
-            article_html = await _fetch_html(
-                client,
-                url,
-                max_retries=target.max_retries,
-                timeout=float(target.request_timeout_seconds),
-            )
-            if not article_html:
-                continue
+async def crawl_target(
+    target: CrawlTarget,
+    known_urls: set[str],
+    engine: CrawlEngine | None = None,
+) -> list[ConnectorDocument]:
+    """単一の IBM サイト対象をクロールし、新しい記事を返す。
 
-            doc = _html_to_connector_document(
-                article_html, url, target
-            )
-            documents.append(doc)
+    Args:
+        target: クロール対象の設定。
+        known_urls: 既にインデックスされた URL のセット（差分検出用）。
+        engine: 共有する :class:`CrawlEngine`。省略時はこの呼び出し専用のエンジンを使う。
 
-        return documents
+    Returns:
+        新しい :class:`ConnectorDocument` インスタンスのリスト。
+    """
+    if engine is not None:
+        return await engine.crawl(target, known_urls)
+    async with CrawlEngine() as own_engine:
+        return await own_engine.crawl(target, known_urls)
 
 
 def _html_to_connector_document(
@@ -235,14 +469,19 @@ def _html_to_connector_document(
     url: str,
     target: CrawlTarget,
 ) -> ConnectorDocument:
-    soup = BeautifulSoup(html, "html.parser")
-    title_tag = soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else url
+    """取得した記事 HTML を ConnectorDocument に包む。
+
+    HTML のパースはここでは行わない（本文はクリーニング段階で
+    :func:`~connectors.watson_news.html_extractor.extract_page` が抽出する）。
+    タイトルは :func:`~connectors.watson_news.html_extractor.extract_title` で
+    ``<title>`` だけを取り出し、無ければ URL を使う。
+    """
+    slug = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or urlparse(url).netloc
 
     now = datetime.now(tz=timezone.utc)
     return ConnectorDocument(
         id=str(uuid.uuid5(uuid.NAMESPACE_URL, url)),
-        filename=f"{title[:80]}.html",
+        filename=f"{slug[:80]}.html",
         mimetype="text/html",
         content=html.encode(),
         source_url=url,
@@ -251,7 +490,7 @@ def _html_to_connector_document(
         created_time=now,
         metadata={
             "source_type": "ibm_crawl",
-            "title": title,
+            "title": extract_title(html) or url,
             "language": target.language,
             "site_category": target.site_category,
             "crawl_target": target.name,
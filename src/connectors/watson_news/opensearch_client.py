@@ -0,0 +1,143 @@
+"""Watson News サブシステムで共有する長寿命 OpenSearch クライアント。
+
+検索 API・記事取得 API・ETL パイプラインはすべて :func:`get_opensearch` が返す
+1 つのクライアント（= 1 つのコネクションプール）を使い回す。リクエストごとに
+クライアントを作って閉じると TCP/TLS ハンドシェイクが毎回発生するため、
+プロセス内でキープアライブ接続を共有する。
+
+- プールサイズは ``WATSON_NEWS_OS_POOL_MAXSIZE`` で上限を設定する。
+- 起動時に :func:`start_opensearch` で ``WATSON_NEWS_OS_WARM_CONNECTIONS`` 本の接続を
+  事前に張っておき、最初の検索リクエストのレイテンシを抑える。
+- シャットダウン時に :func:`close_opensearch` でプールを閉じる。
+
+呼び出し側はクライアントを ``close()`` してはならない。
+"""
+
+import asyncio
+import os
+
+from opensearchpy import AsyncOpenSearch
+
+from utils.logging_config import get_logger
+from utils.opensearch_connection import TimedAIOHttpConnection
+
+logger = get_logger(__name__)
+
+OPENSEARCH_HOST = os.getenv("OPENSEARCH_HOST", "localhost")
+OPENSEARCH_PORT = int(os.getenv("OPENSEARCH_PORT", "9200"))
+OPENSEARCH_USERNAME = os.getenv("OPENSEARCH_USERNAME", "admin")
+OPENSEARCH_PASSWORD = os.getenv("OPENSEARCH_PASSWORD", "")
+
+# 共有コネクションプールの最大接続数
+WATSON_NEWS_OS_POOL_MAXSIZE = int(os.getenv("WATSON_NEWS_OS_POOL_MAXSIZE", "20"))
+# 起動時に事前確立しておく接続数
+WATSON_NEWS_OS_WARM_CONNECTIONS = int(os.getenv("WATSON_NEWS_OS_WARM_CONNECTIONS", "2"))
+# リクエストタイムアウト（秒）
+WATSON_NEWS_OS_TIMEOUT = int(os.getenv("WATSON_NEWS_OS_TIMEOUT", "30"))
+
+_client: AsyncOpenSearch | None = None
+# クライアントを作成したイベントループ（aiohttp セッションはループに紐づく）
+_client_loop: asyncio.AbstractEventLoop | None = None
+# ループ変更で置き換えたクライアントのクローズ処理（完了まで参照を保持する）
+_closing: set[asyncio.Future] = set()
+
+
+def _create_client() -> AsyncOpenSearch:
+    return AsyncOpenSearch(
+        hosts=[{"host": OPENSEARCH_HOST, "port": OPENSEARCH_PORT}],
+        connection_class=TimedAIOHttpConnection,
+        scheme="https",
+        use_ssl=True,
+        verify_certs=False,
+        ssl_assert_fingerprint=None,
+        http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
+        http_compress=True,
+        maxsize=max(1, WATSON_NEWS_OS_POOL_MAXSIZE),
+        timeout=WATSON_NEWS_OS_TIMEOUT,
+    )
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _close_quietly(client: AsyncOpenSearch) -> None:
+    try:
+        await client.close()
+    except Exception as exc:
+        logger.warning("Error closing Watson News OpenSearch client", error=str(exc))
+
+
+def _discard(client: AsyncOpenSearch, client_loop: asyncio.AbstractEventLoop | None) -> None:
+    """置き換えたクライアントを閉じる（元のループが動いていればそのループ上で、なければ現在のループで）。"""
+    if client_loop is not None and client_loop.is_running() and not client_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_close_quietly(client), client_loop)
+        return
+    future = asyncio.ensure_future(_close_quietly(client))
+    _closing.add(future)
+    future.add_done_callback(_closing.discard)
+
+
+def get_opensearch() -> AsyncOpenSearch:
+    """共有 OpenSearch クライアントを返す（未作成なら作成する）。
+
+    別のイベントループから呼ばれた場合は、そのループ用にクライアントを作り直し、
+    古いクライアントのコネクションプールは閉じる。
+    """
+    global _client, _client_loop
+    loop = _running_loop()
+    if _client is None or (loop is not None and _client_loop is not loop):
+        if _client is not None:
+            logger.debug("Event loop changed, recreating Watson News OpenSearch client")
+            _discard(_client, _client_loop)
+        _client = _create_client()
+        _client_loop = loop
+        logger.info(
+            "Watson News OpenSearch client initialized",
+            host=OPENSEARCH_HOST,
+            port=OPENSEARCH_PORT,
+            pool_maxsize=WATSON_NEWS_OS_POOL_MAXSIZE,
+        )
+    return _client
+
+
+async def start_opensearch() -> AsyncOpenSearch:
+    """共有クライアントを作成し、接続を事前に確立する。
+
+    ウォームアップに失敗しても例外は送出しない（最初のリクエスト時に接続される）。
+    """
+    client = get_opensearch()
+    warm = min(max(0, WATSON_NEWS_OS_WARM_CONNECTIONS), max(1, WATSON_NEWS_OS_POOL_MAXSIZE))
+    if warm:
+        # 並列に ping することで、プール内に複数のキープアライブ接続を張る
+        results = await asyncio.gather(
+            *(client.ping() for _ in range(warm)), return_exceptions=True
+        )
+        failed = [r for r in results if isinstance(r, BaseException) or r is False]
+        if failed:
+            logger.warning(
+                "Watson News OpenSearch warm-up incomplete",
+                requested=warm,
+                failed=len(failed),
+            )
+        else:
+            logger.info("Watson News OpenSearch connections warmed up", connections=warm)
+    return client
+
+
+async def close_opensearch() -> None:
+    """共有クライアントのコネクションプールを閉じる。"""
+    global _client, _client_loop
+    client = _client
+    _client = None
+    _client_loop = None
+    loop = asyncio.get_running_loop()
+    pending = [future for future in _closing if future.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    if client is not None:
+        await _close_quietly(client)
+        logger.info("Watson News OpenSearch client closed")
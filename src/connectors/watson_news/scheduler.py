@@ -2,22 +2,63 @@
 
 登録されるジョブ:
 - GDELT 取得ジョブ（15分ごと）
-- IBM クロールジョブ（ibm_crawl_targets.yaml に定義された対象ごと、間隔はファイルに準拠）
-- Box 差分取得 + クリーニング / エンリッチ / インデックス登録（1時間ごと）
+- IBM クロールジョブ（ibm_crawl_targets.yaml に定義された対象ごと、間隔はファイルに準拠）。
+  各ジョブは自分のターゲットだけをクロールする。
+
+全ジョブは :func:`_run_job` を経由して実行される。ここで共有の同時実行数バジェット
+（``WATSON_NEWS_MAX_CONCURRENT_JOBS``）を取得し、実行ごとのメトリクスと最終実行状態を
+記録する。記録は :func:`get_job_states` で取得でき、ETL ステータス API に反映される。
+起動時刻の集中を避けるため、各トリガーには ``WATSON_NEWS_JOB_JITTER_SECONDS`` の
+ジッターを付与する。
 """
 
 import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from connectors.watson_news.etl_pipeline import run_gdelt_pipeline, run_ibm_crawl_pipeline
-from connectors.watson_news.ibm_crawl_connector import load_crawl_targets, crawl_target
+from connectors.watson_news.ibm_crawl_connector import load_crawl_targets
+from services.shared_state import get_shared_state
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 同時に実行できる ETL ジョブ数（全ジョブ共通のバジェット）
+WATSON_NEWS_MAX_CONCURRENT_JOBS = int(os.getenv("WATSON_NEWS_MAX_CONCURRENT_JOBS", "2"))
+# 各ジョブの実行時刻に加えるランダムなずれの最大秒数
+WATSON_NEWS_JOB_JITTER_SECONDS = int(os.getenv("WATSON_NEWS_JOB_JITTER_SECONDS", "60"))
+
+GDELT_JOB_ID = "watson_news_gdelt"
+IBM_CRAWL_JOB_PREFIX = "watson_news_ibm_crawl_"
+
 _scheduler: AsyncIOScheduler | None = None
+_job_budget: asyncio.Semaphore | None = None
+
+
+@dataclass
+class JobRunState:
+    """ジョブごとの実行メトリクスと最終実行状態。"""
+
+    job_id: str
+    runs: int = 0
+    failures: int = 0
+    total_processed: int = 0
+    last_status: str | None = None  # running | success | failed
+    last_started_at: str | None = None
+    last_finished_at: str | None = None
+    last_duration_seconds: float | None = None
+    last_wait_seconds: float | None = None
+    last_processed: int | None = None
+    last_error: str | None = None
+
+
+_job_states: dict[str, JobRunState] = {}
 
 
 def _get_scheduler() -> AsyncIOScheduler:
@@ -27,16 +68,112 @@ def _get_scheduler() -> AsyncIOScheduler:
     return _scheduler
 
 
+def _get_job_budget() -> asyncio.Semaphore:
+    global _job_budget
+    if _job_budget is None:
+        _job_budget = asyncio.Semaphore(max(1, WATSON_NEWS_MAX_CONCURRENT_JOBS))
+    return _job_budget
+
+
+def _now_iso() -> str:
+    return datetime.now(tz=timezone.utc).isoformat()
+
+
 # ---------------------------------------------------------------------------
-# ジョブラッパー（APScheduler に必要な sync → async ブリッジ）
+# ジョブ実行
 # ---------------------------------------------------------------------------
 
-def _run_gdelt() -> None:
-    asyncio.get_event_loop().run_until_complete(run_gdelt_pipeline())
+async def _run_job(
+    job_id: str,
+    pipeline: Callable[..., Awaitable[int]],
+    *args: Any,
+) -> int | None:
+    """共有バジェットを取得して *pipeline* を実行し、結果を :class:`JobRunState` に記録する。
+
+    例外はここで捕捉して記録するため、失敗したジョブも次回のスケジュールで再実行される。
+    処理件数を返す（失敗時は ``None``）。一部だけ失敗した場合に例外が ``processed`` を
+    持っていれば（:class:`~connectors.watson_news.etl_pipeline.CrawlPipelineError` など）、その件数も記録する。
+    """
+    state = _job_states.setdefault(job_id, JobRunState(job_id=job_id))
+    queued_at = time.monotonic()
+
+    async with _get_job_budget():
+        started = time.monotonic()
+        state.last_wait_seconds = round(started - queued_at, 3)
+        state.last_started_at = _now_iso()
+        state.last_status = "running"
+        logger.info("Watson News job started", job_id=job_id, wait_seconds=state.last_wait_seconds)
+
+        try:
+            processed = await pipeline(*args)
+        except Exception as exc:
+            state.failures += 1
+            state.last_status = "failed"
+            state.last_error = str(exc)
+            state.last_processed = getattr(exc, "processed", None)
+            state.total_processed += state.last_processed or 0
+            logger.error("Watson News job failed", job_id=job_id, error=str(exc))
+            return None
+        else:
+            state.last_status = "success"
+            state.last_error = None
+            state.last_processed = processed
+            state.total_processed += processed or 0
+            return processed
+        finally:
+            state.runs += 1
+            state.last_finished_at = _now_iso()
+            state.last_duration_seconds = round(time.monotonic() - started, 3)
+            logger.info(
+                "Watson News job finished",
+                job_id=job_id,
+                status=state.last_status,
+                duration_seconds=state.last_duration_seconds,
+                processed=state.last_processed,
+            )
+            publish_states()
+
+
+def get_job_states() -> dict[str, dict[str, Any]]:
+    """全ジョブの実行メトリクスと最終実行状態を ``{job_id: state}`` で返す。"""
+    return {job_id: asdict(state) for job_id, state in _job_states.items()}
+
+
+def publish_states() -> None:
+    """マルチワーカー構成で、実行状態と次回実行時刻を共有ステートに書き込む。
+
+    スケジューラーはリーダーワーカーでのみ動作するため、他のワーカーは
+    :func:`get_published_states` で ETL ステータスを参照する。
+    """
+    store = get_shared_state()
+    if store is None:
+        return
+    running = bool(_scheduler and _scheduler.running)
+    next_run_at = {}
+    if running:
+        for job in _scheduler.get_jobs():
+            if job.next_run_time:
+                next_run_at[job.id] = job.next_run_time.isoformat()
+    try:
+        store.put("watson_news", "scheduler", {
+            "scheduler_running": running,
+            "job_states": get_job_states(),
+            "next_run_at": next_run_at,
+        })
+    except Exception as exc:
+        logger.warning("Failed to publish Watson News job states", error=str(exc))
 
 
-def _run_ibm_crawl() -> None:
-    asyncio.get_event_loop().run_until_complete(run_ibm_crawl_pipeline())
+def get_published_states() -> dict[str, Any] | None:
+    """リーダーワーカーが共有ステートに書き込んだスケジューラー状態を返す（未公開なら ``None``）。"""
+    store = get_shared_state()
+    if store is None:
+        return None
+    try:
+        return store.get("watson_news", "scheduler")
+    except Exception as exc:
+        logger.warning("Failed to read Watson News job states", error=str(exc))
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -54,32 +191,40 @@ def register_jobs(scheduler: AsyncIOScheduler | None = None) -> AsyncIOScheduler
         スケジューラー（開始済みまたは渡されたもの）。
     """
     sched = scheduler or _get_scheduler()
+    jitter = WATSON_NEWS_JOB_JITTER_SECONDS or None
 
     # GDELT — 固定 15分間隔
     sched.add_job(
-        run_gdelt_pipeline,
-        trigger=IntervalTrigger(minutes=15),
-        id="watson_news_gdelt",
+        _run_job,
+        trigger=IntervalTrigger(minutes=15, jitter=jitter),
+        args=[GDELT_JOB_ID, run_gdelt_pipeline],
+        id=GDELT_JOB_ID,
         replace_existing=True,
         max_instances=1,
+        coalesce=True,
         misfire_grace_time=300,
     )
     logger.info("Registered GDELT job", interval="15min")
 
-    # IBM クロール — YAML 設定から動的にジョブを生成
+    # IBM クロール — YAML 設定から対象ごとにジョブを生成する（各ジョブは自分の対象のみクロール）
     try:
         targets = load_crawl_targets()
     except Exception as exc:
         logger.warning("Could not load crawl targets, IBM crawl jobs not registered", error=str(exc))
         targets = []
 
+    target_job_ids = set()
     for target in targets:
+        job_id = f"{IBM_CRAWL_JOB_PREFIX}{target.name}"
+        target_job_ids.add(job_id)
         sched.add_job(
-            run_ibm_crawl_pipeline,
-            trigger=IntervalTrigger(hours=target.interval_hours),
-            id=f"watson_news_ibm_crawl_{target.name}",
+            _run_job,
+            trigger=IntervalTrigger(hours=target.interval_hours, jitter=jitter),
+            args=[job_id, run_ibm_crawl_pipeline, [target]],
+            id=job_id,
             replace_existing=True,
             max_instances=1,
+            coalesce=True,
             misfire_grace_time=600,
         )
         logger.info(
@@ -88,6 +233,12 @@ def register_jobs(scheduler: AsyncIOScheduler | None = None) -> AsyncIOScheduler
             interval_hours=target.interval_hours,
         )
 
+    # 設定から削除・無効化されたターゲットのジョブを取り除く
+    for job in sched.get_jobs():
+        if job.id.startswith(IBM_CRAWL_JOB_PREFIX) and job.id not in target_job_ids:
+            sched.remove_job(job.id)
+            logger.info("Removed stale IBM crawl job", job_id=job.id)
+
     return sched
 
 
@@ -98,13 +249,16 @@ def start_scheduler() -> AsyncIOScheduler:
     if not sched.running:
         sched.start()
         logger.info("Watson News scheduler started")
+    publish_states()
     return sched
 
 
 def stop_scheduler() -> None:
     """スケジューラーが実行中であれば停止する。"""
-    global _scheduler
+    global _scheduler, _job_budget
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
         logger.info("Watson News scheduler stopped")
     _scheduler = None
+    _job_budget = None
+    publish_states()
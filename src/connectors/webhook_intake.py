@@ -0,0 +1,473 @@
+"""
+Coalescing and de-duplication of connector webhook notifications.
+
+Google Drive and Microsoft Graph send bursts of notifications for one logical change
+(a save followed by metadata updates, a folder move touching every child). Instead of
+starting a sync per notification, each notification is normalised to
+``(connection_id, file_id, change_kind)`` and put into a buffer keyed by connection
+and file:
+
+- Changes to the same file collapse into one pending item. The latest kind wins, so a
+  delete supersedes pending updates.
+- A connection is flushed once it has been quiet for ``CONNECTOR_WEBHOOK_QUIET_SECONDS``
+  (or its oldest item has waited ``CONNECTOR_WEBHOOK_MAX_DELAY_SECONDS``). Folder items
+  are expanded once and their files de-duplicated against the pending file items; the
+  connection's items are then dispatched as one batch: updates as one sync task,
+  deletes removed from the index.
+
+The buffer is written to ``CONNECTOR_WEBHOOK_BUFFER_FILE`` whenever its items change,
+so pending items survive a restart. Writes run in a worker thread, one at a time;
+changes made while a write is in flight are saved by a single follow-up write. Each process owns the items it received; items
+left by a previous run on the same host are claimed at startup.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from utils.logging_config import get_logger
+
+from .base import CHANGE_DELETE, CHANGE_FOLDER, CHANGE_UPDATE, WebhookChange
+
+logger = get_logger(__name__)
+
+CONNECTOR_WEBHOOK_QUIET_SECONDS = float(os.getenv("CONNECTOR_WEBHOOK_QUIET_SECONDS", "10"))
+CONNECTOR_WEBHOOK_MAX_DELAY_SECONDS = float(os.getenv("CONNECTOR_WEBHOOK_MAX_DELAY_SECONDS", "120"))
+CONNECTOR_WEBHOOK_BUFFER_FILE = os.getenv("CONNECTOR_WEBHOOK_BUFFER_FILE", "data/connector_webhooks.json")
+
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+ItemKey = Tuple[str, str]  # (connection_id, file_id)
+
+
+@dataclass
+class PendingChange:
+    connection_id: str
+    file_id: str
+    kind: str
+    first_seen: float
+    last_seen: float
+    notifications: int = 1
+
+
+@dataclass
+class WebhookBatch:
+    """The coalesced changes of one connection, dispatched together"""
+
+    connection_id: str
+    updates: List[str] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    notifications: int = 0
+
+    def __len__(self) -> int:
+        return len(self.updates) + len(self.deletes)
+
+
+def _owner_gone(owner: str, process_id: str) -> bool:
+    """Whether items owned by ``owner`` were left behind by a process that no longer runs"""
+    if owner == process_id:
+        return False
+    try:
+        owner_host, owner_pid, _ = owner.rsplit(":", 2)
+        host, pid, _ = process_id.rsplit(":", 2)
+    except ValueError:
+        return True
+    if owner_host != host:
+        return False  # Another host sharing the volume: not ours to take
+    if owner_pid == pid:
+        return True  # Same pid with another process id is a previous run of this process
+    try:
+        os.kill(int(owner_pid), 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, ValueError):
+        return False
+    return False
+
+
+class WebhookBufferStore:
+    """Pending items per owning process in a JSON file, locked across processes"""
+
+    def __init__(self, path: str = CONNECTOR_WEBHOOK_BUFFER_FILE):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    @contextmanager
+    def locked(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f).get("owners", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logger.warning("Failed to read webhook buffer", path=self.path, error=str(e))
+            return {}
+
+    def _write(self, owners: Dict[str, List[Dict[str, Any]]]) -> None:
+        owners = {owner: items for owner, items in owners.items() if items}
+        if not owners:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"owners": owners}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def save(self, process_id: str, items: Iterable[PendingChange]) -> None:
+        with self.locked():
+            owners = self._read()
+            owners[process_id] = [asdict(item) for item in items]
+            self._write(owners)
+
+    def claim(self, process_id: str) -> List[PendingChange]:
+        """Take over the items of this process and of processes that are gone"""
+        with self.locked():
+            owners = self._read()
+            claimed = []
+            for owner in [o for o in owners if o == process_id or _owner_gone(o, process_id)]:
+                for data in owners.pop(owner):
+                    try:
+                        claimed.append(PendingChange(**data))
+                    except TypeError:
+                        logger.warning("Skipping unreadable webhook buffer item", owner=owner)
+            owners[process_id] = [asdict(item) for item in claimed]
+            self._write(owners)
+            return claimed
+
+
+class WebhookIntake:
+    """Keyed debounce buffer between webhook handlers and the task system"""
+
+    def __init__(
+        self,
+        dispatch: Callable[[WebhookBatch], Awaitable[Any]],
+        expand: Optional[Callable[[str, List[str]], Awaitable[List[str]]]] = None,
+        store: Optional[WebhookBufferStore] = None,
+        quiet_seconds: float = CONNECTOR_WEBHOOK_QUIET_SECONDS,
+        max_delay_seconds: float = CONNECTOR_WEBHOOK_MAX_DELAY_SECONDS,
+        clock: Callable[[], float] = time.time,
+        process_id: str = PROCESS_ID,
+    ):
+        self.dispatch = dispatch
+        self.expand = expand
+        self.store = store
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.clock = clock
+        self.process_id = process_id
+        self._pending: Dict[ItemKey, PendingChange] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._persist_task: Optional[asyncio.Task] = None
+        self._persist_dirty = False
+        self.stats = {"received": 0, "coalesced": 0, "dispatched": 0, "batches": 0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def pending_for(self, connection_id: str) -> List[PendingChange]:
+        return [item for (cid, _), item in self._pending.items() if cid == connection_id]
+
+    def _persist(self) -> None:
+        """Save the buffer off the event loop (coalesced with a write already in flight)"""
+        if self.store is None:
+            return
+        self._persist_dirty = True
+        if self._persist_task is not None and not self._persist_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._persist_dirty = False
+            self._save(list(self._pending.values()))
+            return
+        self._persist_task = loop.create_task(self._persist_pending())
+
+    async def _persist_pending(self) -> None:
+        while self._persist_dirty:
+            self._persist_dirty = False
+            # Copies, since the loop keeps updating the items while the thread writes
+            snapshot = [replace(item) for item in self._pending.values()]
+            await asyncio.to_thread(self._save, snapshot)
+
+    def _save(self, items: List[PendingChange]) -> None:
+        try:
+            self.store.save(self.process_id, items)
+        except Exception as e:
+            logger.warning("Failed to persist webhook buffer", error=str(e))
+
+    def _put(self, item: PendingChange) -> bool:
+        """Merge an item into the buffer; returns whether the buffer's items changed"""
+        key = (item.connection_id, item.file_id)
+        current = self._pending.get(key)
+        if current is None:
+            self._pending[key] = item
+            return True
+        changed = current.kind != item.kind
+        current.kind = item.kind  # Latest wins: a delete supersedes pending updates
+        current.first_seen = min(current.first_seen, item.first_seen)
+        current.last_seen = max(current.last_seen, item.last_seen)
+        current.notifications += item.notifications
+        return changed
+
+    def enqueue(self, connection_id: str, changes: Iterable[WebhookChange]) -> Dict[str, int]:
+        """Buffer the changes of one notification; returns received/coalesced/pending counts"""
+        now = self.clock()
+        received = coalesced = 0
+        changed = False
+        for change in changes:
+            received += 1
+            if (connection_id, change.file_id) in self._pending:
+                coalesced += 1
+            changed |= self._put(PendingChange(connection_id, change.file_id, change.kind, now, now))
+        self.stats["received"] += received
+        self.stats["coalesced"] += coalesced
+        # Timestamps alone are not persisted on every notification: after a restart
+        # the restored items are simply flushed a little early
+        if changed:
+            self._persist()
+        if received:
+            self._schedule()
+        return {"received": received, "coalesced": coalesced, "pending": len(self.pending_for(connection_id))}
+
+    def _due_at(self, items: List[PendingChange]) -> float:
+        return min(
+            max(item.last_seen for item in items) + self.quiet_seconds,
+            min(item.first_seen for item in items) + self.max_delay_seconds,
+        )
+
+    def _by_connection(self) -> Dict[str, List[PendingChange]]:
+        connections = defaultdict(list)
+        for item in self._pending.values():
+            connections[item.connection_id].append(item)
+        return connections
+
+    def ready_connections(self) -> List[str]:
+        now = self.clock()
+        return [cid for cid, items in self._by_connection().items() if self._due_at(items) <= now]
+
+    def _schedule(self, delay: Optional[float] = None) -> None:
+        if self._flush_handle is not None or not self._pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if delay is None:
+            due = min(self._due_at(items) for items in self._by_connection().values())
+            delay = max(0.0, due - self.clock())
+        self._flush_handle = loop.call_later(delay, self._run_scheduled_flush, loop)
+
+    def _run_scheduled_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._flush_handle = None
+        # Keep a reference so the flush task is not garbage collected mid-dispatch
+        self._flush_task = loop.create_task(self._timer_flush())
+
+    async def _timer_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Webhook buffer flush failed", error=str(e))
+        self._schedule()
+
+    async def _expand_folders(self, connection_id: str, items: Dict[str, PendingChange]) -> None:
+        """Replace folder items with update items for their files not already pending"""
+        folders = [file_id for file_id, item in items.items() if item.kind == CHANGE_FOLDER]
+        if not folders:
+            return
+        if self.expand is None:
+            # Let the sync expand them
+            for file_id in folders:
+                items[file_id].kind = CHANGE_UPDATE
+            return
+        try:
+            children = await self.expand(connection_id, folders)
+        except Exception as e:
+            logger.warning("Failed to expand webhook folders, syncing them as given", connection_id=connection_id, error=str(e))
+            for file_id in folders:
+                items[file_id].kind = CHANGE_UPDATE
+            return
+        notifications = sum(items.pop(file_id).notifications for file_id in folders)
+        now = self.clock()
+        for child in dict.fromkeys(children):
+            if child not in items:
+                items[child] = PendingChange(connection_id, child, CHANGE_UPDATE, now, now, 0)
+        logger.debug(
+            "Expanded webhook folders",
+            connection_id=connection_id,
+            folders=len(folders),
+            files=len(children),
+            notifications=notifications,
+        )
+
+    async def _flush_connection(self, connection_id: str) -> int:
+        items = {
+            file_id: self._pending.pop((cid, file_id))
+            for cid, file_id in list(self._pending)
+            if cid == connection_id
+        }
+        await self._expand_folders(connection_id, items)
+        batch = WebhookBatch(
+            connection_id,
+            updates=[file_id for file_id, item in items.items() if item.kind == CHANGE_UPDATE],
+            deletes=[file_id for file_id, item in items.items() if item.kind == CHANGE_DELETE],
+            notifications=sum(item.notifications for item in items.values()),
+        )
+        try:
+            result = await self.dispatch(batch)
+        except Exception as e:
+            # Keep the items; changes received meanwhile are newer and win
+            for item in items.values():
+                key = (connection_id, item.file_id)
+                if key in self._pending:
+                    newer = self._pending.pop(key)
+                    self._pending[key] = item
+                    self._put(newer)
+                else:
+                    self._pending[key] = item
+            # Retry after another quiet period rather than on the next timer tick
+            now = self.clock()
+            for item in self.pending_for(connection_id):
+                item.last_seen = now
+            logger.error("Failed to dispatch webhook batch", connection_id=connection_id, error=str(e))
+            return 0
+        self.stats["dispatched"] += len(batch)
+        self.stats["batches"] += 1
+        logger.info(
+            "Dispatched coalesced webhook changes",
+            connection_id=connection_id,
+            notifications=batch.notifications,
+            updates=len(batch.updates),
+            deletes=len(batch.deletes),
+            result=result,
+        )
+        return len(batch)
+
+    async def flush(self, force: bool = False) -> int:
+        """Dispatch every ready connection (every connection with ``force``); returns items dispatched"""
+        async with self._flush_lock:
+            connections = list(self._by_connection()) if force else self.ready_connections()
+            if not connections:
+                return 0
+            dispatched = 0
+            for connection_id in connections:
+                dispatched += await self._flush_connection(connection_id)
+            self._persist()
+            return dispatched
+
+    async def start(self) -> int:
+        """Restore items left in the buffer file by a previous run; returns how many"""
+        if self.store is not None:
+            try:
+                for item in await asyncio.to_thread(self.store.claim, self.process_id):
+                    self._put(item)
+            except Exception as e:
+                logger.warning("Failed to restore webhook buffer", error=str(e))
+        if self._pending:
+            logger.info("Restored pending webhook changes", pending=len(self._pending))
+            self._schedule()
+        return len(self._pending)
+
+    async def stop(self) -> None:
+        """Stop the flush timer; pending items stay in the buffer file for the next run"""
+        if self._flush_task is not None:
+            # A dispatch in flight finishes (and may re-arm the timer) before the timer is cancelled
+            await self._flush_task
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._persist_task is not None:
+            await self._persist_task
+
+
+class ConnectorWebhookDispatcher:
+    """Expands folders through the connector and hands batches to the connector service"""
+
+    def __init__(self, connector_service, session_manager):
+        self.connector_service = connector_service
+        self.session_manager = session_manager
+
+    async def expand(self, connection_id: str, folder_ids: List[str]) -> List[str]:
+        """Files inside the folders (the folder IDs themselves if the connector cannot list them)"""
+        connector = await self.connector_service.get_connector(connection_id)
+        cfg = getattr(connector, "cfg", None)
+        if cfg is None:
+            return list(folder_ids)
+        # Same selection override as sync_specific_files: list_files() expands cfg.file_ids
+        original_file_ids = getattr(cfg, "file_ids", None)
+        original_folder_ids = getattr(cfg, "folder_ids", None)
+        try:
+            cfg.file_ids = list(folder_ids)
+            cfg.folder_ids = None
+            result = await connector.list_files()
+        finally:
+            cfg.file_ids = original_file_ids
+            cfg.folder_ids = original_folder_ids
+        return [f["id"] for f in result.get("files", [])]
+
+    async def dispatch(self, batch: WebhookBatch) -> Optional[str]:
+        """Delete removed files from the index and start one sync task for the updated ones"""
+        from config.settings import get_index_name
+        from utils.opensearch_queries import build_document_ids_delete_body
+
+        connection = await self.connector_service.connection_manager.get_connection(batch.connection_id)
+        if connection is None or not connection.is_active:
+            logger.info("Dropping webhook batch for inactive connection", connection_id=batch.connection_id)
+            return None
+
+        # JWT for OpenSearch authentication of the connection's user
+        user = self.session_manager.get_user(connection.user_id)
+        jwt_token = self.session_manager.create_jwt_token(user) if user else None
+
+        if batch.deletes:
+            opensearch_client = self.session_manager.get_user_opensearch_client(connection.user_id, jwt_token)
+            result = await opensearch_client.delete_by_query(
+                index=get_index_name(), body=build_document_ids_delete_body(batch.deletes)
+            )
+            logger.info(
+                "Deleted chunks of files removed at the source",
+                connection_id=batch.connection_id,
+                files=len(batch.deletes),
+                deleted_chunks=result.get("deleted", 0),
+            )
+
+        if not batch.updates:
+            return None
+        return await self.connector_service.sync_specific_files(
+            batch.connection_id,
+            connection.user_id,
+            batch.updates,
+            jwt_token=jwt_token,
+        )
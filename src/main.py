@@ -1,10 +1,16 @@
 
 
+# STARTUP_PROFILE=true の場合、以降のモジュールごとのインポート時間を計測する
+from utils.startup_profile import get_startup_profile, install_import_profiler, log_startup_profile  # isort: skip
+install_import_profiler()
+
 # 構造化ログを早期に設定する
 from connectors.langflow_connector_service import LangflowConnectorService
+from connectors.webhook_intake import ConnectorWebhookDispatcher, WebhookBufferStore, WebhookIntake
 from connectors.service import ConnectorService
 from services.flows_service import FlowsService
 from utils.container_utils import detect_container_environment
+from utils.embedding_fields import invalidate_embedding_field_cache
 from utils.embeddings import create_dynamic_index_body
 from utils.logging_config import configure_from_env, get_logger
 from utils.telemetry import TelemetryClient, Category, MessageId
@@ -23,14 +29,16 @@ from functools import partial
 
 from starlette.applications import Starlette
 from starlette.routing import Route
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
 # CUDA との互換性を確保するためマルチプロセス起動方式を 'spawn' に設定する
 multiprocessing.set_start_method("spawn", force=True)
 
-# torch/CUDA インポートより前にプロセスプールを作成する
+# プロセスプールは初回使用時に作成される（torch / docling 等の重い依存も utils.subsystems で遅延読み込みする）
 from utils.process_pool import process_pool  # isort: skip
-import torch
+from utils.subsystems import PRELOAD_SUBSYSTEMS, get_readiness, subsystems
+from utils.http_clients import close_http_clients
+from utils.metrics import METRICS_ENABLED, render_metrics
 
 # API エンドポイント
 from api import (
@@ -56,11 +64,16 @@ from api import (
 # 既存のサービス
 from api.connector_router import ConnectorRouter
 from auth_middleware import optional_auth, require_auth
+from metrics_middleware import MetricsMiddleware
 
 # API キー認証
 from api_key_middleware import require_api_key
 from services.api_key_service import APIKeyService
+from services.reembedding_service import ReembeddingService
+from services.index_layout_service import IndexLayoutService, install_index_templates
 from api import keys as api_keys
+from api import reembedding as api_reembedding
+from api import index_layout as api_index_layout
 from api.v1 import chat as v1_chat, search as v1_search, documents as v1_documents, settings as v1_settings, models as v1_models, knowledge_filters as v1_knowledge_filters
 from api.watson_news import routes as watson_news_routes
 
@@ -92,18 +105,23 @@ from services.langflow_file_service import LangflowFileService
 from services.models_service import ModelsService
 from services.monitor_service import MonitorService
 from services.search_service import SearchService
+from services.shared_state import (
+    BACKEND_WORKERS,
+    SERVER_ROLE,
+    SERVER_ROLES,
+    LeaderElector,
+    get_shared_state,
+    is_multi_worker,
+)
 from services.task_service import TaskService
 from session_manager import SessionManager
 
-logger.info(
-    "CUDA デバイス情報",
-    cuda_available=torch.cuda.is_available(),
-    cuda_version=torch.version.cuda,
-)
-
 # 起動時の取り込み対象から除外するファイル名
 EXCLUDED_INGESTION_FILES = {"warmup_ocr.pdf"}
 
+# 起動後この秒数以内に終了したワーカーは、この秒数待ってから再起動する
+WORKER_RESTART_BACKOFF_SECONDS = 5.0
+
 
 async def wait_for_opensearch():
     """OpenSearch が準備完了になるまでリトライしながら待機する。"""
@@ -164,6 +182,7 @@ async def _ensure_opensearch_index():
 
         # ハードコードされた INDEX_BODY でインデックスを作成する（OpenAI エンベディング次元数を使用）
         await clients.opensearch.indices.create(index=index_name, body=INDEX_BODY)
+        invalidate_embedding_field_cache(index_name)
         logger.info(
             "従来のコネクターサービス用 OpenSearch インデックスを作成しました",
             index_name=index_name,
@@ -189,6 +208,10 @@ async def init_index():
     try:
         await wait_for_opensearch()
 
+        # シャード数・レプリカ数・リフレッシュ間隔を決めるインデックステンプレートを先に登録する
+        # （インデックス名が変更されている場合もテンプレートのパターンを更新する）
+        await install_index_templates()
+
         # ユーザー設定から設定済みのエンベディングモデルを取得する
         config = get_openrag_config()
         embedding_model = config.knowledge.embedding_model
@@ -205,6 +228,8 @@ async def init_index():
 
         # ドキュメントインデックスを作成する
         index_name = get_index_name()
+        # インデックスが削除・再作成されている可能性があるため、既知のエンベディングフィールドを破棄する
+        invalidate_embedding_field_cache(index_name)
         if not await clients.opensearch.indices.exists(index=index_name):
             await clients.opensearch.indices.create(
                 index=index_name, body=dynamic_index_body
@@ -466,6 +491,22 @@ async def health_check(request):
     return JSONResponse({"status": "ok"}, status_code=200)
 
 
+async def subsystems_health(request):
+    """遅延読み込みされるサブシステムごとの準備状況（STARTUP_PROFILE 有効時はインポートプロファイルも）を返す。"""
+    body = {"subsystems": get_readiness()}
+    profile = get_startup_profile()
+    if profile is not None:
+        body["startup_profile"] = profile
+    return JSONResponse(body, status_code=200)
+
+
+async def metrics_endpoint(request):
+    """Prometheus テキスト形式でレイテンシメトリクスを返す（METRICS_ENABLED=false の場合は 404）。"""
+    if not METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 async def opensearch_health_ready(request):
     """準備完了プローブ: OpenSearch 依存サービスへの接続を確認する。"""
     try:
@@ -562,6 +603,12 @@ async def _update_mcp_servers_with_provider_credentials(services):
         # MCP の更新が失敗してもサーバー起動を妨げない
 
 
+def is_leader(services) -> bool:
+    """シングルトンジョブを実行するワーカーか（シングルワーカー構成では常に True）。"""
+    elector = services.get("leader_elector")
+    return elector is None or elector.is_leader
+
+
 async def startup_tasks(services):
     """起動時タスクを実行する。"""
     logger.info("起動時タスクを開始します")
@@ -570,6 +617,12 @@ async def startup_tasks(services):
     # インデックスはエンベディングモデルが確定するオンボーディング後に作成する
     await wait_for_opensearch()
 
+    # 以降に作成されるインデックス（Watson News を含む）に適用されるようレイアウトテンプレートを登録する
+    try:
+        await services["index_layout_service"].install_templates()
+    except Exception as e:
+        logger.error("インデックスレイアウトテンプレートの登録に失敗しました", error=str(e))
+
     if DISABLE_INGEST_WITH_LANGFLOW:
         await _ensure_opensearch_index()
 
@@ -600,6 +653,14 @@ async def startup_tasks(services):
         )
         raise
 
+    # ナレッジフィルターのサブスクリプションを読み込み、取り込み時のプロセス内照合を有効にする
+    try:
+        from services.knowledge_filter_matcher import knowledge_filter_matcher
+        subscription_count = await knowledge_filter_matcher.load(clients.opensearch)
+        logger.info("ナレッジフィルターのサブスクリプションを読み込みました", subscriptions=subscription_count)
+    except Exception as e:
+        logger.warning("ナレッジフィルターのサブスクリプションの読み込みに失敗しました", error=str(e))
+
     # アラートセキュリティを設定する
     await configure_alerting_security()
 
@@ -609,7 +670,9 @@ async def startup_tasks(services):
     # フローがリセットされているか確認し、設定が編集済みであれば再適用する
     try:
         config = get_openrag_config()
-        if config.edited:
+        if not is_leader(services):
+            logger.debug("リーダーワーカーではないため、フローリセット確認をスキップします")
+        elif config.edited:
             logger.info("Langflow フローがリセットされていないか確認します")
             flows_service = services["flows_service"]
             reset_flows = await flows_service.check_flows_reset()
@@ -632,9 +695,11 @@ async def startup_tasks(services):
         await TelemetryClient.send_event(Category.FLOW_OPERATIONS, MessageId.ORB_FLOW_RESET_CHECK_FAIL)
         # この確認が失敗してもサーバー起動を妨げない
 
-    # Watson News OpenSearch インデックスを初期化する（ノンブロッキング）
+    # Watson News 共有 OpenSearch クライアントの接続を温め、インデックスを初期化する（ノンブロッキング）
     try:
+        from connectors.watson_news.opensearch_client import start_opensearch
         from services.watson_news_service import ensure_indices
+        await start_opensearch()
         await ensure_indices()
         logger.info("Watson News OpenSearch インデックスを確認しました")
     except Exception as exc:
@@ -661,7 +726,15 @@ async def initialize_services():
     # 各サービスを初期化する
     document_service = DocumentService(session_manager=session_manager)
     search_service = SearchService(session_manager)
-    task_service = TaskService(document_service, process_pool, ingestion_timeout=INGESTION_TIMEOUT)
+    # インデックスのレイアウトプロファイル（テンプレート、大量取り込み時のバルクロードモード、ドリフト検出）
+    index_layout_service = IndexLayoutService()
+    task_service = TaskService(
+        document_service,
+        process_pool,
+        ingestion_timeout=INGESTION_TIMEOUT,
+        shared_state=get_shared_state(),
+        index_layout=index_layout_service,
+    )
     chat_service = ChatService()
     flows_service = FlowsService()
     knowledge_filter_service = KnowledgeFilterService(session_manager)
@@ -720,6 +793,14 @@ async def initialize_services():
     else:
         logger.info("[コネクター] 認証なしモードのため接続読み込みをスキップします")
 
+    # Webhook 通知をファイル単位で集約し、接続ごとに 1 つの同期タスクとして投入する
+    webhook_dispatcher = ConnectorWebhookDispatcher(connector_service, session_manager)
+    webhook_intake = WebhookIntake(
+        webhook_dispatcher.dispatch,
+        expand=webhook_dispatcher.expand,
+        store=WebhookBufferStore(),
+    )
+
     await TelemetryClient.send_event(Category.SERVICE_INITIALIZATION, MessageId.ORB_SVC_INIT_SUCCESS)
 
     langflow_file_service = LangflowFileService()
@@ -727,6 +808,23 @@ async def initialize_services():
     # パブリック API 認証用の API キーサービス
     api_key_service = APIKeyService(session_manager)
 
+    # 埋め込みモデル切り替え時にインデックスをバックグラウンドで再埋め込みするサービス
+    reembedding_service = ReembeddingService(
+        task_service=task_service,
+        shared_state=get_shared_state(),
+    )
+
+    # マルチワーカー構成では、スケジューラー等のシングルトンジョブを実行するリーダーを選出する
+    leader_elector = None
+    if is_multi_worker():
+        if SERVER_ROLE not in SERVER_ROLES:
+            logger.warning("不明な SERVER_ROLE です。all として扱います", server_role=SERVER_ROLE)
+        leader_elector = LeaderElector(
+            "backend-leader",
+            get_shared_state(),
+            candidate=SERVER_ROLE != "api",
+        )
+
     return {
         "document_service": document_service,
         "search_service": search_service,
@@ -736,11 +834,15 @@ async def initialize_services():
         "langflow_file_service": langflow_file_service,
         "auth_service": auth_service,
         "connector_service": connector_service,
+        "webhook_intake": webhook_intake,
         "knowledge_filter_service": knowledge_filter_service,
         "models_service": models_service,
         "monitor_service": monitor_service,
         "session_manager": session_manager,
         "api_key_service": api_key_service,
+        "reembedding_service": reembedding_service,
+        "index_layout_service": index_layout_service,
+        "leader_elector": leader_elector,
     }
 
 
@@ -947,7 +1049,6 @@ async def create_app():
                 partial(
                     knowledge_filter.subscribe_to_knowledge_filter,
                     knowledge_filter_service=services["knowledge_filter_service"],
-                    monitor_service=services["monitor_service"],
                     session_manager=services["session_manager"],
                 )
             ),
@@ -1160,6 +1261,7 @@ async def create_app():
                 connectors.connector_webhook,
                 connector_service=services["connector_service"],
                 session_manager=services["session_manager"],
+                webhook_intake=services["webhook_intake"],
             ),
             methods=["POST", "GET"],
         ),
@@ -1250,6 +1352,17 @@ async def create_app():
             opensearch_health_ready,
             methods=["GET"],
         ),
+        Route(
+            "/health/subsystems",
+            subsystems_health,
+            methods=["GET"],
+        ),
+        # Prometheus メトリクスエンドポイント
+        Route(
+            "/metrics",
+            metrics_endpoint,
+            methods=["GET"],
+        ),
         # モデルエンドポイント
         Route(
             "/models/openai",
@@ -1412,6 +1525,68 @@ async def create_app():
             ),
             methods=["DELETE"],
         ),
+        # ===== 再埋め込みエンドポイント =====
+        Route(
+            "/reembedding",
+            require_auth(services["session_manager"])(
+                partial(
+                    api_reembedding.progress_endpoint,
+                    reembedding_service=services["reembedding_service"],
+                )
+            ),
+            methods=["GET"],
+        ),
+        Route(
+            "/reembedding/start",
+            require_auth(services["session_manager"])(
+                partial(
+                    api_reembedding.start_endpoint,
+                    reembedding_service=services["reembedding_service"],
+                )
+            ),
+            methods=["POST"],
+        ),
+        Route(
+            "/reembedding/pause",
+            require_auth(services["session_manager"])(
+                partial(
+                    api_reembedding.pause_endpoint,
+                    reembedding_service=services["reembedding_service"],
+                )
+            ),
+            methods=["POST"],
+        ),
+        Route(
+            "/reembedding/resume",
+            require_auth(services["session_manager"])(
+                partial(
+                    api_reembedding.resume_endpoint,
+                    reembedding_service=services["reembedding_service"],
+                )
+            ),
+            methods=["POST"],
+        ),
+        Route(
+            "/reembedding/cancel",
+            require_auth(services["session_manager"])(
+                partial(
+                    api_reembedding.cancel_endpoint,
+                    reembedding_service=services["reembedding_service"],
+                )
+            ),
+            methods=["POST"],
+        ),
+        # インデックスレイアウト（プロファイルとの差分）エンドポイント
+        Route(
+            "/index-layout",
+            require_auth(services["session_manager"])(
+                partial(
+                    api_index_layout.layout_endpoint,
+                    index_layout_service=services["index_layout_service"],
+                )
+            ),
+            methods=["GET"],
+        ),
         # ===== パブリック API v1 エンドポイント（API キー認証） =====
         # チャットエンドポイント
         Route(
@@ -1484,6 +1659,17 @@ async def create_app():
             ),
             methods=["POST"],
         ),
+        Route(
+            "/v1/tasks/status",
+            require_api_key(services["api_key_service"])(
+                partial(
+                    v1_documents.task_statuses_endpoint,
+                    task_service=services["task_service"],
+                    session_manager=services["session_manager"],
+                )
+            ),
+            methods=["POST"],
+        ),
         Route(
             "/v1/tasks/{task_id}",
             require_api_key(services["api_key_service"])(
@@ -1643,6 +1829,8 @@ async def create_app():
         app_env="development" if debug_mode else "production",
     )
     app = Starlette(debug=debug_mode, routes=routes)
+    # ルートテンプレートごとのリクエストレイテンシを記録する（TIMING_HEADER 有効時は Server-Timing ヘッダーも付与する）
+    app.add_middleware(MetricsMiddleware, routes=routes)
     app.state.services = services  # クリーンアップ用にサービスを保存する
     app.state.background_tasks = set()
 
@@ -1650,23 +1838,13 @@ async def create_app():
     @app.on_event("startup")
     async def startup_event():
         await TelemetryClient.send_event(Category.APPLICATION_STARTUP, MessageId.ORB_APP_STARTED)
-        # OIDC エンドポイントをブロックしないようインデックス初期化をバックグラウンドで開始する
-        t1 = asyncio.create_task(startup_tasks(services))
-        app.state.background_tasks.add(t1)
-        t1.add_done_callback(app.state.background_tasks.discard)
-
         # 定期タスククリーンアップスケジューラーを開始する
         services["task_service"].start_cleanup_scheduler()
+        # セッション所有権をリクエスト受付前にスレッドで読み込み、初回アクセス時の同期 I/O を避ける
+        from services.session_ownership_service import session_ownership_service
+        await session_ownership_service.preload()
 
-        # Watson News ETL スケジューラーを開始する
-        try:
-            from connectors.watson_news.scheduler import start_scheduler
-            start_scheduler()
-            logger.info("Watson News ETL スケジューラーを開始しました")
-        except Exception as exc:
-            logger.warning("Watson News スケジューラーを開始できませんでした（致命的ではありません）", error=str(exc))
-
-        # 定期フローバックアップタスクを開始する（5分間隔）
+        # 定期フローバックアップタスク（5分間隔）
         async def periodic_backup():
             """15分間隔で実行される定期バックアップタスク。"""
             while True:
@@ -1701,25 +1879,136 @@ async def create_app():
                     logger.error(f"定期バックアップタスクでエラーが発生しました: {str(e)}")
                     # バックアップが失敗しても実行を継続する
 
-        backup_task = asyncio.create_task(periodic_backup())
-        app.state.background_tasks.add(backup_task)
-        backup_task.add_done_callback(app.state.background_tasks.discard)
+        leader_tasks = set()
+
+        async def start_leader_jobs():
+            """リーダーワーカーだけが実行するスケジューラーと定期タスクを開始する。"""
+            # Watson News ETL スケジューラーを開始する
+            try:
+                from connectors.watson_news.scheduler import start_scheduler
+                start_scheduler()
+                logger.info("Watson News ETL スケジューラーを開始しました")
+            except Exception as exc:
+                logger.warning("Watson News スケジューラーを開始できませんでした（致命的ではありません）", error=str(exc))
+
+            backup_task = asyncio.create_task(periodic_backup())
+            leader_tasks.add(backup_task)
+            app.state.background_tasks.add(backup_task)
+            backup_task.add_done_callback(app.state.background_tasks.discard)
+            backup_task.add_done_callback(leader_tasks.discard)
+
+            # 再起動前に実行中だった再埋め込みジョブをチェックポイントから再開する
+            resume_task = asyncio.create_task(services["reembedding_service"].resume_interrupted())
+            app.state.background_tasks.add(resume_task)
+            resume_task.add_done_callback(app.state.background_tasks.discard)
+
+            # 中断したバルクロードが残したインデックス設定を元に戻す（定期実行）
+            recovery_task = asyncio.create_task(services["index_layout_service"].run_recovery())
+            leader_tasks.add(recovery_task)
+            app.state.background_tasks.add(recovery_task)
+            recovery_task.add_done_callback(app.state.background_tasks.discard)
+            recovery_task.add_done_callback(leader_tasks.discard)
+
+            # TTL を過ぎた会話スレッドを会話ストアから削除する（定期実行）
+            from agent import active_conversations
+            prune_task = asyncio.create_task(active_conversations.run_pruning())
+            leader_tasks.add(prune_task)
+            app.state.background_tasks.add(prune_task)
+            prune_task.add_done_callback(app.state.background_tasks.discard)
+            prune_task.add_done_callback(leader_tasks.discard)
+
+        async def stop_leader_jobs():
+            """リーダー権を失ったときにシングルトンジョブを停止する。"""
+            from connectors.watson_news.scheduler import stop_scheduler
+            stop_scheduler()
+            for task in list(leader_tasks):
+                task.cancel()
+            await services["reembedding_service"].shutdown()
+
+        elector = services.get("leader_elector")
+        if elector is None:
+            await start_leader_jobs()
+        else:
+            elector.on_elected = start_leader_jobs
+            elector.on_demoted = stop_leader_jobs
+            # 起動時タスクがリーダーかどうかを参照できるよう、最初の選出を先に行う
+            await elector.elect()
+            elector.start()
+            logger.info(
+                "マルチワーカーモードで起動しました",
+                server_role=SERVER_ROLE,
+                is_leader=elector.is_leader,
+            )
+
+        # OIDC エンドポイントをブロックしないようインデックス初期化をバックグラウンドで開始する
+        t1 = asyncio.create_task(startup_tasks(services))
+        app.state.background_tasks.add(t1)
+        t1.add_done_callback(app.state.background_tasks.discard)
+
+        # 他のワーカーで作成されたサブスクリプションを取り込むため、各ワーカーで定期的に再読み込みする
+        from services.knowledge_filter_matcher import knowledge_filter_matcher
+        t3 = asyncio.create_task(knowledge_filter_matcher.run_reload(clients.opensearch))
+        app.state.background_tasks.add(t3)
+        t3.add_done_callback(app.state.background_tasks.discard)
+
+        # 前回の実行で未処理のまま残った Webhook 変更を復元する
+        await services["webhook_intake"].start()
+
+        # 重いサブシステム（docling など）はリクエスト処理を妨げないようバックグラウンドで事前読み込みする
+        if PRELOAD_SUBSYSTEMS:
+            t2 = asyncio.create_task(subsystems.preload(PRELOAD_SUBSYSTEMS))
+            app.state.background_tasks.add(t2)
+            t2.add_done_callback(app.state.background_tasks.discard)
+
+        log_startup_profile()
 
     # シャットダウンイベントハンドラーを追加する
     @app.on_event("shutdown")
     async def shutdown_event():
         await TelemetryClient.send_event(Category.APPLICATION_SHUTDOWN, MessageId.ORB_APP_SHUTDOWN)
         await cleanup_subscriptions_proper(services)
+        # Webhook 集約のタイマーを止める（未処理の変更はファイルに残り、次回起動時に復元される）
+        await services["webhook_intake"].stop()
+        # 再埋め込みジョブを停止する（状態は running のまま残し、次回起動時に再開する）
+        await services["reembedding_service"].shutdown()
         # タスクサービスをクリーンアップする（バックグラウンドタスクとプロセスプールをキャンセル）
         await services["task_service"].shutdown()
+        # 会話メタデータとセッション所有権の未書き込み分をフラッシュする
+        try:
+            from services.conversation_persistence_service import conversation_persistence
+            from services.session_ownership_service import session_ownership_service
+            await conversation_persistence.flush()
+            session_ownership_service.flush()
+        except Exception as e:
+            logger.warning("会話ストアのフラッシュに失敗しました", error=str(e))
+        # 取り込み結果の読み戻しを止め、集約中のナレッジフィルター通知を配信する
+        try:
+            from services.knowledge_filter_matcher import knowledge_filter_matcher
+            await knowledge_filter_matcher.close()
+        except Exception as e:
+            logger.warning("ナレッジフィルター通知の配信に失敗しました", error=str(e))
+        # API キーの last_used_at の未書き込み分をフラッシュする
+        try:
+            await services["api_key_service"].flush_last_used()
+        except Exception as e:
+            logger.warning("API キー使用日時のフラッシュに失敗しました", error=str(e))
+        # リーダー権を解放し、他のワーカーがすぐに引き継げるようにする
+        if services.get("leader_elector") is not None:
+            await services["leader_elector"].stop()
         # Watson News ETL スケジューラーを停止する
         try:
             from connectors.watson_news.scheduler import stop_scheduler
+            from connectors.watson_news.html_extractor import shutdown_pool
+            from connectors.watson_news.opensearch_client import close_opensearch
             stop_scheduler()
+            shutdown_pool()
+            await close_opensearch()
         except Exception:
             pass
         # 非同期クライアントをクリーンアップする
         await clients.cleanup()
+        # 外部プロバイダー呼び出し用の共有 HTTP クライアントを閉じる
+        await close_http_clients()
         # テレメトリクライアントをクリーンアップする
         from utils.telemetry.client import cleanup_telemetry_client
         await cleanup_telemetry_client()
@@ -1781,10 +2070,10 @@ async def cleanup_subscriptions_proper(services):
         logger.error("サブスクリプションのクリーンアップに失敗しました", error=str(e))
 
 
-if __name__ == "__main__":
+def _run_server(sockets=None):
+    """アプリケーションを作成して uvicorn で提供する（マルチワーカー構成では各ワーカープロセスで実行）。"""
     import uvicorn
 
-    # TUI チェックはファイル先頭で処理済み
     # クリーンアップ関数を登録する
     atexit.register(cleanup)
 
@@ -1795,11 +2084,78 @@ if __name__ == "__main__":
     access_log = os.getenv("ACCESS_LOG", "true").lower() == "true"
 
     # サーバーを起動する（起動タスクは Starlette の startup イベントで処理される）
-    uvicorn.run(
+    config = uvicorn.Config(
         app,
-        workers=1,
         host="0.0.0.0",
         port=8000,
         reload=False,  # main から実行するためリロードを無効化する
         access_log=access_log,
     )
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+def _run_workers(worker_count: int):
+    """共有ソケットで待ち受ける API ワーカープロセスを起動し、終了まで監視する。
+
+    異常終了したワーカーは再起動する。SIGTERM / SIGINT を受けると全ワーカーを停止する。
+    """
+    import signal
+    import socket
+    import time
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("0.0.0.0", 8000))
+    sock.set_inheritable(True)
+
+    from multiprocessing.connection import wait
+
+    context = multiprocessing.get_context("spawn")
+
+    def _start(i):
+        worker = context.Process(target=_run_server, kwargs={"sockets": [sock]}, name=f"openrag-worker-{i}")
+        worker.start()
+        return worker, time.monotonic()
+
+    workers = [_start(i) for i in range(worker_count)]
+    logger.info("API ワーカープロセスを起動しました", workers=worker_count, server_role=SERVER_ROLE)
+    stopping = False
+
+    def _terminate(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for worker, _started_at in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    signal.signal(signal.SIGTERM, _terminate)
+    signal.signal(signal.SIGINT, _terminate)
+
+    # 異常終了したワーカーは再起動する（起動直後の終了が続く場合は間隔を空ける）
+    while not stopping:
+        wait([worker.sentinel for worker, _started_at in workers], timeout=1.0)
+        for i, (worker, started_at) in enumerate(workers):
+            if stopping or worker.is_alive():
+                continue
+            logger.warning(
+                "API ワーカープロセスが終了したため再起動します",
+                worker=worker.name,
+                exitcode=worker.exitcode,
+            )
+            if time.monotonic() - started_at < WORKER_RESTART_BACKOFF_SECONDS:
+                time.sleep(WORKER_RESTART_BACKOFF_SECONDS)
+            if not stopping:
+                workers[i] = _start(i)
+
+    for worker, _started_at in workers:
+        worker.join()
+    sock.close()
+
+
+if __name__ == "__main__":
+    # TUI チェックはファイル先頭で処理済み
+    if BACKEND_WORKERS > 1:
+        # 状態は SHARED_STATE_DB_FILE で共有し、スケジューラーはリーダーワーカーのみが実行する
+        _run_workers(BACKEND_WORKERS)
+    else:
+        _run_server()
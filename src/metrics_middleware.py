@@ -0,0 +1,67 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+from utils.metrics import (
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    TIMING_HEADER,
+    server_timing_header,
+    start_request_timings,
+)
+
+# Not recorded, so scrapes and probes do not dominate the latency histograms
+EXCLUDED_PATHS = {"/metrics", "/health"}
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route template
+
+    Implemented as plain ASGI (not BaseHTTPMiddleware) so streamed responses pass
+    through untouched and are timed until their last chunk.
+    """
+
+    def __init__(self, app, routes=(), timing_header: bool = TIMING_HEADER):
+        self.app = app
+        self.routes = list(routes)
+        self.timing_header = timing_header
+
+    def _route_template(self, scope) -> str:
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.timing_header:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        server_timing_header(timings, time.perf_counter() - started),
+                    )
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=self._route_template(scope),
+                status=str(status["code"]),
+            )
@@ -1,6 +1,7 @@
 from typing import Any
 from .tasks import UploadTask, FileTask
 from utils.logging_config import get_logger
+from utils.metrics import EMBEDDING_SECONDS, timed
 from utils.file_utils import get_file_extension, clean_connector_filename
 
 logger = get_logger(__name__)
@@ -173,8 +174,9 @@ class TaskProcessor:
         import datetime
         from config.settings import clients, get_embedding_model, get_index_name
         from services.document_service import chunk_texts_for_embeddings
-        from utils.document_processing import extract_relevant
-        from utils.embedding_fields import get_embedding_field_name, ensure_embedding_field_exists
+        from utils.document_processing import convert_and_extract
+        from utils.embedding_fields import ensure_embedding_field_exists
+        from utils.vector_profiles import get_vector_codec, get_vector_profile
 
         # Use provided embedding model or fall back to default
         embedding_model = embedding_model or get_embedding_model()
@@ -188,9 +190,10 @@ class TaskProcessor:
         if await self.check_document_exists(file_hash, opensearch_client):
             return {"status": "unchanged", "id": file_hash}
 
-        # Ensure the embedding field exists for this model
+        # Ensure the embedding field for this model and vector profile exists
+        vector_profile = get_vector_profile(embedding_model)
         embedding_field_name = await ensure_embedding_field_exists(
-            opensearch_client, embedding_model, get_index_name()
+            opensearch_client, embedding_model, get_index_name(), profile=vector_profile
         )
 
         logger.info(
@@ -218,9 +221,8 @@ class TaskProcessor:
                 slim_doc["filename"] = original_filename
         else:
             # Convert and extract using docling for other file types
-            result = clients.converter.convert(file_path)
-            full_doc = result.document.export_to_dict()
-            slim_doc = extract_relevant(full_doc)
+            # (cached by content hash, so re-ingesting the same bytes skips docling)
+            slim_doc = convert_and_extract(await clients.get_converter(), file_path, file_hash, source_label="file")
 
         texts = [c["text"] for c in slim_doc["chunks"]]
 
@@ -229,12 +231,22 @@ class TaskProcessor:
         embeddings = []
 
         for batch in text_batches:
-            resp = await clients.patched_embedding_client.embeddings.create(
-                model=embedding_model, input=batch
-            )
+            with timed(EMBEDDING_SECONDS, model=embedding_model, purpose="ingest"):
+                resp = await clients.patched_embedding_client.embeddings.create(
+                    model=embedding_model, input=batch
+                )
             embeddings.extend([d.embedding for d in resp.data])
 
+        # Encode vectors for the field's storage profile (truncation / quantization);
+        # the first document written to an int8 field calibrates its range
+        if embeddings:
+            codec = await get_vector_codec(
+                opensearch_client, get_index_name(), embedding_field_name, vector_profile, sample=embeddings
+            )
+            embeddings = codec.encode(embeddings)
+
         # Index each chunk as a separate document
+        indexed_chunks = []
         for i, (chunk, vect) in enumerate(zip(slim_doc["chunks"], embeddings)):
             chunk_doc = {
                 "document_id": file_hash,
@@ -289,6 +301,15 @@ class TaskProcessor:
                 )
                 logger.error("Chunk document details", chunk_doc=chunk_doc)
                 raise
+            indexed_chunks.append((chunk_id, chunk_doc))
+
+        # Notify knowledge filter subscriptions matching the new chunks
+        try:
+            from services.knowledge_filter_matcher import knowledge_filter_matcher
+
+            knowledge_filter_matcher.notify_indexed(indexed_chunks)
+        except Exception as e:
+            logger.warning("Knowledge filter matching failed", file_hash=file_hash, error=str(e))
         return {"status": "indexed", "id": file_hash}
 
     async def process_item(
@@ -602,11 +623,11 @@ class S3FileProcessor(TaskProcessor):
         owner_name: str = None,
         owner_email: str = None,
     ):
-        import boto3
+        from utils.subsystems import subsystems
 
         super().__init__(document_service)
         self.bucket = bucket
-        self.s3_client = s3_client or boto3.client("s3")
+        self.s3_client = s3_client or subsystems.get("s3").client("s3")
         self.owner_user_id = owner_user_id
         self.jwt_token = jwt_token
         self.owner_name = owner_name
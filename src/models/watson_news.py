@@ -103,6 +103,10 @@ class WatsonNewsSearchRequest(BaseModel):
     sentiment: str | None = None  # positive | neutral | negative
     topic: str | None = None
     top_k: int = 10
+    mode: str = "hybrid"  # hybrid | vector | keyword
+    fusion: str = "rrf"  # rrf | blend
+    keyword_weight: float = 0.3  # blend only: weight of the BM25 score (0..1)
+    search_after: list[Any] | None = None  # next_search_after from a previous response in the same mode
 
 
 class SearchResultItem(BaseModel):
@@ -121,8 +125,18 @@ class SearchResultItem(BaseModel):
 
 class WatsonNewsSearchResponse(BaseModel):
     query: str
+    # Results reachable with next_search_after (up to 10,000 per retriever in hybrid mode)
     total: int
     results: list[SearchResultItem]
+    mode: str = "hybrid"
+    next_search_after: list[Any] | None = None
+    # Documents matched by the retrievers
+    total_matches: int = 0
+    # Candidates fetched per retriever for this page (hybrid), or the kNN k (vector)
+    search_window: int = 0
+    embedding_cache_hit: bool = False
+    # Latency breakdown in milliseconds: embed, keyword, vector, fusion, total
+    timings_ms: dict[str, float] = Field(default_factory=dict)
 
 
 # ---------------------------------------------------------------------------
@@ -153,8 +167,24 @@ class TrendResponse(BaseModel):
     data: list[TrendDataPoint]
 
 
+class ETLJobStatus(BaseModel):
+    job_id: str
+    runs: int = 0
+    failures: int = 0
+    total_processed: int = 0
+    last_status: str | None = None  # running | success | failed
+    last_started_at: str | None = None
+    last_finished_at: str | None = None
+    last_duration_seconds: float | None = None
+    last_wait_seconds: float | None = None
+    last_processed: int | None = None
+    last_error: str | None = None
+    next_run_at: str | None = None
+
+
 class ETLStatusResponse(BaseModel):
     gdelt_last_run: str | None = None
     ibm_crawl_last_run: str | None = None
     box_last_run: str | None = None
     scheduler_running: bool = False
+    jobs: dict[str, ETLJobStatus] = Field(default_factory=dict)
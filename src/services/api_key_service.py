@@ -1,22 +1,141 @@
 """
 API Key Service for managing user API keys for public API authentication.
 """
+import asyncio
 import hashlib
+import os
 import secrets
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 from config.settings import API_KEYS_INDEX_NAME
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds a validated key is trusted without re-checking OpenSearch. Revoke/delete
+# invalidate immediately in this process; other workers see it after the TTL.
+API_KEY_CACHE_TTL_SECONDS = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "30"))
+API_KEY_CACHE_SIZE = int(os.getenv("API_KEY_CACHE_SIZE", "10000"))
+# Seconds to coalesce last_used_at updates before writing them in one bulk request
+API_KEY_LAST_USED_FLUSH_SECONDS = float(os.getenv("API_KEY_LAST_USED_FLUSH_SECONDS", "60"))
+
 
 class APIKeyService:
-    """Service for managing user API keys for public API authentication."""
+    """Service for managing user API keys for public API authentication.
+
+    Validated keys are cached in-process by key hash for a short TTL, and
+    ``last_used_at`` updates are coalesced per key and flushed periodically with a
+    single ``_bulk`` request, so authenticated calls normally hit OpenSearch zero times.
+    """
 
-    def __init__(self, session_manager=None):
+    def __init__(
+        self,
+        session_manager=None,
+        cache_ttl: float = API_KEY_CACHE_TTL_SECONDS,
+        cache_size: int = API_KEY_CACHE_SIZE,
+        flush_interval: float = API_KEY_LAST_USED_FLUSH_SECONDS,
+    ):
         self.session_manager = session_manager
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        # key_hash -> (expires_at, user info)
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # key_id -> last_used_at awaiting the next bulk flush
+        self._pending_last_used: Dict[str, str] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _cache_get(self, key_hash: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key_hash)
+        if entry is None:
+            return None
+        expires_at, info = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key_hash]
+            return None
+        self._cache.move_to_end(key_hash)
+        return info
+
+    def _cache_put(self, key_hash: str, info: Dict[str, Any]):
+        if self.cache_ttl <= 0:
+            return
+        self._cache[key_hash] = (time.monotonic() + self.cache_ttl, info)
+        self._cache.move_to_end(key_hash)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def invalidate_key(self, key_id: str):
+        """Drop a key from the validation cache (and its pending last_used_at update)"""
+        for key_hash, (_, info) in list(self._cache.items()):
+            if info["key_id"] == key_id:
+                del self._cache[key_hash]
+        self._pending_last_used.pop(key_id, None)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _mark_used(self, key_id: str):
+        """Record a key use; written by the next periodic bulk flush"""
+        self._pending_last_used[key_id] = datetime.now(timezone.utc).isoformat()
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Flush after ``flush_interval`` unless a flush is already scheduled"""
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_handle = loop.call_later(self.flush_interval, self._run_scheduled_flush, loop)
+
+    def _run_scheduled_flush(self, loop: asyncio.AbstractEventLoop):
+        self._flush_handle = None
+        # Keep a reference so the flush task is not garbage collected mid-write
+        self._flush_task = loop.create_task(self.flush_last_used())
+
+    async def flush_last_used(self) -> int:
+        """Write pending last_used_at updates in one bulk request; returns the update count"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending_last_used = self._pending_last_used, {}
+        if not pending:
+            return 0
+
+        body = []
+        for key_id, last_used_at in pending.items():
+            body.append({"update": {"_index": API_KEYS_INDEX_NAME, "_id": key_id}})
+            body.append({"doc": {"last_used_at": last_used_at}})
+
+        try:
+            from config.settings import clients
+            result = await clients.opensearch.bulk(body=body)
+            if result.get("errors"):
+                # Missing documents (deleted keys) are expected; nothing to retry
+                logger.debug("Some API key last_used_at updates failed", count=len(pending))
+        except Exception as e:
+            logger.warning("Failed to flush API key last_used_at updates", error=str(e))
+            # Keep the updates for the next flush unless newer ones replaced them
+            for key_id, last_used_at in pending.items():
+                self._pending_last_used.setdefault(key_id, last_used_at)
+            self._schedule_flush()
+            return 0
+        return len(pending)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "cached_keys": len(self._cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "pending_last_used": len(self._pending_last_used),
+        }
 
     def _generate_api_key(self) -> tuple[str, str, str]:
         """
@@ -72,7 +191,7 @@ class APIKeyService:
             # Create a unique key_id
             key_id = secrets.token_urlsafe(16)
 
-            now = datetime.utcnow().isoformat()
+            now = datetime.now(timezone.utc).isoformat()
 
             # Create the document to store
             key_doc = {
@@ -139,6 +258,13 @@ class APIKeyService:
             # Hash the incoming key
             key_hash = self._hash_key(api_key)
 
+            cached = self._cache_get(key_hash)
+            if cached is not None:
+                self.cache_hits += 1
+                self._mark_used(cached["key_id"])
+                return dict(cached)
+            self.cache_misses += 1
+
             # Get OpenSearch client
             from config.settings import clients
             opensearch_client = clients.opensearch
@@ -167,26 +293,18 @@ class APIKeyService:
 
             key_doc = hits[0]["_source"]
 
-            # Update last_used_at (fire and forget)
-            try:
-                await opensearch_client.update(
-                    index=API_KEYS_INDEX_NAME,
-                    id=key_doc["key_id"],
-                    body={
-                        "doc": {
-                            "last_used_at": datetime.utcnow().isoformat()
-                        }
-                    },
-                )
-            except Exception:
-                pass  # Don't fail validation if update fails
-
-            return {
+            info = {
                 "key_id": key_doc["key_id"],
                 "user_id": key_doc["user_id"],
                 "user_email": key_doc["user_email"],
                 "name": key_doc["name"],
             }
+            self._cache_put(key_hash, info)
+
+            # Update last_used_at in the next batched flush
+            self._mark_used(info["key_id"])
+
+            return dict(info)
 
         except Exception as e:
             logger.error("Failed to validate API key", error=str(e))
@@ -290,6 +408,8 @@ class APIKeyService:
                 },
                 refresh="wait_for",
             )
+            # The write is refreshed, so a re-validation can no longer find the key
+            self.invalidate_key(key_id)
 
             if result.get("result") == "updated":
                 logger.info(
@@ -351,6 +471,7 @@ class APIKeyService:
                 id=key_id,
                 refresh="wait_for",
             )
+            self.invalidate_key(key_id)
 
             if result.get("result") == "deleted":
                 logger.info(
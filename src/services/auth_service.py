@@ -1,7 +1,6 @@
 import os
 import uuid
 import json
-import httpx
 import aiofiles
 import logging
 from datetime import datetime, timedelta
@@ -13,12 +12,8 @@ from config.settings import WEBHOOK_BASE_URL, is_no_auth_mode
 logger = logging.getLogger(__name__)
 from session_manager import SessionManager
 from services.langflow_mcp_service import LangflowMCPService
-from connectors.google_drive.oauth import GoogleDriveOAuth
-from connectors.onedrive.oauth import OneDriveOAuth
-from connectors.sharepoint.oauth import SharePointOAuth
-from connectors.google_drive import GoogleDriveConnector
-from connectors.onedrive import OneDriveConnector
-from connectors.sharepoint import SharePointConnector
+from utils.http_clients import shared_http_client
+from utils.subsystems import subsystems
 
 
 class AuthService:
@@ -95,11 +90,7 @@ class AuthService:
         import os
 
         # Map connector types to their connector and OAuth classes
-        connector_class_map = {
-            "google_drive": (GoogleDriveConnector, GoogleDriveOAuth),
-            "onedrive": (OneDriveConnector, OneDriveOAuth),
-            "sharepoint": (SharePointConnector, SharePointOAuth),
-        }
+        connector_class_map = await subsystems.aget("connectors")
 
         connector_class, oauth_class = connector_class_map.get(
             connector_type, (None, None)
@@ -183,17 +174,13 @@ class AuthService:
                 raise ValueError("Redirect URI not found in connection config")
 
             # Get connector to access client credentials and endpoints
-            connector = self.connector_service.connection_manager._create_connector(
+            connector = await self.connector_service.connection_manager._create_connector(
                 connection_config
             )
 
             # Get token endpoint from connector type
             connector_type = connection_config.connector_type
-            connector_class_map = {
-                "google_drive": (GoogleDriveConnector, GoogleDriveOAuth),
-                "onedrive": (OneDriveConnector, OneDriveOAuth),
-                "sharepoint": (SharePointConnector, SharePointOAuth),
-            }
+            connector_class_map = await subsystems.aget("connectors")
 
             connector_class, oauth_class = connector_class_map.get(
                 connector_type, (None, None)
@@ -213,7 +200,7 @@ class AuthService:
                 "grant_type": "authorization_code",
             }
 
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client("oauth") as client:
                 token_response = await client.post(token_url, data=token_payload)
 
             if token_response.status_code != 200:
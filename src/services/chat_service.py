@@ -273,7 +273,7 @@ class ChatService:
         if previous_response_id:
             from agent import get_conversation_thread
 
-            conversation_history = get_conversation_thread(
+            conversation_history = await get_conversation_thread(
                 user_id, previous_response_id
             )
             if conversation_history:
@@ -366,10 +366,10 @@ class ChatService:
             return {"error": "User ID is required", "conversations": []}
 
         # Get metadata from persistent storage
-        conversations_dict = get_user_conversations(user_id)
+        conversations_dict = await get_user_conversations(user_id)
 
-        # Get in-memory conversations (with function calls)
-        in_memory_conversations = active_conversations.get(user_id, {})
+        # Get full conversation threads (with function calls), resident or spilled
+        in_memory_conversations = await active_conversations.user_threads(user_id)
 
         logger.debug(
             "Getting chat history for user",
@@ -470,40 +470,79 @@ class ChatService:
             "total_conversations": len(conversations),
         }
 
-    async def get_langflow_history(self, user_id: str):
-        """Get langflow conversation history for a user - now fetches from both OpenRAG memory and Langflow database"""
+    async def get_langflow_history(
+        self,
+        user_id: str,
+        page: int = 1,
+        page_size: int | None = None,
+        session_id: str | None = None,
+    ):
+        """Get langflow conversation history for a user - now fetches from both OpenRAG memory and Langflow database
+
+        Only the user's own sessions (conversation metadata and session ownership) are
+        fetched from Langflow, most recently active first. With *page_size* set, only
+        that page of sessions is fetched; with *session_id* set, only that session.
+        """
         from agent import get_user_conversations
         from services.langflow_history_service import langflow_history_service
+        from services.session_ownership_service import session_ownership_service
 
         if not user_id:
             return {"error": "User ID is required", "conversations": []}
 
         all_conversations = []
+        local_metadata = {}
+        page = max(1, page)
+        has_more = False
+        total_sessions = 0
 
         try:
             # 1. Get local conversation metadata (no actual messages stored here)
-            conversations_dict = get_user_conversations(user_id)
-            local_metadata = {}
+            conversations_dict = await get_user_conversations(user_id)
 
             for response_id, conversation_metadata in conversations_dict.items():
                 # Store metadata for later use with Langflow data
                 local_metadata[response_id] = conversation_metadata
 
-            # 2. Get actual conversations from Langflow database (source of truth for messages)
-            logger.debug(f"Attempting to fetch Langflow history for user: {user_id}")
+            # 2. Collect the user's session IDs, most recently active first
+            activity = {
+                response_id: metadata.get("last_activity") or ""
+                for response_id, metadata in local_metadata.items()
+            }
+            owned_sessions = session_ownership_service.get_user_session_activity(user_id)
+            for owned_session_id, last_accessed in owned_sessions.items():
+                activity.setdefault(owned_session_id, last_accessed or "")
+
+            if session_id is not None:
+                session_ids = [session_id] if session_id in activity else []
+            else:
+                session_ids = sorted(activity, key=lambda sid: str(activity[sid]), reverse=True)
+            total_sessions = len(session_ids)
+
+            if page_size:
+                start = (page - 1) * page_size
+                has_more = start + page_size < len(session_ids)
+                session_ids = session_ids[start:start + page_size]
+
+            # 3. Get actual conversations from Langflow database (source of truth for messages)
+            logger.debug(
+                f"Attempting to fetch Langflow history for user: {user_id} ({len(session_ids)} sessions)"
+            )
             langflow_history = (
                 await langflow_history_service.get_user_conversation_history(
-                    user_id, flow_id=LANGFLOW_CHAT_FLOW_ID
+                    user_id,
+                    flow_id=LANGFLOW_CHAT_FLOW_ID,
+                    session_ids=session_ids,
+                    versions={
+                        sid: str(activity[sid]) if activity[sid] else None
+                        for sid in session_ids
+                    },
                 )
             )
 
             if langflow_history.get("conversations"):
                 for conversation in langflow_history["conversations"]:
-                    session_id = conversation["session_id"]
-
-                    # Only process sessions that belong to this user (exist in local metadata)
-                    if session_id not in local_metadata:
-                        continue
+                    conversation_session_id = conversation["session_id"]
 
                     # Use Langflow messages (with function calls) as source of truth
                     messages = []
@@ -526,7 +565,7 @@ class ChatService:
 
                     if messages:
                         # Use local metadata if available, otherwise generate from Langflow data
-                        metadata = local_metadata.get(session_id, {})
+                        metadata = local_metadata.get(conversation_session_id, {})
 
                         if not metadata.get("title"):
                             first_user_msg = next(
@@ -545,7 +584,7 @@ class ChatService:
 
                         all_conversations.append(
                             {
-                                "response_id": session_id,
+                                "response_id": conversation_session_id,
                                 "title": title,
                                 "endpoint": "langflow",
                                 "messages": messages,  # Function calls preserved from Langflow
@@ -556,7 +595,7 @@ class ChatService:
                                 "filter_id": metadata.get("filter_id"),
                                 "total_messages": len(messages),
                                 "source": "langflow_enhanced",
-                                "langflow_session_id": session_id,
+                                "langflow_session_id": conversation_session_id,
                                 "langflow_flow_id": conversation.get("flow_id"),
                             }
                         )
@@ -588,6 +627,10 @@ class ChatService:
             "endpoint": "langflow",
             "conversations": all_conversations,
             "total_conversations": len(all_conversations),
+            "total_sessions": total_sessions,
+            "page": page,
+            "page_size": page_size,
+            "has_more": has_more,
         }
 
     async def delete_session(self, user_id: str, session_id: str):
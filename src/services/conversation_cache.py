@@ -0,0 +1,367 @@
+"""
+Conversation Cache
+Memory-bounded cache for full conversation threads (messages with function call data).
+Threads are evicted LRU per user and globally by estimated size in bytes, and after
+an idle TTL. Evicted threads spill to the SQLite conversation store and are
+rehydrated transparently on the next access. Store reads and writes, including
+encoding, run in a worker thread so they never block the event loop.
+"""
+
+import asyncio
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.conversation_store import ConversationStore, get_conversation_store
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CONVERSATION_CACHE_MAX_BYTES = int(os.getenv("CONVERSATION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CONVERSATION_CACHE_USER_MAX_BYTES = int(os.getenv("CONVERSATION_CACHE_USER_MAX_BYTES", str(32 * 1024 * 1024)))
+CONVERSATION_CACHE_TTL_SECONDS = float(os.getenv("CONVERSATION_CACHE_TTL_SECONDS", str(6 * 3600)))
+# Seconds between prunes of stored threads that have not been written for the TTL
+CONVERSATION_THREAD_PRUNE_INTERVAL_SECONDS = float(
+    os.getenv("CONVERSATION_THREAD_PRUNE_INTERVAL_SECONDS", "3600")
+)
+
+_DATETIME_TAG = "__datetime__"
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return {_DATETIME_TAG: obj.isoformat()}
+    return str(obj)
+
+
+def _decode_hook(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and _DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[_DATETIME_TAG])
+    return obj
+
+
+def encode_thread(state: Dict[str, Any]) -> bytes:
+    """Serialize a conversation thread (datetimes preserved) to compressed JSON"""
+    return zlib.compress(json.dumps(state, default=_encode_default, ensure_ascii=False).encode("utf-8"))
+
+
+def decode_thread(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data).decode("utf-8"), object_hook=_decode_hook)
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=_encode_default, ensure_ascii=False))
+
+
+def _metadata_size(state: Dict[str, Any]) -> int:
+    return _json_size({key: value for key, value in state.items() if key != "messages"})
+
+
+def estimate_size(state: Dict[str, Any]) -> int:
+    """Approximate in-memory footprint of a thread as its serialized JSON length"""
+    return _metadata_size(state) + sum(_json_size(message) for message in state.get("messages") or [])
+
+
+@dataclass
+class _Entry:
+    state: Dict[str, Any]
+    size: int
+    touched_at: float
+    # Serialized size of state["messages"][:message_count], reused when the thread grows
+    message_bytes: int = 0
+    message_count: int = 0
+    # Store updated_at of the copy this entry was written as or loaded from
+    stored_at: Optional[float] = None
+
+
+class ConversationCache:
+    """LRU + TTL conversation thread cache bounded in bytes, per user and globally"""
+
+    def __init__(
+        self,
+        max_bytes: int = CONVERSATION_CACHE_MAX_BYTES,
+        user_max_bytes: int = CONVERSATION_CACHE_USER_MAX_BYTES,
+        ttl_seconds: float = CONVERSATION_CACHE_TTL_SECONDS,
+        store: Optional[ConversationStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+        write_through: bool = False,
+    ):
+        self.max_bytes = max_bytes
+        self.user_max_bytes = min(user_max_bytes, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._store = store
+        self._clock = clock
+        # Persist every put so threads created by one worker process can be
+        # rehydrated by any other (multi-worker mode). Resident threads are then
+        # checked against the store before use, since another worker may have
+        # stored a newer copy.
+        self.write_through = write_through
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        # id(state) -> latest resident entry holding that state object
+        self._by_state: Dict[int, _Entry] = {}
+        self._user_keys: Dict[str, "OrderedDict[str, None]"] = {}
+        self._user_bytes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.rehydrated = 0
+        self.spilled = 0
+        self.stale = 0
+        self.pruned = 0
+
+    @property
+    def store(self) -> ConversationStore:
+        if self._store is None:
+            self._store = get_conversation_store()
+        return self._store
+
+    # Internal bookkeeping
+
+    def _remove(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if self._by_state.get(id(entry.state)) is entry:
+            del self._by_state[id(entry.state)]
+        user_id, response_id = key
+        user_keys = self._user_keys.get(user_id)
+        if user_keys is not None:
+            user_keys.pop(response_id, None)
+            if not user_keys:
+                del self._user_keys[user_id]
+        self._user_bytes[user_id] = self._user_bytes.get(user_id, 0) - entry.size
+        if self._user_bytes[user_id] <= 0:
+            del self._user_bytes[user_id]
+        self.total_bytes -= entry.size
+        return entry
+
+    def _insert(self, key: Tuple[str, str], entry: _Entry):
+        self._remove(key)
+        user_id, response_id = key
+        self._entries[key] = entry
+        self._by_state[id(entry.state)] = entry
+        self._user_keys.setdefault(user_id, OrderedDict())[response_id] = None
+        self._user_bytes[user_id] = self._user_bytes.get(user_id, 0) + entry.size
+        self.total_bytes += entry.size
+
+    def _touch(self, key: Tuple[str, str], entry: _Entry):
+        entry.touched_at = self._clock()
+        self._entries.move_to_end(key)
+        self._user_keys[key[0]].move_to_end(key[1])
+
+    def _entry(self, state: Dict[str, Any]) -> _Entry:
+        """Entry for *state*, measuring only messages added since a resident copy was measured"""
+        messages = state.get("messages") or []
+        known = self._by_state.get(id(state))
+        if known is not None and known.state is state and known.message_count <= len(messages):
+            message_bytes = known.message_bytes + sum(
+                _json_size(message) for message in messages[known.message_count:]
+            )
+        else:
+            message_bytes = sum(_json_size(message) for message in messages)
+        return _Entry(
+            state=state,
+            size=_metadata_size(state) + message_bytes,
+            touched_at=self._clock(),
+            message_bytes=message_bytes,
+            message_count=len(messages),
+        )
+
+    async def _spill(self, evicted: List[Tuple[Tuple[str, str], _Entry]]):
+        """Write evicted threads to the persistent store in one transaction"""
+        if not evicted:
+            return
+        records = [(user_id, response_id, entry.state) for (user_id, response_id), entry in evicted]
+        try:
+            stored_at = await asyncio.to_thread(
+                lambda: self.store.save_threads(
+                    (user_id, response_id, encode_thread(state)) for user_id, response_id, state in records
+                )
+            )
+            self.spilled += len(evicted)
+            logger.debug(f"Spilled {len(evicted)} conversation threads to {self.store.db_path}")
+        except Exception as e:
+            logger.error(f"Failed to spill conversation threads: {e}")
+            return
+        for _key, entry in evicted:
+            entry.stored_at = stored_at
+
+    def _load(self, user_id: str, response_id: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        record = self.store.load_thread_record(user_id, response_id)
+        return (decode_thread(record[0]), record[1]) if record is not None else None
+
+    async def _is_stale(self, user_id: str, response_id: str, entry: _Entry) -> bool:
+        """Whether another worker stored a newer copy of a resident thread"""
+        if not self.write_through or entry.stored_at is None:
+            return False
+        try:
+            updated_at = await asyncio.to_thread(self.store.thread_updated_at, user_id, response_id)
+        except Exception as e:
+            logger.warning(f"Failed to check conversation thread {response_id} against the store: {e}")
+            return False
+        return updated_at is not None and updated_at > entry.stored_at
+
+    def _evict(self, keep: Optional[Tuple[str, str]] = None) -> List[Tuple[Tuple[str, str], _Entry]]:
+        """Evict expired threads, then LRU threads over the per-user and global budgets
+
+        Returns the evicted entries, to be spilled by the caller.
+        """
+        evicted = []
+        now = self._clock()
+
+        # Oldest entries come first, so stop at the first one still within the TTL
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if key == keep or now - entry.touched_at <= self.ttl_seconds:
+                break
+            evicted.append((key, self._remove(key)))
+
+        if keep is not None:
+            user_id = keep[0]
+            user_keys = self._user_keys.get(user_id)
+            while user_keys and self._user_bytes.get(user_id, 0) > self.user_max_bytes:
+                response_id = next(iter(user_keys))
+                if (user_id, response_id) == keep:
+                    break
+                key = (user_id, response_id)
+                evicted.append((key, self._remove(key)))
+                user_keys = self._user_keys.get(user_id)
+
+        while self._entries and self.total_bytes > self.max_bytes:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            evicted.append((key, self._remove(key)))
+
+        return evicted
+
+    # Public API
+
+    async def put(self, user_id: str, response_id: str, state: Dict[str, Any]):
+        """Cache a thread, evicting cold threads to the persistent store as needed"""
+        key = (user_id, response_id)
+        entry = self._entry(state)
+        self._insert(key, entry)
+        evicted = self._evict(keep=key)
+        if self.write_through:
+            evicted.append((key, entry))
+        await self._spill(evicted)
+
+    async def get(self, user_id: str, response_id: str) -> Optional[Dict[str, Any]]:
+        """Get a thread from memory, rehydrating it from the persistent store if it was spilled"""
+        key = (user_id, response_id)
+        entry = self._entries.get(key)
+        if entry is not None and await self._is_stale(user_id, response_id, entry):
+            self.stale += 1
+            if self._entries.get(key) is entry:
+                self._remove(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._touch(key, entry)
+            return entry.state
+
+        self.misses += 1
+        try:
+            loaded = await asyncio.to_thread(self._load, user_id, response_id)
+        except Exception as e:
+            logger.error(f"Failed to load spilled conversation thread {response_id}: {e}")
+            return None
+        if loaded is None:
+            return None
+        if key in self._entries:
+            # Another caller rehydrated or stored the thread while this one was loading
+            return self._entries[key].state
+
+        state, stored_at = loaded
+        self.rehydrated += 1
+        entry = self._entry(state)
+        entry.stored_at = stored_at
+        self._insert(key, entry)
+        await self._spill(self._evict(keep=key))
+        return state
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._entries
+
+    async def pop(self, user_id: str, response_id: str) -> bool:
+        """Remove a thread from memory and the persistent store; True if it existed"""
+        existed = self._remove((user_id, response_id)) is not None
+        try:
+            if await asyncio.to_thread(self.store.delete_thread, user_id, response_id):
+                existed = True
+        except Exception as e:
+            logger.error(f"Failed to delete spilled conversation thread {response_id}: {e}")
+        return existed
+
+    def user_conversations(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """Resident threads for a user (spilled threads are not loaded)"""
+        return {
+            response_id: self._entries[(user_id, response_id)].state
+            for response_id in self._user_keys.get(user_id, ())
+        }
+
+    async def user_threads(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """Resident and spilled threads for a user
+
+        Spilled threads are decoded for the caller but not made resident, so listing a
+        user's history does not evict other users' threads.
+        """
+        threads = self.user_conversations(user_id)
+
+        def load_spilled() -> Dict[str, Dict[str, Any]]:
+            return {
+                response_id: decode_thread(data)
+                for response_id, data in self.store.load_user_threads(user_id).items()
+                if response_id not in threads
+            }
+
+        try:
+            threads.update(await asyncio.to_thread(load_spilled))
+        except Exception as e:
+            logger.error(f"Failed to load spilled conversation threads for user {user_id}: {e}")
+        return threads
+
+    async def prune_store(self) -> int:
+        """Delete stored threads not written for ``ttl_seconds``; returns how many
+
+        Resident threads are written again when they are evicted, so only
+        threads idle in every worker are lost.
+        """
+        if self.ttl_seconds <= 0:
+            return 0
+        pruned = await asyncio.to_thread(self.store.prune_threads, time.time() - self.ttl_seconds)
+        self.pruned += pruned
+        if pruned:
+            logger.info(f"Pruned {pruned} expired conversation threads from {self.store.db_path}")
+        return pruned
+
+    async def run_pruning(self, interval: float = CONVERSATION_THREAD_PRUNE_INTERVAL_SECONDS) -> None:
+        """Leader job: prune expired threads from the persistent store"""
+        while True:
+            try:
+                await self.prune_store()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to prune conversation threads: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threads": len(self._entries),
+            "users": len(self._user_keys),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "rehydrated": self.rehydrated,
+            "spilled": self.spilled,
+            "stale": self.stale,
+            "pruned": self.pruned,
+        }
@@ -3,69 +3,132 @@ Conversation Persistence Service
 Simple service to persist chat conversations to disk so they survive server restarts
 """
 
-import json
-import os
 import asyncio
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
-import threading
+from services.conversation_store import CONVERSATION_DB_FILE, get_conversation_store
+from services.shared_state import is_multi_worker
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds before pending writes are retried after a failed flush
+CONVERSATION_FLUSH_RETRY_SECONDS = 5.0
+
+
 class ConversationPersistenceService:
-    """Simple service to persist conversations to disk"""
+    """Persist conversation metadata to an indexed SQLite store
+
+    Conversations are loaded per user on first access. Each stored turn upserts a
+    single record; turns stored while a write is in flight are coalesced into the
+    next transaction. Records of a failed write are kept and retried.
+    """
 
-    def __init__(self, storage_file: str = "data/conversations.json"):
+    def __init__(
+        self,
+        storage_file: str = CONVERSATION_DB_FILE,
+        legacy_file: Optional[str] = "data/conversations.json",
+        reload_on_access: Optional[bool] = None,
+    ):
         self.storage_file = storage_file
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-        self.lock = threading.Lock()
-        self._conversations = self._load_conversations()
-    
-    def _load_conversations(self) -> Dict[str, Dict[str, Any]]:
-        """Load conversations from disk"""
-        if os.path.exists(self.storage_file):
+        self.legacy_file = legacy_file
+        self.store = get_conversation_store(storage_file)
+        # Other worker processes write to the same store in multi-worker mode,
+        # so a user's conversations are re-read instead of cached
+        self.reload_on_access = is_multi_worker() if reload_on_access is None else reload_on_access
+        self._conversations: Dict[str, Dict[str, Any]] = {}
+        self._migrated = False
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._retry_handle: Optional[asyncio.TimerHandle] = None
+
+    def _ensure_migrated(self):
+        """Import the legacy whole-file JSON store on first use"""
+        if self._migrated:
+            return
+        self._migrated = True
+        if self.legacy_file:
+            try:
+                self.store.import_legacy_json(self.legacy_file, "conversations")
+            except Exception as e:
+                logger.error(f"Error migrating conversations from {self.legacy_file}: {e}")
+
+    def _flush_pending_sync(self, records):
+        self.store.upsert_conversations(records)
+        logger.debug(f"Saved {len(records)} conversations to {self.storage_file}")
+
+    async def _flush_pending(self):
+        """Write pending upserts until none are left (runs in executor)"""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            records = [
+                (user_id, response_id, metadata)
+                for (user_id, response_id), metadata in self._pending.items()
+            ]
+            self._pending = {}
             try:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.debug(f"Loaded {self._count_total_conversations(data)} conversations from {self.storage_file}")
-                    return data
+                await loop.run_in_executor(None, self._flush_pending_sync, records)
             except Exception as e:
-                logger.error(f"Error loading conversations from {self.storage_file}: {e}")
-                return {}
-        return {}
-    
-    def _save_conversations_sync(self):
-        """Synchronous save conversations to disk (runs in executor)"""
-        try:
-            with self.lock:
-                with open(self.storage_file, 'w', encoding='utf-8') as f:
-                    json.dump(self._conversations, f, indent=2, ensure_ascii=False, default=str)
-                logger.debug(f"Saved {self._count_total_conversations(self._conversations)} conversations to {self.storage_file}")
-        except Exception as e:
-            logger.error(f"Error saving conversations to {self.storage_file}: {e}")
-    
+                logger.error(f"Error saving conversations to {self.storage_file}: {e}")
+                # Keep records that were neither replaced nor deleted meanwhile, and retry later
+                for user_id, response_id, metadata in records:
+                    if response_id in self._conversations.get(user_id, {}):
+                        self._pending.setdefault((user_id, response_id), metadata)
+                if self._retry_handle is None:
+                    self._retry_handle = loop.call_later(CONVERSATION_FLUSH_RETRY_SECONDS, self._retry)
+                return
+
+    def _retry(self):
+        self._retry_handle = None
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self._flush_pending())
+
     async def _save_conversations(self):
-        """Async save conversations to disk (non-blocking)"""
-        # Run the synchronous file I/O in a thread pool to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._save_conversations_sync)
-    
-    def _count_total_conversations(self, data: Dict[str, Any]) -> int:
-        """Count total conversations across all users"""
-        total = 0
-        for user_conversations in data.values():
-            if isinstance(user_conversations, dict):
-                total += len(user_conversations)
-        return total
-    
+        """Async save pending conversations to disk (non-blocking, coalesced)"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_pending())
+        await asyncio.shield(self._flush_task)
+
+    async def flush(self):
+        """Wait until all pending conversation writes are on disk"""
+        if self._pending or (self._flush_task and not self._flush_task.done()):
+            await self._save_conversations()
+
+    def _read_user_conversations(self, user_id: str) -> Dict[str, Any]:
+        self._ensure_migrated()
+        return self.store.get_user_conversations(user_id)
+
+    def _cache_user_conversations(self, user_id: str, conversations: Dict[str, Any]) -> Dict[str, Any]:
+        # Turns not written yet take precedence over the stored copies
+        for (pending_user_id, response_id), metadata in self._pending.items():
+            if pending_user_id == user_id:
+                conversations[response_id] = metadata
+        self._conversations[user_id] = conversations
+        return conversations
+
     def get_user_conversations(self, user_id: str) -> Dict[str, Any]:
-        """Get all conversations for a user"""
-        if user_id not in self._conversations:
-            self._conversations[user_id] = {}
+        """Get all conversations for a user (reads the store on the calling thread)"""
+        if user_id not in self._conversations or self.reload_on_access:
+            try:
+                conversations = self._read_user_conversations(user_id)
+            except Exception as e:
+                logger.error(f"Error loading conversations for user {user_id}: {e}")
+                return self._conversations.get(user_id, {})
+            self._cache_user_conversations(user_id, conversations)
+        return self._conversations[user_id]
+
+    async def aget_user_conversations(self, user_id: str) -> Dict[str, Any]:
+        """Get all conversations for a user, reading the store in a worker thread"""
+        if user_id not in self._conversations or self.reload_on_access:
+            try:
+                conversations = await asyncio.to_thread(self._read_user_conversations, user_id)
+            except Exception as e:
+                logger.error(f"Error loading conversations for user {user_id}: {e}")
+                return self._conversations.get(user_id, {})
+            self._cache_user_conversations(user_id, conversations)
         return self._conversations[user_id]
-    
+
     def _serialize_datetime(self, obj: Any) -> Any:
         """Recursively convert datetime objects to ISO strings for JSON serialization"""
         if isinstance(obj, datetime):
@@ -76,59 +139,57 @@ class ConversationPersistenceService:
             return [self._serialize_datetime(item) for item in obj]
         else:
             return obj
-    
+
     async def store_conversation_thread(self, user_id: str, response_id: str, conversation_state: Dict[str, Any]):
         """Store a conversation thread and persist to disk (async, non-blocking)"""
-        if user_id not in self._conversations:
-            self._conversations[user_id] = {}
-        
+        user_conversations = await self.aget_user_conversations(user_id)
+
         # Recursively convert datetime objects to strings for JSON serialization
         serialized_conversation = self._serialize_datetime(conversation_state)
-        
-        self._conversations[user_id][response_id] = serialized_conversation
-        
+
+        user_conversations[response_id] = serialized_conversation
+        self._pending[(user_id, response_id)] = serialized_conversation
+
         # Save to disk asynchronously (non-blocking)
         await self._save_conversations()
-    
+
     def get_conversation_thread(self, user_id: str, response_id: str) -> Dict[str, Any]:
         """Get a specific conversation thread"""
         user_conversations = self.get_user_conversations(user_id)
         return user_conversations.get(response_id, {})
-    
+
     async def delete_conversation_thread(self, user_id: str, response_id: str) -> bool:
         """Delete a specific conversation thread (async, non-blocking)"""
-        if user_id in self._conversations and response_id in self._conversations[user_id]:
-            del self._conversations[user_id][response_id]
-            await self._save_conversations()
+        user_conversations = await self.aget_user_conversations(user_id)
+        if response_id in user_conversations:
+            del user_conversations[response_id]
+            # Make sure an in-flight upsert does not resurrect the record
+            self._pending.pop((user_id, response_id), None)
+            await self.flush()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.store.delete_conversation, user_id, response_id)
             logger.debug(f"Deleted conversation {response_id} for user {user_id}")
             return True
         return False
-    
+
     async def clear_user_conversations(self, user_id: str):
         """Clear all conversations for a user (async, non-blocking)"""
-        if user_id in self._conversations:
+        if await self.aget_user_conversations(user_id):
             del self._conversations[user_id]
-            await self._save_conversations()
+            self._pending = {key: value for key, value in self._pending.items() if key[0] != user_id}
+            await self.flush()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.store.delete_user_conversations, user_id)
             logger.debug(f"Cleared all conversations for user {user_id}")
-    
+
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get statistics about stored conversations"""
-        total_users = len(self._conversations)
-        total_conversations = self._count_total_conversations(self._conversations)
-        
-        user_stats = {}
-        for user_id, conversations in self._conversations.items():
-            user_stats[user_id] = {
-                'conversation_count': len(conversations),
-                'latest_activity': max(
-                    (conv.get('last_activity', '') for conv in conversations.values()),
-                    default=''
-                )
-            }
-        
+        self._ensure_migrated()
+        user_stats = self.store.conversation_stats()
+
         return {
-            'total_users': total_users,
-            'total_conversations': total_conversations,
+            'total_users': len(user_stats),
+            'total_conversations': sum(stats['conversation_count'] for stats in user_stats.values()),
             'storage_file': self.storage_file,
             'file_exists': os.path.exists(self.storage_file),
             'user_stats': user_stats
@@ -136,4 +197,4 @@ class ConversationPersistenceService:
 
 
 # Global instance
-conversation_persistence = ConversationPersistenceService()
\ No newline at end of file
+conversation_persistence = ConversationPersistenceService()
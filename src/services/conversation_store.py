@@ -0,0 +1,287 @@
+"""
+Conversation Store
+Embedded SQLite (WAL mode) store for conversation metadata and session ownership.
+Writes are single-record upserts batched into one transaction, so their cost does
+not grow with the total number of stored conversations.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CONVERSATION_DB_FILE = os.getenv("CONVERSATION_DB_FILE", "data/conversations.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    user_id TEXT NOT NULL,
+    response_id TEXT NOT NULL,
+    last_activity TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, response_id)
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_activity
+    ON conversations (user_id, last_activity);
+CREATE TABLE IF NOT EXISTS session_ownership (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at TEXT,
+    last_accessed TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_session_ownership_user
+    ON session_ownership (user_id);
+CREATE TABLE IF NOT EXISTS conversation_threads (
+    user_id TEXT NOT NULL,
+    response_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (user_id, response_id)
+);
+CREATE INDEX IF NOT EXISTS idx_conversation_threads_updated
+    ON conversation_threads (updated_at);
+"""
+
+
+class ConversationStore:
+    """Thread-safe SQLite store shared by conversation persistence and session ownership"""
+
+    def __init__(self, db_path: str = CONVERSATION_DB_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller must hold self._lock
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _write(self, statements: Iterable[Tuple[str, tuple]]) -> int:
+        """Run statements in a single transaction; returns the number of changed rows"""
+        changed = 0
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    changed += conn.execute(sql, params).rowcount
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return changed
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Conversations
+
+    def get_user_conversations(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        rows = self._read(
+            "SELECT response_id, data FROM conversations WHERE user_id = ? ORDER BY last_activity",
+            (user_id,),
+        )
+        return {response_id: json.loads(data) for response_id, data in rows}
+
+    def upsert_conversations(self, records: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Upsert (user_id, response_id, metadata) records in one transaction"""
+        self._write(
+            (
+                "INSERT INTO conversations (user_id, response_id, last_activity, data) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (user_id, response_id) DO UPDATE SET "
+                "last_activity = excluded.last_activity, data = excluded.data",
+                (
+                    user_id,
+                    response_id,
+                    str(metadata.get("last_activity") or ""),
+                    json.dumps(metadata, ensure_ascii=False, default=str),
+                ),
+            )
+            for user_id, response_id, metadata in records
+        )
+
+    def delete_conversation(self, user_id: str, response_id: str) -> None:
+        self._write(
+            [(
+                "DELETE FROM conversations WHERE user_id = ? AND response_id = ?",
+                (user_id, response_id),
+            )]
+        )
+
+    def delete_user_conversations(self, user_id: str) -> None:
+        self._write([("DELETE FROM conversations WHERE user_id = ?", (user_id,))])
+
+    def conversation_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-user conversation count and latest activity"""
+        rows = self._read(
+            "SELECT user_id, COUNT(*), MAX(last_activity) FROM conversations GROUP BY user_id"
+        )
+        return {
+            user_id: {"conversation_count": count, "latest_activity": latest or ""}
+            for user_id, count, latest in rows
+        }
+
+    # Spilled conversation threads (full message lists evicted from memory)
+
+    def save_threads(self, records: Iterable[Tuple[str, str, bytes]]) -> float:
+        """Upsert (user_id, response_id, encoded thread) records in one transaction
+
+        Returns the ``updated_at`` the records were written with.
+        """
+        now = time.time()
+        self._write(
+            (
+                "INSERT INTO conversation_threads (user_id, response_id, updated_at, data) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (user_id, response_id) DO UPDATE SET "
+                "updated_at = excluded.updated_at, data = excluded.data",
+                (user_id, response_id, now, data),
+            )
+            for user_id, response_id, data in records
+        )
+        return now
+
+    def load_thread(self, user_id: str, response_id: str) -> Optional[bytes]:
+        rows = self._read(
+            "SELECT data FROM conversation_threads WHERE user_id = ? AND response_id = ?",
+            (user_id, response_id),
+        )
+        return rows[0][0] if rows else None
+
+    def load_thread_record(self, user_id: str, response_id: str) -> Optional[Tuple[bytes, float]]:
+        """(encoded thread, updated_at) of a stored thread"""
+        rows = self._read(
+            "SELECT data, updated_at FROM conversation_threads WHERE user_id = ? AND response_id = ?",
+            (user_id, response_id),
+        )
+        return rows[0] if rows else None
+
+    def thread_updated_at(self, user_id: str, response_id: str) -> Optional[float]:
+        rows = self._read(
+            "SELECT updated_at FROM conversation_threads WHERE user_id = ? AND response_id = ?",
+            (user_id, response_id),
+        )
+        return rows[0][0] if rows else None
+
+    def load_user_threads(self, user_id: str) -> Dict[str, bytes]:
+        rows = self._read(
+            "SELECT response_id, data FROM conversation_threads WHERE user_id = ?",
+            (user_id,),
+        )
+        return dict(rows)
+
+    def delete_thread(self, user_id: str, response_id: str) -> bool:
+        """Delete a spilled thread; True if it existed"""
+        return self._write(
+            [(
+                "DELETE FROM conversation_threads WHERE user_id = ? AND response_id = ?",
+                (user_id, response_id),
+            )]
+        ) > 0
+
+    def prune_threads(self, older_than: float) -> int:
+        """Delete threads last written before *older_than* (epoch seconds); returns how many"""
+        return self._write(
+            [("DELETE FROM conversation_threads WHERE updated_at < ?", (older_than,))]
+        )
+
+    # Session ownership
+
+    def get_all_ownership(self) -> Dict[str, Dict[str, Any]]:
+        rows = self._read(
+            "SELECT session_id, user_id, created_at, last_accessed FROM session_ownership"
+        )
+        return {
+            session_id: {"user_id": user_id, "created_at": created_at, "last_accessed": last_accessed}
+            for session_id, user_id, created_at, last_accessed in rows
+        }
+
+    def write_ownership(self, changes: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Apply {session_id: record} upserts (``None`` deletes) in one transaction"""
+        statements = []
+        for session_id, record in changes.items():
+            if record is None:
+                statements.append(
+                    ("DELETE FROM session_ownership WHERE session_id = ?", (session_id,))
+                )
+            else:
+                statements.append((
+                    "INSERT INTO session_ownership (session_id, user_id, created_at, last_accessed) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (session_id) DO UPDATE SET "
+                    "user_id = excluded.user_id, last_accessed = excluded.last_accessed",
+                    (
+                        session_id,
+                        record.get("user_id"),
+                        record.get("created_at"),
+                        record.get("last_accessed"),
+                    ),
+                ))
+        self._write(statements)
+
+    # Migration
+
+    def import_legacy_json(self, legacy_file: str, kind: str) -> int:
+        """Import a legacy whole-file JSON store once, then rename it to ``*.migrated``
+
+        *kind* is ``"conversations"`` ({user_id: {response_id: metadata}}) or
+        ``"ownership"`` ({session_id: record}). Returns the number of imported records.
+        """
+        if not os.path.exists(legacy_file):
+            return 0
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading legacy store {legacy_file}: {e}")
+            return 0
+
+        if kind == "conversations":
+            records = [
+                (user_id, response_id, metadata)
+                for user_id, conversations in data.items()
+                if isinstance(conversations, dict)
+                for response_id, metadata in conversations.items()
+            ]
+            self.upsert_conversations(records)
+        else:
+            records = list(data.items())
+            self.write_ownership(dict(records))
+
+        os.replace(legacy_file, f"{legacy_file}.migrated")
+        logger.info(f"Migrated {len(records)} records from {legacy_file} to {self.db_path}")
+        return len(records)
+
+
+_stores: Dict[str, ConversationStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_conversation_store(db_path: str = CONVERSATION_DB_FILE) -> ConversationStore:
+    """Get the shared store for *db_path* (one connection per database file)"""
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = _stores[db_path] = ConversationStore(db_path)
+        return store
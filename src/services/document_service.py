@@ -4,7 +4,6 @@ import tempfile
 import os
 import aiofiles
 from io import BytesIO
-from docling_core.types.io import DocumentStream
 from typing import List
 import openai
 import tiktoken
@@ -13,7 +12,7 @@ from utils.logging_config import get_logger
 logger = get_logger(__name__)
 
 from config.settings import clients, get_embedding_model, get_index_name
-from utils.document_processing import extract_relevant, process_document_sync
+from utils.document_processing import convert_and_extract, process_document_sync
 from utils.telemetry import TelemetryClient, Category, MessageId
 
 
@@ -211,10 +210,13 @@ class DocumentService:
             }
         else:
             # Create DocumentStream and process with docling
+            from docling_core.types.io import DocumentStream
+            from utils.hash_utils import hash_id
+
             doc_stream = DocumentStream(name=filename, stream=content)
-            result = clients.converter.convert(doc_stream)
-            full_doc = result.document.export_to_dict()
-            slim_doc = extract_relevant(full_doc)
+            slim_doc = convert_and_extract(
+                await clients.get_converter(), doc_stream, hash_id(content), source_label="chat_upload"
+            )
 
             # Extract all text content
             all_text = []
@@ -953,6 +953,17 @@ class FlowsService:
             node_display_name="Split Text",
         )
 
+    async def update_ingest_flow_vector_profile(self, vector_encoding: str, vector_dimensions: int):
+        """Helper function to update the vector storage profile in the ingest flow"""
+        if not LANGFLOW_INGEST_FLOW_ID:
+            raise ValueError("LANGFLOW_INGEST_FLOW_ID is not configured")
+
+        from config.settings import OPENSEARCH_COMPONENT_DISPLAY_NAME
+        await self._update_flow_field(LANGFLOW_INGEST_FLOW_ID, "vector_encoding", vector_encoding,
+                                node_display_name=OPENSEARCH_COMPONENT_DISPLAY_NAME)
+        await self._update_flow_field(LANGFLOW_INGEST_FLOW_ID, "vector_dimensions", vector_dimensions,
+                                node_display_name=OPENSEARCH_COMPONENT_DISPLAY_NAME)
+
     async def update_ingest_flow_embedding_model(self, embedding_model: str, provider: str):
         """Helper function to update embedding model in the ingest flow"""
         if not LANGFLOW_INGEST_FLOW_ID:
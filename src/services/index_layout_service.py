@@ -0,0 +1,521 @@
+"""
+Index Layout Service
+Shard/replica sizing, refresh policy, translog durability and codec for every
+OpenRAG index.
+
+A named profile (``OPENSEARCH_INDEX_PROFILE``) is installed as a composable index
+template matching the documents index, ``knowledge_filters``, ``api_keys`` and the
+Watson News indices. Index bodies elsewhere only carry mappings (and ``index.knn``),
+so the layout is decided in one place and applies when an index is created.
+
+Bulk-load mode: while a large ingest task runs, the documents index is switched to
+``refresh_interval=-1`` and no replicas, which makes bulk indexing much cheaper.
+The settings found before the switch are persisted in a marker file *before* the
+index is changed. The last task to finish restores them. If the backend dies first,
+:meth:`IndexLayoutService.recover` (run by the leader) finds the marker and restores
+the settings once no live task holds the bulk load. Holders are leases that are
+renewed while the task runs. A holder from a previous incarnation of this process,
+or a lease that is no longer renewed, counts as dead.
+
+:meth:`IndexLayoutService.drift_report` compares the effective settings of every
+managed index with the profile, for the admin endpoint.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock on the marker file
+    fcntl = None
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+OPENSEARCH_INDEX_PROFILE = os.getenv("OPENSEARCH_INDEX_PROFILE", "single-node")
+# Ingest tasks with at least this many files run in bulk-load mode (0 disables it)
+INDEX_BULK_LOAD_MIN_FILES = int(os.getenv("INDEX_BULK_LOAD_MIN_FILES", "100"))
+INDEX_BULK_LOAD_MARKER_FILE = os.getenv("INDEX_BULK_LOAD_MARKER_FILE", "data/index_bulk_load.json")
+
+TEMPLATE_NAME = "openrag-index-layout"
+TEMPLATE_PRIORITY = 100
+# Fixed OpenRAG indices; the documents index name comes from the configuration
+MANAGED_INDEX_PATTERNS = ("knowledge_filters", "api_keys", "watson_news_*", "watson_box_*")
+
+BULK_LOAD_SETTINGS = {"index.refresh_interval": "-1", "index.number_of_replicas": "0"}
+# A holder lease not renewed for this long belongs to a task that is gone
+BULK_LOAD_HOLDER_TTL_SECONDS = 300.0
+BULK_LOAD_HEARTBEAT_SECONDS = 60.0
+
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+T = TypeVar("T")
+
+# Layout template body last installed through each OpenSearch client
+_installed_templates: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+class IndexLayoutError(Exception):
+    """Unknown layout profile"""
+
+
+@dataclass(frozen=True)
+class IndexLayoutProfile:
+    name: str
+    shards: int
+    replicas: int
+    refresh_interval: str
+    translog_durability: str
+    codec: str
+
+    def settings(self) -> Dict[str, Any]:
+        """Index settings for the template body"""
+        return {
+            "index": {
+                "number_of_shards": self.shards,
+                "number_of_replicas": self.replicas,
+                "refresh_interval": self.refresh_interval,
+                "translog": {"durability": self.translog_durability},
+                "codec": self.codec,
+            }
+        }
+
+    def flat_settings(self) -> Dict[str, str]:
+        """The same settings as OpenSearch reports them with ``flat_settings``"""
+        return {
+            "index.number_of_shards": str(self.shards),
+            "index.number_of_replicas": str(self.replicas),
+            "index.refresh_interval": self.refresh_interval,
+            "index.translog.durability": self.translog_durability,
+            "index.codec": self.codec,
+        }
+
+
+INDEX_LAYOUT_PROFILES = {
+    # Local development: fastest writes, losing the last second of writes on a crash is fine
+    "dev": IndexLayoutProfile("dev", 1, 0, "1s", "async", "default"),
+    # One OpenSearch node (the docker compose default): a replica could never be assigned
+    "single-node": IndexLayoutProfile("single-node", 1, 0, "1s", "request", "default"),
+    # A cluster: replicated, spread over shards, fewer refreshes and smaller stored fields
+    "production": IndexLayoutProfile("production", 3, 1, "5s", "request", "best_compression"),
+}
+
+
+def get_index_layout_profile(name: Optional[str] = None) -> IndexLayoutProfile:
+    name = (name or OPENSEARCH_INDEX_PROFILE).lower()
+    try:
+        return INDEX_LAYOUT_PROFILES[name]
+    except KeyError:
+        raise IndexLayoutError(
+            f"Unknown index layout profile '{name}'; expected one of {', '.join(INDEX_LAYOUT_PROFILES)}"
+        ) from None
+
+
+def build_index_template(profile: IndexLayoutProfile, index_patterns: List[str]) -> Dict[str, Any]:
+    """Composable index template body for *profile*"""
+    return {
+        "index_patterns": list(index_patterns),
+        "priority": TEMPLATE_PRIORITY,
+        "template": {"settings": profile.settings()},
+        "_meta": {"managed_by": "openrag", "profile": profile.name},
+    }
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but owned by another user
+    return True
+
+
+class BulkLoadMarkerStore:
+    """Pre-bulk settings and holders per index in a JSON file, locked across processes
+
+    The methods block on the file lock and fsync; async callers run them with
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str = INDEX_BULK_LOAD_MARKER_FILE):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    @contextmanager
+    def locked(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Failed to read bulk-load marker", path=self.path, error=str(e))
+            return {}
+
+    def save(self, markers: Dict[str, Any]) -> None:
+        if not markers:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(markers, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def update(self, mutate: Callable[[Dict[str, Any]], T]) -> T:
+        """Apply *mutate* to the markers under the file lock and save them"""
+        with self.locked():
+            markers = self.load()
+            result = mutate(markers)
+            self.save(markers)
+            return result
+
+
+class IndexLayoutService:
+    """Installs the layout template, runs bulk-load mode and reports drift"""
+
+    def __init__(
+        self,
+        opensearch_client=None,
+        profile: Optional[IndexLayoutProfile] = None,
+        marker_path: str = INDEX_BULK_LOAD_MARKER_FILE,
+        bulk_load_min_files: int = INDEX_BULK_LOAD_MIN_FILES,
+        documents_index: Optional[str] = None,
+        process_id: str = PROCESS_ID,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._opensearch_client = opensearch_client
+        self.profile = profile or get_index_layout_profile()
+        self.store = BulkLoadMarkerStore(marker_path)
+        self.bulk_load_min_files = bulk_load_min_files
+        self._documents_index = documents_index
+        self.process_id = process_id
+        self.clock = clock
+        self._lock = asyncio.Lock()
+
+    @property
+    def opensearch(self):
+        if self._opensearch_client is not None:
+            return self._opensearch_client
+        from config.settings import clients
+
+        return clients.opensearch
+
+    def documents_index(self) -> str:
+        if self._documents_index:
+            return self._documents_index
+        from config.settings import get_index_name
+
+        return get_index_name()
+
+    def index_patterns(self) -> List[str]:
+        return [self.documents_index(), *MANAGED_INDEX_PATTERNS]
+
+    # Template
+
+    async def _update_markers(self, mutate: Callable[[Dict[str, Any]], T]) -> T:
+        return await asyncio.to_thread(self.store.update, mutate)
+
+    async def install_templates(self, force: bool = False) -> Dict[str, Any]:
+        """Install (or update) the layout template; applies to indices created afterwards
+
+        A body already installed through the same client is not sent again unless *force*.
+        """
+        client = self.opensearch
+        body = build_index_template(self.profile, self.index_patterns())
+        if not force and _installed_templates.get(client) == body:
+            return body
+        await client.indices.put_index_template(name=TEMPLATE_NAME, body=body)
+        _installed_templates[client] = body
+        logger.info(
+            "Installed index layout template",
+            template=TEMPLATE_NAME,
+            profile=self.profile.name,
+            index_patterns=body["index_patterns"],
+        )
+        return body
+
+    # Bulk-load mode
+
+    def wants_bulk_load(self, item_count: int) -> bool:
+        return self.bulk_load_min_files > 0 and item_count >= self.bulk_load_min_files
+
+    def _holder(self) -> Dict[str, Any]:
+        host, pid, _ = self.process_id.rsplit(":", 2)
+        return {
+            "process": self.process_id,
+            "host": host,
+            "pid": int(pid),
+            "expires_at": self.clock() + BULK_LOAD_HOLDER_TTL_SECONDS,
+        }
+
+    def _holder_alive(self, holder: Dict[str, Any]) -> bool:
+        if holder.get("process") == self.process_id:
+            return True
+        if holder.get("expires_at", 0) < self.clock():
+            return False
+        host, pid, _ = self.process_id.rsplit(":", 2)
+        if holder.get("host") == host:
+            # Same pid with another process id is a previous run of this process
+            if holder.get("pid") == int(pid):
+                return False
+            return _process_alive(holder.get("pid", 0))
+        return True  # Another host: trust the lease
+
+    async def _current_settings(self, index_name: str) -> Dict[str, Optional[str]]:
+        """Explicitly set values of the bulk-load settings (None when not set)"""
+        response = await self.opensearch.indices.get_settings(index=index_name, flat_settings=True)
+        settings = response.get(index_name, {}).get("settings", {})
+        return {key: settings.get(key) for key in BULK_LOAD_SETTINGS}
+
+    async def _put_settings(self, index_name: str, settings: Dict[str, Optional[str]]) -> None:
+        await self.opensearch.indices.put_settings(index=index_name, body=dict(settings))
+
+    async def enter_bulk_load(self, index_name: str, holder_id: str) -> None:
+        async with self._lock:
+            holder = self._holder()
+
+            def join(markers):
+                marker = markers.get(index_name)
+                first = marker is None
+                if first:
+                    marker = markers[index_name] = {"previous": None, "applied": False, "holders": {}}
+                marker["holders"][holder_id] = holder
+                return first
+
+            if not await self._update_markers(join):
+                return
+
+            previous = await self._current_settings(index_name)
+
+            def record_previous(markers):
+                markers[index_name]["previous"] = previous
+
+            # Persist what to restore before touching the index
+            await self._update_markers(record_previous)
+            await self._put_settings(index_name, BULK_LOAD_SETTINGS)
+            await self._update_markers(_mark_applied(index_name))
+            logger.info("Index switched to bulk-load mode", index=index_name, previous=previous, holder=holder_id)
+
+    async def exit_bulk_load(self, index_name: str, holder_id: str) -> bool:
+        """Release *holder_id*; restores the index when it was the last holder"""
+        async with self._lock:
+
+            def leave(markers):
+                marker = markers.get(index_name)
+                if marker is not None:
+                    marker["holders"].pop(holder_id, None)
+                return marker
+
+            marker = await self._update_markers(leave)
+            if marker is None or marker["holders"]:
+                return False
+            return await self._restore(index_name, marker)
+
+    async def _restore(self, index_name: str, marker: Dict[str, Any]) -> bool:
+        # Caller holds self._lock. The marker stays until the restore succeeded.
+        if marker.get("previous") is not None:
+            try:
+                await self._put_settings(index_name, marker["previous"])
+                await self.opensearch.indices.refresh(index=index_name)
+            except Exception as e:
+                logger.error(
+                    "Failed to restore index settings after bulk load; will retry",
+                    index=index_name,
+                    error=str(e),
+                )
+                return False
+
+        def finish(markers):
+            current = markers.get(index_name)
+            if current is not None and current["holders"]:
+                # A task joined while the settings were restored: switch back for it
+                current["applied"] = False
+                return True
+            markers.pop(index_name, None)
+            return False
+
+        if await self._update_markers(finish):
+            await self._put_settings(index_name, BULK_LOAD_SETTINGS)
+            await self._update_markers(_mark_applied(index_name))
+            return False
+        logger.info("Index settings restored after bulk load", index=index_name, settings=marker.get("previous"))
+        return True
+
+    async def _renew(self, index_name: str, holder_id: str) -> None:
+        while True:
+            await asyncio.sleep(BULK_LOAD_HEARTBEAT_SECONDS)
+            expires_at = self.clock() + BULK_LOAD_HOLDER_TTL_SECONDS
+
+            def renew(markers):
+                holders = markers.get(index_name, {}).get("holders", {})
+                if holder_id in holders:
+                    holders[holder_id]["expires_at"] = expires_at
+
+            await self._update_markers(renew)
+
+    @asynccontextmanager
+    async def bulk_load(self, holder_id: str, index_name: Optional[str] = None):
+        """Keep *index_name* (the documents index by default) in bulk-load mode for the block"""
+        index_name = index_name or self.documents_index()
+        try:
+            await self.enter_bulk_load(index_name, holder_id)
+        except Exception as e:
+            # Bulk-load mode is an optimization; the ingest runs with normal settings
+            logger.error("Failed to switch index to bulk-load mode", index=index_name, error=str(e))
+            await self.exit_bulk_load(index_name, holder_id)
+            yield
+            return
+        heartbeat = asyncio.create_task(self._renew(index_name, holder_id))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await self.exit_bulk_load(index_name, holder_id)
+
+    async def recover(self) -> List[str]:
+        """Drop dead holders and restore indices nobody holds anymore; returns restored indices"""
+        restored = []
+        async with self._lock:
+
+            def drop_dead_holders(markers):
+                orphaned = {}
+                for index_name, marker in markers.items():
+                    marker["holders"] = {
+                        holder_id: holder
+                        for holder_id, holder in marker["holders"].items()
+                        if self._holder_alive(holder)
+                    }
+                    if not marker["holders"]:
+                        orphaned[index_name] = marker
+                return orphaned
+
+            orphaned = await self._update_markers(drop_dead_holders)
+            for index_name, marker in orphaned.items():
+                logger.warning("Restoring index settings left by an interrupted bulk load", index=index_name)
+                if await self._restore(index_name, marker):
+                    restored.append(index_name)
+        return restored
+
+    async def run_recovery(self, interval: float = BULK_LOAD_HEARTBEAT_SECONDS) -> None:
+        """Leader job: restore settings left behind by crashed tasks"""
+        while True:
+            try:
+                await self.recover()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Bulk-load recovery failed", error=str(e))
+            await asyncio.sleep(interval)
+
+    # Drift
+
+    async def drift_report(self) -> Dict[str, Any]:
+        """Effective settings of the managed indices compared with the profile"""
+        expected = self.profile.flat_settings()
+        template = await self._template_status()
+        response = await self.opensearch.indices.get_settings(
+            index=",".join(self.index_patterns()),
+            flat_settings=True,
+            include_defaults=True,
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        bulk_loading = {
+            index_name
+            for index_name, marker in (await asyncio.to_thread(self.store.load)).items()
+            if marker.get("applied")
+        }
+
+        indices = {}
+        for index_name, data in sorted(response.items()):
+            effective = {**data.get("defaults", {}), **data.get("settings", {})}
+            in_bulk_load = index_name in bulk_loading
+            drift = []
+            for key, value in expected.items():
+                actual = effective.get(key)
+                if in_bulk_load and key in BULK_LOAD_SETTINGS:
+                    continue  # Intentionally changed until the bulk load finishes
+                if actual != value:
+                    drift.append({"setting": key, "expected": value, "actual": actual})
+            indices[index_name] = {
+                "settings": {key: effective.get(key) for key in expected},
+                "bulk_load": in_bulk_load,
+                "drift": drift,
+            }
+
+        return {
+            "profile": self.profile.name,
+            "expected": expected,
+            "template": template,
+            "indices": indices,
+            "drift": not template["up_to_date"] or any(entry["drift"] for entry in indices.values()),
+        }
+
+    async def _template_status(self) -> Dict[str, Any]:
+        expected = build_index_template(self.profile, self.index_patterns())
+        try:
+            response = await self.opensearch.indices.get_index_template(name=TEMPLATE_NAME)
+        except Exception as e:
+            if getattr(e, "status_code", None) != 404:
+                raise
+            return {"name": TEMPLATE_NAME, "installed": False, "up_to_date": False}
+        installed = next(
+            (
+                entry["index_template"]
+                for entry in response.get("index_templates", [])
+                if entry.get("name") == TEMPLATE_NAME
+            ),
+            None,
+        )
+        if installed is None:
+            return {"name": TEMPLATE_NAME, "installed": False, "up_to_date": False}
+        up_to_date = (
+            sorted(installed.get("index_patterns", [])) == sorted(expected["index_patterns"])
+            and installed.get("_meta", {}).get("profile") == self.profile.name
+        )
+        return {"name": TEMPLATE_NAME, "installed": True, "up_to_date": up_to_date}
+
+
+def _mark_applied(index_name: str) -> Callable[[Dict[str, Any]], None]:
+    def mark(markers: Dict[str, Any]) -> None:
+        if index_name in markers:
+            markers[index_name]["applied"] = True
+
+    return mark
+
+
+async def install_index_templates(opensearch_client=None) -> Dict[str, Any]:
+    """Install the layout template of the configured profile (before creating indices)
+
+    Called on every index check; the template is only sent when the same body has
+    not been installed through this client yet.
+    """
+    return await IndexLayoutService(opensearch_client).install_templates()
@@ -0,0 +1,574 @@
+"""
+In-process matching of newly indexed chunks against knowledge filter subscriptions.
+
+Subscribing to a knowledge filter used to create an OpenSearch alerting doc-level
+monitor per subscription. Those monitors poll the cluster every minute and fail on
+indices with KNN fields. Instead, each subscribed filter is compiled into a predicate
+over chunk metadata (filename, mimetype, owner, connector type) and free text. The
+predicates are kept in an inverted index keyed by one selective term each, a local
+percolator: a newly indexed chunk is only evaluated against the subscriptions
+registered under one of its own terms.
+
+The backend ingest path hands its chunks over as it indexes them. Chunks written by
+the Langflow ingestion flow are indexed out of process, so they are read back by
+document id (or filename and owner) in the background once the flow run returns and
+the index has refreshed on its own schedule. Chunks that were already searchable when
+the run started are left out, so re-ingesting a file does not notify its old chunks.
+
+Matches are coalesced per subscription over a window and delivered as one
+notification per subscription through a pluggable sink. Subscriptions are stored in
+the knowledge filter documents and reloaded from the knowledge filter index at
+startup and periodically, so every backend worker matches the chunks it indexes.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import re
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+from services.knowledge_filter_service import KNOWLEDGE_FILTERS_INDEX_NAME, normalize_query_data
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+KNOWLEDGE_FILTER_NOTIFY_WINDOW_SECONDS = float(os.getenv("KNOWLEDGE_FILTER_NOTIFY_WINDOW_SECONDS", "60"))
+KNOWLEDGE_FILTER_NOTIFY_SINK = os.getenv("KNOWLEDGE_FILTER_NOTIFY_SINK", "log").lower()
+KNOWLEDGE_FILTER_RELOAD_SECONDS = float(os.getenv("KNOWLEDGE_FILTER_RELOAD_SECONDS", "300"))
+# Matches listed per notification; the total is always reported in match_count
+KNOWLEDGE_FILTER_MAX_MATCHES_PER_NOTIFICATION = 100
+# Chunks of one Langflow-ingested document read back for matching
+KNOWLEDGE_FILTER_MAX_INGESTED_CHUNKS = 10000
+# Seconds to wait before each read-back of a flow run's chunks; the index is never
+# refreshed for it, so later attempts cover slow refreshes and bulk loads
+INGEST_READ_BACK_DELAYS = (2.0, 10.0, 60.0, 300.0)
+
+WILDCARD = "*"
+TEXT_FIELD = "text"
+# Knowledge filter keys and the chunk fields they constrain (as in the search service)
+FILTER_FIELDS = {
+    "data_sources": "filename",
+    "document_types": "mimetype",
+    "owners": "owner",
+    "connector_types": "connector_type",
+}
+# Rough number of chunks sharing one value of each field, used to pick the index term
+FIELD_COST = {"filename": 1, TEXT_FIELD: 2, "owner": 8, "connector_type": 16, "mimetype": 16}
+_TERM_RE = re.compile(r"\w\w+")
+# Chunk fields needed to match and summarise; vectors are never read back
+MATCH_SOURCE_FIELDS = [
+    "document_id",
+    "filename",
+    "mimetype",
+    "page",
+    "connector_type",
+    "owner",
+    "owner_name",
+    "allowed_users",
+    TEXT_FIELD,
+]
+
+
+def text_terms(text: str) -> Set[str]:
+    """Lowercased word terms of at least two characters"""
+    return set(_TERM_RE.findall((text or "").lower()))
+
+
+def chunk_values(chunk: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """Values of the filterable fields of a chunk; the owner matches by user id or display name"""
+    values = {
+        "filename": {chunk.get("filename")},
+        "mimetype": {chunk.get("mimetype")},
+        "owner": {chunk.get("owner"), chunk.get("owner_name")},
+        "connector_type": {chunk.get("connector_type")},
+    }
+    return {name: {str(value) for value in found if value is not None} for name, found in values.items()}
+
+
+@dataclass(frozen=True)
+class FilterPredicate:
+    """Conjunction of per-field value sets and free-text terms.
+
+    A field maps to the values it accepts (any of them); an empty set accepts
+    nothing, like an empty filter list in search. Every text term must occur in the
+    chunk text.
+    """
+
+    fields: Dict[str, FrozenSet[str]]
+    terms: FrozenSet[str]
+
+    @property
+    def never_matches(self) -> bool:
+        return any(not values for values in self.fields.values())
+
+    def matches(self, values: Dict[str, Set[str]], terms: Set[str]) -> bool:
+        for name, accepted in self.fields.items():
+            if accepted.isdisjoint(values.get(name, ())):
+                return False
+        return self.terms <= terms
+
+
+def compile_filter(query_data: Union[str, Dict[str, Any], None]) -> FilterPredicate:
+    """Compile a knowledge filter's query data into a predicate over chunks"""
+    data = json.loads(normalize_query_data(query_data or {}))
+    fields = {}
+    for key, name in FILTER_FIELDS.items():
+        values = data["filters"].get(key)
+        if not isinstance(values, list) or WILDCARD in values:
+            continue
+        fields[name] = frozenset(str(value) for value in values)
+    query = data.get("query")
+    # Only plain text queries constrain the text; "*" and raw query objects match all text
+    terms = text_terms(query) if isinstance(query, str) and query.strip() != WILDCARD else set()
+    return FilterPredicate(fields=fields, terms=frozenset(terms))
+
+
+@dataclass
+class Subscription:
+    subscription_id: str
+    filter_id: str
+    filter_name: str
+    user_id: Optional[str]
+    predicate: FilterPredicate
+    notification_config: Dict[str, Any] = field(default_factory=dict)
+
+    def can_see(self, chunk: Dict[str, Any]) -> bool:
+        """Same rule as the document-level security on the documents index"""
+        owner = chunk.get("owner")
+        return owner is None or owner == self.user_id or self.user_id in (chunk.get("allowed_users") or [])
+
+
+IndexKey = Tuple[str, str]
+
+
+class SubscriptionIndex:
+    """Subscriptions indexed by their most selective term (a local percolator)"""
+
+    def __init__(self):
+        self.subscriptions: Dict[str, Subscription] = {}
+        self._postings: Dict[IndexKey, Set[str]] = defaultdict(set)
+        self._keys: Dict[str, List[IndexKey]] = {}
+        self._by_filter: Dict[str, Set[str]] = defaultdict(set)
+        # Subscriptions without any constraint are candidates for every chunk
+        self._match_all: Set[str] = set()
+        # Predicate evaluations so far (candidates checked)
+        self.evaluations = 0
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def _index_keys(self, predicate: FilterPredicate) -> Optional[List[IndexKey]]:
+        """Keys under which a chunk matching the predicate will look; None for match-all"""
+        options = [[(name, value) for value in values] for name, values in predicate.fields.items()]
+        # Any one term is enough because every term must occur; longer terms are rarer
+        options += [[(TEXT_FIELD, term)] for term in sorted(predicate.terms, key=lambda t: (-len(t), t))[:3]]
+        if not options:
+            return None
+
+        def cost(keys: List[IndexKey]) -> Tuple[int, int]:
+            return (
+                sum(FIELD_COST.get(name, 4) for name, _ in keys),
+                sum(len(self._postings.get(key, ())) for key in keys),
+            )
+
+        return min(options, key=cost)
+
+    def add(self, subscription: Subscription) -> None:
+        self.remove(subscription.subscription_id)
+        self.subscriptions[subscription.subscription_id] = subscription
+        self._by_filter[subscription.filter_id].add(subscription.subscription_id)
+        if subscription.predicate.never_matches:
+            self._keys[subscription.subscription_id] = []
+            return
+        keys = self._index_keys(subscription.predicate)
+        if keys is None:
+            self._match_all.add(subscription.subscription_id)
+            keys = []
+        for key in keys:
+            self._postings[key].add(subscription.subscription_id)
+        self._keys[subscription.subscription_id] = keys
+
+    def remove(self, subscription_id: str) -> Optional[Subscription]:
+        subscription = self.subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return None
+        self._match_all.discard(subscription_id)
+        siblings = self._by_filter.get(subscription.filter_id)
+        if siblings is not None:
+            siblings.discard(subscription_id)
+            if not siblings:
+                del self._by_filter[subscription.filter_id]
+        for key in self._keys.pop(subscription_id, []):
+            posting = self._postings.get(key)
+            if posting is not None:
+                posting.discard(subscription_id)
+                if not posting:
+                    del self._postings[key]
+        return subscription
+
+    def remove_filter(self, filter_id: str) -> int:
+        subscription_ids = list(self._by_filter.get(filter_id, ()))
+        for subscription_id in subscription_ids:
+            self.remove(subscription_id)
+        return len(subscription_ids)
+
+    def match(self, chunk: Dict[str, Any]) -> List[Subscription]:
+        """Subscriptions whose filter matches the chunk and whose user can see it"""
+        values = chunk_values(chunk)
+        terms = text_terms(chunk.get(TEXT_FIELD, ""))
+        candidates = set(self._match_all)
+        for name, field_values in values.items():
+            for value in field_values:
+                candidates.update(self._postings.get((name, value), ()))
+        for term in terms:
+            candidates.update(self._postings.get((TEXT_FIELD, term), ()))
+
+        matched = []
+        for subscription_id in candidates:
+            subscription = self.subscriptions[subscription_id]
+            self.evaluations += 1
+            if subscription.predicate.matches(values, terms) and subscription.can_see(chunk):
+                matched.append(subscription)
+        return matched
+
+
+Notification = Dict[str, Any]
+
+
+class LogNotificationSink:
+    """Logs notifications (the default)"""
+
+    async def deliver(self, notification: Notification) -> None:
+        logger.info(
+            "Knowledge filter matched documents",
+            filter_id=notification["filter_id"],
+            subscription_id=notification["subscription_id"],
+            matched_count=notification["match_count"],
+        )
+
+
+class QueueNotificationSink:
+    """Keeps the latest notifications in memory for in-process consumers"""
+
+    def __init__(self, maxlen: int = 1000):
+        self.notifications: deque = deque(maxlen=maxlen)
+
+    async def deliver(self, notification: Notification) -> None:
+        self.notifications.append(notification)
+
+    def drain(self) -> List[Notification]:
+        drained = list(self.notifications)
+        self.notifications.clear()
+        return drained
+
+
+class CallbackNotificationSink:
+    """Calls a local webhook function (sync or async) with each notification"""
+
+    def __init__(self, callback: Callable[[Notification], Union[None, Awaitable[None]]]):
+        self.callback = callback
+
+    async def deliver(self, notification: Notification) -> None:
+        result = self.callback(notification)
+        if inspect.isawaitable(result):
+            await result
+
+
+def create_notification_sink(kind: str = KNOWLEDGE_FILTER_NOTIFY_SINK):
+    if kind == "queue":
+        return QueueNotificationSink()
+    if kind != "log":
+        logger.warning("Unknown knowledge filter notification sink, using log", sink=kind)
+    return LogNotificationSink()
+
+
+def _match_summary(chunk_id: str, chunk: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "chunk_id": chunk_id,
+        "document_id": chunk.get("document_id"),
+        "filename": chunk.get("filename"),
+        "mimetype": chunk.get("mimetype"),
+        "page": chunk.get("page"),
+        "connector_type": chunk.get("connector_type"),
+    }
+
+
+class NotificationCoalescer:
+    """Collects matches per subscription and delivers them once per window"""
+
+    def __init__(
+        self,
+        sink,
+        window_seconds: float = KNOWLEDGE_FILTER_NOTIFY_WINDOW_SECONDS,
+        max_matches: int = KNOWLEDGE_FILTER_MAX_MATCHES_PER_NOTIFICATION,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.sink = sink
+        self.window_seconds = window_seconds
+        self.max_matches = max_matches
+        self.clock = clock
+        # subscription_id -> pending notification
+        self._pending: Dict[str, Notification] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, subscription: Subscription, chunk_id: str, chunk: Dict[str, Any]) -> None:
+        entry = self._pending.get(subscription.subscription_id)
+        if entry is None:
+            entry = self._pending[subscription.subscription_id] = {
+                "filter_id": subscription.filter_id,
+                "filter_name": subscription.filter_name,
+                "subscription_id": subscription.subscription_id,
+                "user_id": subscription.user_id,
+                "window_start": self.clock(),
+                "match_count": 0,
+                "matches": [],
+            }
+        entry["match_count"] += 1
+        if len(entry["matches"]) < self.max_matches:
+            entry["matches"].append(_match_summary(chunk_id, chunk))
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_handle = loop.call_later(self.window_seconds, self._run_scheduled_flush, loop)
+
+    def _run_scheduled_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._flush_handle = None
+        # Keep a reference so the delivery task is not garbage collected mid-flush
+        self._flush_task = loop.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """Deliver one notification per subscription with pending matches"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        now = self.clock()
+        for notification in pending.values():
+            notification["window_end"] = now
+            notification["truncated"] = notification["match_count"] > len(notification["matches"])
+            try:
+                await self.sink.deliver(notification)
+            except Exception as e:
+                logger.warning(
+                    "Failed to deliver knowledge filter notification",
+                    subscription_id=notification["subscription_id"],
+                    error=str(e),
+                )
+        return len(pending)
+
+
+class KnowledgeFilterMatcher:
+    """Registers subscribed filters, matches indexed chunks and coalesces notifications"""
+
+    def __init__(
+        self,
+        sink=None,
+        window_seconds: float = KNOWLEDGE_FILTER_NOTIFY_WINDOW_SECONDS,
+        reload_interval: float = KNOWLEDGE_FILTER_RELOAD_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.index = SubscriptionIndex()
+        self.coalescer = NotificationCoalescer(sink or create_notification_sink(), window_seconds, clock=clock)
+        self.reload_interval = reload_interval
+        self.read_back_delays = INGEST_READ_BACK_DELAYS
+        # Background read-backs of Langflow flow runs
+        self._tasks: Set[asyncio.Task] = set()
+
+    def set_sink(self, sink) -> None:
+        self.coalescer.sink = sink
+
+    @staticmethod
+    def _subscriptions_of(filter_doc: Dict[str, Any]) -> List[Subscription]:
+        predicate = compile_filter(filter_doc.get("query_data"))
+        return [
+            Subscription(
+                subscription_id=subscription["subscription_id"],
+                filter_id=filter_doc["id"],
+                filter_name=filter_doc.get("name", ""),
+                user_id=subscription.get("user_id") or filter_doc.get("owner"),
+                predicate=predicate,
+                notification_config=subscription.get("notification_config") or {},
+            )
+            for subscription in filter_doc.get("subscriptions") or []
+            if subscription.get("subscription_id")
+        ]
+
+    def register_filter(self, filter_doc: Dict[str, Any]) -> int:
+        """(Re)register every subscription of a knowledge filter document"""
+        self.index.remove_filter(filter_doc["id"])
+        subscriptions = self._subscriptions_of(filter_doc)
+        for subscription in subscriptions:
+            self.index.add(subscription)
+        return len(subscriptions)
+
+    def remove_filter(self, filter_id: str) -> int:
+        return self.index.remove_filter(filter_id)
+
+    def unsubscribe(self, subscription_id: str) -> bool:
+        return self.index.remove(subscription_id) is not None
+
+    def notify_indexed(self, chunks: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Match newly indexed ``(chunk_id, chunk)`` pairs; returns the number of matches"""
+        if not self.index.subscriptions:
+            return 0
+        matches = 0
+        for chunk_id, chunk in chunks:
+            for subscription in self.index.match(chunk):
+                self.coalescer.add(subscription, chunk_id, chunk)
+                matches += 1
+        return matches
+
+    @staticmethod
+    def _ingested_query(
+        document_id: Optional[str], filename: Optional[str], owner: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        if document_id:
+            return {"term": {"document_id": document_id}}
+        if not filename:
+            return None
+        clauses = [{"term": {"filename": filename}}]
+        if owner:
+            clauses.append({"term": {"owner": owner}})
+        return {"bool": {"filter": clauses}}
+
+    async def _searchable_chunks(self, opensearch_client, query: Dict[str, Any], source) -> List[Dict[str, Any]]:
+        from config.settings import get_index_name
+
+        response = await opensearch_client.search(
+            index=get_index_name(),
+            body={"query": query, "_source": source, "size": KNOWLEDGE_FILTER_MAX_INGESTED_CHUNKS},
+        )
+        return response.get("hits", {}).get("hits", [])
+
+    def _spawn(self, coro: Awaitable[Any]) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def watch_ingest(
+        self,
+        opensearch_client,
+        document_id: Optional[str] = None,
+        filename: Optional[str] = None,
+        owner: Optional[str] = None,
+    ) -> Optional["IngestWatch"]:
+        """Start watching a Langflow flow run that indexes one document out of process
+
+        Chunks are found by *document_id*, or by *filename* and *owner* when the flow
+        was not given a document id. The ids already searchable are read right away;
+        call :meth:`IngestWatch.finish` once the run returned to match the rest in the
+        background. Returns ``None`` when there is nothing to match against.
+        """
+        query = self._ingested_query(document_id, filename, owner)
+        if not self.index.subscriptions or query is None:
+            return None
+        return IngestWatch(self, opensearch_client, query)
+
+    async def notify_ingested(
+        self,
+        opensearch_client,
+        query: Dict[str, Any],
+        existing: FrozenSet[str] = frozenset(),
+        delays: Iterable[float] = INGEST_READ_BACK_DELAYS,
+    ) -> int:
+        """Read back chunks matching *query*, less the *existing* ids, and match them
+
+        Waits out each of *delays* in turn until the new chunks are searchable.
+        """
+        for delay in delays:
+            await asyncio.sleep(delay)
+            if not self.index.subscriptions:
+                return 0
+            hits = await self._searchable_chunks(opensearch_client, query, MATCH_SOURCE_FIELDS)
+            new = [hit for hit in hits if hit["_id"] not in existing]
+            if new:
+                return self.notify_indexed((hit["_id"], hit.get("_source") or {}) for hit in new)
+        return 0
+
+    async def load(self, opensearch_client) -> int:
+        """Rebuild the index from the subscriptions stored in the knowledge filter index"""
+        response = await opensearch_client.search(
+            index=KNOWLEDGE_FILTERS_INDEX_NAME,
+            body={"query": {"exists": {"field": "subscriptions"}}, "size": 10000},
+        )
+        index = SubscriptionIndex()
+        for hit in response.get("hits", {}).get("hits", []):
+            try:
+                for subscription in self._subscriptions_of(hit["_source"]):
+                    index.add(subscription)
+            except Exception as e:
+                logger.warning("Skipping unreadable knowledge filter subscription", filter_id=hit.get("_id"), error=str(e))
+        self.index = index
+        return len(index)
+
+    async def run_reload(self, opensearch_client) -> None:
+        """Reload periodically so subscriptions made through another worker are picked up"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.load(opensearch_client)
+            except Exception as e:
+                logger.warning("Failed to reload knowledge filter subscriptions", error=str(e))
+
+    async def flush(self) -> int:
+        return await self.coalescer.flush()
+
+    async def close(self) -> int:
+        """Stop pending read-backs and deliver what has been matched so far"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        return await self.flush()
+
+
+class IngestWatch:
+    """Chunks of one Langflow flow run, matched in the background once the run returned"""
+
+    def __init__(self, matcher: KnowledgeFilterMatcher, opensearch_client, query: Dict[str, Any]):
+        self.matcher = matcher
+        self.opensearch_client = opensearch_client
+        self.query = query
+        self._existing = matcher._spawn(self._existing_ids())
+
+    async def _existing_ids(self) -> Optional[FrozenSet[str]]:
+        try:
+            hits = await self.matcher._searchable_chunks(self.opensearch_client, self.query, False)
+        except Exception as e:
+            logger.warning("Failed to read chunks indexed before the flow run", error=str(e))
+            return None
+        return frozenset(hit["_id"] for hit in hits)
+
+    def finish(self) -> asyncio.Task:
+        return self.matcher._spawn(self._match())
+
+    async def _match(self) -> int:
+        existing = await self._existing
+        if existing is None:
+            # Without the earlier ids, older chunks would be notified again
+            return 0
+        try:
+            return await self.matcher.notify_ingested(
+                self.opensearch_client, self.query, existing, self.matcher.read_back_delays
+            )
+        except Exception as e:
+            logger.warning("Knowledge filter matching failed", query=self.query, error=str(e))
+            return 0
+
+
+knowledge_filter_matcher = KnowledgeFilterMatcher()
@@ -1,8 +1,52 @@
+import json
 from typing import Any, Dict, Optional
 
 KNOWLEDGE_FILTERS_INDEX_NAME = "knowledge_filters"
 
 
+def normalize_query_data(query_data: str | dict) -> str:
+    """
+    Normalize query_data to ensure all required fields exist with defaults.
+    This prevents frontend crashes when API-created filters have incomplete data.
+    """
+    # Parse if string
+    if isinstance(query_data, str):
+        try:
+            data = json.loads(query_data)
+        except json.JSONDecodeError:
+            data = {}
+    else:
+        data = query_data or {}
+
+    # Ensure filters object exists with all required fields
+    filters = data.get("filters") or {}
+    normalized_filters = {
+        "data_sources": filters.get("data_sources", ["*"]),
+        "document_types": filters.get("document_types", ["*"]),
+        "owners": filters.get("owners", ["*"]),
+        "connector_types": filters.get("connector_types", ["*"]),
+    }
+
+    # Build normalized query_data with defaults
+    normalized = {
+        "query": data.get("query", ""),
+        "filters": normalized_filters,
+        "limit": data.get("limit", 10),
+        "scoreThreshold": data.get("scoreThreshold", 0),
+        "color": data.get("color", "zinc"),
+        "icon": data.get("icon", "filter"),
+    }
+
+    return json.dumps(normalized)
+
+
+def _knowledge_filter_matcher():
+    # Imported lazily: the matcher module imports normalize_query_data from here
+    from services.knowledge_filter_matcher import knowledge_filter_matcher
+
+    return knowledge_filter_matcher
+
+
 class KnowledgeFilterService:
     def __init__(self, session_manager=None):
         self.session_manager = session_manager
@@ -31,6 +75,8 @@ class KnowledgeFilterService:
                     await opensearch_client.indices.refresh(index=KNOWLEDGE_FILTERS_INDEX_NAME)
                 except Exception:
                     pass
+                # A filter recreated by an update keeps its subscriptions
+                _knowledge_filter_matcher().register_filter(filter_doc)
                 return {"success": True, "id": filter_doc["id"], "filter": filter_doc}
             else:
                 return {"success": False, "error": "Failed to create knowledge filter"}
@@ -162,6 +208,7 @@ class KnowledgeFilterService:
                 updated_doc = await opensearch_client.get(
                     index=KNOWLEDGE_FILTERS_INDEX_NAME, id=filter_id
                 )
+                _knowledge_filter_matcher().register_filter(updated_doc["_source"])
                 return {"success": True, "filter": updated_doc["_source"]}
             else:
                 return {"success": False, "error": "Failed to update knowledge filter"}
@@ -191,6 +238,7 @@ class KnowledgeFilterService:
                     await opensearch_client.indices.refresh(index=KNOWLEDGE_FILTERS_INDEX_NAME)
                 except Exception:
                     pass
+                _knowledge_filter_matcher().remove_filter(filter_id)
                 return {
                     "success": True,
                     "message": "Knowledge filter deleted successfully",
@@ -260,6 +308,9 @@ class KnowledgeFilterService:
             )
 
             if result.get("result") in ["updated", "noop"]:
+                _knowledge_filter_matcher().register_filter(
+                    {**filter_doc, "subscriptions": subscriptions}
+                )
                 return {"success": True, "subscription": subscription_data}
             else:
                 return {"success": False, "error": "Failed to add subscription"}
@@ -315,6 +366,7 @@ class KnowledgeFilterService:
             )
 
             if result.get("result") in ["updated", "noop"]:
+                _knowledge_filter_matcher().unsubscribe(subscription_id)
                 return {"success": True, "message": "Subscription removed successfully"}
             else:
                 return {"success": False, "error": "Failed to remove subscription"}
@@ -179,6 +179,14 @@ class LangflowFileService:
         
         # Add provider credentials as global variables for ingestion
         add_provider_credentials_to_headers(headers, config)
+
+        # The flow indexes out of process; note which chunks exist before it runs so
+        # only its own chunks are matched against knowledge filter subscriptions
+        from services.knowledge_filter_matcher import knowledge_filter_matcher
+
+        ingest_watch = knowledge_filter_matcher.watch_ingest(
+            clients.opensearch, document_id=document_id, filename=filename, owner=owner
+        )
         logger.info(f"[LF] Headers {headers}")
         logger.info(f"[LF] Payload {payload}")
         resp = await clients.langflow_request(
@@ -224,6 +232,10 @@ class LangflowFileService:
             )
 
             raise
+
+        # Match the flow's chunks in the background once the index has picked them up
+        if ingest_watch is not None:
+            ingest_watch.finish()
         return resp_json
 
     async def upload_and_ingest_file(
@@ -3,6 +3,9 @@ Langflow Message History Service
 Simplified service that retrieves message history from Langflow using shared client infrastructure
 """
 
+import asyncio
+import os
+from collections import OrderedDict
 from typing import List, Dict, Optional, Any
 
 from config.settings import clients
@@ -10,12 +13,50 @@ from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Max concurrent Langflow message requests per history load
+LANGFLOW_HISTORY_CONCURRENCY = int(os.getenv("LANGFLOW_HISTORY_CONCURRENCY", "8"))
+# Number of sessions whose converted messages are kept in memory
+LANGFLOW_HISTORY_CACHE_SIZE = int(os.getenv("LANGFLOW_HISTORY_CACHE_SIZE", "1000"))
+
+
 class LangflowHistoryService:
     """Simplified service to retrieve message history from Langflow"""
-    
-    def __init__(self):
-        pass
-            
+
+    def __init__(
+        self,
+        max_concurrency: int = LANGFLOW_HISTORY_CONCURRENCY,
+        cache_size: int = LANGFLOW_HISTORY_CACHE_SIZE,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache_size = cache_size
+        # session_id -> (version, converted messages). The version is the caller's
+        # last known activity stamp for the session; a different stamp is a miss.
+        self._message_cache: "OrderedDict[str, tuple[Optional[str], List[Dict[str, Any]]]]" = OrderedDict()
+
+    def invalidate_session(self, session_id: Optional[str]):
+        """Drop cached messages for a session (call when it receives new messages)"""
+        if session_id:
+            self._message_cache.pop(session_id, None)
+
+    def clear_cache(self):
+        """Drop all cached session messages"""
+        self._message_cache.clear()
+
+    def _get_cached_messages(self, session_id: str, version: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        entry = self._message_cache.get(session_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._message_cache.move_to_end(session_id)
+        return entry[1]
+
+    def _cache_messages(self, session_id: str, version: Optional[str], messages: List[Dict[str, Any]]):
+        if self.cache_size <= 0:
+            return
+        self._message_cache[session_id] = (version, messages)
+        self._message_cache.move_to_end(session_id)
+        while len(self._message_cache) > self.cache_size:
+            self._message_cache.popitem(last=False)
+
     async def get_user_sessions(self, user_id: str, flow_id: Optional[str] = None) -> List[str]:
         """Get all session IDs for a user's conversations"""
         try:
@@ -41,8 +82,18 @@ class LangflowHistoryService:
             logger.error(f"Error getting user sessions: {e}")
             return []
             
-    async def get_session_messages(self, user_id: str, session_id: str) -> List[Dict[str, Any]]:
-        """Get all messages for a specific session"""
+    async def get_session_messages(
+        self, user_id: str, session_id: str, version: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all messages for a specific session
+
+        Converted messages are cached per session. Pass the session's last activity
+        stamp as *version* so that a newer turn bypasses a stale cache entry.
+        """
+        cached = self._get_cached_messages(session_id, version)
+        if cached is not None:
+            return cached
+
         try:
             response = await clients.langflow_request(
                 "GET",
@@ -56,7 +107,9 @@ class LangflowHistoryService:
             if response.status_code == 200:
                 messages = response.json()
                 # Convert to OpenRAG format
-                return self._convert_langflow_messages(messages)
+                converted = self._convert_langflow_messages(messages)
+                self._cache_messages(session_id, version, converted)
+                return converted
             else:
                 logger.error(f"Failed to get messages for session {session_id}: {response.status_code}")
                 return []
@@ -65,6 +118,23 @@ class LangflowHistoryService:
             logger.error(f"Error getting session messages: {e}")
             return []
             
+    async def get_sessions_messages(
+        self,
+        user_id: str,
+        session_ids: List[str],
+        versions: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get messages for several sessions with bounded concurrency"""
+        versions = versions or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _fetch(session_id: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_session_messages(user_id, session_id, versions.get(session_id))
+
+        results = await asyncio.gather(*(_fetch(session_id) for session_id in session_ids))
+        return dict(zip(session_ids, results))
+
     def _convert_langflow_messages(self, langflow_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert Langflow messages to OpenRAG format"""
         converted_messages = []
@@ -122,45 +192,55 @@ class LangflowHistoryService:
                 
         return converted_messages
         
-    async def get_user_conversation_history(self, user_id: str, flow_id: Optional[str] = None) -> Dict[str, Any]:
-        """Get all conversation history for a user, organized by session
-        
-        Simplified version - gets all sessions and lets the frontend filter by user_id
+    async def get_user_conversation_history(
+        self,
+        user_id: str,
+        flow_id: Optional[str] = None,
+        session_ids: Optional[List[str]] = None,
+        versions: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Dict[str, Any]:
+        """Get conversation history for a user, organized by session
+
+        When *session_ids* is given (the user's own sessions, e.g. from conversation
+        metadata), only those sessions are fetched. Otherwise every Langflow session
+        is listed and the caller is expected to filter by user.
         """
         try:
-            # Get all sessions (no complex filtering needed)
-            session_ids = await self.get_user_sessions(user_id, flow_id)
-            
+            if session_ids is None:
+                session_ids = await self.get_user_sessions(user_id, flow_id)
+
+            messages_by_session = await self.get_sessions_messages(user_id, session_ids, versions)
+
             conversations = []
             for session_id in session_ids:
-                messages = await self.get_session_messages(user_id, session_id)
+                messages = messages_by_session.get(session_id)
                 if messages:
                     # Create conversation metadata
-                    first_message = messages[0] if messages else None
-                    last_message = messages[-1] if messages else None
-                    
+                    first_message = messages[0]
+                    last_message = messages[-1]
+
                     conversation = {
                         "session_id": session_id,
                         "langflow_session_id": session_id,  # For compatibility
                         "response_id": session_id,  # Map session_id to response_id for frontend compatibility
                         "messages": messages,
                         "message_count": len(messages),
-                        "created_at": first_message.get("timestamp") if first_message else None,
-                        "last_activity": last_message.get("timestamp") if last_message else None,
-                        "flow_id": first_message.get("langflow_flow_id") if first_message else None,
+                        "created_at": first_message.get("timestamp"),
+                        "last_activity": last_message.get("timestamp"),
+                        "flow_id": first_message.get("langflow_flow_id"),
                         "source": "langflow"
                     }
                     conversations.append(conversation)
-            
+
             # Sort by last activity (most recent first)
-            conversations.sort(key=lambda c: c.get("last_activity", ""), reverse=True)
-            
+            conversations.sort(key=lambda c: c.get("last_activity") or "", reverse=True)
+
             return {
                 "conversations": conversations,
                 "total_conversations": len(conversations),
                 "user_id": user_id
             }
-            
+
         except Exception as e:
             logger.error(f"Error getting user conversation history: {e}")
             return {
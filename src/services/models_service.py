@@ -1,8 +1,10 @@
+import functools
 import httpx
 import os
 import ssl
 from typing import Dict, List
 from utils.container_utils import transform_localhost_url
+from utils.http_clients import shared_http_client
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -18,8 +20,9 @@ WATSONX_USERNAME = os.getenv("WATSONX_USERNAME", "")
 WATSONX_PASSWORD = os.getenv("WATSONX_PASSWORD", "")
 
 
+@functools.lru_cache(maxsize=1)
 def _build_ssl_context() -> bool | ssl.SSLContext:
-    """環境設定に基づいて SSL コンテキストを構築する。"""
+    """環境設定に基づいて SSL コンテキストを構築する（共有 HTTP クライアントのキーになるためキャッシュする）。"""
     if not WATSONX_SSL_VERIFY:
         return False
     if WATSONX_CA_BUNDLE_PATH:
@@ -81,7 +84,7 @@ class ModelsService:
                 "Content-Type": "application/json",
             }
 
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client("openai") as client:
                 # Lightweight validation: just check if API key is valid
                 # This doesn't consume credits, only validates the key
                 response = await client.get(
@@ -153,7 +156,7 @@ class ModelsService:
 
             # Anthropic doesn't have a models list endpoint, so we'll validate the key
             # and return our curated list of models
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client("anthropic") as client:
                 # Validate the API key with a minimal messages request
                 validation_payload = {
                     "model": "claude-3-5-haiku-latest",
@@ -219,7 +222,7 @@ class ModelsService:
             DESIRED_CAPABILITY = "completion"
             TOOL_CALLING_CAPABILITY = "tools"
 
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client("ollama") as client:
                 # Fetch available models
                 tags_response = await client.get(tags_url, timeout=10.0)
                 tags_response.raise_for_status()
@@ -330,7 +333,7 @@ class ModelsService:
             if is_cp4d and WATSONX_AUTH_URL and WATSONX_USERNAME and WATSONX_PASSWORD:
                 # CP4D認証（オンプレミス）
                 logger.info("Using CP4D authentication for on-premise watsonx")
-                async with httpx.AsyncClient(verify=verify_ssl) as client:
+                async with shared_http_client("watsonx", verify=verify_ssl) as client:
                     auth_payload = {
                         "username": WATSONX_USERNAME,
                         "password": WATSONX_PASSWORD
@@ -354,7 +357,7 @@ class ModelsService:
             elif api_key:
                 # IBM Cloud IAM認証
                 logger.info("Using IBM Cloud IAM authentication")
-                async with httpx.AsyncClient(verify=verify_ssl) as client:
+                async with shared_http_client("watsonx", verify=verify_ssl) as client:
                     token_response = await client.post(
                         "https://iam.cloud.ibm.com/identity/token",
                         headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -391,7 +394,7 @@ class ModelsService:
             language_models = []
             embedding_models = []
 
-            async with httpx.AsyncClient(verify=verify_ssl) as client:
+            async with shared_http_client("watsonx", verify=verify_ssl) as client:
                 # Fetch text chat models
                 text_params = {
                     "version": "2024-09-16",
@@ -0,0 +1,612 @@
+"""
+Re-embedding Service
+Migrates the documents index to a new embedding model in the background.
+
+Chunks missing the target model's ``chunk_embedding_*`` field are read with a
+point in time (PIT) and ``search_after``, one page at a time. Their ``text`` is
+embedded in batches through the configured provider, and only the new vector
+field is written back with ``_bulk`` partial updates. After every page the
+progress (last sort key and counts) is checkpointed to a local JSON file, so a
+restarted backend resumes where it stopped. Because the query only matches
+chunks still missing the field, a page re-read after a crash does not write
+any vector twice.
+
+Throughput is capped by a documents-per-second budget so the migration does not
+starve live ingest and search. Once every chunk has the new field, the
+``embedding_model`` tracking fields are switched to the new model. Optionally,
+the old models' vector values are removed as well.
+
+Progress is mirrored into a TaskService task so the UI can show it like an
+ingestion task.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from models.tasks import TaskStatus, UploadTask
+from utils.embedding_fields import ensure_embedding_field_exists, get_embedding_field_name
+from utils.logging_config import get_logger
+from utils.metrics import EMBEDDING_SECONDS, timed
+from utils.rate_limit import TokenBucket
+from utils.vector_profiles import VectorProfile, get_vector_codec, get_vector_profile
+
+logger = get_logger(__name__)
+
+REEMBED_DOCS_PER_SECOND = float(os.getenv("REEMBED_DOCS_PER_SECOND", "50"))
+REEMBED_PAGE_SIZE = int(os.getenv("REEMBED_PAGE_SIZE", "500"))
+REEMBED_BATCH_SIZE = int(os.getenv("REEMBED_BATCH_SIZE", "64"))
+REEMBED_CHECKPOINT_FILE = os.getenv("REEMBED_CHECKPOINT_FILE", "data/reembedding_checkpoint.json")
+
+PIT_KEEP_ALIVE = "5m"
+MAX_EMBED_ATTEMPTS = 3
+MAX_RECORDED_ERRORS = 20
+# Lease that keeps a second worker from running the same migration
+LEASE_NAME = "reembedding"
+LEASE_SECONDS = 120.0
+
+TASK_STATUS_BY_STATE = {
+    "running": TaskStatus.RUNNING,
+    "paused": TaskStatus.PENDING,
+    "completed": TaskStatus.COMPLETED,
+    "cancelled": TaskStatus.FAILED,
+    "failed": TaskStatus.FAILED,
+}
+
+EmbedFunction = Callable[[str, List[str]], Awaitable[List[List[float]]]]
+
+
+class ReembeddingError(Exception):
+    """Invalid request for the current migration state"""
+
+
+class ReembeddingCheckpointStore:
+    """Job state in a JSON file, plus a control file other workers use to pause or cancel"""
+
+    def __init__(self, path: str = REEMBED_CHECKPOINT_FILE):
+        self.path = path
+        self.control_path = f"{path}.control"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Failed to read re-embedding checkpoint", path=self.path, error=str(e))
+            return None
+
+    def _write(self, path: str, data: Dict[str, Any]) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self._write(self.path, state)
+
+    def request(self, action: str) -> None:
+        self._write(self.control_path, {"action": action, "requested_at": time.time()})
+
+    def take_request(self) -> Optional[str]:
+        try:
+            with open(self.control_path, "r") as f:
+                action = json.load(f).get("action")
+        except (OSError, json.JSONDecodeError):
+            return None
+        try:
+            os.remove(self.control_path)
+        except OSError:
+            pass
+        return action
+
+
+async def embed_with_configured_provider(model: str, texts: List[str]) -> List[List[float]]:
+    """Embed *texts* with the patched client used for ingestion"""
+    from config.settings import clients
+
+    with timed(EMBEDDING_SECONDS, model=model, purpose="reembed"):
+        response = await clients.patched_embedding_client.embeddings.create(model=model, input=texts)
+    return [item.embedding for item in response.data]
+
+
+def missing_field_query(field_name: str) -> Dict[str, Any]:
+    """Chunks with embeddable text that do not have *field_name* yet
+
+    ``exists`` also matches empty and whitespace-only text, which is never
+    embedded; requiring at least one indexed term keeps those chunks out of the
+    job so the remaining count can reach zero.
+    """
+    return {
+        "bool": {
+            "filter": [{"wildcard": {"text": {"value": "*"}}}],
+            "must_not": [{"exists": {"field": field_name}}],
+        }
+    }
+
+
+class ReembeddingService:
+    """Runs at most one re-embedding job per backend (per checkpoint file)"""
+
+    def __init__(
+        self,
+        task_service=None,
+        opensearch_client=None,
+        embed: EmbedFunction = embed_with_configured_provider,
+        checkpoint_path: str = REEMBED_CHECKPOINT_FILE,
+        docs_per_second: float = REEMBED_DOCS_PER_SECOND,
+        page_size: int = REEMBED_PAGE_SIZE,
+        batch_size: int = REEMBED_BATCH_SIZE,
+        shared_state=None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.task_service = task_service
+        self._opensearch_client = opensearch_client
+        self.embed = embed
+        self.store = ReembeddingCheckpointStore(checkpoint_path)
+        self.docs_per_second = docs_per_second
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.shared_state = shared_state
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._clock = clock
+        self._sleep = sleep
+        self.limiter = TokenBucket(docs_per_second, capacity=batch_size, clock=clock, sleep=sleep)
+        self.state: Optional[Dict[str, Any]] = self.store.load()
+        self._task: Optional[asyncio.Task] = None
+        self._stop_reason: Optional[str] = None
+        self._started_at: Optional[float] = None
+        self._processed_at_start = 0
+
+    @property
+    def client(self):
+        if self._opensearch_client is not None:
+            return self._opensearch_client
+        from config.settings import clients
+
+        return clients.opensearch
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # Control
+
+    async def start(
+        self,
+        user_id: str,
+        target_model: Optional[str] = None,
+        index_name: Optional[str] = None,
+        remove_old_fields: bool = False,
+        docs_per_second: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Start migrating to *target_model* (the configured embedding model by default)"""
+        from config.settings import get_embedding_model, get_index_name
+
+        current = self._current_state()
+        if current and current.get("status") in ("running", "paused"):
+            raise ReembeddingError(
+                f"A re-embedding job is already {current['status']} (job {current['job_id']})"
+            )
+
+        target_model = target_model or get_embedding_model()
+        if not target_model:
+            raise ReembeddingError("No target embedding model configured")
+        index_name = index_name or get_index_name()
+        profile = get_vector_profile(target_model)
+        target_field = get_embedding_field_name(target_model, profile)
+        if docs_per_second is not None:
+            self._set_rate(docs_per_second)
+
+        total = (
+            await self.client.count(index=index_name, body={"query": missing_field_query(target_field)})
+        )["count"]
+        now = time.time()
+        self.state = {
+            "job_id": str(uuid.uuid4()),
+            "status": "running",
+            "index_name": index_name,
+            "target_model": target_model,
+            "target_field": target_field,
+            "vector_profile": {"encoding": profile.encoding, "dimensions": profile.dimensions},
+            "dimensions": None,
+            "remove_old_fields": bool(remove_old_fields),
+            "docs_per_second": self.docs_per_second,
+            "user_id": user_id,
+            "total": total,
+            "processed": 0,
+            "updated": 0,
+            "skipped": 0,
+            "failed": 0,
+            "remaining": total,
+            "search_after": None,
+            "errors": [],
+            "finalized": False,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        self._checkpoint()
+        logger.info(
+            "Starting re-embedding job",
+            job_id=self.state["job_id"],
+            target_model=target_model,
+            index_name=index_name,
+            total=total,
+            docs_per_second=self.docs_per_second,
+        )
+        self._launch()
+        return self.progress()
+
+    async def pause(self) -> Dict[str, Any]:
+        return await self._stop("paused")
+
+    async def cancel(self) -> Dict[str, Any]:
+        return await self._stop("cancelled")
+
+    async def resume(self, docs_per_second: Optional[float] = None) -> Dict[str, Any]:
+        """Continue a paused or interrupted job from its checkpoint"""
+        if self.is_running():
+            raise ReembeddingError("The re-embedding job is already running")
+        state = self.store.load()
+        if not state or state.get("status") not in ("paused", "running"):
+            raise ReembeddingError("There is no paused or interrupted re-embedding job")
+        if state.get("status") == "running" and self._lease_held_elsewhere():
+            raise ReembeddingError("The re-embedding job is running in another worker")
+        if docs_per_second is not None:
+            self._set_rate(docs_per_second)
+            state["docs_per_second"] = docs_per_second
+        else:
+            self._set_rate(state.get("docs_per_second", self.docs_per_second))
+        state["status"] = "running"
+        self.state = state
+        self._checkpoint()
+        logger.info("Resuming re-embedding job", job_id=state["job_id"], processed=state["processed"])
+        self._launch()
+        return self.progress()
+
+    async def resume_interrupted(self) -> bool:
+        """Restart a job that was running when the backend stopped (called at startup)"""
+        state = self.store.load()
+        if self.is_running() or not state or state.get("status") != "running":
+            return False
+        try:
+            await self.resume()
+        except ReembeddingError as e:
+            logger.info("Not resuming re-embedding job", reason=str(e))
+            return False
+        return True
+
+    async def shutdown(self) -> None:
+        """Stop the job without changing its status, so the next start resumes it"""
+        if self.is_running():
+            await self._stop("shutdown")
+
+    def progress(self) -> Dict[str, Any]:
+        state = self._current_state()
+        if not state:
+            return {"status": "idle"}
+        progress = {key: value for key, value in state.items() if key != "search_after"}
+        total = state.get("total") or 0
+        embeddable = total - state.get("skipped", 0)
+        progress["coverage"] = (
+            round(1 - state.get("remaining", embeddable) / embeddable, 4) if embeddable > 0 else 1.0
+        )
+        if self.is_running() and self._started_at is not None:
+            elapsed = self._clock() - self._started_at
+            done = state["processed"] - self._processed_at_start
+            rate = done / elapsed if elapsed > 0 else None
+            progress["docs_per_second_actual"] = round(rate, 2) if rate else None
+            pending = max(total - state["processed"], 0)
+            progress["eta_seconds"] = round(pending / rate) if rate else None
+        progress["running_here"] = self.is_running()
+        return progress
+
+    # Internals
+
+    def _current_state(self) -> Optional[Dict[str, Any]]:
+        # Another worker may own the job; its checkpoint file is the source of truth
+        return self.state if self.is_running() else self.store.load()
+
+    def _set_rate(self, docs_per_second: float) -> None:
+        self.docs_per_second = docs_per_second
+        self.limiter.set_rate(docs_per_second)
+
+    def _launch(self) -> None:
+        self._stop_reason = None
+        self._started_at = self._clock()
+        self._processed_at_start = self.state["processed"]
+        self.store.take_request()  # Drop stale control requests
+        self._task = asyncio.create_task(self._run())
+        self._sync_task()
+
+    async def _stop(self, reason: str) -> Dict[str, Any]:
+        if self.is_running():
+            self._stop_reason = reason
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            return self.progress()
+
+        state = self.store.load()
+        if not state or state.get("status") not in ("running", "paused"):
+            raise ReembeddingError("There is no active re-embedding job")
+        if state["status"] == "running" and self._lease_held_elsewhere():
+            # The job runs in another worker, which picks this up after its current page
+            self.store.request(reason)
+            return {**self.progress(), "requested": reason}
+        if reason == "paused" and state["status"] == "paused":
+            return self.progress()
+        state["status"] = reason
+        state["updated_at"] = time.time()
+        if reason == "cancelled":
+            state["finished_at"] = state["updated_at"]
+        self.state = state
+        self._checkpoint()
+        self._sync_task()
+        return self.progress()
+
+    def _lease_held_elsewhere(self) -> bool:
+        if self.shared_state is None:
+            return False
+        owner = self.shared_state.lease_owner(LEASE_NAME)
+        return owner is not None and owner != self.owner
+
+    def _renew_lease(self) -> None:
+        if self.shared_state is not None and not self.shared_state.acquire_lease(
+            LEASE_NAME, self.owner, LEASE_SECONDS
+        ):
+            raise ReembeddingError("The re-embedding job is running in another worker")
+
+    def _release_lease(self) -> None:
+        if self.shared_state is not None:
+            try:
+                self.shared_state.release_lease(LEASE_NAME, self.owner)
+            except Exception as e:
+                logger.warning("Failed to release re-embedding lease", error=str(e))
+
+    def _checkpoint(self) -> None:
+        self.state["updated_at"] = time.time()
+        self.store.save(self.state)
+
+    def _record_error(self, message: str) -> None:
+        errors = self.state["errors"]
+        errors.append({"at": time.time(), "error": message[:500]})
+        del errors[:-MAX_RECORDED_ERRORS]
+
+    def _sync_task(self) -> None:
+        """Mirror progress into a TaskService task (counts are chunks, not files)"""
+        if self.task_service is None or not self.state:
+            return
+        state = self.state
+        upload_task = self.task_service.get_tracked_task(state["user_id"], state["job_id"])
+        if upload_task is None:
+            upload_task = UploadTask(task_id=state["job_id"], total_files=state["total"])
+            upload_task.created_at = state["created_at"]
+            self.task_service.track_task(state["user_id"], upload_task)
+        if self._task is not None:
+            upload_task.background_task = self._task
+        upload_task.total_files = state["total"]
+        upload_task.processed_files = state["processed"]
+        upload_task.successful_files = state["updated"]
+        upload_task.failed_files = state["failed"]
+        upload_task.status = TASK_STATUS_BY_STATE.get(state["status"], TaskStatus.RUNNING)
+        upload_task.updated_at = time.time()
+        self.task_service.publish_task(
+            state["user_id"], upload_task, force=state["status"] != "running"
+        )
+
+    async def _run(self) -> None:
+        state = self.state
+        client = self.client
+        index_name = state["index_name"]
+        target_field = state["target_field"]
+        try:
+            self._renew_lease()
+            profile = self._profile()
+            await ensure_embedding_field_exists(client, state["target_model"], index_name, profile=profile)
+            # Vectors written before a restart must be visible to the new point in time
+            await client.indices.refresh(index=index_name)
+            pit_id = (await client.create_pit(index=index_name, keep_alive=PIT_KEEP_ALIVE))["pit_id"]
+            try:
+                while True:
+                    request = self.store.take_request()
+                    if request in ("paused", "cancelled"):
+                        self._stop_reason = request
+                        raise asyncio.CancelledError()
+
+                    body = {
+                        "size": self.page_size,
+                        "query": missing_field_query(target_field),
+                        "sort": [{"_id": "asc"}],
+                        "_source": ["text"],
+                        "pit": {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+                    }
+                    if state["search_after"] is not None:
+                        body["search_after"] = state["search_after"]
+                    response = await client.search(body=body)
+                    pit_id = response.get("pit_id", pit_id)
+                    hits = response.get("hits", {}).get("hits", [])
+                    if not hits:
+                        break
+
+                    await self._process_page(hits)
+                    state["search_after"] = hits[-1]["sort"]
+                    self._checkpoint()
+                    self._sync_task()
+                    self._renew_lease()
+            finally:
+                try:
+                    await client.delete_pit(body={"pit_id": [pit_id]})
+                except Exception as e:
+                    logger.debug("Failed to delete re-embedding PIT", error=str(e))
+
+            await self._complete()
+        except asyncio.CancelledError:
+            reason = self._stop_reason or "cancelled"
+            if reason != "shutdown":
+                state["status"] = reason
+                if reason == "cancelled":
+                    state["finished_at"] = time.time()
+            self._checkpoint()
+            self._sync_task()
+            logger.info("Re-embedding job stopped", job_id=state["job_id"], reason=reason)
+            self._release_lease()
+            raise
+        except Exception as e:
+            state["status"] = "failed"
+            state["finished_at"] = time.time()
+            self._record_error(str(e))
+            self._checkpoint()
+            self._sync_task()
+            logger.error("Re-embedding job failed", job_id=state["job_id"], error=str(e))
+        self._release_lease()
+
+    def _profile(self) -> VectorProfile:
+        return VectorProfile(**self.state.get("vector_profile", {}))
+
+    async def _process_page(self, hits: List[Dict[str, Any]]) -> None:
+        """Embed and write one page; counters are committed with the page checkpoint"""
+        state = self.state
+        documents = [(hit["_id"], (hit.get("_source") or {}).get("text")) for hit in hits]
+        with_text = [(doc_id, text) for doc_id, text in documents if isinstance(text, str) and text.strip()]
+        updated = failed = 0
+
+        for start in range(0, len(with_text), self.batch_size):
+            batch = with_text[start:start + self.batch_size]
+            await self.limiter.acquire(len(batch))
+            vectors = await self._embed_batch([text for _, text in batch])
+            if vectors is None:
+                failed += len(batch)
+                continue
+            codec = await get_vector_codec(
+                self.client, state["index_name"], state["target_field"], self._profile(), sample=vectors
+            )
+            vectors = codec.encode(vectors)
+            if state["dimensions"] is None and vectors:
+                state["dimensions"] = len(vectors[0])
+
+            actions: List[Dict[str, Any]] = []
+            for (doc_id, _), vector in zip(batch, vectors):
+                actions.append({"update": {"_index": state["index_name"], "_id": doc_id}})
+                actions.append({"doc": {state["target_field"]: vector}})
+            result = await self.client.bulk(body=actions)
+            for item in result.get("items", []):
+                outcome = item.get("update", {})
+                if outcome.get("status", 500) < 300:
+                    updated += 1
+                else:
+                    failed += 1
+                    self._record_error(f"{outcome.get('_id')}: {outcome.get('error')}")
+
+        state["processed"] += len(documents)
+        state["skipped"] += len(documents) - len(with_text)
+        state["updated"] += updated
+        state["failed"] += failed
+        state["remaining"] = max(state["total"] - state["updated"] - state["skipped"], 0)
+
+    async def _embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        delay = 1.0
+        for attempt in range(1, MAX_EMBED_ATTEMPTS + 1):
+            try:
+                vectors = await self.embed(self.state["target_model"], texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+                return vectors
+            except Exception as e:
+                if attempt == MAX_EMBED_ATTEMPTS:
+                    self._record_error(f"Embedding failed after {attempt} attempts: {e}")
+                    logger.warning("Re-embedding batch failed", batch_size=len(texts), error=str(e))
+                    return None
+                await self._sleep(delay)
+                delay *= 2
+        return None
+
+    async def _complete(self) -> None:
+        state = self.state
+        client = self.client
+        remaining = (
+            await client.count(
+                index=state["index_name"],
+                body={"query": missing_field_query(state["target_field"])},
+            )
+        )["count"]
+        # Chunks skipped as blank still match the query but can never be embedded
+        remaining = max(remaining - state["skipped"], 0)
+        state["remaining"] = remaining
+        if remaining == 0:
+            await self._finalize()
+            state["finalized"] = True
+        state["status"] = "completed"
+        state["finished_at"] = time.time()
+        self._checkpoint()
+        self._sync_task()
+        logger.info(
+            "Re-embedding job completed",
+            job_id=state["job_id"],
+            updated=state["updated"],
+            failed=state["failed"],
+            remaining=remaining,
+            finalized=state["finalized"],
+        )
+
+    async def _finalize(self) -> None:
+        """Point the tracking fields at the new model and optionally drop old vectors"""
+        state = self.state
+        client = self.client
+        index_name = state["index_name"]
+        old_fields: List[str] = []
+        if state["remove_old_fields"]:
+            mapping = await client.indices.get_mapping(index=index_name)
+            properties = mapping.get(index_name, {}).get("mappings", {}).get("properties", {})
+            old_fields = [
+                name for name in properties
+                if name.startswith("chunk_embedding") and name != state["target_field"]
+            ]
+
+        should = [{"bool": {"must_not": [{"term": {"embedding_model": state["target_model"]}}]}}]
+        should.extend({"exists": {"field": name}} for name in old_fields)
+        body = {
+            "query": {
+                "bool": {
+                    "filter": [{"exists": {"field": state["target_field"]}}],
+                    "should": should,
+                    "minimum_should_match": 1,
+                }
+            },
+            "script": {
+                "lang": "painless",
+                "source": (
+                    "ctx._source.embedding_model = params.model; "
+                    "if (params.dimensions != null) { ctx._source.embedding_dimensions = params.dimensions; } "
+                    "for (field in params.remove) { ctx._source.remove(field); }"
+                ),
+                "params": {
+                    "model": state["target_model"],
+                    "dimensions": state["dimensions"],
+                    "remove": old_fields,
+                },
+            },
+        }
+        params = {"conflicts": "proceed", "refresh": "true", "request_timeout": 3600}
+        if self.docs_per_second > 0:
+            params["requests_per_second"] = self.docs_per_second
+        result = await client.update_by_query(index=index_name, body=body, params=params)
+        logger.info(
+            "Re-embedding finalized",
+            job_id=state["job_id"],
+            updated=result.get("updated"),
+            removed_fields=old_fields,
+        )
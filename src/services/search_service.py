@@ -5,6 +5,7 @@ from agentd.tool_decorator import tool
 from config.settings import EMBED_MODEL, clients, get_embedding_model, get_index_name, WATSONX_EMBEDDING_DIMENSIONS
 from auth_context import get_auth_context
 from utils.logging_config import get_logger
+from utils.metrics import EMBEDDING_SECONDS, SEARCH_SECONDS, timed
 
 logger = get_logger(__name__)
 
@@ -31,7 +32,12 @@ class SearchService:
         Returns:
             dict (str, Any): {"results": [chunks]} on success
         """
+        with timed(SEARCH_SECONDS):
+            return await self._search(query, embedding_model)
+
+    async def _search(self, query: str, embedding_model: str = None) -> Dict[str, Any]:
         from utils.embedding_fields import get_embedding_field_name
+        from utils.vector_profiles import VectorCodec, VectorProfile, get_vector_fields
 
         # Strategy: Use provided model, or default to the configured embedding
         # model. This assumes documents are embedded with that model by default.
@@ -172,9 +178,10 @@ class SearchService:
                 while attempts < MAX_EMBED_RETRIES:
                     attempts += 1
                     try:
-                        resp = await clients.patched_embedding_client.embeddings.create(
-                            model=formatted_model, input=[query]
-                        )
+                        with timed(EMBEDDING_SECONDS, model=model_name, purpose="query"):
+                            resp = await clients.patched_embedding_client.embeddings.create(
+                                model=formatted_model, input=[query]
+                            )
                         # Try to get embedding - some providers return .embedding, others return ['embedding']
                         embedding = getattr(resp.data[0], 'embedding', None)
                         if embedding is None:
@@ -269,18 +276,34 @@ class SearchService:
             knn_queries = []
             embedding_fields_to_check = []
 
+            # A model may have fields with different vector profiles; each is
+            # queried with the query vector encoded the same way as its documents
+            try:
+                vector_fields = await get_vector_fields(opensearch_client, get_index_name())
+            except Exception as e:
+                logger.warning("Failed to read vector field profiles, using default fields", error=str(e))
+                vector_fields = []
+
             for model_name, embedding_vector in query_embeddings.items():
-                field_name = get_embedding_field_name(model_name)
-                embedding_fields_to_check.append(field_name)
-                knn_queries.append({
-                    "knn": {
-                        field_name: {
-                            "vector": embedding_vector,
-                            "k": 50,
-                            "num_candidates": 1000,
+                base_field_name = get_embedding_field_name(model_name)
+                model_fields = [
+                    (vector_field.name, vector_field.codec)
+                    for vector_field in vector_fields
+                    if vector_field.model == model_name
+                    or (vector_field.model is None and vector_field.name == base_field_name)
+                ] or [(base_field_name, VectorCodec(VectorProfile()))]
+
+                for field_name, codec in model_fields:
+                    embedding_fields_to_check.append(field_name)
+                    knn_queries.append({
+                        "knn": {
+                            field_name: {
+                                "vector": codec.encode([embedding_vector])[0],
+                                "k": 50,
+                                "num_candidates": 1000,
+                            }
                         }
-                    }
-                })
+                    })
 
             # Build exists filter - doc must have at least one embedding field
             exists_any_embedding = {
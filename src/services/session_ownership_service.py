@@ -3,43 +3,195 @@ Session Ownership Service
 Simple service that tracks which user owns which session
 """
 
-import json
+import asyncio
 import os
-from typing import Dict, List, Optional
+import threading
+import time
+from typing import Dict, List, Optional, Set
 from datetime import datetime
+from services.conversation_store import CONVERSATION_DB_FILE, get_conversation_store
+from services.shared_state import is_multi_worker
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds to coalesce last_accessed updates before writing them
+SESSION_OWNERSHIP_FLUSH_SECONDS = float(os.getenv("SESSION_OWNERSHIP_FLUSH_SECONDS", "5"))
+
+
 class SessionOwnershipService:
-    """Simple service to track which user owns which session"""
-
-    def __init__(self):
-        self.ownership_file = "data/session_ownership.json"
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.ownership_file), exist_ok=True)
-        self.ownership_data = self._load_ownership_data()
-    
+    """Simple service to track which user owns which session
+
+    Ownership lives in memory with a per-user index and is persisted to the shared
+    SQLite conversation store. New claims and releases are written right away (off
+    the event loop); ``last_accessed`` updates are coalesced and written in batches.
+    Flushes are serialized, so changes reach the store in the order they were made,
+    and a failed flush is retried after ``flush_interval``.
+    """
+
+    def __init__(
+        self,
+        storage_file: str = CONVERSATION_DB_FILE,
+        legacy_file: Optional[str] = "data/session_ownership.json",
+        flush_interval: float = SESSION_OWNERSHIP_FLUSH_SECONDS,
+        reload_interval: Optional[float] = None,
+    ):
+        self.storage_file = storage_file
+        self.ownership_file = legacy_file
+        self.flush_interval = flush_interval
+        # In multi-worker mode other processes claim sessions too, so the
+        # in-memory view is reloaded from the store (in the background) once it
+        # is this old
+        if reload_interval is None and is_multi_worker():
+            reload_interval = flush_interval
+        self.reload_interval = reload_interval
+        self._loaded_at = 0.0
+        self.store = get_conversation_store(storage_file)
+        self._loaded_data: Optional[Dict[str, Dict[str, any]]] = None
+        self._user_index: Dict[str, Set[str]] = {}
+        # session_id -> record to upsert, or None to delete
+        self._pending: Dict[str, Optional[Dict[str, any]]] = {}
+        self._pending_lock = threading.Lock()
+        # Held from taking the pending changes until they are written
+        self._flush_lock = threading.Lock()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        # Local changes made while a background reload is in flight
+        self._reload_overrides: Dict[str, Optional[Dict[str, any]]] = {}
+
+    @property
+    def ownership_data(self) -> Dict[str, Dict[str, any]]:
+        if self._loaded_data is None:
+            self._apply_loaded(self._load_ownership_data())
+        elif (
+            self.reload_interval is not None
+            and time.monotonic() - self._loaded_at > self.reload_interval
+        ):
+            self._schedule_reload()
+        return self._loaded_data
+
+    async def preload(self):
+        """Load ownership data off the event loop, so request handlers never read the store"""
+        if self._loaded_data is not None:
+            return
+        data = await asyncio.to_thread(self._load_ownership_data)
+        # A synchronous access may have loaded the data while the thread was reading
+        if self._loaded_data is None:
+            self._apply_loaded(data)
+
+    def _apply_loaded(self, data: Dict[str, Dict[str, any]]):
+        """Install data read from the store; local changes not yet in it win"""
+        with self._pending_lock:
+            local = {**self._pending, **self._reload_overrides}
+            self._reload_overrides = {}
+        for session_id, record in local.items():
+            if record is None:
+                data.pop(session_id, None)
+            else:
+                data[session_id] = record
+        self._loaded_data = data
+        self._loaded_at = time.monotonic()
+        self._user_index = {}
+        for session_id, session_data in data.items():
+            self._user_index.setdefault(session_data.get("user_id"), set()).add(session_id)
+
+    def _flush_and_load(self) -> Dict[str, Dict[str, any]]:
+        # Write local changes first so the reload does not drop them; a failed
+        # read raises, so the current view is kept
+        self.flush()
+        return self.store.get_all_ownership()
+
+    def _schedule_reload(self):
+        """Reload from the store off the event loop; the current view is served meanwhile"""
+        if self._reload_task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._apply_loaded(self._flush_and_load())
+            return
+        self._loaded_at = time.monotonic()  # do not reschedule while the reload runs
+        self._reload_task = loop.create_task(self._reload())
+
+    async def _reload(self):
+        try:
+            self._apply_loaded(await asyncio.to_thread(self._flush_and_load))
+        except Exception as e:
+            logger.error(f"Error reloading session ownership data: {e}")
+        finally:
+            self._reload_task = None
+
     def _load_ownership_data(self) -> Dict[str, Dict[str, any]]:
-        """Load session ownership data from JSON file"""
-        if os.path.exists(self.ownership_file):
+        """Load session ownership data from the store (migrating the legacy JSON file once)"""
+        try:
+            if self.ownership_file:
+                self.store.import_legacy_json(self.ownership_file, "ownership")
+            return self.store.get_all_ownership()
+        except Exception as e:
+            logger.error(f"Error loading session ownership data: {e}")
+            return {}
+
+    def flush(self):
+        """Write pending ownership changes in one transaction"""
+        with self._flush_lock:
+            with self._pending_lock:
+                changes, self._pending = self._pending, {}
+            if not changes:
+                return
             try:
-                with open(self.ownership_file, 'r') as f:
-                    return json.load(f)
+                self.store.write_ownership(changes)
+                logger.debug(f"Saved {len(changes)} session ownership changes to {self.storage_file}")
+                return
             except Exception as e:
-                logger.error(f"Error loading session ownership data: {e}")
-                return {}
-        return {}
-    
-    def _save_ownership_data(self):
-        """Save session ownership data to JSON file"""
+                logger.error(f"Error saving session ownership data: {e}")
+                # Keep the changes for the next flush unless newer ones replaced them
+                with self._pending_lock:
+                    for session_id, record in changes.items():
+                        self._pending.setdefault(session_id, record)
+        self._retry_flush()
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop):
+        """Flush in the executor after ``flush_interval`` unless a flush is already scheduled"""
+        with self._pending_lock:
+            if self._flush_handle is not None:
+                return
+            self._flush_handle = loop.call_later(self.flush_interval, self._run_scheduled_flush, loop)
+
+    def _run_scheduled_flush(self, loop: asyncio.AbstractEventLoop):
+        with self._pending_lock:
+            self._flush_handle = None
+        loop.run_in_executor(None, self.flush)
+
+    def _retry_flush(self):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
         try:
-            with open(self.ownership_file, 'w') as f:
-                json.dump(self.ownership_data, f, indent=2)
-            logger.debug(f"Saved session ownership data to {self.ownership_file}")
-        except Exception as e:
-            logger.error(f"Error saving session ownership data: {e}")
-    
+            loop.call_soon_threadsafe(self._schedule_flush, loop)
+        except RuntimeError:
+            pass  # Loop closed meanwhile; the changes stay pending for the shutdown flush
+
+    def _save_ownership_data(self, session_id: str, immediate: bool = True):
+        """Queue a session's record for writing (off the event loop when one is running)"""
+        record = self.ownership_data.get(session_id)
+        with self._pending_lock:
+            self._pending[session_id] = record
+            if self._reload_task is not None:
+                self._reload_overrides[session_id] = record
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        self._loop = loop
+        if immediate:
+            loop.run_in_executor(None, self.flush)
+        else:
+            self._schedule_flush(loop)
+
     def claim_session(self, user_id: str, session_id: str):
         """Claim a session for a user"""
         if session_id not in self.ownership_data:
@@ -48,33 +200,38 @@ class SessionOwnershipService:
                 "created_at": datetime.now().isoformat(),
                 "last_accessed": datetime.now().isoformat()
             }
-            self._save_ownership_data()
+            self._user_index.setdefault(user_id, set()).add(session_id)
+            self._save_ownership_data(session_id)
             logger.debug(f"Claimed session {session_id} for user {user_id}")
         else:
-            # Update last accessed time
+            # Update last accessed time (coalesced write)
             self.ownership_data[session_id]["last_accessed"] = datetime.now().isoformat()
-            self._save_ownership_data()
-    
+            self._save_ownership_data(session_id, immediate=False)
+
     def get_session_owner(self, session_id: str) -> Optional[str]:
         """Get the user ID that owns a session"""
         session_data = self.ownership_data.get(session_id)
         return session_data.get("user_id") if session_data else None
-    
+
     def get_user_sessions(self, user_id: str) -> List[str]:
         """Get all sessions owned by a user"""
-        return [
-            session_id 
-            for session_id, session_data in self.ownership_data.items()
-            if session_data.get("user_id") == user_id
-        ]
-    
+        self.ownership_data  # ensure the index is loaded
+        return list(self._user_index.get(user_id, ()))
+
+    def get_user_session_activity(self, user_id: str) -> Dict[str, Optional[str]]:
+        """Get {session_id: last_accessed} for all sessions owned by a user"""
+        return {
+            session_id: self.ownership_data[session_id].get("last_accessed")
+            for session_id in self.get_user_sessions(user_id)
+        }
+
     def is_session_owned_by_user(self, session_id: str, user_id: str) -> bool:
         """Check if a session is owned by a specific user"""
         return self.get_session_owner(session_id) == user_id
-    
+
     def filter_sessions_for_user(self, session_ids: List[str], user_id: str) -> List[str]:
         """Filter a list of sessions to only include those owned by the user"""
-        user_sessions = self.get_user_sessions(user_id)
+        user_sessions = set(self.get_user_sessions(user_id))
         return [session for session in session_ids if session in user_sessions]
 
     def release_session(self, user_id: str, session_id: str) -> bool:
@@ -83,29 +240,28 @@ class SessionOwnershipService:
             # Verify the user owns this session before deleting
             if self.ownership_data[session_id].get("user_id") == user_id:
                 del self.ownership_data[session_id]
-                self._save_ownership_data()
+                self._user_index.get(user_id, set()).discard(session_id)
+                self._save_ownership_data(session_id)
                 logger.debug(f"Released session {session_id} from user {user_id}")
                 return True
             else:
                 logger.warning(f"User {user_id} tried to release session {session_id} they don't own")
                 return False
         return False
-    
+
     def get_ownership_stats(self) -> Dict[str, any]:
         """Get statistics about session ownership"""
-        users = set()
-        for session_data in self.ownership_data.values():
-            users.add(session_data.get("user_id"))
-        
+        self.ownership_data  # ensure the index is loaded
+        sessions_per_user = {
+            user: len(sessions) for user, sessions in self._user_index.items() if user and sessions
+        }
+
         return {
             "total_tracked_sessions": len(self.ownership_data),
-            "unique_users": len(users),
-            "sessions_per_user": {
-                user: len(self.get_user_sessions(user))
-                for user in users if user
-            }
+            "unique_users": len(sessions_per_user),
+            "sessions_per_user": sessions_per_user,
         }
 
 
 # Global instance
-session_ownership_service = SessionOwnershipService()
\ No newline at end of file
+session_ownership_service = SessionOwnershipService()
@@ -0,0 +1,282 @@
+"""
+Shared State
+State shared between backend worker processes in multi-worker mode.
+
+A small SQLite (WAL mode) key/value store holds task snapshots, users, ETL status
+and leader leases, so any worker can answer a request for state created by
+another. A lease-based :class:`LeaderElector` picks the one worker that runs
+schedulers and other singleton background jobs.
+
+With ``BACKEND_WORKERS=1`` (the default) nothing here is used and all state stays
+in process memory as before.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Number of API worker processes started by main.py
+BACKEND_WORKERS = int(os.getenv("BACKEND_WORKERS", "1"))
+# all: serve the API and stand for leadership; api: serve the API only;
+# worker: stand for leadership (schedulers, ETL, background jobs), e.g. in a separate container
+SERVER_ROLE = os.getenv("SERVER_ROLE", "all").lower()
+SHARED_STATE_DB_FILE = os.getenv("SHARED_STATE_DB_FILE", "data/shared_state.db")
+LEADER_LEASE_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", "30"))
+
+SERVER_ROLES = ("all", "api", "worker")
+
+# Stays below SQLite's default limit on bound parameters per statement
+_MAX_KEYS_PER_QUERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def is_multi_worker() -> bool:
+    """True when state must be shared with other backend processes"""
+    return BACKEND_WORKERS > 1 or SERVER_ROLE != "all"
+
+
+class SharedStateStore:
+    """Thread-safe SQLite key/value store with namespaces and leases"""
+
+    def __init__(self, db_path: str = SHARED_STATE_DB_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller must hold self._lock
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None, timeout=10
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _write(self, statements: Iterable[Tuple[str, tuple]]) -> int:
+        """Run statements in a single transaction; returns the rows changed by the last one"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            changed = 0
+            try:
+                for sql, params in statements:
+                    changed = conn.execute(sql, params).rowcount
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return changed
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Key/value
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        rows = self._read(
+            "SELECT value FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Values stored under *keys* in *namespace*; missing keys are left out"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        for start in range(0, len(keys), _MAX_KEYS_PER_QUERY):
+            batch = keys[start : start + _MAX_KEYS_PER_QUERY]
+            rows = self._read(
+                "SELECT key, value FROM shared_state WHERE namespace = ? "
+                f"AND key IN ({', '.join('?' * len(batch))})",
+                (namespace, *batch),
+            )
+            found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        rows = self._read("SELECT key, value FROM shared_state WHERE namespace = ?", (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        self.put_many(namespace, [(key, value)])
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[str, Any]]) -> None:
+        now = time.time()
+        self._write(
+            (
+                "INSERT INTO shared_state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET "
+                "value = excluded.value, updated_at = excluded.updated_at",
+                (namespace, key, json.dumps(value, default=str), now),
+            )
+            for key, value in items
+        )
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._write([
+            ("DELETE FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key))
+        ])
+
+    def purge(self, namespace_prefix: str, older_than: float) -> int:
+        """Delete entries in namespaces starting with *namespace_prefix* not updated since *older_than*"""
+        return self._write([(
+            "DELETE FROM shared_state WHERE substr(namespace, 1, ?) = ? AND updated_at < ?",
+            (len(namespace_prefix), namespace_prefix, older_than),
+        )])
+
+    # Leases
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew lease *name* for *owner*; False while another owner holds it"""
+        now = time.time()
+        changed = self._write([(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+            (name, owner, now + ttl, now),
+        )])
+        return changed > 0
+
+    def release_lease(self, name: str, owner: str) -> None:
+        self._write([("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))])
+
+    def lease_owner(self, name: str) -> Optional[str]:
+        rows = self._read(
+            "SELECT owner FROM leases WHERE name = ? AND expires_at >= ?", (name, time.time())
+        )
+        return rows[0][0] if rows else None
+
+
+class LeaderElector:
+    """Lease-based leader election between backend processes
+
+    The leader renews its lease every third of ``lease_seconds``; if it dies, another
+    candidate takes over once the lease expires. ``on_elected`` / ``on_demoted`` start
+    and stop the singleton jobs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        store: "SharedStateStore",
+        on_elected: Optional[Callable[[], Awaitable[None]]] = None,
+        on_demoted: Optional[Callable[[], Awaitable[None]]] = None,
+        lease_seconds: float = LEADER_LEASE_SECONDS,
+        candidate: bool = True,
+        owner: Optional[str] = None,
+    ):
+        self.name = name
+        self.store = store
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lease_seconds = lease_seconds
+        self.candidate = candidate
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    def try_acquire(self) -> bool:
+        """Attempt to take or renew the lease once"""
+        if not self.candidate:
+            return False
+        try:
+            acquired = self.store.acquire_lease(self.name, self.owner, self.lease_seconds)
+        except Exception as e:
+            logger.warning(f"Leader lease check failed for {self.name}: {e}")
+            acquired = False
+        return acquired
+
+    async def elect(self):
+        """Take or renew the lease and run the election callbacks on a change"""
+        acquired = await asyncio.get_running_loop().run_in_executor(None, self.try_acquire)
+        if acquired and not self.is_leader:
+            self.is_leader = True
+            logger.info(f"Elected leader for {self.name}", owner=self.owner)
+            if self.on_elected:
+                await self.on_elected()
+        elif not acquired and self.is_leader:
+            self.is_leader = False
+            logger.warning(f"Lost leadership for {self.name}", owner=self.owner)
+            if self.on_demoted:
+                await self.on_demoted()
+
+    async def run(self):
+        while True:
+            try:
+                await self.elect()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Leader election step failed for {self.name}: {e}")
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    def start(self) -> Optional[asyncio.Task]:
+        if self.candidate and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                self.store.release_lease(self.name, self.owner)
+            except Exception as e:
+                logger.warning(f"Failed to release leader lease {self.name}: {e}")
+
+
+_store: Optional[SharedStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_shared_state() -> Optional[SharedStateStore]:
+    """The process-wide shared store in multi-worker mode, otherwise ``None``"""
+    global _store
+    if not is_multi_worker():
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SharedStateStore(SHARED_STATE_DB_FILE)
+        return _store
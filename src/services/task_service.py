@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import os
 import random
 import time
@@ -9,6 +10,7 @@ from models.tasks import FileTask, TaskStatus, UploadTask
 from session_manager import AnonymousUser
 from utils.gpu_detection import get_worker_count
 from utils.logging_config import get_logger
+from utils.metrics import TASK_ITEM_SECONDS, TASK_QUEUE_WAIT_SECONDS
 from utils.telemetry import TelemetryClient, Category, MessageId
 
 T = TypeVar("T")
@@ -25,12 +27,30 @@ class TaskService:
     # Cleanup interval in seconds (2 hours)
     CLEANUP_INTERVAL_SECONDS = 2 * 60 * 60
 
-    def __init__(self, document_service=None, process_pool=None, ingestion_timeout=3600):
+    # Minimum seconds between shared-state snapshots of a running task
+    SHARED_PUBLISH_INTERVAL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        document_service=None,
+        process_pool=None,
+        ingestion_timeout=3600,
+        shared_state=None,
+        index_layout=None,
+    ):
         self.document_service = document_service
         self.process_pool = process_pool
         self.task_store: dict[
             str, dict[str, UploadTask]
         ] = {}  # user_id -> {task_id -> UploadTask}
+        # In multi-worker mode, task snapshots are published here so that status
+        # requests served by other workers can see tasks running in this process
+        self.shared_state = shared_state
+        self._last_published: dict[str, float] = {}
+        self._unpublished: dict[tuple[str, str], dict] = {}
+        self._publish_task: asyncio.Task | None = None
+        # Large tasks switch the documents index to bulk-load settings while they run
+        self.index_layout = index_layout
         self.background_tasks = set()
         self.ingestion_timeout = ingestion_timeout
         self._cleanup_task: asyncio.Task | None = None
@@ -45,6 +65,89 @@ class TaskService:
         if self.process_pool is None:
             raise ValueError("TaskService requires a process_pool parameter")
 
+    def _publish(self, user_id: str, upload_task: UploadTask, force: bool = False) -> None:
+        """Queue a task summary for the shared state store (throttled unless *force*)"""
+        if self.shared_state is None:
+            return
+        now = time.time()
+        task_id = upload_task.task_id
+        if not force and now - self._last_published.get(task_id, 0.0) < self.SHARED_PUBLISH_INTERVAL_SECONDS:
+            return
+        self._last_published[task_id] = now
+        self._unpublished[(user_id, task_id)] = self._shared_summary(upload_task)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_snapshots(self._take_unpublished())
+            return
+        if self._publish_task is None or self._publish_task.done():
+            self._publish_task = asyncio.create_task(self._publish_pending())
+
+    def _take_unpublished(self) -> dict[tuple[str, str], dict]:
+        pending, self._unpublished = self._unpublished, {}
+        return pending
+
+    async def _publish_pending(self) -> None:
+        """Write queued summaries off the event loop until none are left"""
+        while self._unpublished:
+            await asyncio.to_thread(self._write_snapshots, self._take_unpublished())
+
+    def _write_snapshots(self, pending: dict[tuple[str, str], dict]) -> None:
+        by_user: dict[str, list[tuple[str, dict]]] = {}
+        for (user_id, task_id), summary in pending.items():
+            by_user.setdefault(user_id, []).append((task_id, summary))
+        for user_id, items in by_user.items():
+            try:
+                self.shared_state.put_many(f"tasks:{user_id}", items)
+            except Exception as e:
+                logger.warning(
+                    "Failed to publish task snapshots", user_id=user_id, tasks=len(items), error=str(e)
+                )
+
+    async def wait_published(self) -> None:
+        """Wait until queued task summaries have reached the shared state store"""
+        while self._publish_task is not None and not self._publish_task.done():
+            await asyncio.shield(self._publish_task)
+
+    def track_task(self, user_id: str, upload_task: UploadTask) -> None:
+        """Register a task run by another service so it is listed with ingestion tasks"""
+        self.task_store.setdefault(user_id, {})[upload_task.task_id] = upload_task
+        self._publish(user_id, upload_task, force=True)
+
+    def get_tracked_task(self, user_id: str, task_id: str) -> UploadTask | None:
+        return self.task_store.get(user_id, {}).get(task_id)
+
+    def publish_task(self, user_id: str, upload_task: UploadTask, force: bool = False) -> None:
+        """Share progress of a task registered with :meth:`track_task`"""
+        self._publish(user_id, upload_task, force=force)
+
+    async def _shared_tasks(self, user_id: str) -> dict[str, dict]:
+        """Task summaries published by all workers for a user"""
+        if self.shared_state is None:
+            return {}
+        try:
+            return await asyncio.to_thread(self.shared_state.items, f"tasks:{user_id}")
+        except Exception as e:
+            logger.warning("Failed to read shared task snapshots", user_id=user_id, error=str(e))
+            return {}
+
+    def _read_shared_statuses(self, user_ids: list[str], task_ids: list[str]) -> dict[str, dict]:
+        """Look up *task_ids* under each of *user_ids* in turn; the first match wins"""
+        found: dict[str, dict] = {}
+        for user_id in user_ids:
+            remaining = [task_id for task_id in task_ids if task_id not in found]
+            if not remaining:
+                break
+            for task_id, snapshot in self.shared_state.get_many(f"tasks:{user_id}", remaining).items():
+                found.setdefault(task_id, snapshot)
+        return found
+
+    def _bulk_load(self, upload_task: UploadTask):
+        """Bulk-load mode for the documents index while a large task runs"""
+        if self.index_layout is None or not self.index_layout.wants_bulk_load(upload_task.total_files):
+            return contextlib.nullcontext()
+        return self.index_layout.bulk_load(f"task:{upload_task.task_id}")
+
     def _get_task_lock(self, task_id: str) -> asyncio.Lock:
         """Get or create a lock for a specific task's counter updates"""
         if task_id not in self._task_locks:
@@ -194,6 +297,7 @@ class TaskService:
         if store_user_id not in self.task_store:
             self.task_store[store_user_id] = {}
         self.task_store[store_user_id][task_id] = upload_task
+        self._publish(store_user_id, upload_task, force=True)
 
         # Start background processing
         background_task = asyncio.create_task(
@@ -279,7 +383,10 @@ class TaskService:
             # - Limits concurrency across all tasks, not just within this one
             # - Potential bottlenecks related to downstream Langflow / Docling capacity rather than backend I/O
             async def process_with_semaphore(item, item_key: str):
+                queued_at = time.perf_counter()
                 async with self._processing_semaphore:
+                    started_at = time.perf_counter()
+                    TASK_QUEUE_WAIT_SECONDS.observe(started_at - queued_at)
                     file_task = upload_task.file_tasks[item_key]
                     file_task.status = TaskStatus.RUNNING
                     file_task.updated_at = time.time()
@@ -362,20 +469,28 @@ class TaskService:
 
                     finally:
                         file_task.updated_at = time.time()
+                        TASK_ITEM_SECONDS.observe(
+                            time.perf_counter() - started_at,
+                            processor=processor.__class__.__name__,
+                            status=file_task.status.value,
+                        )
                         # Only increment processed_files if the file reached a terminal state
                         # This prevents counter inconsistency on cancellation
                         if file_task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
                             async with self._get_task_lock(task_id):
                                 upload_task.processed_files += 1
                         upload_task.updated_at = time.time()
+                        self._publish(user_id, upload_task)
 
             tasks = [process_with_semaphore(item, str(item)) for item in items]
 
-            await asyncio.gather(*tasks, return_exceptions=True)
+            async with self._bulk_load(upload_task):
+                await asyncio.gather(*tasks, return_exceptions=True)
 
             # Mark task as completed
             upload_task.status = TaskStatus.COMPLETED
             upload_task.updated_at = time.time()
+            self._publish(user_id, upload_task, force=True)
 
             status: str = "FAILED"
 
@@ -448,6 +563,7 @@ class TaskService:
                 upload_task = self.task_store[user_id][task_id]
                 upload_task.status = TaskStatus.FAILED
                 upload_task.updated_at = time.time()
+                self._publish(user_id, upload_task, force=True)
 
                 logger.error(
                     "Upload / ingestion task exception encountered",
@@ -489,50 +605,37 @@ class TaskService:
                     exception=str(e),
                 )
 
-    def get_task_status(self, user_id: str, task_id: str) -> dict | None:
-        """Get the status of a specific upload task
-
-        Includes fallback to shared tasks stored under the "anonymous" user key
-        so default system tasks are visible to all users.
-        """
-        if not task_id:
-            return None
-
-        # Prefer the caller's user_id; otherwise check shared/anonymous tasks
-        candidate_user_ids = [user_id, AnonymousUser().user_id]
-
-        upload_task = None
-        for candidate_user_id in candidate_user_ids:
-            if (
-                candidate_user_id in self.task_store
-                and task_id in self.task_store[candidate_user_id]
-            ):
-                upload_task = self.task_store[candidate_user_id][task_id]
-                break
-
-        if upload_task is None:
-            return None
-
+    def _task_summary(
+        self,
+        upload_task: UploadTask,
+        include_completed_files: bool = True,
+        include_pending_files: bool = True,
+    ) -> dict:
+        """Serialize a task with per-file statuses and running/pending counts"""
         file_statuses = {}
         running_files_count = 0
         pending_files_count = 0
 
         for file_path, file_task in upload_task.file_tasks.items():
-            file_statuses[file_path] = {
-                "status": file_task.status.value,
-                "result": file_task.result,
-                "error": file_task.error,
-                "retry_count": file_task.retry_count,
-                "created_at": file_task.created_at,
-                "updated_at": file_task.updated_at,
-                "duration_seconds": file_task.duration_seconds,
-                "filename": file_task.filename,
-            }
+            status = file_task.status.value
+            if (include_completed_files or status != "completed") and (
+                include_pending_files or status != "pending"
+            ):
+                file_statuses[file_path] = {
+                    "status": status,
+                    "result": file_task.result,
+                    "error": file_task.error,
+                    "retry_count": file_task.retry_count,
+                    "created_at": file_task.created_at,
+                    "updated_at": file_task.updated_at,
+                    "duration_seconds": file_task.duration_seconds,
+                    "filename": file_task.filename,
+                }
 
             # Count running and pending files
-            if file_task.status.value == "running":
+            if status == "running":
                 running_files_count += 1
-            elif file_task.status.value == "pending":
+            elif status == "pending":
                 pending_files_count += 1
 
         return {
@@ -550,63 +653,78 @@ class TaskService:
             "files": file_statuses,
         }
 
-    def get_all_tasks(self, user_id: str) -> list:
+    def _shared_summary(self, upload_task: UploadTask) -> dict:
+        """Compact summary published for other workers: counts plus running and failed files"""
+        return self._task_summary(
+            upload_task, include_completed_files=False, include_pending_files=False
+        )
+
+    async def get_task_status(self, user_id: str, task_id: str) -> dict | None:
+        """Get the status of a specific upload task
+
+        Includes fallback to shared tasks stored under the "anonymous" user key
+        so default system tasks are visible to all users. In multi-worker mode,
+        tasks running in other workers are read from their shared summaries,
+        which list running and failed files only.
+        """
+        if not task_id:
+            return None
+        return (await self.get_task_statuses(user_id, [task_id])).get(task_id)
+
+    async def get_task_statuses(self, user_id: str, task_ids: list[str]) -> dict[str, dict]:
+        """Get the status of several upload tasks; unknown task ids are left out
+
+        Same lookup as :meth:`get_task_status`, but tasks not held by this worker
+        are read from the shared state store in one pass off the event loop.
+        """
+        # Prefer the caller's user_id; otherwise check shared/anonymous tasks
+        candidate_user_ids = [user_id, AnonymousUser().user_id]
+        statuses: dict[str, dict] = {}
+        remote_ids = []
+
+        for task_id in dict.fromkeys(task_ids):
+            if not task_id:
+                continue
+            for candidate_user_id in candidate_user_ids:
+                upload_task = self.task_store.get(candidate_user_id, {}).get(task_id)
+                if upload_task is not None:
+                    statuses[task_id] = self._task_summary(upload_task)
+                    break
+            else:
+                remote_ids.append(task_id)
+
+        if remote_ids and self.shared_state is not None:
+            try:
+                statuses.update(
+                    await asyncio.to_thread(self._read_shared_statuses, candidate_user_ids, remote_ids)
+                )
+            except Exception as e:
+                logger.warning("Failed to read shared task snapshots", user_id=user_id, error=str(e))
+
+        return statuses
+
+    async def get_all_tasks(self, user_id: str) -> list:
         """Get all tasks for a user
 
         Returns the union of the user's own tasks and shared default tasks stored
         under the "anonymous" user key. User-owned tasks take precedence
-        if a task_id overlaps.
+        if a task_id overlaps, and local tasks take precedence over summaries
+        published by other workers.
         """
         tasks_by_id = {}
 
-        def add_tasks_from_store(store_user_id):
-            if store_user_id not in self.task_store:
-                return
-            for task_id, upload_task in self.task_store[store_user_id].items():
-                if task_id in tasks_by_id:
-                    continue
-
-                # Calculate running and pending counts and build file statuses
-                running_files_count = 0
-                pending_files_count = 0
-                file_statuses = {}
-
-                for file_path, file_task in upload_task.file_tasks.items():
-                    if file_task.status.value != "completed":
-                        file_statuses[file_path] = {
-                            "status": file_task.status.value,
-                            "result": file_task.result,
-                            "error": file_task.error,
-                            "retry_count": file_task.retry_count,
-                            "created_at": file_task.created_at,
-                            "updated_at": file_task.updated_at,
-                            "duration_seconds": file_task.duration_seconds,
-                            "filename": file_task.filename,
-                        }
-
-                    if file_task.status.value == "running":
-                        running_files_count += 1
-                    elif file_task.status.value == "pending":
-                        pending_files_count += 1
-
-                tasks_by_id[task_id] = {
-                    "task_id": upload_task.task_id,
-                    "status": upload_task.status.value,
-                    "total_files": upload_task.total_files,
-                    "processed_files": upload_task.processed_files,
-                    "successful_files": upload_task.successful_files,
-                    "failed_files": upload_task.failed_files,
-                    "running_files": running_files_count,
-                    "pending_files": pending_files_count,
-                    "created_at": upload_task.created_at,
-                    "updated_at": upload_task.updated_at,
-                    "duration_seconds": upload_task.duration_seconds,
-                    "files": file_statuses,
-                }
+        async def add_tasks_from_store(store_user_id):
+            for task_id, upload_task in self.task_store.get(store_user_id, {}).items():
+                if task_id not in tasks_by_id:
+                    tasks_by_id[task_id] = self._task_summary(
+                        upload_task, include_completed_files=False
+                    )
+            for task_id, snapshot in (await self._shared_tasks(store_user_id)).items():
+                tasks_by_id.setdefault(task_id, snapshot)
 
         # First, add user-owned tasks; then shared anonymous;
-        add_tasks_from_store(user_id)
-        add_tasks_from_store(AnonymousUser().user_id)
+        await add_tasks_from_store(user_id)
+        await add_tasks_from_store(AnonymousUser().user_id)
 
         tasks = list(tasks_by_id.values())
         tasks.sort(key=lambda x: x["created_at"], reverse=True)
@@ -623,6 +741,7 @@ class TaskService:
         """
         current_time = time.time()
         cleaned_count = 0
+        expired_snapshots: list[tuple[str, str]] = []
 
         # Complexity Analysis:
         # O(n) where n = total tasks across all users
@@ -636,6 +755,9 @@ class TaskService:
                     del self.task_store[user_id][task_id]
                     # Clean up the associated lock
                     self._task_locks.pop(task_id, None)
+                    self._last_published.pop(task_id, None)
+                    self._unpublished.pop((user_id, task_id), None)
+                    expired_snapshots.append((user_id, task_id))
                     cleaned_count += 1
                     logger.debug(
                         "Cleaned up old task",
@@ -648,11 +770,30 @@ class TaskService:
             if not self.task_store[user_id]:
                 del self.task_store[user_id]
 
+        if self.shared_state is not None:
+            await asyncio.to_thread(
+                self._expire_snapshots,
+                expired_snapshots,
+                current_time - max(max_age_seconds, self.ingestion_timeout),
+            )
+
         if cleaned_count > 0:
             logger.info("Task cleanup completed", cleaned_count=cleaned_count)
 
         return cleaned_count
 
+    def _expire_snapshots(self, expired: list[tuple[str, str]], older_than: float) -> None:
+        for user_id, task_id in expired:
+            try:
+                self.shared_state.delete(f"tasks:{user_id}", task_id)
+            except Exception as e:
+                logger.warning("Failed to delete shared task snapshot", task_id=task_id, error=str(e))
+        # Snapshots left behind by workers that exited before cleaning up
+        try:
+            self.shared_state.purge("tasks:", older_than)
+        except Exception as e:
+            logger.warning("Failed to purge shared task snapshots", error=str(e))
+
     async def cancel_task(self, user_id: str, task_id: str) -> bool:
         """Cancel a task if it exists and is not already completed.
 
@@ -709,6 +850,7 @@ class TaskService:
                     file_task.error = "Task cancelled by user"
                     file_task.updated_at = time.time()
 
+        self._publish(store_user_id, upload_task, force=True)
         return True
 
     async def shutdown(self):
@@ -718,7 +860,8 @@ class TaskService:
         1. Cancelling the periodic cleanup task
         2. Cancelling all running background tasks
         3. Waiting for cancellation to complete
-        4. Shutting down the process pool
+        4. Writing queued task summaries to the shared state store
+        5. Shutting down the process pool
         """
         logger.info("Shutting down TaskService", background_tasks_count=len(self.background_tasks))
 
@@ -743,6 +886,9 @@ class TaskService:
                 if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
                     logger.warning("Background task raised exception during shutdown", error=str(result))
 
+        # Let the last task summaries reach the shared state store
+        await self.wait_published()
+
         # Shutdown the process pool
         if hasattr(self, "process_pool"):
             self.process_pool.shutdown(wait=True)
@@ -2,13 +2,14 @@
 
 import asyncio
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any
 
-from opensearchpy import AsyncOpenSearch, NotFoundError
-from opensearchpy._async.http_aiohttp import AIOHttpConnection
+from opensearchpy import NotFoundError
 
-from connectors.watson_news.enricher import get_watsonx_client
+from connectors.watson_news.enricher import WATSON_NEWS_EMBED_MODEL, get_watsonx_client
 from connectors.watson_news.etl_pipeline import (
     IDX_BOX_ENRICHED,
     IDX_BOX_RAW,
@@ -16,9 +17,11 @@ from connectors.watson_news.etl_pipeline import (
     IDX_NEWS_RAW,
     run_full_pipeline,
 )
+from connectors.watson_news.opensearch_client import get_opensearch
 from models.watson_news import (
     ArticleListResponse,
     BoxFileListResponse,
+    ETLJobStatus,
     ETLStatusResponse,
     SearchResultItem,
     TrendDataPoint,
@@ -26,15 +29,11 @@ from models.watson_news import (
     WatsonNewsSearchRequest,
     WatsonNewsSearchResponse,
 )
+from services.shared_state import get_shared_state
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-OPENSEARCH_HOST = os.getenv("OPENSEARCH_HOST", "localhost")
-OPENSEARCH_PORT = int(os.getenv("OPENSEARCH_PORT", "9200"))
-OPENSEARCH_USERNAME = os.getenv("OPENSEARCH_USERNAME", "admin")
-OPENSEARCH_PASSWORD = os.getenv("OPENSEARCH_PASSWORD", "")
-
 # Dimension of granite-embedding-107m-multilingual
 _EMBED_DIM = 384
 
@@ -46,19 +45,6 @@ _etl_status: dict[str, Any] = {
 }
 
 
-def _make_os() -> AsyncOpenSearch:
-    return AsyncOpenSearch(
-        hosts=[{"host": OPENSEARCH_HOST, "port": OPENSEARCH_PORT}],
-        connection_class=AIOHttpConnection,
-        scheme="https",
-        use_ssl=True,
-        verify_certs=False,
-        ssl_assert_fingerprint=None,
-        http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
-        http_compress=True,
-    )
-
-
 # ---------------------------------------------------------------------------
 # OpenSearch index management
 # ---------------------------------------------------------------------------
@@ -66,8 +52,6 @@ def _make_os() -> AsyncOpenSearch:
 _NEWS_ENRICHED_MAPPING = {
     "settings": {
         "index": {"knn": True},
-        "number_of_shards": 1,
-        "number_of_replicas": 0,
     },
     "mappings": {
         "properties": {
@@ -99,8 +83,6 @@ _NEWS_ENRICHED_MAPPING = {
 _BOX_ENRICHED_MAPPING = {
     "settings": {
         "index": {"knn": True},
-        "number_of_shards": 1,
-        "number_of_replicas": 0,
     },
     "mappings": {
         "properties": {
@@ -125,7 +107,6 @@ _BOX_ENRICHED_MAPPING = {
 
 _SIMPLE_MAPPINGS = {
     IDX_NEWS_RAW: {
-        "settings": {"number_of_shards": 1, "number_of_replicas": 0},
         "mappings": {
             "properties": {
                 "url": {"type": "keyword"},
@@ -136,7 +117,6 @@ _SIMPLE_MAPPINGS = {
         },
     },
     IDX_BOX_RAW: {
-        "settings": {"number_of_shards": 1, "number_of_replicas": 0},
         "mappings": {
             "properties": {
                 "box_file_id": {"type": "keyword"},
@@ -149,130 +129,456 @@ _SIMPLE_MAPPINGS = {
 
 
 async def ensure_indices() -> None:
-    """Create Watson News OpenSearch indices if they don't exist."""
-    os_client = _make_os()
-    try:
-        index_mappings = {
-            **_SIMPLE_MAPPINGS,
-            IDX_NEWS_ENRICHED: _NEWS_ENRICHED_MAPPING,
-            IDX_BOX_ENRICHED: _BOX_ENRICHED_MAPPING,
-            "watson_news_clean": {
-                "settings": {"number_of_shards": 1, "number_of_replicas": 0},
-                "mappings": {
-                    "properties": {
-                        "url": {"type": "keyword"},
-                        "source_type": {"type": "keyword"},
-                        "language": {"type": "keyword"},
-                        "published": {"type": "date"},
-                    }
-                },
+    """Create Watson News OpenSearch indices if they don't exist.
+
+    Shard, replica and refresh settings come from the index layout template.
+    """
+    os_client = get_opensearch()
+    index_mappings = {
+        **_SIMPLE_MAPPINGS,
+        IDX_NEWS_ENRICHED: _NEWS_ENRICHED_MAPPING,
+        IDX_BOX_ENRICHED: _BOX_ENRICHED_MAPPING,
+        "watson_news_clean": {
+            "mappings": {
+                "properties": {
+                    "url": {"type": "keyword"},
+                    "source_type": {"type": "keyword"},
+                    "language": {"type": "keyword"},
+                    "published": {"type": "date"},
+                }
             },
-        }
-        for idx, body in index_mappings.items():
-            try:
-                exists = await os_client.indices.exists(index=idx)
-                if not exists:
-                    await os_client.indices.create(index=idx, body=body)
-                    logger.info("Created OpenSearch index", index=idx)
-                else:
-                    logger.debug("OpenSearch index already exists", index=idx)
-            except Exception as exc:
-                logger.error(
-                    "Failed to create OpenSearch index",
-                    index=idx,
-                    error=str(exc),
-                )
-    finally:
-        await os_client.close()
+        },
+    }
+    for idx, body in index_mappings.items():
+        try:
+            exists = await os_client.indices.exists(index=idx)
+            if not exists:
+                await os_client.indices.create(index=idx, body=body)
+                logger.info("Created OpenSearch index", index=idx)
+            else:
+                logger.debug("OpenSearch index already exists", index=idx)
+        except Exception as exc:
+            logger.error(
+                "Failed to create OpenSearch index",
+                index=idx,
+                error=str(exc),
+            )
 
 
 # ---------------------------------------------------------------------------
 # Search
 # ---------------------------------------------------------------------------
 
-async def search_watson_news(req: WatsonNewsSearchRequest) -> WatsonNewsSearchResponse:
-    """Perform hybrid KNN + keyword search across Watson News and Box indices."""
-    os_client = _make_os()
-    client = get_watsonx_client()
+# Candidates fetched from each retriever before fusion for the first hybrid page;
+# later pages widen the window to twice the results served so far
+WATSON_NEWS_SEARCH_WINDOW = int(os.getenv("WATSON_NEWS_SEARCH_WINDOW", "100"))
+# How long the point in time behind a keyword or vector cursor stays open between pages
+WATSON_NEWS_SEARCH_PIT_KEEP_ALIVE = os.getenv("WATSON_NEWS_SEARCH_PIT_KEEP_ALIVE", "2m")
+WATSON_NEWS_QUERY_VECTOR_CACHE_SIZE = int(
+    os.getenv("WATSON_NEWS_QUERY_VECTOR_CACHE_SIZE", "512")
+)
 
-    try:
-        # Embed the query
-        vectors = await client.embed([req.query])
-        query_vector = vectors[0] if vectors else []
-
-        # Determine which indices to search
-        indices = []
-        if any(st in req.source_types for st in ("gdelt", "ibm_crawl")):
-            indices.append(IDX_NEWS_ENRICHED)
-        if "box" in req.source_types:
-            indices.append(IDX_BOX_ENRICHED)
-
-        if not indices:
-            return WatsonNewsSearchResponse(query=req.query, total=0, results=[])
-
-        # Build filters
-        filter_clauses: list[dict] = []
-        if req.source_types:
-            filter_clauses.append({"terms": {"source_type": req.source_types}})
-        if req.language:
-            filter_clauses.append({"term": {"language": req.language}})
-        if req.sentiment:
-            filter_clauses.append({"term": {"sentiment_label": req.sentiment}})
-        if req.topic:
-            filter_clauses.append({"term": {"topic": req.topic}})
-        if req.date_from or req.date_to:
-            date_range: dict = {}
-            if req.date_from:
-                date_range["gte"] = req.date_from
-            if req.date_to:
-                date_range["lte"] = req.date_to
-            filter_clauses.append({"range": {"published": date_range}})
-
-        knn_query: dict[str, Any] = {
-            "knn": {
-                "vector": {
-                    "vector": query_vector,
-                    "k": req.top_k,
-                }
+SEARCH_MODES = ("hybrid", "vector", "keyword")
+FUSION_METHODS = ("rrf", "blend")
+
+# Reciprocal Rank Fusion constant (Cormack et al.)
+_RRF_K = 60
+
+# Deepest hit a single query can return: OpenSearch's default index.max_result_window,
+# which also bounds the kNN k. Hybrid windows and vector-mode cursors stop there.
+_MAX_RETRIEVER_DEPTH = 10_000
+
+# First element of a next_search_after cursor
+_PIT_CURSOR = "pit"  # keyword/vector: ["pit", pit_id, served, *sort]
+_FUSED_CURSOR = "fused"  # hybrid: ["fused", served]
+_PIT_SORT = [{"_score": {"order": "desc"}}, {"_shard_doc": {"order": "asc"}}]
+
+# BM25 fields across the news (title/summary/clean_body) and Box (filename/clean_text) indices
+_KEYWORD_FIELDS = ["title^3", "summary^2", "clean_body", "filename^2", "clean_text"]
+
+# Large fields never returned by search
+_SEARCH_SOURCE_EXCLUDES = ["vector", "clean_body", "clean_text"]
+
+
+class QueryVectorCache:
+    """LRU cache of query embeddings keyed by embedding model and query text."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+
+    @staticmethod
+    def _key(query: str) -> tuple[str, str]:
+        return (WATSON_NEWS_EMBED_MODEL, " ".join(query.split()))
+
+    def get(self, query: str) -> list[float] | None:
+        key = self._key(query)
+        vector = self._entries.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return vector
+
+    def put(self, query: str, vector: list[float]) -> None:
+        if self.maxsize <= 0 or not vector:
+            return
+        key = self._key(query)
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_query_vector_cache = QueryVectorCache(WATSON_NEWS_QUERY_VECTOR_CACHE_SIZE)
+
+
+async def _embed_query(query: str) -> tuple[list[float], bool]:
+    """Return ``(vector, cache_hit)`` for *query*, calling watsonx only on a cache miss."""
+    cached = _query_vector_cache.get(query)
+    if cached is not None:
+        return cached, True
+    vectors = await get_watsonx_client().embed([query])
+    vector = vectors[0] if vectors else []
+    _query_vector_cache.put(query, vector)
+    return vector, False
+
+
+def _search_indices(source_types: list[str]) -> list[str]:
+    indices = []
+    if any(st in source_types for st in ("gdelt", "ibm_crawl")):
+        indices.append(IDX_NEWS_ENRICHED)
+    if "box" in source_types:
+        indices.append(IDX_BOX_ENRICHED)
+    return indices
+
+
+def _search_filters(req: WatsonNewsSearchRequest) -> list[dict]:
+    filter_clauses: list[dict] = []
+    if req.source_types:
+        filter_clauses.append({"terms": {"source_type": req.source_types}})
+    if req.language:
+        filter_clauses.append({"term": {"language": req.language}})
+    if req.sentiment:
+        filter_clauses.append({"term": {"sentiment_label": req.sentiment}})
+    if req.topic:
+        filter_clauses.append({"term": {"topic": req.topic}})
+    if req.date_from or req.date_to:
+        date_range: dict = {}
+        if req.date_from:
+            date_range["gte"] = req.date_from
+        if req.date_to:
+            date_range["lte"] = req.date_to
+        filter_clauses.append({"range": {"published": date_range}})
+    return filter_clauses
+
+
+def _keyword_body(query: str, filter_clauses: list[dict], size: int) -> dict:
+    # best_fields for ordinary term matching, plus a boosted phrase match so that
+    # exact names (e.g. "watsonx Orchestrate", "日本アイ・ビー・エム") rank first.
+    return {
+        "query": {
+            "bool": {
+                "should": [
+                    {"multi_match": {"query": query, "fields": _KEYWORD_FIELDS, "type": "best_fields"}},
+                    {
+                        "multi_match": {
+                            "query": query,
+                            "fields": _KEYWORD_FIELDS,
+                            "type": "phrase",
+                            "boost": 2.0,
+                        }
+                    },
+                ],
+                "minimum_should_match": 1,
+                "filter": filter_clauses,
             }
-        }
+        },
+        "size": size,
+        "track_total_hits": True,
+        "_source": {"excludes": _SEARCH_SOURCE_EXCLUDES},
+    }
+
+
+def _vector_body(vector: list[float], filter_clauses: list[dict], size: int, k: int | None = None) -> dict:
+    knn: dict[str, Any] = {"vector": vector, "k": k or size}
+    if filter_clauses:
+        knn["filter"] = {"bool": {"must": filter_clauses}}
+    return {
+        "query": {"knn": {"vector": knn}},
+        "size": size,
+        "_source": {"excludes": _SEARCH_SOURCE_EXCLUDES},
+    }
+
+
+def _hit_key(hit: dict) -> str:
+    return f"{hit.get('_index', '')}/{hit['_id']}"
+
+
+def _raw_scores(hits: list[dict]) -> list[tuple[float, str, dict]]:
+    return [(float(hit.get("_score") or 0.0), _hit_key(hit), hit) for hit in hits]
+
+
+def _rrf_fuse(*ranked: list[dict], k: int = _RRF_K) -> list[tuple[float, str, dict]]:
+    """Reciprocal Rank Fusion: ``score = sum(1 / (k + rank))`` over every ranked list."""
+    scores: dict[str, float] = {}
+    hits: dict[str, dict] = {}
+    for hit_list in ranked:
+        for rank, hit in enumerate(hit_list, start=1):
+            key = _hit_key(hit)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            hits.setdefault(key, hit)
+    return [(score, key, hits[key]) for key, score in scores.items()]
+
+
+def _normalize(hits: list[dict]) -> dict[str, float]:
+    """Min-max normalize ``_score`` to 0..1 (a single or constant score maps to 1)."""
+    if not hits:
+        return {}
+    raw = {_hit_key(h): float(h.get("_score") or 0.0) for h in hits}
+    low, high = min(raw.values()), max(raw.values())
+    if high == low:
+        return {key: 1.0 for key in raw}
+    return {key: (score - low) / (high - low) for key, score in raw.items()}
+
+
+def _blend_fuse(
+    keyword_hits: list[dict],
+    vector_hits: list[dict],
+    keyword_weight: float,
+) -> list[tuple[float, str, dict]]:
+    """Weighted sum of min-max normalized BM25 and kNN scores."""
+    keyword_weight = min(max(keyword_weight, 0.0), 1.0)
+    keyword_scores = _normalize(keyword_hits)
+    vector_scores = _normalize(vector_hits)
+    hits = {_hit_key(h): h for h in (*vector_hits, *keyword_hits)}
+    return [
+        (
+            keyword_weight * keyword_scores.get(key, 0.0)
+            + (1.0 - keyword_weight) * vector_scores.get(key, 0.0),
+            key,
+            hit,
+        )
+        for key, hit in hits.items()
+    ]
 
-        if filter_clauses:
-            knn_query["knn"]["vector"]["filter"] = {"bool": {"must": filter_clauses}}
 
-        os_body: dict = {
-            "query": knn_query,
-            "size": req.top_k,
-        }
+def _parse_cursor(search_after: list[Any] | None, mode: str) -> tuple[str | None, int, list[Any] | None]:
+    """``(pit_id, served, sort_values)`` of a ``next_search_after`` cursor for *mode*."""
+    if not search_after:
+        return None, 0, None
+    try:
+        if mode == "hybrid":
+            tag, served = search_after
+            if tag != _FUSED_CURSOR:
+                raise ValueError
+            return None, int(served), None
+        tag, pit_id, served, *sort_values = search_after
+        if tag != _PIT_CURSOR or not sort_values:
+            raise ValueError
+        return str(pit_id), int(served), sort_values
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"search_after must be the next_search_after cursor of a previous {mode} search"
+        ) from None
+
+
+def _hybrid_window(served: int, size: int) -> int:
+    """Candidates per retriever for a fused page: twice the depth reached, at least the configured window."""
+    return min(_MAX_RETRIEVER_DEPTH, max(WATSON_NEWS_SEARCH_WINDOW, 2 * (served + size)))
+
+
+def _fused_page(
+    scored: list[tuple[float, str, dict]],
+    served: int,
+    size: int,
+) -> tuple[list[tuple[float, str, dict]], list[Any] | None]:
+    """Sort by ``(score desc, key asc)`` and return the page after the *served* results."""
+    ordered = sorted(scored, key=lambda item: (-item[0], item[1]))
+    page = ordered[served : served + size]
+    next_cursor = [_FUSED_CURSOR, served + len(page)] if len(ordered) > served + size else None
+    return page, next_cursor
+
+
+async def _close_pit(os_client, pit_id: str) -> None:
+    try:
+        await os_client.delete_pit(body={"pit_id": [pit_id]})
+    except Exception as exc:
+        logger.debug("Failed to delete search point in time", error=str(exc))
+
+
+def _to_result_item(score: float, hit: dict) -> SearchResultItem:
+    source = hit.get("_source", {})
+    return SearchResultItem(
+        id=hit["_id"],
+        source_type=source.get("source_type", ""),
+        score=score,
+        url=source.get("url", ""),
+        title=source.get("title", ""),
+        summary=source.get("summary", ""),
+        sentiment_label=source.get("sentiment_label", ""),
+        topic=source.get("topic", ""),
+        language=source.get("language", ""),
+        published=source.get("published", ""),
+        filename=source.get("filename", ""),
+    )
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
 
-        resp = await os_client.search(
-            index=",".join(indices),
-            body=os_body,
+
+async def search_watson_news(req: WatsonNewsSearchRequest) -> WatsonNewsSearchResponse:
+    """Search Watson News and Box indices with BM25, kNN, or both fused.
+
+    ``hybrid`` (default) runs a BM25 query over title/summary/body and a kNN
+    query concurrently, then fuses the two candidate lists with Reciprocal Rank
+    Fusion (``fusion="rrf"``) or a weighted blend of min-max normalized scores
+    (``fusion="blend"``). ``keyword`` skips the embedding call entirely.
+
+    Query embeddings are served from an in-process LRU cache. Results are paged
+    with the ``next_search_after`` cursor. ``keyword`` and ``vector`` pages come
+    from an OpenSearch point in time with ``search_after``, so every keyword match
+    is reachable; vector pages grow the kNN ``k`` with the depth. ``hybrid`` pages
+    re-run both retrievers with a window of twice the results served so far (at
+    least ``WATSON_NEWS_SEARCH_WINDOW``). Both stop at ``_MAX_RETRIEVER_DEPTH``
+    hits per retriever, OpenSearch's default result window.
+    """
+    if req.mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{req.mode}', expected one of {SEARCH_MODES}")
+    if req.fusion not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{req.fusion}', expected one of {FUSION_METHODS}")
+    pit_id, served, sort_values = _parse_cursor(req.search_after, req.mode)
+
+    started = time.perf_counter()
+    indices = _search_indices(req.source_types)
+    if not indices:
+        return WatsonNewsSearchResponse(
+            query=req.query, total=0, results=[], mode=req.mode, search_window=WATSON_NEWS_SEARCH_WINDOW
         )
 
+    os_client = get_opensearch()
+    index = ",".join(indices)
+    filter_clauses = _search_filters(req)
+    timings: dict[str, float] = {}
+    cache_hit = False
+
+    async def _query_vector() -> list[float]:
+        nonlocal cache_hit
+        leg_started = time.perf_counter()
+        try:
+            vector, cache_hit = await _embed_query(req.query)
+        finally:
+            timings["embed"] = _elapsed_ms(leg_started)
+        return vector
+
+    def _response(page, total, total_matches, window, next_cursor) -> WatsonNewsSearchResponse:
+        timings["total"] = _elapsed_ms(started)
+        return WatsonNewsSearchResponse(
+            query=req.query,
+            total=total,
+            total_matches=total_matches,
+            results=[_to_result_item(score, hit) for score, _, hit in page],
+            mode=req.mode,
+            search_window=window,
+            next_search_after=next_cursor,
+            embedding_cache_hit=cache_hit,
+            timings_ms=timings,
+        )
+
+    if req.mode != "hybrid":
+        # One extra hit tells whether another page follows
+        size = req.top_k + 1
+        window = 0
+        if req.mode == "vector":
+            vector = await _query_vector()
+            if not vector:
+                if pit_id is not None:
+                    await _close_pit(os_client, pit_id)
+                return _response([], 0, 0, 0, None)
+            window = min(_MAX_RETRIEVER_DEPTH, max(WATSON_NEWS_SEARCH_WINDOW, served + size))
+            body = _vector_body(vector, filter_clauses, size, k=window)
+        else:
+            body = _keyword_body(req.query, filter_clauses, size)
+
+        leg_started = time.perf_counter()
+        if pit_id is None:
+            pit_id = (
+                await os_client.create_pit(index=index, keep_alive=WATSON_NEWS_SEARCH_PIT_KEEP_ALIVE)
+            )["pit_id"]
+        body.update(
+            pit={"id": pit_id, "keep_alive": WATSON_NEWS_SEARCH_PIT_KEEP_ALIVE},
+            sort=_PIT_SORT,
+            track_scores=True,
+        )
+        if sort_values:
+            body["search_after"] = sort_values
+        try:
+            resp = await os_client.search(body=body)
+        except NotFoundError:
+            raise ValueError("The search_after cursor has expired; start the search again") from None
+        timings[req.mode] = _elapsed_ms(leg_started)
+
+        pit_id = resp.get("pit_id", pit_id)
         hits = resp["hits"]["hits"]
-        total = resp["hits"]["total"]["value"]
-
-        results = [
-            SearchResultItem(
-                id=hit["_id"],
-                source_type=hit["_source"].get("source_type", ""),
-                score=hit["_score"] or 0.0,
-                url=hit["_source"].get("url", ""),
-                title=hit["_source"].get("title", ""),
-                summary=hit["_source"].get("summary", ""),
-                sentiment_label=hit["_source"].get("sentiment_label", ""),
-                topic=hit["_source"].get("topic", ""),
-                language=hit["_source"].get("language", ""),
-                published=hit["_source"].get("published", ""),
-                filename=hit["_source"].get("filename", ""),
-            )
-            for hit in hits
-        ]
+        page = _raw_scores(hits[: req.top_k])
+        if len(hits) > req.top_k:
+            next_cursor = [_PIT_CURSOR, pit_id, served + len(page), *hits[req.top_k - 1]["sort"]]
+        else:
+            next_cursor = None
+            await _close_pit(os_client, pit_id)
+        matched = resp["hits"]["total"]["value"]
+        return _response(page, matched, matched, window, next_cursor)
+
+    window = _hybrid_window(served, req.top_k)
+
+    async def _keyword_leg() -> tuple[list[dict], int]:
+        leg_started = time.perf_counter()
+        resp = await os_client.search(index=index, body=_keyword_body(req.query, filter_clauses, window))
+        timings["keyword"] = _elapsed_ms(leg_started)
+        return resp["hits"]["hits"], resp["hits"]["total"]["value"]
+
+    async def _vector_leg() -> tuple[list[dict], int]:
+        try:
+            vector = await _query_vector()
+        except Exception as exc:
+            # Hybrid search degrades to keyword-only when the embedding service is down
+            logger.warning("Query embedding failed, using keyword results only", error=str(exc))
+            return [], 0
+        if not vector:
+            return [], 0
+        leg_started = time.perf_counter()
+        resp = await os_client.search(index=index, body=_vector_body(vector, filter_clauses, window))
+        timings["vector"] = _elapsed_ms(leg_started)
+        return resp["hits"]["hits"], resp["hits"]["total"]["value"]
+
+    (keyword_hits, keyword_total), (vector_hits, vector_total) = await asyncio.gather(
+        _keyword_leg(), _vector_leg()
+    )
+
+    fusion_started = time.perf_counter()
+    if req.fusion == "blend":
+        scored = _blend_fuse(keyword_hits, vector_hits, req.keyword_weight)
+    else:
+        scored = _rrf_fuse(keyword_hits, vector_hits)
+    page, next_cursor = _fused_page(scored, served, req.top_k)
+    timings["fusion"] = _elapsed_ms(fusion_started)
 
-        return WatsonNewsSearchResponse(query=req.query, total=total, results=results)
-    finally:
-        await os_client.close()
+    total_matches = max(keyword_total, vector_total, len(scored))
+    # Every match is reachable by widening the window, up to the per-retriever limit
+    total = max(len(scored), min(total_matches, _MAX_RETRIEVER_DEPTH))
+    return _response(page, total, total_matches, window, next_cursor)
 
 
 # ---------------------------------------------------------------------------
@@ -285,43 +591,40 @@ async def list_articles(
     source_type: str | None = None,
     language: str | None = None,
 ) -> ArticleListResponse:
-    os_client = _make_os()
-    try:
-        filters: list[dict] = []
-        if source_type:
-            filters.append({"term": {"source_type": source_type}})
-        if language:
-            filters.append({"term": {"language": language}})
-
-        query = {"bool": {"must": filters}} if filters else {"match_all": {}}
-        from_ = (page - 1) * page_size
-
-        resp = await os_client.search(
-            index=IDX_NEWS_ENRICHED,
-            body={
-                "query": query,
-                "from": from_,
-                "size": page_size,
-                "sort": [{"published": {"order": "desc"}}],
-                "_source": {
-                    "excludes": ["vector", "clean_body"]
-                },
+    os_client = get_opensearch()
+    filters: list[dict] = []
+    if source_type:
+        filters.append({"term": {"source_type": source_type}})
+    if language:
+        filters.append({"term": {"language": language}})
+
+    query = {"bool": {"must": filters}} if filters else {"match_all": {}}
+    from_ = (page - 1) * page_size
+
+    resp = await os_client.search(
+        index=IDX_NEWS_ENRICHED,
+        body={
+            "query": query,
+            "from": from_,
+            "size": page_size,
+            "sort": [{"published": {"order": "desc"}}],
+            "_source": {
+                "excludes": ["vector", "clean_body"]
             },
-        )
-        hits = resp["hits"]["hits"]
-        total = resp["hits"]["total"]["value"]
-        return ArticleListResponse(
-            total=total,
-            page=page,
-            page_size=page_size,
-            articles=[{"id": h["_id"], **h["_source"]} for h in hits],
-        )
-    finally:
-        await os_client.close()
+        },
+    )
+    hits = resp["hits"]["hits"]
+    total = resp["hits"]["total"]["value"]
+    return ArticleListResponse(
+        total=total,
+        page=page,
+        page_size=page_size,
+        articles=[{"id": h["_id"], **h["_source"]} for h in hits],
+    )
 
 
 async def get_article(article_id: str) -> dict[str, Any] | None:
-    os_client = _make_os()
+    os_client = get_opensearch()
     try:
         resp = await os_client.get(index=IDX_NEWS_ENRICHED, id=article_id)
         doc = resp["_source"]
@@ -331,8 +634,6 @@ async def get_article(article_id: str) -> dict[str, Any] | None:
         return doc
     except NotFoundError:
         return None
-    finally:
-        await os_client.close()
 
 
 # ---------------------------------------------------------------------------
@@ -340,30 +641,27 @@ async def get_article(article_id: str) -> dict[str, Any] | None:
 # ---------------------------------------------------------------------------
 
 async def list_box_files(page: int = 1, page_size: int = 20) -> BoxFileListResponse:
-    os_client = _make_os()
-    try:
-        from_ = (page - 1) * page_size
-        resp = await os_client.search(
-            index=IDX_BOX_RAW,
-            body={
-                "query": {"match_all": {}},
-                "from": from_,
-                "size": page_size,
-                "sort": [{"updated_at": {"order": "desc"}}],
-            },
-        )
-        hits = resp["hits"]["hits"]
-        total = resp["hits"]["total"]["value"]
-        return BoxFileListResponse(
-            total=total,
-            files=[{"id": h["_id"], **h["_source"]} for h in hits],
-        )
-    finally:
-        await os_client.close()
+    os_client = get_opensearch()
+    from_ = (page - 1) * page_size
+    resp = await os_client.search(
+        index=IDX_BOX_RAW,
+        body={
+            "query": {"match_all": {}},
+            "from": from_,
+            "size": page_size,
+            "sort": [{"updated_at": {"order": "desc"}}],
+        },
+    )
+    hits = resp["hits"]["hits"]
+    total = resp["hits"]["total"]["value"]
+    return BoxFileListResponse(
+        total=total,
+        files=[{"id": h["_id"], **h["_source"]} for h in hits],
+    )
 
 
 async def get_box_file(file_id: str) -> dict[str, Any] | None:
-    os_client = _make_os()
+    os_client = get_opensearch()
     try:
         # File metadata
         file_resp = await os_client.get(index=IDX_BOX_RAW, id=file_id)
@@ -386,8 +684,6 @@ async def get_box_file(file_id: str) -> dict[str, Any] | None:
         return file_data
     except NotFoundError:
         return None
-    finally:
-        await os_client.close()
 
 
 # ---------------------------------------------------------------------------
@@ -396,37 +692,34 @@ async def get_box_file(file_id: str) -> dict[str, Any] | None:
 
 async def get_trends(period: str = "7d") -> TrendResponse:
     """Return daily article counts and average sentiment for the last *period*."""
-    os_client = _make_os()
-    try:
-        resp = await os_client.search(
-            index=IDX_NEWS_ENRICHED,
-            body={
-                "size": 0,
-                "aggs": {
-                    "by_day": {
-                        "date_histogram": {
-                            "field": "published",
-                            "calendar_interval": "day",
-                        },
-                        "aggs": {
-                            "avg_sentiment": {"avg": {"field": "sentiment_score"}}
-                        },
-                    }
-                },
+    os_client = get_opensearch()
+    resp = await os_client.search(
+        index=IDX_NEWS_ENRICHED,
+        body={
+            "size": 0,
+            "aggs": {
+                "by_day": {
+                    "date_histogram": {
+                        "field": "published",
+                        "calendar_interval": "day",
+                    },
+                    "aggs": {
+                        "avg_sentiment": {"avg": {"field": "sentiment_score"}}
+                    },
+                }
             },
+        },
+    )
+    buckets = resp["aggregations"]["by_day"]["buckets"]
+    data = [
+        TrendDataPoint(
+            date=b["key_as_string"],
+            count=b["doc_count"],
+            sentiment_avg=round(b["avg_sentiment"]["value"] or 0.0, 3),
         )
-        buckets = resp["aggregations"]["by_day"]["buckets"]
-        data = [
-            TrendDataPoint(
-                date=b["key_as_string"],
-                count=b["doc_count"],
-                sentiment_avg=round(b["avg_sentiment"]["value"] or 0.0, 3),
-            )
-            for b in buckets
-        ]
-        return TrendResponse(period=period, data=data)
-    finally:
-        await os_client.close()
+        for b in buckets
+    ]
+    return TrendResponse(period=period, data=data)
 
 
 # ---------------------------------------------------------------------------
@@ -439,16 +732,77 @@ async def trigger_etl() -> dict[str, Any]:
     now = datetime.now(tz=timezone.utc).isoformat()
     _etl_status["gdelt_last_run"] = now
     _etl_status["ibm_crawl_last_run"] = now
+    store = get_shared_state()
+    if store is not None:
+        try:
+            store.put("watson_news", "etl_status", _etl_status)
+        except Exception as exc:
+            logger.warning("Failed to publish Watson News ETL status", error=str(exc))
     return result
 
 
-def get_etl_status() -> ETLStatusResponse:
-    from connectors.watson_news.scheduler import _scheduler
+def _manual_run_status() -> dict[str, Any]:
+    """Manual-trigger timestamps, including runs triggered on other workers."""
+    store = get_shared_state()
+    if store is None:
+        return _etl_status
+    try:
+        shared = store.get("watson_news", "etl_status") or {}
+    except Exception as exc:
+        logger.warning("Failed to read Watson News ETL status", error=str(exc))
+        return _etl_status
+    return {
+        key: _latest(_etl_status.get(key), shared.get(key)) if key.endswith("_last_run") else _etl_status.get(key)
+        for key in _etl_status
+    }
 
-    running = bool(_scheduler and _scheduler.running)
+
+def _latest(*timestamps: str | None) -> str | None:
+    """Return the most recent of the given UTC ISO-8601 timestamps."""
+    present = [ts for ts in timestamps if ts]
+    return max(present) if present else None
+
+
+def get_etl_status() -> ETLStatusResponse:
+    """Combine manual-trigger timestamps with per-job scheduler run state."""
+    from connectors.watson_news import scheduler
+
+    sched = scheduler._scheduler
+    running = bool(sched and sched.running)
+    # In multi-worker mode the scheduler runs on the leader worker only
+    published = None if running else scheduler.get_published_states()
+
+    jobs: dict[str, ETLJobStatus] = {}
+    if published is not None:
+        running = bool(published.get("scheduler_running"))
+        for job_id, state in published.get("job_states", {}).items():
+            jobs[job_id] = ETLJobStatus(**state)
+        for job_id, next_run_at in published.get("next_run_at", {}).items():
+            jobs.setdefault(job_id, ETLJobStatus(job_id=job_id)).next_run_at = next_run_at
+    else:
+        for job_id, state in scheduler.get_job_states().items():
+            jobs[job_id] = ETLJobStatus(**state)
+    if sched and sched.running:
+        for job in sched.get_jobs():
+            status = jobs.setdefault(job.id, ETLJobStatus(job_id=job.id))
+            if job.next_run_time:
+                status.next_run_at = job.next_run_time.isoformat()
+
+    ibm_runs = [
+        status.last_finished_at
+        for job_id, status in jobs.items()
+        if job_id.startswith(scheduler.IBM_CRAWL_JOB_PREFIX)
+    ]
+    gdelt_job = jobs.get(scheduler.GDELT_JOB_ID)
+
+    manual = _manual_run_status()
     return ETLStatusResponse(
-        gdelt_last_run=_etl_status.get("gdelt_last_run"),
-        ibm_crawl_last_run=_etl_status.get("ibm_crawl_last_run"),
-        box_last_run=_etl_status.get("box_last_run"),
+        gdelt_last_run=_latest(
+            manual.get("gdelt_last_run"),
+            gdelt_job.last_finished_at if gdelt_job else None,
+        ),
+        ibm_crawl_last_run=_latest(manual.get("ibm_crawl_last_run"), *ibm_runs),
+        box_last_run=manual.get("box_last_run"),
         scheduler_running=running,
+        jobs=jobs,
     )
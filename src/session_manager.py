@@ -1,6 +1,9 @@
+import hashlib
 import json
 import jwt
-import httpx
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 from dataclasses import dataclass, asdict
@@ -8,6 +11,8 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, ec, ed25519, ed448
 
 import os
+from services.shared_state import get_shared_state
+from utils.http_clients import shared_http_client
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -15,6 +20,75 @@ logger = get_logger(__name__)
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
+
+# Maximum number of verified JWTs kept in memory (0 disables the cache)
+JWT_VERIFY_CACHE_SIZE = int(os.getenv("JWT_VERIFY_CACHE_SIZE", "10000"))
+
+
+class VerifiedTokenCache:
+    """LRU cache of verified JWT payloads keyed by a SHA-256 digest of the token
+
+    Entries live until the token's ``exp`` claim, so a cached token is never accepted
+    after it would have failed verification. Tokens without ``exp`` and rejected
+    tokens are never cached.
+    """
+
+    def __init__(self, max_size: int = JWT_VERIFY_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # digest -> (exp, payload)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            exp, payload = entry
+            if time.time() >= exp:
+                del self._entries[digest]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, digest: str, payload: Dict[str, Any]):
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (exp, dict(payload))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
+
+
 @dataclass
 class User:
     """User information from OAuth provider"""
@@ -65,6 +139,11 @@ class SessionManager:
         self.private_key_path = private_key_path
         self.public_key_path = public_key_path
 
+        # Verified tokens, shared by cookie auth and OpenSearch token introspection
+        self.token_cache = VerifiedTokenCache()
+        # Users logged in through other worker processes (multi-worker mode only)
+        self.shared_state = get_shared_state()
+
         # Configure JWT signing (checks env var first, falls back to key files)
         self._configure_jwt_signing()
 
@@ -136,7 +215,7 @@ class SessionManager:
     ) -> Optional[Dict[str, Any]]:
         """Get user info from Google using access token"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client("google") as client:
                 response = await client.get(
                     "https://www.googleapis.com/oauth2/v2/userinfo",
                     headers={"Authorization": f"Bearer {access_token}"},
@@ -179,6 +258,7 @@ class SessionManager:
             self.users[user_id].last_login = datetime.now()
         else:
             self.users[user_id] = user
+        self._publish_user(self.users[user_id])
 
         # Create JWT token using the shared method
         return self.create_jwt_token(user)
@@ -219,7 +299,15 @@ class SessionManager:
         return token
 
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify JWT token and return user info"""
+        """Verify JWT token and return user info
+
+        Successful verifications are cached until the token expires, so the
+        signature check runs once per token rather than once per request.
+        """
+        digest = self.token_cache.digest(token)
+        cached = self.token_cache.get(digest)
+        if cached is not None:
+            return cached
         try:
             payload = jwt.decode(
                 token,
@@ -227,15 +315,37 @@ class SessionManager:
                 algorithms=[self.algorithm],
                 audience=["opensearch", "openrag"],
             )
+            self.token_cache.put(digest, payload)
             return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
 
+    def _publish_user(self, user: User):
+        """Make a logged-in user visible to the other worker processes"""
+        if self.shared_state is None:
+            return
+        try:
+            self.shared_state.put("users", user.user_id, asdict(user))
+        except Exception as e:
+            logger.warning("Failed to publish user to shared state", user_id=user.user_id, error=str(e))
+
     def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        return self.users.get(user_id)
+        user = self.users.get(user_id)
+        if user is None and self.shared_state is not None:
+            try:
+                data = self.shared_state.get("users", user_id)
+            except Exception as e:
+                logger.warning("Failed to read user from shared state", user_id=user_id, error=str(e))
+                data = None
+            if data:
+                for field_name in ("created_at", "last_login"):
+                    if data.get(field_name):
+                        data[field_name] = datetime.fromisoformat(data[field_name])
+                user = self.users[user_id] = User(**data)
+        return user
 
     def get_user_from_token(self, token: str) -> Optional[User]:
         """Get user from JWT token"""
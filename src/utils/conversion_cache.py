@@ -0,0 +1,172 @@
+"""
+Content-addressed cache of docling conversion results.
+
+Docling conversion (layout analysis, OCR, table structure) is the slowest stage of
+ingestion. Its ``extract_relevant`` output is cached on local disk, keyed by the
+file's content hash plus a fingerprint of the converter's pipeline options and the
+docling version. Re-uploading the same bytes, re-syncing an unchanged connector
+file or attaching the same file to several conversations then skips the converter.
+
+Entries are gzip-compressed JSON files written to a temporary file and renamed
+into place, so the backend and the process-pool workers can share the directory
+and a reader never sees a partial entry. Reading an entry refreshes its mtime.
+When the directory grows past ``DOCLING_CACHE_MAX_BYTES``, the least recently used
+entries are evicted.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from utils.logging_config import get_logger
+from utils.metrics import DOCLING_CACHE_BYTES_SAVED, DOCLING_CACHE_HITS, DOCLING_CACHE_MISSES
+
+logger = get_logger(__name__)
+
+DOCLING_CACHE_ENABLED = os.getenv("DOCLING_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+DOCLING_CACHE_DIR = os.getenv("DOCLING_CACHE_DIR", "data/docling_cache")
+DOCLING_CACHE_MAX_BYTES = int(os.getenv("DOCLING_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+# Bump when the cached payload (extract_relevant output) changes shape
+CACHE_FORMAT_VERSION = 1
+ENTRY_SUFFIX = ".json.gz"
+
+
+@lru_cache(maxsize=1)
+def _docling_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("docling")
+    except Exception:
+        return "unknown"
+
+
+def pipeline_fingerprint(options: Optional[Dict[str, Any]]) -> str:
+    """Short stable hash of the converter's pipeline options and the docling version"""
+    payload = json.dumps(
+        {"format": CACHE_FORMAT_VERSION, "docling": _docling_version(), "options": options or {}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ConversionCache:
+    """Conversion results on disk by ``(content hash, pipeline fingerprint)``"""
+
+    def __init__(self, directory: str = DOCLING_CACHE_DIR, max_bytes: int = DOCLING_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Size of the directory as last seen by this process; a full scan corrects it
+        self._approx_bytes: Optional[int] = None
+
+    def _path(self, content_hash: str, fingerprint: str) -> str:
+        name = f"{content_hash}-{fingerprint}{ENTRY_SUFFIX}"
+        return os.path.join(self.directory, content_hash[:2], name)
+
+    def get(self, content_hash: str, fingerprint: str, source: str = "file") -> Optional[Dict[str, Any]]:
+        path = self._path(content_hash, fingerprint)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            DOCLING_CACHE_MISSES.inc(source=source)
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            # Not produced by an atomic write (e.g. disk full); drop it and convert again
+            logger.warning("Discarding unreadable conversion cache entry", path=path, error=str(e))
+            self._remove(path)
+            DOCLING_CACHE_MISSES.inc(source=source)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        DOCLING_CACHE_HITS.inc(source=source)
+        DOCLING_CACHE_BYTES_SAVED.inc(entry.get("source_bytes", 0), source=source)
+        return entry["result"]
+
+    def put(
+        self, content_hash: str, fingerprint: str, result: Dict[str, Any], source_bytes: int = 0
+    ) -> None:
+        path = self._path(content_hash, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as f:
+                    f.write(
+                        json.dumps({"source_bytes": source_bytes, "result": result}).encode("utf-8")
+                    )
+                raw.flush()
+                os.fsync(raw.fileno())
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write conversion cache entry", path=path, error=str(e))
+            self._remove(tmp_path)
+            return
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan_size()
+        else:
+            self._approx_bytes += size
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(ENTRY_SUFFIX):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # Evicted by another process
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits; returns entries removed"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                removed += 1
+            total -= size
+        self._approx_bytes = total
+        if removed:
+            logger.info("Evicted conversion cache entries", removed=removed, cache_bytes=total)
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+_cache: Optional[ConversionCache] = None
+
+
+def get_conversion_cache() -> Optional[ConversionCache]:
+    """The process-wide cache, or ``None`` when disabled"""
+    global _cache
+    if not DOCLING_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ConversionCache()
+    return _cache
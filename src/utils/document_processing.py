@@ -31,7 +31,9 @@ def create_document_converter(ocr_engine: str | None = None):
         )
         from docling.document_converter import DocumentConverter  # type: ignore
 
-        return DocumentConverter()
+        converter = DocumentConverter()
+        _record_pipeline_options(converter, {"defaults": True})
+        return converter
 
     pipeline_options = PdfPipelineOptions()
     pipeline_options.do_ocr = False
@@ -71,6 +73,9 @@ def create_document_converter(ocr_engine: str | None = None):
             error=str(exc),
         )
         converter = DocumentConverter()
+        _record_pipeline_options(converter, {"defaults": True})
+    else:
+        _record_pipeline_options(converter, _describe_pipeline_options(pipeline_options, ocr_engine))
 
     logger.info(
         "Docling converter initialized",
@@ -81,6 +86,86 @@ def create_document_converter(ocr_engine: str | None = None):
     return converter
 
 
+def _describe_pipeline_options(pipeline_options, ocr_engine: str | None) -> dict:
+    """Options that change the conversion output (part of the conversion cache key)"""
+    table_options = getattr(pipeline_options, "table_structure_options", None)
+    table_mode = getattr(table_options, "mode", None)
+    return {
+        "do_ocr": bool(getattr(pipeline_options, "do_ocr", False)),
+        "ocr_engine": ocr_engine if getattr(pipeline_options, "do_ocr", False) else None,
+        "do_table_structure": bool(getattr(pipeline_options, "do_table_structure", False)),
+        "table_mode": getattr(table_mode, "value", table_mode),
+        "do_cell_matching": getattr(table_options, "do_cell_matching", None),
+        "do_picture_classification": bool(getattr(pipeline_options, "do_picture_classification", False)),
+        "do_picture_description": bool(getattr(pipeline_options, "do_picture_description", False)),
+    }
+
+
+def _record_pipeline_options(converter, options: dict) -> None:
+    try:
+        converter.openrag_pipeline_options = options
+    except AttributeError:  # pragma: no cover - converter without instance attributes
+        pass
+
+
+def converter_pipeline_options(converter) -> dict:
+    """Pipeline options a converter was created with"""
+    options = getattr(converter, "openrag_pipeline_options", None)
+    if options is None:
+        return {"converter": type(converter).__name__}
+    return options
+
+
+def _source_size(source) -> int:
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            return os.path.getsize(source)
+        stream = getattr(source, "stream", source)
+        return len(stream.getbuffer())
+    except Exception:
+        return 0
+
+
+def _source_filename(source) -> str | None:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return getattr(source, "name", None)
+
+
+def convert_and_extract(converter, source, content_hash: str | None = None, source_label: str = "file") -> dict:
+    """
+    Convert a file path or DocumentStream with docling and return extract_relevant() output.
+
+    With a content hash, the result is looked up in (and stored to) the conversion
+    cache, keyed by the hash and the converter's pipeline options, so identical bytes
+    are only converted once.
+    """
+    from utils.conversion_cache import get_conversion_cache, pipeline_fingerprint
+    from utils.metrics import DOCLING_SECONDS, timed
+
+    cache = get_conversion_cache() if content_hash else None
+    fingerprint = pipeline_fingerprint(converter_pipeline_options(converter)) if cache else None
+    if cache is not None:
+        slim_doc = cache.get(content_hash, fingerprint, source=source_label)
+    else:
+        slim_doc = None
+
+    if slim_doc is not None:
+        logger.info("Docling conversion served from cache", content_hash=content_hash[:12])
+    else:
+        with timed(DOCLING_SECONDS, source=source_label):
+            result = converter.convert(source)
+        slim_doc = extract_relevant(result.document.export_to_dict())
+        if cache is not None:
+            cache.put(content_hash, fingerprint, slim_doc, source_bytes=_source_size(source))
+
+    # A cached entry carries the filename of whichever upload populated it
+    filename = _source_filename(source)
+    if filename:
+        slim_doc["filename"] = filename
+    return slim_doc
+
+
 def get_worker_converter():
     """Get or create a DocumentConverter instance for this worker process"""
     global _worker_converter
@@ -320,7 +405,7 @@ def process_document_sync(file_path: str):
             traceback.print_exc()
             raise
 
-        # Convert with docling
+        # Convert with docling (or reuse a cached conversion of the same bytes)
         try:
             logger.info("Starting docling conversion", worker_pid=os.getpid())
             memory_before_convert = process.memory_info().rss / 1024 / 1024
@@ -330,7 +415,7 @@ def process_document_sync(file_path: str):
                 memory_mb=f"{memory_before_convert:.1f}",
             )
 
-            result = converter.convert(file_path)
+            slim_doc = convert_and_extract(converter, file_path, file_hash, source_label="worker")
 
             memory_after_convert = process.memory_info().rss / 1024 / 1024
             logger.info(
@@ -340,14 +425,6 @@ def process_document_sync(file_path: str):
             )
             logger.info("Docling conversion completed", worker_pid=os.getpid())
 
-            full_doc = result.document.export_to_dict()
-            memory_after_export = process.memory_info().rss / 1024 / 1024
-            logger.info(
-                "Memory after export",
-                worker_pid=os.getpid(),
-                memory_mb=f"{memory_after_export:.1f}",
-            )
-
         except Exception as e:
             current_memory = process.memory_info().rss / 1024 / 1024
             logger.error(
@@ -359,42 +436,17 @@ def process_document_sync(file_path: str):
             traceback.print_exc()
             raise
 
-        # Extract relevant content (same logic as extract_relevant)
-        try:
-            logger.info("Extracting relevant content", worker_pid=os.getpid())
-            origin = full_doc.get("origin", {})
-            texts = full_doc.get("texts", [])
-            logger.info(
-                "Found text fragments",
-                worker_pid=os.getpid(),
-                fragment_count=len(texts),
-            )
-
-            page_texts = defaultdict(list)
-            for txt in texts:
-                prov = txt.get("prov", [])
-                page_no = prov[0].get("page_no") if prov else None
-                if page_no is not None:
-                    page_texts[page_no].append(txt.get("text", "").strip())
-
-            chunks = []
-            for page in sorted(page_texts):
-                joined = "\n".join(page_texts[page])
-                chunks.append({"page": page, "text": joined})
-
-            logger.info(
-                "Created chunks from pages",
-                worker_pid=os.getpid(),
-                chunk_count=len(chunks),
-                page_count=len(page_texts),
-            )
-
-        except Exception as e:
-            logger.error(
-                "Failed during content extraction", worker_pid=os.getpid(), error=str(e)
-            )
-            traceback.print_exc()
-            raise
+        # Page text chunks (tables are not indexed on this path)
+        chunks = [
+            {"page": chunk["page"], "text": chunk["text"]}
+            for chunk in slim_doc["chunks"]
+            if chunk["type"] == "text"
+        ]
+        logger.info(
+            "Created chunks from pages",
+            worker_pid=os.getpid(),
+            chunk_count=len(chunks),
+        )
 
         final_memory = process.memory_info().rss / 1024 / 1024
         memory_delta = final_memory - start_memory
@@ -407,8 +459,8 @@ def process_document_sync(file_path: str):
 
         return {
             "id": file_hash,
-            "filename": origin.get("filename"),
-            "mimetype": origin.get("mimetype"),
+            "filename": slim_doc["filename"],
+            "mimetype": slim_doc["mimetype"],
             "chunks": chunks,
             "file_path": file_path,
         }
@@ -4,12 +4,23 @@ Utility functions for managing dynamic embedding field names in OpenSearch.
 This module provides helpers for:
 - Normalizing embedding model names to valid OpenSearch field names
 - Generating dynamic field names based on embedding models
-- Ensuring embedding fields exist in the OpenSearch index
+- Ensuring embedding fields exist in the OpenSearch index (checked once per
+  process and index, see :class:`EmbeddingFieldRegistry`)
 """
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional, Tuple
 
 from utils.logging_config import get_logger
+from utils.vector_profiles import (
+    VectorProfile,
+    check_recorded_profile,
+    get_vector_profile,
+    knn_vector_mapping,
+    merged_meta,
+    meta_lock,
+    vector_codecs,
+)
 
 logger = get_logger(__name__)
 
@@ -46,15 +57,17 @@ def normalize_model_name(model_name: str) -> str:
     return normalized
 
 
-def get_embedding_field_name(model_name: str) -> str:
+def get_embedding_field_name(model_name: str, profile: Optional[VectorProfile] = None) -> str:
     """
     Get the OpenSearch field name for storing embeddings from a specific model.
 
     Args:
         model_name: The embedding model name
+        profile: Vector storage profile; non-default profiles add a suffix
+            (e.g. "_int8_d512") so each profile has its own field
 
     Returns:
-        Field name in format: chunk_embedding_{normalized_model_name}
+        Field name in format: chunk_embedding_{normalized_model_name}[{profile_suffix}]
 
     Examples:
         >>> get_embedding_field_name("text-embedding-3-small")
@@ -63,37 +76,191 @@ def get_embedding_field_name(model_name: str) -> str:
         'chunk_embedding_nomic_embed_text'
     """
     normalized = normalize_model_name(model_name)
-    return f"chunk_embedding_{normalized}"
+    suffix = profile.field_suffix if profile is not None else ""
+    return f"chunk_embedding_{normalized}{suffix}"
+
+
+class EmbeddingDimensionMismatchError(RuntimeError):
+    """An embedding field exists with a different dimension than the model produces"""
+
+    def __init__(self, index_name: str, field_name: str, existing: Optional[int], requested: int):
+        self.index_name = index_name
+        self.field_name = field_name
+        self.existing = existing
+        self.requested = requested
+        has = f"has dimension {existing}" if existing is not None else "has a different dimension"
+        super().__init__(
+            f"Field '{field_name}' in index '{index_name}' {has}, "
+            f"but the embedding model produces {requested}-dimensional vectors. "
+            "Re-create the index or use a different embedding model."
+        )
+
+
+def _is_dimension_conflict(error: Exception) -> bool:
+    message = str(error).lower()
+    return "dimension" in message and ("cannot be changed" in message or "conflict" in message)
+
+
+class EmbeddingFieldRegistry:
+    """Per-process record of embedding fields known to exist, by index
+
+    The first :meth:`ensure` for an ``(index, field)`` reads the live mapping (and adds
+    the field if it is missing); later calls return without any I/O. Concurrent first
+    calls for the same field wait on one lock, so a single ``put_mapping`` is sent; the
+    lock is dropped once that check is done. Entries are dropped by :meth:`invalidate`
+    when the index is (re)created or reset.
+    """
+
+    def __init__(self):
+        self._known: Dict[Tuple[str, str], int] = {}  # (index, field) -> dimension
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def _check_dimension(self, key: Tuple[str, str], dimensions: Optional[int]) -> bool:
+        known = self._known.get(key)
+        if known is None:
+            return False
+        if dimensions is not None and known != dimensions:
+            raise EmbeddingDimensionMismatchError(key[0], key[1], known, dimensions)
+        return True
+
+    async def ensure(
+        self,
+        opensearch_client,
+        index_name: str,
+        field_name: str,
+        dimensions: Optional[int],
+        model_name: str = None,
+        profile: Optional[VectorProfile] = None,
+        native_dimensions: Optional[int] = None,
+    ) -> None:
+        """Make sure *field_name* exists; ``dimensions=None`` accepts the existing field's"""
+        key = (index_name, field_name)
+        if self._check_dimension(key, dimensions):
+            return
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another caller may have finished the check while we waited
+                if self._check_dimension(key, dimensions):
+                    return
+                existing = await _add_embedding_field(
+                    opensearch_client,
+                    index_name,
+                    field_name,
+                    dimensions,
+                    model_name,
+                    profile=profile,
+                    native_dimensions=native_dimensions,
+                )
+                self._known[key] = existing
+        finally:
+            # Callers already waiting keep their reference; later ones find the field known
+            if self._locks.get(key) is lock:
+                del self._locks[key]
+
+    def invalidate(self, index_name: Optional[str] = None, field_name: Optional[str] = None) -> None:
+        """Forget known fields of *index_name* (all indexes when omitted)"""
+        for key in list(self._known):
+            if (index_name is None or key[0] == index_name) and (
+                field_name is None or key[1] == field_name
+            ):
+                del self._known[key]
+
+    def is_known(self, index_name: str, field_name: str) -> bool:
+        return (index_name, field_name) in self._known
+
+
+embedding_field_registry = EmbeddingFieldRegistry()
+
+
+def invalidate_embedding_field_cache(index_name: Optional[str] = None) -> None:
+    """Call after deleting, creating or resetting an index"""
+    embedding_field_registry.invalidate(index_name)
+    vector_codecs.invalidate(index_name)
 
 
 async def ensure_embedding_field_exists(
     opensearch_client,
     model_name: str,
     index_name: str = None,
+    profile: Optional[VectorProfile] = None,
 ) -> str:
     """
     Ensure that an embedding field for the specified model exists in the OpenSearch index.
     If the field doesn't exist, it will be added dynamically using PUT mapping API.
 
+    The mapping is only checked on the first call per process for an index and
+    field; later calls return without contacting OpenSearch. For models that are not
+    in the static dimension tables an existing field's dimension is accepted as is,
+    and a new field is sized with the configured provider (probing Ollama).
+
     Args:
         opensearch_client: OpenSearch client instance
         model_name: The embedding model name
         index_name: OpenSearch index name (defaults to get_index_name() from settings)
+        profile: Vector storage profile (defaults to the configured profile)
 
     Returns:
         The field name that was ensured to exist
 
     Raises:
+        EmbeddingDimensionMismatchError: If the field exists with another dimension
+        VectorProfileMismatchError: If the field is recorded with another profile
         Exception: If unable to add the field mapping
     """
-    from config.settings import KNN_EF_CONSTRUCTION, KNN_M, get_index_name
-    from utils.embeddings import get_embedding_dimensions
+    from config.settings import get_index_name
+    from utils.embeddings import known_embedding_dimensions
 
     if index_name is None:
         index_name = get_index_name()
 
-    field_name = get_embedding_field_name(model_name)
-    dimensions = await get_embedding_dimensions(model_name)
+    if profile is None:
+        profile = get_vector_profile(model_name)
+    field_name = get_embedding_field_name(model_name, profile)
+    # Models outside the static tables (e.g. Ollama) trust the live mapping's dimension
+    native_dimensions = known_embedding_dimensions(model_name)
+
+    await embedding_field_registry.ensure(
+        opensearch_client,
+        index_name,
+        field_name,
+        profile.stored_dimensions(native_dimensions) if native_dimensions else None,
+        model_name,
+        profile=profile,
+        native_dimensions=native_dimensions,
+    )
+    return field_name
+
+
+async def _resolve_native_dimensions(model_name: str) -> int:
+    """Dimensions of *model_name*, using the configured provider when it is the configured model"""
+    from config.settings import get_openrag_config
+    from utils.embeddings import get_embedding_dimensions
+
+    config = get_openrag_config()
+    provider = endpoint = None
+    if model_name == config.knowledge.embedding_model:
+        provider = config.knowledge.embedding_provider
+        endpoint = getattr(config.get_embedding_provider_config(), "endpoint", None)
+    return await get_embedding_dimensions(model_name, provider, endpoint)
+
+
+async def _add_embedding_field(
+    opensearch_client,
+    index_name: str,
+    field_name: str,
+    dimensions: Optional[int],
+    model_name: str = None,
+    profile: Optional[VectorProfile] = None,
+    native_dimensions: Optional[int] = None,
+) -> int:
+    """Check the live mapping and add the field if missing; returns its dimension
+
+    ``dimensions=None`` accepts an existing field's dimension and resolves the model's
+    dimension only when the field has to be added.
+    """
+    profile = profile or VectorProfile()
 
     logger.info(
         "Ensuring embedding field exists",
@@ -102,77 +269,127 @@ async def ensure_embedding_field_exists(
         dimensions=dimensions,
     )
 
-    async def _get_field_definition() -> Dict[str, Any]:
+    mapping = await _fetch_mapping(opensearch_client, index_name)
+    existing_definition = _field_definition(mapping, index_name, field_name)
+    if existing_definition:
+        return _accept_existing_field(
+            mapping, index_name, field_name, existing_definition,
+            dimensions, model_name, profile, native_dimensions,
+        )
+
+    if dimensions is None:
+        native_dimensions = await _resolve_native_dimensions(model_name)
+        dimensions = profile.stored_dimensions(native_dimensions)
+    profile_meta = profile.to_meta(model_name, native_dimensions or dimensions)
+
+    async with meta_lock(opensearch_client, index_name):
+        # put_mapping replaces _meta as a whole, so merge into a copy read under the
+        # lock rather than the one read before it
+        mapping = await _fetch_mapping(opensearch_client, index_name)
+        existing_definition = _field_definition(mapping, index_name, field_name)
+        if existing_definition:
+            return _accept_existing_field(
+                mapping, index_name, field_name, existing_definition,
+                dimensions, model_name, profile, native_dimensions,
+            )
+
+        # Define the field mapping for both the vector field and the tracking field
+        # The field's storage profile is recorded in the index _meta next to the mapping
+        mapping = {
+            "_meta": merged_meta(mapping, index_name, field_name, profile_meta),
+            "properties": {
+                field_name: knn_vector_mapping(dimensions, profile),
+                # Also ensure the embedding_model tracking field exists as keyword
+                "embedding_model": {
+                    "type": "keyword"
+                },
+                "embedding_dimensions": {
+                    "type": "integer"
+                },
+            }
+        }
+
         try:
-            mapping = await opensearch_client.indices.get_mapping(index=index_name)
-        except Exception as e:
-            logger.debug(
-                "Failed to fetch mapping before ensuring embedding field",
+            # A successful put_mapping is acknowledged by the cluster, so the mapping
+            # is not read back
+            await opensearch_client.indices.put_mapping(
                 index=index_name,
+                body=mapping
+            )
+            logger.info(
+                "Successfully ensured embedding field exists",
+                field_name=field_name,
+                model_name=model_name,
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to add embedding field mapping",
+                field_name=field_name,
+                model_name=model_name,
                 error=str(e),
             )
-            return {}
+            if _is_dimension_conflict(e):
+                # Another process added the field with a different dimension
+                embedding_field_registry.invalidate(index_name, field_name)
+                existing = await _live_dimension(opensearch_client, index_name, field_name)
+                raise EmbeddingDimensionMismatchError(
+                    index_name, field_name, existing, dimensions
+                ) from e
+            raise
 
-        properties = mapping.get(index_name, {}).get("mappings", {}).get("properties", {})
-        return properties.get(field_name, {}) if isinstance(properties, dict) else {}
+    return dimensions
 
-    existing_definition = await _get_field_definition()
-    if existing_definition:
-        if existing_definition.get("type") != "knn_vector":
-            raise RuntimeError(
-                f"Field '{field_name}' already exists with incompatible type '{existing_definition.get('type')}'"
-            )
-        return field_name
-
-    # Define the field mapping for both the vector field and the tracking field
-    mapping = {
-        "properties": {
-            field_name: {
-                "type": "knn_vector",
-                "dimension": dimensions,
-                "method": {
-                    "name": "disk_ann",
-                    "engine": "jvector",
-                    "space_type": "l2",
-                    "parameters": {"ef_construction": KNN_EF_CONSTRUCTION, "m": KNN_M},
-                },
-            },
-            # Also ensure the embedding_model tracking field exists as keyword
-            "embedding_model": {
-                "type": "keyword"
-            },
-            "embedding_dimensions": {
-                "type": "integer"
-            },
-        }
-    }
 
+async def _fetch_mapping(opensearch_client, index_name: str) -> dict:
+    """The live index mapping; raises instead of guessing, since a put_mapping
+    built from an empty mapping would drop the recorded ``_meta``"""
     try:
-        # Try to add the mapping
-        # OpenSearch will ignore if field already exists
-        await opensearch_client.indices.put_mapping(
-            index=index_name,
-            body=mapping
-        )
-        logger.info(
-            "Successfully ensured embedding field exists",
-            field_name=field_name,
-            model_name=model_name,
-        )
+        return await opensearch_client.indices.get_mapping(index=index_name)
     except Exception as e:
         logger.error(
-            "Failed to add embedding field mapping",
-            field_name=field_name,
-            model_name=model_name,
+            "Failed to fetch mapping before ensuring embedding field",
+            index=index_name,
             error=str(e),
         )
         raise
 
-    # Verify mapping was applied correctly
-    new_definition = await _get_field_definition()
-    if new_definition.get("type") != "knn_vector":
+
+def _field_definition(mapping: dict, index_name: str, field_name: str) -> dict:
+    properties = mapping.get(index_name, {}).get("mappings", {}).get("properties", {})
+    return properties.get(field_name, {}) if isinstance(properties, dict) else {}
+
+
+def _accept_existing_field(
+    mapping: dict,
+    index_name: str,
+    field_name: str,
+    existing_definition: dict,
+    dimensions: Optional[int],
+    model_name: Optional[str],
+    profile: VectorProfile,
+    native_dimensions: Optional[int],
+) -> int:
+    """Validate an existing field against the requested one; returns its dimension"""
+    if existing_definition.get("type") != "knn_vector":
         raise RuntimeError(
-            f"Failed to ensure '{field_name}' is mapped as knn_vector. Current definition: {new_definition}"
+            f"Field '{field_name}' already exists with incompatible type '{existing_definition.get('type')}'"
         )
+    existing_dimension = existing_definition.get("dimension")
+    if dimensions is None:
+        dimensions = existing_dimension
+    elif existing_dimension is not None and existing_dimension != dimensions:
+        raise EmbeddingDimensionMismatchError(
+            index_name, field_name, existing_dimension, dimensions
+        )
+    profile_meta = profile.to_meta(model_name, native_dimensions or dimensions)
+    check_recorded_profile(mapping, index_name, field_name, profile_meta)
+    return dimensions
 
-    return field_name
+
+async def _live_dimension(opensearch_client, index_name: str, field_name: str) -> Optional[int]:
+    try:
+        mapping = await opensearch_client.indices.get_mapping(index=index_name)
+    except Exception:
+        return None
+    properties = mapping.get(index_name, {}).get("mappings", {}).get("properties", {})
+    return (properties.get(field_name) or {}).get("dimension")
@@ -1,7 +1,10 @@
-import httpx
-from config.settings import KNN_EF_CONSTRUCTION, KNN_M, OPENAI_EMBEDDING_DIMENSIONS, VECTOR_DIM, WATSONX_EMBEDDING_DIMENSIONS
+from typing import Optional
+
+from config.settings import OPENAI_EMBEDDING_DIMENSIONS, VECTOR_DIM, WATSONX_EMBEDDING_DIMENSIONS
 from utils.container_utils import transform_localhost_url
+from utils.http_clients import shared_http_client
 from utils.logging_config import get_logger
+from utils.vector_profiles import META_KEY, VectorProfile, get_vector_profile, knn_vector_mapping
 
 
 logger = get_logger(__name__)
@@ -24,7 +27,7 @@ async def _probe_ollama_embedding_dimension(endpoint: str, model_name: str) -> i
     url = f"{transformed_endpoint}/api/embeddings"
     test_input = "test"
 
-    async with httpx.AsyncClient() as client:
+    async with shared_http_client("ollama") as client:
         errors: list[str] = []
 
         # Try modern API format first (input parameter)
@@ -111,6 +114,12 @@ async def _probe_ollama_embedding_dimension(endpoint: str, model_name: str) -> i
     )
 
 
+def known_embedding_dimensions(model_name: str) -> Optional[int]:
+    """Dimensions of *model_name* from the static OpenAI/watsonx tables, or None"""
+    all_models = {**OPENAI_EMBEDDING_DIMENSIONS, **WATSONX_EMBEDDING_DIMENSIONS}
+    return all_models.get(model_name.lower().strip().split(":")[0])
+
+
 async def get_embedding_dimensions(model_name: str, provider: str = None, endpoint: str = None) -> int:
     """Get the embedding dimensions for a given model name."""
 
@@ -121,13 +130,8 @@ async def get_embedding_dimensions(model_name: str, provider: str = None, endpoi
             )
         return await _probe_ollama_embedding_dimension(endpoint, model_name)
 
-    # Check all model dictionaries
-    all_models = {**OPENAI_EMBEDDING_DIMENSIONS, **WATSONX_EMBEDDING_DIMENSIONS}
-
-    model_name = model_name.lower().strip().split(":")[0]
-
-    if model_name in all_models:
-        dimensions = all_models[model_name]
+    dimensions = known_embedding_dimensions(model_name)
+    if dimensions is not None:
         logger.info(f"Found dimensions for model '{model_name}': {dimensions}")
         return dimensions
 
@@ -140,7 +144,8 @@ async def get_embedding_dimensions(model_name: str, provider: str = None, endpoi
 async def create_dynamic_index_body(
     embedding_model: str,
     provider: str = None,
-    endpoint: str = None
+    endpoint: str = None,
+    profile: VectorProfile = None,
 ) -> dict:
     """Create a dynamic index body configuration based on the embedding model.
     
@@ -148,19 +153,25 @@ async def create_dynamic_index_body(
         embedding_model: Name of the embedding model
         provider: Provider name (e.g., "ollama", "openai", "watsonx")
         endpoint: Endpoint URL for the provider (used for Ollama probing)
+        profile: Vector storage profile (defaults to the configured profile)
         
     Returns:
         OpenSearch index body configuration
     """
-    dimensions = await get_embedding_dimensions(embedding_model, provider, endpoint)
+    native_dimensions = await get_embedding_dimensions(embedding_model, provider, endpoint)
+    if profile is None:
+        profile = get_vector_profile(embedding_model)
+    dimensions = profile.stored_dimensions(native_dimensions)
 
     return {
+        # Shards, replicas and refresh policy come from the index layout template
         "settings": {
             "index": {"knn": True},
-            "number_of_shards": 1,
-            "number_of_replicas": 1,
         },
         "mappings": {
+            "_meta": {
+                META_KEY: {"chunk_embedding": profile.to_meta(embedding_model, native_dimensions)},
+            },
             "properties": {
                 "document_id": {"type": "keyword"},
                 "filename": {"type": "keyword"},
@@ -169,16 +180,7 @@ async def create_dynamic_index_body(
                 "text": {"type": "text"},
                 # Legacy field - kept for backward compatibility
                 # New documents will use chunk_embedding_{model_name} fields
-                "chunk_embedding": {
-                    "type": "knn_vector",
-                    "dimension": dimensions,
-                    "method": {
-                        "name": "disk_ann",
-                        "engine": "jvector",
-                        "space_type": "l2",
-                        "parameters": {"ef_construction": KNN_EF_CONSTRUCTION, "m": KNN_M},
-                    },
-                },
+                "chunk_embedding": knn_vector_mapping(dimensions, profile),
                 # Track which embedding model was used for this chunk
                 "embedding_model": {"type": "keyword"},
                 "embedding_dimensions": {"type": "integer"},
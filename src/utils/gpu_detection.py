@@ -36,17 +36,15 @@ def get_worker_count():
 
     Uses min(4, cpu_count // 2) for both GPU and CPU modes to maintain a
     reasonable ratio with downstream services (4 backend : 1 Langflow worker).
+    GPU detection is not needed for the count, so it is skipped here to keep
+    torch out of the startup path.
     """
-    has_gpu_devices, gpu_count = detect_gpu_devices()
-
     # Same formula for both modes: cap at 4, use half of available CPUs
     default_worker_count = max(1, min(4, multiprocessing.cpu_count() // 2))
     worker_count = max(1, int(os.getenv("MAX_WORKERS", default_worker_count)))
-    mode = "GPU" if has_gpu_devices else "CPU-only"
 
     logger.info(
-        f"{mode} mode enabled",
-        gpu_count=gpu_count,
+        "Ingestion worker count configured",
         worker_count=worker_count,
         default_worker_count=default_worker_count,
     )
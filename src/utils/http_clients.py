@@ -0,0 +1,184 @@
+"""
+Shared long-lived HTTP clients for outbound provider calls.
+
+Model listing, provider health checks and validation, token introspection and
+robots.txt fetches used to open a fresh ``httpx.AsyncClient`` per call, paying a
+TCP + TLS handshake every time. :func:`get_http_client` instead returns one pooled
+client per upstream (and TLS verification setting), with HTTP/2 when the ``h2``
+package is installed and keep-alive connections reused across calls.
+
+New connections and requests are counted per upstream
+(``openrag_http_client_connections_opened_total`` /
+``openrag_http_client_requests_total`` on ``/metrics``), so connection reuse is
+visible. Shared clients never store cookies, because they are shared between
+users. Callers must not close the clients; :func:`close_http_clients` does that
+at shutdown.
+"""
+
+import asyncio
+import os
+import ssl
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import AsyncIterator, Dict, Optional, Set, Tuple, Union
+
+import httpx
+
+from utils.logging_config import get_logger
+from utils.metrics import registry
+
+logger = get_logger(__name__)
+
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("true", "1", "yes")
+
+# Same default as a bare httpx.AsyncClient(); call sites pass their own per-request timeouts
+DEFAULT_TIMEOUT = httpx.Timeout(5.0)
+
+HTTP_CLIENT_REQUESTS = registry.counter(
+    "openrag_http_client_requests_total",
+    "Outbound requests sent through shared HTTP clients",
+    ("upstream",),
+)
+HTTP_CLIENT_CONNECTIONS = registry.counter(
+    "openrag_http_client_connections_opened_total",
+    "New TCP connections opened by shared HTTP clients (requests minus these were reused)",
+    ("upstream",),
+)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)"""
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+Verify = Union[bool, ssl.SSLContext]
+
+
+def _no_cookies() -> CookieJar:
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as e:
+        logger.warning(f"Failed to close shared HTTP client: {e}")
+
+
+class HTTPClientRegistry:
+    """Long-lived ``httpx.AsyncClient`` instances keyed by upstream name
+
+    A client's connection pool is bound to the event loop it was first used on, so
+    a caller on a different loop (tests, worker threads) gets its own client and the
+    replaced one is closed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2_available() if http2 is None else http2
+        self._clients: Dict[Tuple[str, object], Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._closing: Set[asyncio.Future] = set()
+
+    def _create(self, upstream: str, verify: Verify) -> httpx.AsyncClient:
+        async def trace(event_name: str, info: dict) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                HTTP_CLIENT_CONNECTIONS.inc(upstream=upstream)
+
+        async def on_request(request: httpx.Request) -> None:
+            HTTP_CLIENT_REQUESTS.inc(upstream=upstream)
+            request.extensions.setdefault("trace", trace)
+
+        logger.debug("Creating shared HTTP client", upstream=upstream, http2=self.http2)
+        return httpx.AsyncClient(
+            http2=self.http2,
+            verify=verify,
+            limits=self.limits,
+            timeout=DEFAULT_TIMEOUT,
+            cookies=_no_cookies(),
+            event_hooks={"request": [on_request]},
+        )
+
+    def get(self, upstream: str, verify: Verify = True) -> httpx.AsyncClient:
+        """Shared client for *upstream*, created on first use
+
+        An ``SSLContext`` *verify* is keyed by identity, so pass the same (cached)
+        context on every call.
+        """
+        loop = asyncio.get_running_loop()
+        key = (upstream, verify if isinstance(verify, bool) else id(verify))
+        entry = self._clients.get(key)
+        if entry is not None:
+            if entry[1] is loop and not entry[0].is_closed:
+                return entry[0]
+            self._discard(*entry)
+        client = self._create(upstream, verify)
+        self._clients[key] = (client, loop)
+        return client
+
+    def _discard(self, client: httpx.AsyncClient, client_loop: asyncio.AbstractEventLoop) -> None:
+        """Close a replaced client on its own loop if that is still running, else here"""
+        if client.is_closed:
+            return
+        if client_loop.is_running() and not client_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), client_loop)
+            return
+        future = asyncio.ensure_future(_close_quietly(client))
+        self._closing.add(future)
+        future.add_done_callback(self._closing.discard)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Requests, new connections and reuse ratio per upstream"""
+        stats = {}
+        for upstream, _verify in self._clients:
+            requests = HTTP_CLIENT_REQUESTS.value(upstream=upstream)
+            connections = HTTP_CLIENT_CONNECTIONS.value(upstream=upstream)
+            stats[upstream] = {
+                "requests": requests,
+                "connections_opened": connections,
+                "reuse_ratio": round(1 - connections / requests, 3) if requests else None,
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        """Close clients that belong to the running event loop and forget the rest"""
+        loop = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        for client, client_loop in clients.values():
+            if client_loop is loop and not client.is_closed:
+                await _close_quietly(client)
+
+
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(upstream: str, verify: Verify = True) -> httpx.AsyncClient:
+    return http_clients.get(upstream, verify)
+
+
+@asynccontextmanager
+async def shared_http_client(upstream: str, verify: Verify = True) -> AsyncIterator[httpx.AsyncClient]:
+    """Drop-in for ``async with httpx.AsyncClient() as client`` that reuses the pooled client"""
+    yield http_clients.get(upstream, verify)
+
+
+async def close_http_clients() -> None:
+    await http_clients.aclose()
@@ -0,0 +1,346 @@
+"""
+In-process latency metrics with Prometheus text exposition.
+
+Hot paths (search, embedding calls, OpenSearch requests, docling conversion,
+Langflow requests, ingestion queue wait) record into histograms defined here,
+and ``GET /metrics`` renders the registry in the Prometheus text format. There is
+no dependency on ``prometheus_client``; the registry implements the small subset
+of the exposition format the backend needs.
+
+:func:`timed` also adds each duration to the breakdown of the HTTP request being
+served (a context variable set by ``MetricsMiddleware``), which is returned in a
+``Server-Timing`` response header when ``TIMING_HEADER`` is enabled.
+
+Metrics are per process: with ``BACKEND_WORKERS > 1`` each scrape is answered by
+one worker, so scrape the workers individually or run one worker per container.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "yes")
+# Adds a Server-Timing header with the per-request breakdown to every response
+TIMING_HEADER = os.getenv("TIMING_HEADER", "false").lower() in ("true", "1", "yes")
+
+# Seconds; covers fast OpenSearch lookups up to long docling conversions
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram.
+
+    ``phase`` is the name used for the metric in the request timing breakdown.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        phase: Optional[str] = None,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.phase = phase
+        # labels -> [per-bucket counts, sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, **labels: str) -> Dict[str, float]:
+        """Count and sum of one labelled series"""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            if series is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": series[2], "sum": series[1]}
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        lines = []
+        for key, (bucket_counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together by :meth:`render`"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        phase: Optional[str] = None,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets, phase))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP layer (recorded by MetricsMiddleware)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "openrag_http_request_duration_seconds",
+    "HTTP request latency by route template, including streamed bodies",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "openrag_http_requests_in_progress", "HTTP requests currently being served"
+)
+
+# Hot paths
+SEARCH_SECONDS = registry.histogram(
+    "openrag_search_duration_seconds",
+    "Knowledge search latency (query embedding plus OpenSearch query)",
+    phase="search",
+)
+EMBEDDING_SECONDS = registry.histogram(
+    "openrag_embedding_request_duration_seconds",
+    "Embedding API call latency",
+    ("model", "purpose"),
+    phase="embedding",
+)
+OPENSEARCH_SECONDS = registry.histogram(
+    "openrag_opensearch_request_duration_seconds",
+    "OpenSearch HTTP request latency by API",
+    ("operation",),
+    phase="opensearch",
+)
+DOCLING_SECONDS = registry.histogram(
+    "openrag_docling_conversion_duration_seconds",
+    "Docling document conversion latency",
+    ("source",),
+    phase="docling",
+)
+LANGFLOW_SECONDS = registry.histogram(
+    "openrag_langflow_request_duration_seconds",
+    "Langflow API request latency",
+    ("method",),
+    phase="langflow",
+)
+TASK_QUEUE_WAIT_SECONDS = registry.histogram(
+    "openrag_task_queue_wait_seconds",
+    "Time ingestion items wait for a processing slot",
+    phase="queue_wait",
+)
+TASK_ITEM_SECONDS = registry.histogram(
+    "openrag_task_item_duration_seconds",
+    "Ingestion item processing time by processor",
+    ("processor", "status"),
+)
+CHAT_TTFT_SECONDS = registry.histogram(
+    "openrag_chat_time_to_first_token_seconds",
+    "Time to the first text delta of streamed chat responses",
+    ("source",),
+)
+DOCLING_CACHE_HITS = registry.counter(
+    "openrag_docling_cache_hits_total",
+    "Docling conversions served from the conversion cache",
+    ("source",),
+)
+DOCLING_CACHE_MISSES = registry.counter(
+    "openrag_docling_cache_misses_total",
+    "Docling conversions not found in the conversion cache",
+    ("source",),
+)
+DOCLING_CACHE_BYTES_SAVED = registry.counter(
+    "openrag_docling_cache_bytes_saved_total",
+    "Size of input documents whose conversion was served from the cache",
+    ("source",),
+)
+
+
+# Request-scoped timing breakdown: phase -> [total seconds, count]
+_request_timings: ContextVar[Optional[Dict[str, list]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> Dict[str, list]:
+    """Begin collecting the timing breakdown for the current request context"""
+    timings: Dict[str, list] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Add *seconds* to *phase* in the current request's breakdown, if any"""
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.setdefault(phase, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+def server_timing_header(timings: Dict[str, list], total_seconds: Optional[float] = None) -> str:
+    """Format a breakdown as a ``Server-Timing`` header value (durations in ms)"""
+    parts = [
+        f'{phase};dur={seconds * 1000:.1f};desc="{count}x"'
+        for phase, (seconds, count) in timings.items()
+    ]
+    if total_seconds is not None:
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of the block in *histogram* and the request breakdown.
+
+    Durations are recorded whether or not the block raises.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        if histogram.phase:
+            record_phase(histogram.phase, elapsed)
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,27 @@
+"""OpenSearch connection class that records request latency metrics."""
+
+from opensearchpy._async.http_aiohttp import AIOHttpConnection
+
+from utils.metrics import OPENSEARCH_SECONDS, timed
+
+
+def opensearch_operation(method: str, url: str) -> str:
+    """Low-cardinality label for a request, e.g. ``POST _search`` or ``PUT index``
+
+    The first ``_``-prefixed path segment names the API; index names and document
+    ids are dropped.
+    """
+    path = url.split("?", 1)[0]
+    segments = [segment for segment in path.split("/") if segment]
+    for segment in segments:
+        if segment.startswith("_"):
+            return f"{method} {segment}"
+    return f"{method} {'index' if segments else 'root'}"
+
+
+class TimedAIOHttpConnection(AIOHttpConnection):
+    """``AIOHttpConnection`` that times each HTTP request to OpenSearch"""
+
+    async def perform_request(self, method, url, *args, **kwargs):
+        with timed(OPENSEARCH_SECONDS, operation=opensearch_operation(method, url)):
+            return await super().perform_request(method, url, *args, **kwargs)
@@ -53,3 +53,22 @@ def build_filename_delete_body(filename: str) -> dict:
     return {
         "query": build_filename_query(filename)
     }
+
+
+def build_document_ids_delete_body(document_ids: List[str]) -> dict:
+    """
+    Build a delete-by-query body for removing all chunks of the given documents.
+
+    Args:
+        document_ids: Document IDs (connector file IDs for connector documents)
+
+    Returns:
+        A dict containing the OpenSearch delete-by-query body
+    """
+    return {
+        "query": {
+            "terms": {
+                "document_id": list(document_ids)
+            }
+        }
+    }
@@ -1,13 +1,36 @@
-import os
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import Executor, ProcessPoolExecutor
 from utils.gpu_detection import get_worker_count
 from utils.logging_config import get_logger
+from utils.subsystems import subsystems
 
 logger = get_logger(__name__)
 
-# Create shared process pool at import time (before CUDA initialization)
-# This avoids the "Cannot re-initialize CUDA in forked subprocess" error
 MAX_WORKERS = get_worker_count()
-process_pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
 
-logger.info("Shared process pool initialized", max_workers=MAX_WORKERS)
+
+def _create_process_pool() -> ProcessPoolExecutor:
+    # Workers use the 'spawn' start method (set in main), so creating the pool
+    # after CUDA initialization does not hit "Cannot re-initialize CUDA in forked subprocess"
+    pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    logger.info("Shared process pool initialized", max_workers=MAX_WORKERS)
+    return pool
+
+
+subsystems.register("process_pool", _create_process_pool)
+
+
+class LazyProcessPool(Executor):
+    """Shared process pool that is only created on first use"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return subsystems.get("process_pool").submit(fn, *args, **kwargs)
+
+    def map(self, fn, *iterables, **kwargs):
+        return subsystems.get("process_pool").map(fn, *iterables, **kwargs)
+
+    def shutdown(self, wait: bool = True, **kwargs):
+        if subsystems.is_loaded("process_pool"):
+            subsystems.get("process_pool").shutdown(wait=wait, **kwargs)
+
+
+process_pool = LazyProcessPool()
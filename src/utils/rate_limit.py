@@ -0,0 +1,55 @@
+"""Token bucket rate limiting for background jobs."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``
+
+    :meth:`acquire` may take more tokens than the capacity; the caller then waits
+    for the deficit, so long-run throughput stays at ``rate`` whatever the batch
+    size. A ``rate`` of 0 or less disables limiting. ``clock`` and ``sleep`` can be
+    replaced in tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Take *tokens*, waiting as needed; returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        async with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            wait = (tokens - self._tokens) / self.rate
+            await self._sleep(wait)
+            # A short sleep leaves a small debt that the next acquire pays back
+            self._refill()
+            self._tokens -= tokens
+            return wait
+
+    def set_rate(self, rate: float) -> None:
+        self._refill()
+        self.rate = rate
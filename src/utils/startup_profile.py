@@ -0,0 +1,130 @@
+"""
+Startup profile mode.
+
+With ``STARTUP_PROFILE=true`` an import hook records how long each module takes to
+import (cumulative, including its own imports, and self time), and the slowest
+modules are logged once the app is created. Install the hook before any other
+import in the entry point. This module only uses the standard library so that
+installing it does not itself skew the measurements.
+"""
+
+import importlib.abc
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() in ("true", "1", "yes")
+STARTUP_PROFILE_TOP = int(os.getenv("STARTUP_PROFILE_TOP", "30"))
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        profiler = self._profiler
+        profiler._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = profiler._stack.pop()
+            if profiler._stack:
+                profiler._stack[-1] += elapsed
+            else:
+                profiler.root_seconds += elapsed
+            profiler.timings[module.__name__] = (elapsed, elapsed - children)
+            # Hand the module its real loader back
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+            spec = getattr(module, "__spec__", None)
+            if spec is not None and spec.loader is self:
+                spec.loader = self._loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps loaders to time module execution"""
+
+    def __init__(self):
+        self.timings: Dict[str, tuple] = {}  # module -> (cumulative, self) seconds
+        self._stack: List[float] = []
+        self.root_seconds = 0.0  # wall time spent in outermost imports
+        self._finding = False
+        self.started_at = time.perf_counter()
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def report(self, top: int = STARTUP_PROFILE_TOP) -> Dict[str, Any]:
+        """Slowest imports by cumulative time plus the total import time"""
+        slowest = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "elapsed_seconds": round(time.perf_counter() - self.started_at, 3),
+            "import_seconds": round(self.root_seconds, 3),
+            "modules_imported": len(self.timings),
+            "slowest": [
+                {"module": name, "cumulative_ms": round(cumulative * 1000, 1), "self_ms": round(own * 1000, 1)}
+                for name, (cumulative, own) in slowest
+            ],
+        }
+
+
+_profiler: Optional[ImportProfiler] = None
+
+
+def install_import_profiler() -> Optional[ImportProfiler]:
+    """Start timing imports when STARTUP_PROFILE is enabled"""
+    global _profiler
+    if STARTUP_PROFILE and _profiler is None:
+        _profiler = ImportProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def get_startup_profile() -> Optional[Dict[str, Any]]:
+    return _profiler.report() if _profiler is not None else None
+
+
+def log_startup_profile() -> None:
+    """Log the import profile and stop timing further imports"""
+    if _profiler is None:
+        return
+    from utils.logging_config import get_logger
+
+    report = _profiler.report()
+    if _profiler in sys.meta_path:
+        sys.meta_path.remove(_profiler)
+    logger = get_logger(__name__)
+    logger.info(
+        "Startup import profile",
+        elapsed_seconds=report["elapsed_seconds"],
+        import_seconds=report["import_seconds"],
+        modules_imported=report["modules_imported"],
+    )
+    for entry in report["slowest"]:
+        logger.info("Slow import", **entry)
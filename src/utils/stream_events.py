@@ -0,0 +1,128 @@
+"""Typed chat stream events and per-stream latency metrics.
+
+Streaming responses are serialized once into :class:`StreamEvent` objects. A
+``StreamEvent`` *is* the JSON line sent to clients (a ``bytes`` subclass), and it
+also carries the parsed payload in ``.data``, so downstream consumers (conversation
+storage, the v1 SSE encoder) read fields without parsing the bytes again.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from utils.logging_config import get_logger
+from utils.metrics import CHAT_TTFT_SECONDS
+
+logger = get_logger(__name__)
+
+# Enables per-chunk diagnostic inspection and logging of streamed events
+STREAM_DEBUG = os.getenv("STREAM_DEBUG", "false").lower() in ("true", "1", "yes")
+
+
+class StreamEvent(bytes):
+    """A JSON-line encoded stream event that keeps its decoded payload in ``.data``."""
+
+    data: Any
+
+    def __new__(cls, data: Any) -> "StreamEvent":
+        event = super().__new__(cls, (json.dumps(data, default=str) + "\n").encode("utf-8"))
+        event.data = data
+        return event
+
+
+def event_data(chunk: Any) -> Optional[Dict[str, Any]]:
+    """Return the payload of a stream chunk as a dict (``None`` if it is not a JSON object).
+
+    :class:`StreamEvent` payloads are returned as-is; plain bytes/str chunks are parsed.
+    """
+    if isinstance(chunk, StreamEvent):
+        data = chunk.data
+    else:
+        text = chunk.decode("utf-8") if isinstance(chunk, (bytes, bytearray)) else str(chunk)
+        text = text.strip()
+        if not text:
+            return None
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def delta_text(data: Dict[str, Any]) -> str:
+    """Text carried by a delta event (``delta`` may be a dict with content/text or a string)."""
+    delta = data.get("delta")
+    if isinstance(delta, dict):
+        return delta.get("content", "") or delta.get("text", "") or ""
+    if isinstance(delta, str):
+        return delta
+    return ""
+
+
+_totals_lock = threading.Lock()
+_totals: Dict[str, float] = {
+    "streams": 0,
+    "chunks": 0,
+    "delta_events": 0,
+    "ttft_seconds_sum": 0.0,
+    "duration_seconds_sum": 0.0,
+}
+
+
+@dataclass
+class StreamMetrics:
+    """Time-to-first-token and throughput for one streamed response.
+
+    Token counts are approximated by the number of text delta events, which is one
+    token per event for OpenAI-compatible and Langflow streams.
+    """
+
+    log_prefix: str = "response"
+    started_at: float = field(default_factory=time.perf_counter)
+    first_token_at: Optional[float] = None
+    chunks: int = 0
+    delta_events: int = 0
+
+    def observe(self, text: str = "") -> None:
+        self.chunks += 1
+        if text:
+            self.delta_events += 1
+            if self.first_token_at is None:
+                self.first_token_at = time.perf_counter()
+
+    def finish(self, completed: bool = True) -> Dict[str, Any]:
+        """Record the stream in the process totals and log a single summary line.
+
+        ``completed=False`` marks a stream that raised or was closed before its end.
+        """
+        duration = time.perf_counter() - self.started_at
+        ttft = self.first_token_at - self.started_at if self.first_token_at is not None else None
+        generation = duration - ttft if ttft is not None else 0.0
+        summary = {
+            "log_prefix": self.log_prefix,
+            "completed": completed,
+            "chunks": self.chunks,
+            "delta_events": self.delta_events,
+            "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "duration_ms": round(duration * 1000, 1),
+            "tokens_per_second": round(self.delta_events / generation, 1) if generation > 0 else None,
+        }
+        with _totals_lock:
+            _totals["streams"] += 1
+            _totals["chunks"] += self.chunks
+            _totals["delta_events"] += self.delta_events
+            _totals["ttft_seconds_sum"] += ttft or 0.0
+            _totals["duration_seconds_sum"] += duration
+        if ttft is not None:
+            CHAT_TTFT_SECONDS.observe(ttft, source=self.log_prefix)
+        logger.info("Stream metrics", **summary)
+        return summary
+
+
+def get_stream_stats() -> Dict[str, float]:
+    """Process-wide totals of recorded streams."""
+    with _totals_lock:
+        return dict(_totals)
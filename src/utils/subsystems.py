@@ -0,0 +1,161 @@
+"""
+Lazily loaded optional subsystems with per-subsystem readiness.
+
+Heavy dependencies (docling, torch, cloud connector SDKs, boto3, the ingestion
+process pool) are loaded on first use instead of at import time, so the backend
+starts serving quickly. Each load is timed and its state is reported by
+:func:`get_readiness` (``/health/subsystems``). ``PRELOAD_SUBSYSTEMS`` lists
+subsystems to warm in the background once the server is up.
+
+Code running on the event loop uses :meth:`SubsystemRegistry.aget`: a first load
+imports heavy modules, and a load already running in another thread holds the
+subsystem lock, so a plain :meth:`~SubsystemRegistry.get` would block the loop.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Comma-separated subsystems to load in the background after startup
+PRELOAD_SUBSYSTEMS = [
+    name.strip()
+    for name in os.getenv("PRELOAD_SUBSYSTEMS", "torch,docling").split(",")
+    if name.strip()
+]
+
+
+@dataclass
+class Subsystem:
+    name: str
+    loader: Callable[[], Any]
+    status: str = "not_loaded"  # not_loaded | loading | ready | failed
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+    value: Any = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class SubsystemRegistry:
+    """Registry of named lazy loaders; each loader runs at most once successfully"""
+
+    def __init__(self):
+        self._subsystems: Dict[str, Subsystem] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        self._subsystems.setdefault(name, Subsystem(name=name, loader=loader))
+
+    def is_loaded(self, name: str) -> bool:
+        subsystem = self._subsystems.get(name)
+        return subsystem is not None and subsystem.status == "ready"
+
+    def get(self, name: str) -> Any:
+        """Load the subsystem on first use (other callers wait for the same load)"""
+        subsystem = self._subsystems[name]
+        if subsystem.status == "ready":
+            return subsystem.value
+        with subsystem.lock:
+            if subsystem.status == "ready":
+                return subsystem.value
+            subsystem.status = "loading"
+            started = time.perf_counter()
+            try:
+                subsystem.value = subsystem.loader()
+            except Exception as e:
+                subsystem.status = "failed"
+                subsystem.error = str(e)
+                logger.error(f"Failed to load subsystem {name}: {e}")
+                raise
+            finally:
+                subsystem.load_seconds = round(time.perf_counter() - started, 3)
+            subsystem.status = "ready"
+            subsystem.error = None
+            logger.info(f"Loaded subsystem {name}", load_seconds=subsystem.load_seconds)
+            return subsystem.value
+
+    async def aget(self, name: str) -> Any:
+        """:meth:`get` for the event loop; loads (or waits for a load) in a worker thread"""
+        subsystem = self._subsystems[name]
+        if subsystem.status == "ready":
+            return subsystem.value
+        return await asyncio.to_thread(self.get, name)
+
+    async def preload(self, names: Iterable[str]) -> None:
+        """Load subsystems in a worker thread, one after another, without raising"""
+        for name in names:
+            if name not in self._subsystems:
+                logger.warning(f"Unknown subsystem in PRELOAD_SUBSYSTEMS: {name}")
+                continue
+            try:
+                await asyncio.to_thread(self.get, name)
+            except Exception:
+                pass  # Already recorded as failed
+
+    def readiness(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "status": subsystem.status,
+                "load_seconds": subsystem.load_seconds,
+                "error": subsystem.error,
+            }
+            for name, subsystem in self._subsystems.items()
+        }
+
+
+subsystems = SubsystemRegistry()
+
+
+def get_readiness() -> Dict[str, Dict[str, Any]]:
+    return subsystems.readiness()
+
+
+# Built-in optional subsystems
+
+
+def _load_torch():
+    import torch
+
+    logger.info(
+        "CUDA device info",
+        cuda_available=torch.cuda.is_available(),
+        cuda_version=torch.version.cuda,
+    )
+    return torch
+
+
+def _load_docling():
+    from config.settings import DOCLING_OCR_ENGINE
+    from utils.document_processing import create_document_converter
+
+    return create_document_converter(ocr_engine=DOCLING_OCR_ENGINE)
+
+
+def _load_connectors():
+    """Connector and OAuth classes by connector type (imports the cloud provider SDKs)"""
+    from connectors.google_drive import GoogleDriveConnector, GoogleDriveOAuth
+    from connectors.onedrive import OneDriveConnector, OneDriveOAuth
+    from connectors.sharepoint import SharePointConnector, SharePointOAuth
+
+    return {
+        "google_drive": (GoogleDriveConnector, GoogleDriveOAuth),
+        "sharepoint": (SharePointConnector, SharePointOAuth),
+        "onedrive": (OneDriveConnector, OneDriveOAuth),
+    }
+
+
+def _load_s3():
+    import boto3
+
+    return boto3
+
+
+subsystems.register("torch", _load_torch)
+subsystems.register("docling", _load_docling)
+subsystems.register("connectors", _load_connectors)
+subsystems.register("s3", _load_s3)
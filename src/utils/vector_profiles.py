@@ -0,0 +1,474 @@
+"""
+Vector storage profiles for embedding fields.
+
+A profile controls how embeddings are mapped and stored in OpenSearch:
+
+- ``float32``: full precision on the jvector DiskANN graph (the default)
+- ``fp16``: faiss HNSW with the fp16 scalar-quantization encoder (half the bytes)
+- ``int8``: byte vectors on lucene HNSW (a quarter of the bytes). Values are mapped
+  linearly onto [-128, 127] with a min/max calibrated from the vectors of the
+  first document written to the field (at most ``VECTOR_CALIBRATION_SAMPLE`` of
+  them); later values outside that range are clipped.
+
+Any profile can also keep only the first N dimensions of models trained with
+Matryoshka representation learning; truncated vectors are re-normalized.
+
+The same profile is applied when mapping a field, encoding ingested chunks and
+encoding queries. Non-default profiles use their own field (for example
+``chunk_embedding_text_embedding_3_large_int8_d512``), so switching profiles
+never mixes encodings in one field. Each field's profile and calibration are
+recorded under ``vector_profiles`` in the index mapping's ``_meta`` (knn_vector
+fields cannot carry their own metadata). Search reads that record to query
+every field of a model with the matching encoding.
+
+``put_mapping`` replaces ``_meta`` as a whole, so every read-merge-write of it holds
+:func:`meta_lock`, a lock document shared by all processes (the backend and the
+Langflow ingestion component). An int8 range is only computed under that lock after
+re-reading ``_meta``, so concurrent writers all encode with the one recorded range.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from opensearchpy.exceptions import ConflictError, NotFoundError
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+VECTOR_ENCODINGS = ("float32", "fp16", "int8")
+# Embedding models whose vector prefixes are usable embeddings on their own
+MATRYOSHKA_MODELS = (
+    "text-embedding-3-small",
+    "text-embedding-3-large",
+    "nomic-embed-text",
+)
+# Upper bound on the vectors of the first written document used to calibrate the
+# int8 range of a new field (a smaller first document calibrates on fewer)
+VECTOR_CALIBRATION_SAMPLE = int(os.getenv("VECTOR_CALIBRATION_SAMPLE", "1000"))
+# How long search reuses the recorded field profiles of an index
+VECTOR_PROFILE_CACHE_SECONDS = 30.0
+
+META_KEY = "vector_profiles"
+# Lock documents serializing _meta updates live in "<index><suffix>" (inside the
+# "documents*" pattern of the user role); keep in sync with
+# flows/components/opensearch_multimodal.py
+META_LOCK_INDEX_SUFFIX = "_meta_locks"
+# A lock held longer than this is taken to belong to a dead process
+META_LOCK_SECONDS = 30.0
+META_LOCK_WAIT_SECONDS = 60.0
+BYTES_PER_VALUE = {"float32": 4, "fp16": 2, "int8": 1}
+FP16_MAX = float(np.finfo(np.float16).max)
+
+
+class VectorProfileMismatchError(RuntimeError):
+    """An embedding field is recorded with a different storage profile"""
+
+
+class MetaLockTimeoutError(RuntimeError):
+    """The ``_meta`` lock of an index could not be taken in time"""
+
+
+def _model_key(model_name: str) -> str:
+    return model_name.lower().strip().split(":")[0].split("/")[-1]
+
+
+def supports_truncation(model_name: str) -> bool:
+    return _model_key(model_name) in MATRYOSHKA_MODELS
+
+
+@dataclass(frozen=True)
+class VectorProfile:
+    encoding: str = "float32"
+    dimensions: int = 0  # Matryoshka prefix length, 0 keeps every dimension
+
+    def __post_init__(self):
+        if self.encoding not in VECTOR_ENCODINGS:
+            raise ValueError(
+                f"Unknown vector encoding '{self.encoding}'; expected one of {', '.join(VECTOR_ENCODINGS)}"
+            )
+        if self.dimensions < 0:
+            raise ValueError("Vector dimensions must be 0 (all) or a positive prefix length")
+
+    @property
+    def is_default(self) -> bool:
+        return self.encoding == "float32" and not self.dimensions
+
+    @property
+    def field_suffix(self) -> str:
+        suffix = "" if self.encoding == "float32" else f"_{self.encoding}"
+        if self.dimensions:
+            suffix += f"_d{self.dimensions}"
+        return suffix
+
+    def stored_dimensions(self, native_dimensions: int) -> int:
+        if self.dimensions and self.dimensions < native_dimensions:
+            return self.dimensions
+        return native_dimensions
+
+    def bytes_per_vector(self, native_dimensions: int) -> int:
+        return self.stored_dimensions(native_dimensions) * BYTES_PER_VALUE[self.encoding]
+
+    def to_meta(self, model_name: Optional[str], native_dimensions: int) -> Dict[str, Any]:
+        return {
+            "model": model_name,
+            "encoding": self.encoding,
+            "dimensions": self.stored_dimensions(native_dimensions),
+            "truncated": self.stored_dimensions(native_dimensions) < native_dimensions,
+        }
+
+    @classmethod
+    def from_meta(cls, entry: Dict[str, Any]) -> "VectorProfile":
+        encoding = entry.get("encoding", "float32")
+        dimensions = entry.get("dimensions", 0) if entry.get("truncated") else 0
+        return cls(encoding=encoding, dimensions=dimensions)
+
+
+def get_vector_profile(model_name: Optional[str] = None) -> VectorProfile:
+    """The configured profile for *model_name*
+
+    Truncation is dropped (with a warning) for models that are not Matryoshka-trained,
+    because a prefix of their vectors is not a meaningful embedding.
+    """
+    from config.settings import get_openrag_config
+
+    knowledge = get_openrag_config().knowledge
+    profile = VectorProfile(
+        encoding=knowledge.vector_encoding or "float32",
+        dimensions=knowledge.vector_dimensions or 0,
+    )
+    if profile.dimensions and model_name and not supports_truncation(model_name):
+        logger.warning(
+            "Embedding model does not support dimension truncation; storing full vectors",
+            model=model_name,
+            dimensions=profile.dimensions,
+        )
+        profile = VectorProfile(encoding=profile.encoding)
+    return profile
+
+
+def knn_vector_mapping(dimensions: int, profile: VectorProfile) -> Dict[str, Any]:
+    """knn_vector field definition for *profile* with *dimensions* stored dimensions"""
+    from config.settings import KNN_EF_CONSTRUCTION, KNN_M
+
+    parameters: Dict[str, Any] = {"ef_construction": KNN_EF_CONSTRUCTION, "m": KNN_M}
+    if profile.encoding == "fp16":
+        parameters["encoder"] = {"name": "sq", "parameters": {"type": "fp16", "clip": True}}
+        return {
+            "type": "knn_vector",
+            "dimension": dimensions,
+            "method": {"name": "hnsw", "engine": "faiss", "space_type": "l2", "parameters": parameters},
+        }
+    if profile.encoding == "int8":
+        return {
+            "type": "knn_vector",
+            "dimension": dimensions,
+            "data_type": "byte",
+            "method": {"name": "hnsw", "engine": "lucene", "space_type": "l2", "parameters": parameters},
+        }
+    return {
+        "type": "knn_vector",
+        "dimension": dimensions,
+        "method": {"name": "disk_ann", "engine": "jvector", "space_type": "l2", "parameters": parameters},
+    }
+
+
+class VectorCodec:
+    """Encodes float embeddings into the stored representation of a profile"""
+
+    def __init__(
+        self,
+        profile: VectorProfile,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+    ):
+        self.profile = profile
+        self.min_value = min_value
+        self.max_value = max_value
+
+    @classmethod
+    def from_meta(cls, entry: Dict[str, Any]) -> "VectorCodec":
+        calibration = entry.get("calibration") or {}
+        return cls(VectorProfile.from_meta(entry), calibration.get("min"), calibration.get("max"))
+
+    @property
+    def calibrated(self) -> bool:
+        return self.profile.encoding != "int8" or (
+            self.min_value is not None and self.max_value is not None
+        )
+
+    def calibration_meta(self) -> Dict[str, float]:
+        return {"min": self.min_value, "max": self.max_value}
+
+    def _prepare(self, vectors: Sequence[Sequence[float]]) -> np.ndarray:
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        dimensions = self.profile.dimensions
+        if dimensions and dimensions < array.shape[1]:
+            array = array[:, :dimensions]
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            array = array / np.where(norms == 0, 1.0, norms)
+        return array
+
+    def calibrate(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Set the int8 range from the first ``VECTOR_CALIBRATION_SAMPLE`` of *vectors*"""
+        sample = self._prepare(list(vectors)[:VECTOR_CALIBRATION_SAMPLE])
+        low, high = float(sample.min()), float(sample.max())
+        if high <= low:
+            high = low + 1e-6
+        self.min_value, self.max_value = low, high
+
+    def encode(self, vectors: Sequence[Sequence[float]]) -> List[List[float]]:
+        array = self._prepare(vectors)
+        if self.profile.encoding == "fp16":
+            return np.clip(array, -FP16_MAX, FP16_MAX).astype(np.float16).astype(np.float32).tolist()
+        if self.profile.encoding == "int8":
+            if not self.calibrated:
+                raise RuntimeError("int8 vector codec used before calibration")
+            scale = 255.0 / (self.max_value - self.min_value)
+            quantized = np.rint((array - self.min_value) * scale - 128.0)
+            return np.clip(quantized, -128, 127).astype(np.int8).tolist()
+        return array.tolist()
+
+    def decode(self, vectors: Sequence[Sequence[float]]) -> List[List[float]]:
+        """Approximate float vectors back from their stored representation"""
+        array = np.asarray(vectors, dtype=np.float32)
+        if self.profile.encoding == "int8":
+            array = (array + 128.0) * (self.max_value - self.min_value) / 255.0 + self.min_value
+        return array.tolist()
+
+
+def _index_mappings(mapping: Dict[str, Any], index_name: str) -> Dict[str, Any]:
+    return mapping.get(index_name, {}).get("mappings", {}) or {}
+
+
+def recorded_profiles(mapping: Dict[str, Any], index_name: str) -> Dict[str, Dict[str, Any]]:
+    """Field profiles recorded in a ``get_mapping`` response"""
+    meta = _index_mappings(mapping, index_name).get("_meta") or {}
+    return dict(meta.get(META_KEY) or {})
+
+
+def merged_meta(mapping: Dict[str, Any], index_name: str, field_name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """The index ``_meta`` with *entry* recorded for *field_name*
+
+    ``put_mapping`` replaces ``_meta`` as a whole, so other keys are carried over.
+    """
+    meta = dict(_index_mappings(mapping, index_name).get("_meta") or {})
+    profiles = dict(meta.get(META_KEY) or {})
+    profiles[field_name] = {**profiles.get(field_name, {}), **entry}
+    meta[META_KEY] = profiles
+    return meta
+
+
+@asynccontextmanager
+async def meta_lock(
+    opensearch_client, index_name: str, wait_seconds: float = META_LOCK_WAIT_SECONDS
+) -> AsyncIterator[None]:
+    """Hold the cross-process lock for reading, merging and writing the ``_meta`` of *index_name*
+
+    The lock is a document created only if absent; a lock older than
+    ``META_LOCK_SECONDS`` is removed so a crashed holder cannot block writers.
+    """
+    lock_index = index_name + META_LOCK_INDEX_SUFFIX
+    body = {"owner": uuid.uuid4().hex}
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        try:
+            created = await opensearch_client.index(
+                index=lock_index,
+                id=index_name,
+                body={**body, "expires_at": time.time() + META_LOCK_SECONDS},
+                op_type="create",
+            )
+            break
+        except ConflictError:
+            pass
+        try:
+            held = await opensearch_client.get(index=lock_index, id=index_name)
+            if held["_source"].get("expires_at", 0) < time.time():
+                await opensearch_client.delete(
+                    index=lock_index,
+                    id=index_name,
+                    if_seq_no=held["_seq_no"],
+                    if_primary_term=held["_primary_term"],
+                )
+                continue
+        except (ConflictError, NotFoundError):
+            continue  # Released or replaced meanwhile
+        if time.monotonic() > deadline:
+            raise MetaLockTimeoutError(f"Timed out waiting for the _meta lock of index '{index_name}'")
+        await asyncio.sleep(0.1)
+    try:
+        yield
+    finally:
+        try:
+            # Only our own lock: it may have expired and been taken by another writer
+            await opensearch_client.delete(
+                index=lock_index,
+                id=index_name,
+                if_seq_no=created["_seq_no"],
+                if_primary_term=created["_primary_term"],
+            )
+        except (ConflictError, NotFoundError):
+            logger.warning("The _meta lock expired before it was released", index=index_name)
+
+
+def check_recorded_profile(
+    mapping: Dict[str, Any], index_name: str, field_name: str, expected: Dict[str, Any]
+) -> None:
+    """Raise if *field_name* is recorded with another encoding or dimension"""
+    recorded = recorded_profiles(mapping, index_name).get(field_name)
+    if not recorded:
+        return
+    for key in ("encoding", "dimensions"):
+        if recorded.get(key) != expected.get(key):
+            raise VectorProfileMismatchError(
+                f"Field '{field_name}' in index '{index_name}' is stored as "
+                f"{recorded.get('encoding')}/{recorded.get('dimensions')}d, but the configured "
+                f"vector profile is {expected.get('encoding')}/{expected.get('dimensions')}d"
+            )
+
+
+@dataclass
+class VectorField:
+    name: str
+    model: Optional[str]
+    codec: VectorCodec
+
+
+class VectorCodecRegistry:
+    """Per-process codecs by ``(index, field)``, plus the recorded fields of each index
+
+    An int8 field is calibrated by the first writer alone: :meth:`get` with a
+    ``sample`` takes the ``_meta`` lock, re-reads the mapping and computes the range
+    from that caller's vectors only if none is recorded yet. Samples are not pooled
+    across callers, since writers cannot encode until a range exists.
+    """
+
+    def __init__(self, field_cache_seconds: float = VECTOR_PROFILE_CACHE_SECONDS):
+        self._codecs: Dict[Tuple[str, str], VectorCodec] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._fields: Dict[str, Tuple[float, List[VectorField]]] = {}
+        self.field_cache_seconds = field_cache_seconds
+
+    async def get(
+        self,
+        opensearch_client,
+        index_name: str,
+        field_name: str,
+        profile: VectorProfile,
+        sample: Optional[Sequence[Sequence[float]]] = None,
+    ) -> VectorCodec:
+        key = (index_name, field_name)
+        codec = self._codecs.get(key)
+        if codec is not None:
+            return codec
+        if profile.encoding != "int8":
+            codec = self._codecs[key] = VectorCodec(profile)
+            return codec
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            codec = self._codecs.get(key)
+            if codec is not None:
+                return codec
+            mapping = await opensearch_client.indices.get_mapping(index=index_name)
+            entry = recorded_profiles(mapping, index_name).get(field_name, {})
+            codec = VectorCodec(profile, **_calibration_kwargs(entry))
+            if not codec.calibrated and sample is not None and len(sample):
+                codec = await self._calibrate(opensearch_client, index_name, field_name, profile, sample)
+            if codec.calibrated:
+                self._codecs[key] = codec
+                self._fields.pop(index_name, None)
+            return codec
+
+    @staticmethod
+    async def _calibrate(
+        opensearch_client,
+        index_name: str,
+        field_name: str,
+        profile: VectorProfile,
+        sample: Sequence[Sequence[float]],
+    ) -> VectorCodec:
+        """Record a range computed from *sample* unless another writer already has"""
+        async with meta_lock(opensearch_client, index_name):
+            mapping = await opensearch_client.indices.get_mapping(index=index_name)
+            entry = recorded_profiles(mapping, index_name).get(field_name, {})
+            codec = VectorCodec(profile, **_calibration_kwargs(entry))
+            if codec.calibrated:
+                return codec
+            codec.calibrate(sample)
+            await opensearch_client.indices.put_mapping(
+                index=index_name,
+                body={"_meta": merged_meta(mapping, index_name, field_name, {"calibration": codec.calibration_meta()})},
+            )
+        logger.info(
+            "Calibrated int8 vector field",
+            index=index_name,
+            field=field_name,
+            min=codec.min_value,
+            max=codec.max_value,
+        )
+        return codec
+
+    async def fields(self, opensearch_client, index_name: str) -> List[VectorField]:
+        """Embedding fields of *index_name* with their codecs (cached briefly)"""
+        cached = self._fields.get(index_name)
+        if cached is not None and time.monotonic() - cached[0] < self.field_cache_seconds:
+            return cached[1]
+
+        mapping = await opensearch_client.indices.get_mapping(index=index_name)
+        properties = _index_mappings(mapping, index_name).get("properties", {}) or {}
+        profiles = recorded_profiles(mapping, index_name)
+        fields = []
+        for name, definition in properties.items():
+            if not name.startswith("chunk_embedding_") or definition.get("type") != "knn_vector":
+                continue
+            entry = profiles.get(name)
+            if entry:
+                codec = VectorCodec.from_meta(entry)
+                if not codec.calibrated:
+                    continue  # Nothing has been written to this int8 field yet
+                fields.append(VectorField(name, entry.get("model"), codec))
+            else:
+                # Fields created before profiles existed hold float32 vectors
+                fields.append(VectorField(name, None, VectorCodec(VectorProfile())))
+        self._fields[index_name] = (time.monotonic(), fields)
+        return fields
+
+    def invalidate(self, index_name: Optional[str] = None) -> None:
+        for key in list(self._codecs):
+            if index_name is None or key[0] == index_name:
+                del self._codecs[key]
+        for name in list(self._fields):
+            if index_name is None or name == index_name:
+                del self._fields[name]
+
+
+def _calibration_kwargs(entry: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    calibration = entry.get("calibration") or {}
+    return {"min_value": calibration.get("min"), "max_value": calibration.get("max")}
+
+
+vector_codecs = VectorCodecRegistry()
+
+
+async def get_vector_codec(
+    opensearch_client,
+    index_name: str,
+    field_name: str,
+    profile: VectorProfile,
+    sample: Optional[Sequence[Sequence[float]]] = None,
+) -> VectorCodec:
+    """Codec for writing to or querying *field_name*; *sample* calibrates a new int8 field"""
+    return await vector_codecs.get(opensearch_client, index_name, field_name, profile, sample)
+
+
+async def get_vector_fields(opensearch_client, index_name: str) -> List[VectorField]:
+    return await vector_codecs.fields(opensearch_client, index_name)
@@ -0,0 +1,9 @@
+"""
+Offline performance benchmarks.
+
+Each scenario drives a backend hot path (upload ingest, connector sync, search,
+chat streaming, task polling, Watson News ETL) against in-process stand-ins for
+OpenSearch, the embedding provider, Langflow and docling, and records latency /
+throughput metrics. Run with ``pytest -m benchmark tests/benchmark``; see
+``conftest.py`` for writing results and comparing them against a baseline.
+"""
@@ -0,0 +1,187 @@
+"""
+Offline benchmark configuration.
+
+Every test under this directory is a ``benchmark`` and only runs when selected
+(``pytest -m benchmark``). The backend's OpenSearch client, embedding client and
+docling converter are replaced by the in-process stand-ins, so nothing touches the
+network.
+
+Environment:
+    BENCHMARK_RESULTS    JSON file the session's results are written to
+                         (default: build/benchmark/benchmark-results.json)
+    BENCHMARK_BASELINE   Stored results to compare against; regressions fail the session
+    BENCHMARK_THRESHOLD  Allowed slowdown as a fraction of the baseline (default: 0.25)
+    BENCHMARK_LOG_LEVEL  Backend log level during benchmarks (default: WARNING)
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from .corpus import SyntheticConverter
+from .embeddings import HashEmbeddings
+from .harness import BenchmarkResults, compare
+from .opensearch_standin import InMemoryOpenSearch
+
+BENCHMARK_DIR = Path(__file__).parent
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+
+# Under the git-ignored build directory, so runs do not leave files in the tree
+DEFAULT_RESULTS_PATH = "build/benchmark/benchmark-results.json"
+
+results = BenchmarkResults()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: offline performance scenario (run with -m benchmark)")
+
+
+def pytest_collection_modifyitems(config, items):
+    selected = "benchmark" in (config.getoption("markexpr") or "")
+    skip = pytest.mark.skip(reason="benchmarks only run with -m benchmark")
+    for item in items:
+        if BENCHMARK_DIR in Path(item.fspath).parents:
+            item.add_marker(pytest.mark.benchmark)
+            if not selected:
+                item.add_marker(skip)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not results.scenarios:
+        return
+    results.write(os.getenv("BENCHMARK_RESULTS", DEFAULT_RESULTS_PATH))
+    baseline = os.getenv("BENCHMARK_BASELINE")
+    if baseline:
+        threshold = float(os.getenv("BENCHMARK_THRESHOLD", "0.25"))
+        session.config._benchmark_regressions = compare(
+            results, BenchmarkResults.load(baseline), threshold
+        )
+        if session.config._benchmark_regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not results.scenarios:
+        return
+    terminalreporter.section("benchmark results")
+    for scenario, metrics in sorted(results.scenarios.items()):
+        summary = ", ".join(f"{name}={metric.value:.4g}{metric.unit}" for name, metric in metrics.items())
+        terminalreporter.write_line(f"{scenario}: {summary}")
+    for regression in getattr(config, "_benchmark_regressions", []):
+        terminalreporter.write_line(f"REGRESSION {regression}", red=True)
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def onboard_system():
+    """No-op override — benchmarks run against in-process stand-ins."""
+    yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_logging():
+    from utils.logging_config import configure_from_env, configure_logging
+
+    configure_logging(log_level=os.getenv("BENCHMARK_LOG_LEVEL", "WARNING"))
+    yield
+    configure_from_env()
+
+
+@pytest.fixture
+def benchmark_results():
+    return results
+
+
+class StandInSessionManager:
+    """Hands every user the same in-memory OpenSearch client"""
+
+    def __init__(self, opensearch):
+        self.opensearch = opensearch
+
+    def get_user_opensearch_client(self, user_id, jwt_token):
+        return self.opensearch
+
+
+@pytest.fixture
+def opensearch():
+    return InMemoryOpenSearch()
+
+
+@pytest.fixture
+def embeddings():
+    return HashEmbeddings(dimensions=EMBEDDING_DIMENSIONS, latency=0.002)
+
+
+@pytest.fixture
+def converter():
+    return SyntheticConverter(latency_per_page=0.001)
+
+
+@pytest_asyncio.fixture
+async def offline_backend(monkeypatch, opensearch, embeddings, converter):
+    """Point the backend's shared clients at the stand-ins"""
+    import utils.conversion_cache as conversion_cache
+    from config.settings import INDEX_BODY, clients, get_index_name
+    from utils.embedding_fields import embedding_field_registry
+    from utils.vector_profiles import vector_codecs
+
+    monkeypatch.setattr(clients, "opensearch", opensearch)
+    monkeypatch.setattr(clients, "_patched_async_client", embeddings)
+    monkeypatch.setattr(type(clients), "converter", property(lambda self: converter))
+
+    async def get_converter(self):
+        return converter
+
+    monkeypatch.setattr(type(clients), "get_converter", get_converter)
+    # Measure conversion itself, not the conversion cache
+    monkeypatch.setattr(conversion_cache, "DOCLING_CACHE_ENABLED", False)
+    embedding_field_registry.invalidate()
+    vector_codecs.invalidate()
+    await opensearch.indices.create(index=get_index_name(), body=INDEX_BODY)
+    yield StandInSessionManager(opensearch)
+    embedding_field_registry.invalidate()
+    vector_codecs.invalidate()
+
+
+async def index_chunks(opensearch, embeddings, count: int, *, seed: int = 0, batch: int = 500) -> list[str]:
+    """
+    Bulk-index ``count`` synthetic chunks embedded with ``EMBEDDING_MODEL``, shaped
+    like the standard processor's output. Returns the chunk texts.
+    """
+    import random
+
+    from config.settings import get_index_name
+    from utils.embedding_fields import ensure_embedding_field_exists
+
+    from .corpus import MIMETYPES, paragraphs
+
+    field = await ensure_embedding_field_exists(opensearch, EMBEDDING_MODEL, get_index_name())
+    rng = random.Random(seed)
+    texts = paragraphs(rng, count, sentences_per_paragraph=3)
+    mimetypes = list(MIMETYPES.values())
+    for start in range(0, count, batch):
+        vectors = await embeddings.embed(texts[start : start + batch])
+        actions = []
+        for offset, (text, vector) in enumerate(zip(texts[start : start + batch], vectors)):
+            position = start + offset
+            document = position // 4
+            actions.append({"index": {"_index": get_index_name(), "_id": f"doc{document}_{position % 4}"}})
+            actions.append(
+                {
+                    "document_id": f"doc{document}",
+                    "filename": f"doc-{document:05d}.txt",
+                    "mimetype": mimetypes[document % len(mimetypes)],
+                    "page": position % 4 + 1,
+                    "text": text,
+                    field: vector,
+                    "embedding_model": EMBEDDING_MODEL,
+                    "embedding_dimensions": len(vector),
+                    "owner": "bench-user",
+                    "owner_name": "Bench User",
+                    "connector_type": "local",
+                }
+            )
+        await opensearch.bulk(body=actions)
+    return texts
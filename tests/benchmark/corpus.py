@@ -0,0 +1,199 @@
+"""
+Synthetic corpus generators and an offline docling stand-in.
+
+Documents are built from a fixed vocabulary with a seeded RNG, so every run sees
+the same corpus. PDFs are small, valid, uncompressed PDF 1.4 files (one text
+object per line), which ``SyntheticConverter`` can read back into the docling
+document shape that ``extract_relevant`` consumes.
+"""
+
+import hashlib
+import random
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+
+VOCABULARY = (
+    "retrieval augmented generation vector index embedding chunk query latency "
+    "throughput document connector ingestion pipeline search ranking hybrid keyword "
+    "semantic model provider cluster shard replica mapping filter owner permission "
+    "quarterly revenue forecast customer contract renewal policy security audit "
+    "network storage compute region deployment release incident review summary"
+).split()
+
+MIMETYPES = {
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".pdf": "application/pdf",
+}
+
+
+@dataclass
+class SyntheticDocument:
+    path: Path
+    mimetype: str
+    paragraphs: list[str]
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+
+def sentences(rng: random.Random, count: int, words: int = 14) -> list[str]:
+    return [
+        " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def paragraphs(rng: random.Random, count: int, sentences_per_paragraph: int = 5) -> list[str]:
+    return [" ".join(sentences(rng, sentences_per_paragraph)) for _ in range(count)]
+
+
+def write_text(path: Path, paras: list[str]) -> None:
+    path.write_text("\n\n".join(paras), encoding="utf-8")
+
+
+def write_markdown(path: Path, paras: list[str]) -> None:
+    lines = [f"# {path.stem.replace('-', ' ').title()}", ""]
+    for index, paragraph in enumerate(paras):
+        if index % 3 == 0:
+            lines += [f"## Section {index // 3 + 1}", ""]
+        lines += [paragraph, ""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, paras: list[str], paragraphs_per_page: int = 3, line_chars: int = 90) -> None:
+    """Minimal multi-page PDF with Helvetica text, one ``Tj`` per wrapped line"""
+    pages = [paras[i : i + paragraphs_per_page] for i in range(0, len(paras), paragraphs_per_page)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        lines = []
+        for paragraph in page:
+            words, line = paragraph.split(), ""
+            for word in words:
+                if len(line) + len(word) + 1 > line_chars:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = f"{line} {word}".strip()
+            lines += [line, ""]
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in lines
+        ) + "ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(bytes(out))
+
+
+WRITERS = {".txt": write_text, ".md": write_markdown, ".pdf": write_pdf}
+
+
+def generate_corpus(
+    directory: Path,
+    count: int,
+    *,
+    kinds: tuple[str, ...] = (".txt", ".md", ".pdf"),
+    paragraphs_per_doc: tuple[int, int] = (3, 9),
+    seed: int = 0,
+) -> list[SyntheticDocument]:
+    """``count`` documents cycling through ``kinds``, written under ``directory``"""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    documents = []
+    for index in range(count):
+        suffix = kinds[index % len(kinds)]
+        paras = paragraphs(rng, rng.randint(*paragraphs_per_doc))
+        path = directory / f"doc-{index:05d}{suffix}"
+        WRITERS[suffix](path, paras)
+        documents.append(SyntheticDocument(path, MIMETYPES[suffix], paras))
+    return documents
+
+
+def html_article(rng: random.Random, title: str, paragraph_count: int = 6) -> str:
+    """News-style HTML page with navigation and footer boilerplate around the article"""
+    body = "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs(rng, paragraph_count))
+    return (
+        f"<html><head><title>{title}</title></head><body>"
+        "<nav><a href='/'>Home</a> <a href='/news'>News</a></nav>"
+        f"<article><h1>{title}</h1>{body}</article>"
+        "<footer>Copyright. All rights reserved.</footer></body></html>"
+    )
+
+
+_TJ_RE = re.compile(rb"\(((?:\\.|[^\\)])*)\)\s*Tj")
+_STREAM_RE = re.compile(rb"stream\n(.*?)\nendstream", re.S)
+
+
+def _pdf_pages(data: bytes) -> list[str]:
+    pages = []
+    for stream in _STREAM_RE.findall(data):
+        lines = [re.sub(rb"\\(.)", rb"\1", raw).decode("latin-1") for raw in _TJ_RE.findall(stream)]
+        pages.append("\n".join(lines))
+    return pages
+
+
+class SyntheticConverter:
+    """
+    Docling ``DocumentConverter`` stand-in for the synthetic corpus.
+
+    Markdown is split into pages at level-2 headings; PDFs keep their pages.
+    ``latency_per_page`` seconds of busy CPU per page model layout analysis.
+    """
+
+    def __init__(self, latency_per_page: float = 0.0):
+        self.latency_per_page = latency_per_page
+        self.openrag_pipeline_options = {"converter": "synthetic"}
+        self.conversions = 0
+
+    def convert(self, source):
+        path = Path(source)
+        data = path.read_bytes()
+        if path.suffix == ".pdf":
+            pages = _pdf_pages(data)
+        else:
+            pages = re.split(r"\n(?=## )", data.decode("utf-8"))
+        self.conversions += 1
+        if self.latency_per_page:
+            deadline = time.perf_counter() + self.latency_per_page * len(pages)
+            while time.perf_counter() < deadline:
+                pass
+        texts = [
+            {"text": fragment, "prov": [{"page_no": page_no}]}
+            for page_no, page in enumerate(pages, start=1)
+            for fragment in page.split("\n\n")
+            if fragment.strip()
+        ]
+        document = {
+            "origin": {
+                "binary_hash": hashlib.sha256(data).hexdigest(),
+                "filename": path.name,
+                "mimetype": MIMETYPES.get(path.suffix, "application/octet-stream"),
+            },
+            "texts": texts,
+            "tables": [],
+        }
+        return SimpleNamespace(document=SimpleNamespace(export_to_dict=lambda: document))
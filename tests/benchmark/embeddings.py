@@ -0,0 +1,80 @@
+"""
+Deterministic hash-based embedding provider.
+
+Each token is hashed into one of ``dimensions`` buckets with a sign, so texts that
+share words get similar vectors and the same text always gets the same vector.
+``latency`` is awaited once per request to model the provider round trip.
+
+The provider answers both the OpenAI-style ``embeddings.create(model=, input=)``
+used by the backend and the ``embed(texts)``/``generate(prompt)`` pair of the
+Watson News watsonx client.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import re
+from types import SimpleNamespace
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def hash_embedding(text: str, dimensions: int) -> list[float]:
+    vector = [0.0] * dimensions
+    for token in _TOKEN_RE.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dimensions
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class _Embeddings:
+    def __init__(self, provider):
+        self._provider = provider
+
+    async def create(self, model, input, **kwargs):
+        texts = [input] if isinstance(input, str) else list(input)
+        vectors = await self._provider.embed(texts)
+        return SimpleNamespace(
+            model=model,
+            data=[SimpleNamespace(index=i, embedding=vector) for i, vector in enumerate(vectors)],
+        )
+
+
+class HashEmbeddings:
+    """Offline embedding (and trivial generation) provider"""
+
+    def __init__(self, dimensions: int = 256, latency: float = 0.0):
+        self.dimensions = dimensions
+        self.latency = latency
+        self.requests = 0
+        self.texts = 0
+        self.embeddings = _Embeddings(self)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.requests += 1
+        self.texts += len(texts)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [hash_embedding(text, self.dimensions) for text in texts]
+
+    async def generate(self, prompt: str) -> str:
+        """Enrichment stand-in: a fixed-shape JSON answer derived from the prompt"""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        words = _TOKEN_RE.findall(prompt)
+        return json.dumps(
+            {
+                "summary": " ".join(words[-30:]),
+                "sentiment_label": "neutral",
+                "sentiment_score": 0.0,
+                "entities": sorted({w for w in words if w[:1].isupper()})[:5],
+                "topic": "technology",
+            }
+        )
+
+    async def close(self):
+        pass
@@ -0,0 +1,170 @@
+"""
+Benchmark results, percentiles and baseline comparison.
+
+Scenarios record named metrics (each with a unit and whether lower or higher is
+better). The session writes them to a JSON file, which can be stored as a
+baseline and compared against later runs:
+
+    python -m tests.benchmark.harness compare build/benchmark/benchmark-results.json baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class Metric:
+    value: float
+    unit: str
+    better: str = "lower"  # "lower" or "higher"
+
+
+@dataclass
+class Regression:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    unit: str
+    ratio: float  # How many times worse than the baseline
+
+    def __str__(self) -> str:
+        return (
+            f"{self.scenario}.{self.metric}: {self.current:.4g} {self.unit} "
+            f"vs baseline {self.baseline:.4g} {self.unit} ({self.ratio:.2f}x worse)"
+        )
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile, ``q`` in [0, 100]"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_metrics(samples: list[float], prefix: str = "") -> dict[str, Metric]:
+    """p50/p95/p99/mean in milliseconds of samples in seconds"""
+    ms = [sample * 1000 for sample in samples]
+    return {
+        f"{prefix}p50_ms": Metric(percentile(ms, 50), "ms"),
+        f"{prefix}p95_ms": Metric(percentile(ms, 95), "ms"),
+        f"{prefix}p99_ms": Metric(percentile(ms, 99), "ms"),
+        f"{prefix}mean_ms": Metric(statistics.fmean(ms) if ms else 0.0, "ms"),
+    }
+
+
+def throughput(count: int, seconds: float, unit: str) -> Metric:
+    return Metric(count / seconds if seconds > 0 else 0.0, unit, better="higher")
+
+
+async def sample_latencies(
+    operation: Callable[[int], Awaitable[object]], runs: int, warmup: int = 3
+) -> list[float]:
+    """Wall-clock seconds of ``runs`` sequential calls of ``operation(i)`` after a warm-up"""
+    for i in range(warmup):
+        await operation(i)
+    samples = []
+    for i in range(runs):
+        started = time.perf_counter()
+        await operation(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+class BenchmarkResults:
+    """Metrics per scenario for one run"""
+
+    def __init__(self):
+        self.scenarios: dict[str, dict[str, Metric]] = {}
+
+    def record(self, scenario: str, metrics: dict[str, Metric]) -> None:
+        self.scenarios.setdefault(scenario, {}).update(metrics)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": RESULTS_VERSION,
+            "environment": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "system": platform.system(),
+            },
+            "scenarios": {
+                scenario: {name: asdict(metric) for name, metric in metrics.items()}
+                for scenario, metrics in sorted(self.scenarios.items())
+            },
+        }
+
+    def write(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchmarkResults":
+        results = cls()
+        for scenario, metrics in data.get("scenarios", {}).items():
+            results.record(scenario, {name: Metric(**metric) for name, metric in metrics.items()})
+        return results
+
+    @classmethod
+    def load(cls, path: str | Path) -> "BenchmarkResults":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def compare(
+    current: BenchmarkResults, baseline: BenchmarkResults, threshold: float = 0.25
+) -> list[Regression]:
+    """
+    Metrics more than ``threshold`` (a fraction) worse than the baseline.
+
+    Scenarios or metrics missing on either side are not compared.
+    """
+    regressions = []
+    for scenario, metrics in current.scenarios.items():
+        for name, metric in metrics.items():
+            base = baseline.scenarios.get(scenario, {}).get(name)
+            if base is None:
+                continue
+            if metric.better == "higher":
+                ratio = base.value / metric.value if metric.value > 0 else float("inf")
+            else:
+                ratio = metric.value / base.value if base.value > 0 else 1.0
+            if ratio > 1 + threshold:
+                regressions.append(Regression(scenario, name, base.value, metric.value, metric.unit, ratio))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    regressions = compare(
+        BenchmarkResults.load(args.results), BenchmarkResults.load(args.baseline), args.threshold
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
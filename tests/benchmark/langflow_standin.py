@@ -0,0 +1,141 @@
+"""
+Fake Langflow server for the file and ingestion-flow endpoints, served in process
+through ``httpx.MockTransport``.
+
+- ``POST /api/v2/files`` stores the uploaded bytes and returns ``id``/``path``.
+- ``DELETE /api/v2/files/{id}`` removes them.
+- ``POST /api/v1/run/{flow_id}`` plays the ingestion flow: it splits the stored file
+  into chunks, embeds them with the hash embedding provider and bulk-indexes them,
+  with the metadata taken from the ``X-Langflow-Global-Var-*`` headers.
+
+``latency`` is awaited on every request and ``run_latency`` once more per flow run.
+"""
+
+import asyncio
+import json
+import re
+import uuid
+
+import httpx
+
+from .embeddings import HashEmbeddings
+
+_GLOBAL_VAR = "x-langflow-global-var-"
+
+
+class FakeLangflow:
+    def __init__(
+        self,
+        opensearch,
+        embeddings: HashEmbeddings,
+        *,
+        index_name: str,
+        embedding_field: str,
+        latency: float = 0.0,
+        run_latency: float = 0.0,
+        chunk_chars: int = 1000,
+    ):
+        self.opensearch = opensearch
+        self.embeddings = embeddings
+        self.index_name = index_name
+        self.embedding_field = embedding_field
+        self.latency = latency
+        self.run_latency = run_latency
+        self.chunk_chars = chunk_chars
+        self.files: dict[str, bytes] = {}
+        self.requests: dict[str, int] = {}
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle), base_url="http://langflow.test")
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if path == "/api/v2/files" and request.method == "POST":
+            return await self._upload(request)
+        if path.startswith("/api/v2/files/") and request.method == "DELETE":
+            self._count("delete")
+            file_id = path.rsplit("/", 1)[-1]
+            if self.files.pop(file_id, None) is None:
+                return httpx.Response(404, json={"detail": "File not found"})
+            return httpx.Response(200, json={"message": "File deleted"})
+        if path.startswith("/api/v1/run/") and request.method == "POST":
+            return await self._run(request)
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+    def _count(self, name):
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+    async def _upload(self, request):
+        self._count("upload")
+        body = await request.aread()
+        boundary = request.headers["content-type"].split("boundary=")[-1].encode()
+        part = next(p for p in body.split(b"--" + boundary) if b'name="file"' in p)
+        headers, _, content = part.partition(b"\r\n\r\n")
+        name = re.search(rb'filename="([^"]*)"', headers).group(1).decode()
+        file_id = uuid.uuid4().hex
+        self.files[file_id] = content.rsplit(b"\r\n", 1)[0]
+        return httpx.Response(
+            201,
+            json={
+                "id": file_id,
+                "name": name,
+                "path": f"{file_id}/{name}",
+                "size": len(self.files[file_id]),
+                "provider": None,
+            },
+        )
+
+    async def _run(self, request):
+        self._count("run")
+        payload = json.loads(await request.aread())
+        variables = {
+            key[len(_GLOBAL_VAR) :].upper(): value
+            for key, value in request.headers.items()
+            if key.lower().startswith(_GLOBAL_VAR)
+        }
+        paths = payload.get("tweaks", {}).get("DoclingRemote-Dp3PX", {}).get("path", [])
+        if self.run_latency:
+            await asyncio.sleep(self.run_latency)
+
+        indexed = 0
+        for path in paths:
+            content = self.files.get(path.split("/", 1)[0])
+            if content is None:
+                return httpx.Response(500, json={"detail": f"File {path} not found"})
+            text = content.decode("utf-8", errors="replace")
+            chunks = [text[i : i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+            vectors = await self.embeddings.embed(chunks)
+            document_id = variables.get("DOCUMENT_ID") or path
+            actions = []
+            for position, (chunk, vector) in enumerate(zip(chunks, vectors)):
+                actions.append({"index": {"_index": self.index_name, "_id": f"{document_id}_{position}"}})
+                actions.append(
+                    {
+                        "document_id": document_id,
+                        "filename": variables.get("FILENAME") or path.split("/", 1)[-1],
+                        "mimetype": variables.get("MIMETYPE"),
+                        "page": position + 1,
+                        "text": chunk,
+                        self.embedding_field: vector,
+                        "embedding_model": variables.get("SELECTED_EMBEDDING_MODEL"),
+                        "embedding_dimensions": len(vector),
+                        "owner": variables.get("OWNER"),
+                        "owner_name": variables.get("OWNER_NAME"),
+                        "connector_type": variables.get("CONNECTOR_TYPE"),
+                        "source_url": variables.get("SOURCE_URL"),
+                        "allowed_users": json.loads(variables.get("ALLOWED_USERS", "[]")),
+                        "allowed_groups": json.loads(variables.get("ALLOWED_GROUPS", "[]")),
+                    }
+                )
+            await self.opensearch.bulk(body=actions)
+            indexed += len(chunks)
+
+        return httpx.Response(
+            200,
+            json={
+                "session_id": payload.get("session_id") or uuid.uuid4().hex,
+                "outputs": [{"outputs": [{"results": {"text": {"text": f"Indexed {indexed} chunks"}}}]}],
+            },
+        )
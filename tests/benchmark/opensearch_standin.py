@@ -0,0 +1,505 @@
+"""
+In-memory stand-in for the subset of the AsyncOpenSearch API the backend uses.
+
+Supported: ``index``/``get``/``exists``/``delete``/``bulk``/``count``,
+``delete_by_query``, ``search`` with ``match_all``, ``bool``, ``term``, ``terms``,
+``exists``, ``range``, ``match``, ``multi_match``, ``dis_max`` and brute-force
+``knn`` (cosine), ``terms``/``cardinality`` aggregations, and
+``indices.create``/``exists``/``get_mapping``/``put_mapping``/``refresh``.
+
+Scores are not OpenSearch's, only consistent: keyword clauses score by the
+fraction of query terms found, kNN by ``(1 + cosine) / 2``. Every call can be
+given a fixed ``latency`` to model the network round trip.
+"""
+
+import asyncio
+import copy
+import json
+import re
+from collections import Counter
+
+import numpy as np
+from opensearchpy.exceptions import ConflictError, NotFoundError, RequestError
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(value):
+    if isinstance(value, list):
+        return [token for item in value for token in _tokens(item)]
+    return _TOKEN_RE.findall(str(value).lower()) if value is not None else []
+
+
+def _field(source, name):
+    """Value of a (possibly dotted, possibly ``.keyword``) field; None when absent"""
+    if name.endswith(".keyword"):
+        name = name[: -len(".keyword")]
+    value = source
+    for part in name.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _values(source, name):
+    value = _field(source, name)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _field_and_boost(spec):
+    name, _, boost = spec.partition("^")
+    return name, float(boost) if boost else 1.0
+
+
+class _Index:
+    def __init__(self, mappings=None):
+        self.docs = {}
+        self.mappings = copy.deepcopy(mappings) if mappings else {"properties": {}}
+        self.version = 0
+        self._token_cache = {}
+        self._vector_cache = {}
+
+    def put(self, doc_id, source):
+        created = doc_id not in self.docs
+        self.docs[doc_id] = source
+        self._map_fields(source)
+        self._changed()
+        return created
+
+    def remove(self, doc_id):
+        if self.docs.pop(doc_id, None) is None:
+            return False
+        self._changed()
+        return True
+
+    def _changed(self):
+        self.version += 1
+        self._vector_cache.clear()
+
+    def _map_fields(self, source):
+        properties = self.mappings.setdefault("properties", {})
+        for name, value in source.items():
+            if name in properties or value is None:
+                continue
+            sample = value[0] if isinstance(value, list) and value else value
+            if isinstance(sample, bool):
+                properties[name] = {"type": "boolean"}
+            elif isinstance(sample, (int, float)) and not isinstance(value, list):
+                properties[name] = {"type": "float" if isinstance(sample, float) else "long"}
+            elif isinstance(value, list) and value and isinstance(sample, float):
+                properties[name] = {"type": "knn_vector", "dimension": len(value)}
+            elif isinstance(sample, str):
+                properties[name] = {"type": "text", "fields": {"keyword": {"type": "keyword"}}}
+
+    def tokens(self, doc_id, name):
+        key = (doc_id, name)
+        cached = self._token_cache.get(key)
+        if cached is None or cached[0] is not self.docs[doc_id]:
+            source = self.docs[doc_id]
+            cached = (source, set(_tokens(_field(source, name))))
+            self._token_cache[key] = cached
+        return cached[1]
+
+    def vectors(self, name):
+        """(ids, unit-normalised matrix) of the documents that have the vector field"""
+        cached = self._vector_cache.get(name)
+        if cached is None:
+            ids, rows = [], []
+            for doc_id, source in self.docs.items():
+                vector = source.get(name)
+                if isinstance(vector, list) and vector:
+                    ids.append(doc_id)
+                    rows.append(vector)
+            matrix = np.asarray(rows, dtype=np.float32) if rows else np.zeros((0, 1), np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True) if rows else None
+            if norms is not None:
+                matrix = matrix / np.where(norms == 0, 1, norms)
+            cached = (ids, matrix)
+            self._vector_cache[name] = cached
+        return cached
+
+
+class _Search:
+    """Evaluates one query against one index"""
+
+    def __init__(self, index):
+        self.index = index
+        self._knn_cache = {}
+
+    def knn_scores(self, name, params):
+        key = id(params)
+        if key not in self._knn_cache:
+            ids, matrix = self.index.vectors(name)
+            scores = {}
+            if ids:
+                query = np.asarray(params["vector"], dtype=np.float32)
+                norm = np.linalg.norm(query)
+                if matrix.shape[1] != query.shape[0]:
+                    raise RequestError(400, "search_phase_execution_exception", "dimension mismatch")
+                similarity = matrix @ (query / (norm or 1))
+                k = min(int(params.get("k", 10)), len(ids))
+                top = np.argpartition(-similarity, k - 1)[:k]
+                scores = {ids[i]: float((1 + similarity[i]) / 2) for i in top}
+            self._knn_cache[key] = scores
+        return self._knn_cache[key]
+
+    def match(self, query, doc_id, source):
+        """Score of the document, or None when it does not match"""
+        if not query:
+            return 1.0
+        (kind, spec), = query.items()
+        handler = getattr(self, f"_{kind}", None)
+        if handler is None:
+            raise RequestError(400, "parsing_exception", f"unknown query [{kind}]")
+        score = handler(spec, doc_id, source)
+        if score is not None and isinstance(spec, dict):
+            score *= float(spec.get("boost", 1.0)) if kind in ("bool", "dis_max", "multi_match") else 1.0
+        return score
+
+    def _match_all(self, spec, doc_id, source):
+        return 1.0
+
+    def _term(self, spec, doc_id, source):
+        (name, value), = spec.items()
+        if isinstance(value, dict):
+            value = value.get("value")
+        return 1.0 if value in _values(source, name) else None
+
+    def _terms(self, spec, doc_id, source):
+        name, wanted = next((k, v) for k, v in spec.items() if k != "boost")
+        return 1.0 if set(map(str, _values(source, name))) & set(map(str, wanted)) else None
+
+    def _exists(self, spec, doc_id, source):
+        value = _field(source, spec["field"])
+        return 1.0 if value not in (None, [], "") else None
+
+    def _range(self, spec, doc_id, source):
+        (name, bounds), = spec.items()
+        checks = {
+            "gt": lambda v, b: v > b,
+            "gte": lambda v, b: v >= b,
+            "lt": lambda v, b: v < b,
+            "lte": lambda v, b: v <= b,
+        }
+        for value in _values(source, name):
+            try:
+                if all(checks[op](value, bound) for op, bound in bounds.items() if op in checks):
+                    return 1.0
+            except TypeError:
+                continue
+        return None
+
+    def _text_score(self, name, text, doc_id):
+        wanted = set(_tokens(text))
+        if not wanted:
+            return None
+        found = wanted & self.index.tokens(doc_id, name)
+        return len(found) / len(wanted) if found else None
+
+    def _match(self, spec, doc_id, source):
+        (name, value), = spec.items()
+        text = value.get("query") if isinstance(value, dict) else value
+        return self._text_score(name, text, doc_id)
+
+    def _multi_match(self, spec, doc_id, source):
+        scores = []
+        for field_spec in spec.get("fields", ["*"]):
+            name, boost = _field_and_boost(field_spec)
+            score = self._text_score(name, spec["query"], doc_id)
+            if score is not None:
+                scores.append(score * boost)
+        return max(scores) if scores else None
+
+    def _dis_max(self, spec, doc_id, source):
+        scores = [s for s in (self.match(q, doc_id, source) for q in spec["queries"]) if s is not None]
+        if not scores:
+            return None
+        best = max(scores)
+        return best + float(spec.get("tie_breaker", 0.0)) * (sum(scores) - best)
+
+    def _knn(self, spec, doc_id, source):
+        (name, params), = spec.items()
+        score = self.knn_scores(name, params).get(doc_id)
+        if score is None:
+            return None
+        inner = params.get("filter")
+        if inner and self.match(inner, doc_id, source) is None:
+            return None
+        return score
+
+    def _bool(self, spec, doc_id, source):
+        def clauses(key):
+            value = spec.get(key, [])
+            return value if isinstance(value, list) else [value]
+
+        score = 0.0
+        for clause in clauses("must"):
+            s = self.match(clause, doc_id, source)
+            if s is None:
+                return None
+            score += s
+        for clause in clauses("filter"):
+            if self.match(clause, doc_id, source) is None:
+                return None
+        for clause in clauses("must_not"):
+            if self.match(clause, doc_id, source) is not None:
+                return None
+        should = clauses("should")
+        if should:
+            matched = [s for s in (self.match(c, doc_id, source) for c in should) if s is not None]
+            required = spec.get(
+                "minimum_should_match", 0 if clauses("must") or clauses("filter") else 1
+            )
+            if len(matched) < int(required):
+                return None
+            score += sum(matched)
+        return score or 1.0
+
+
+class _IndicesClient:
+    def __init__(self, client):
+        self._client = client
+
+    async def create(self, index, body=None, **kwargs):
+        await self._client._call("indices.create")
+        if index in self._client._indices:
+            raise RequestError(400, "resource_already_exists_exception", f"index [{index}] already exists")
+        self._client._indices[index] = _Index((body or {}).get("mappings"))
+        return {"acknowledged": True, "index": index}
+
+    async def exists(self, index, **kwargs):
+        await self._client._call("indices.exists")
+        return index in self._client._indices
+
+    async def delete(self, index, **kwargs):
+        await self._client._call("indices.delete")
+        if self._client._indices.pop(index, None) is None:
+            raise NotFoundError(404, "index_not_found_exception", index)
+        return {"acknowledged": True}
+
+    async def get_mapping(self, index, **kwargs):
+        await self._client._call("indices.get_mapping")
+        return {index: {"mappings": copy.deepcopy(self._client._index(index).mappings)}}
+
+    async def put_mapping(self, index, body, **kwargs):
+        await self._client._call("indices.put_mapping")
+        mappings = self._client._index(index).mappings
+        mappings.setdefault("properties", {}).update(copy.deepcopy(body.get("properties", {})))
+        if "_meta" in body:
+            mappings["_meta"] = copy.deepcopy(body["_meta"])
+        return {"acknowledged": True}
+
+    async def refresh(self, index=None, **kwargs):
+        await self._client._call("indices.refresh")
+        return {"_shards": {"failed": 0}}
+
+
+class InMemoryOpenSearch:
+    """Drop-in for ``AsyncOpenSearch`` backed by dictionaries and numpy"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self._indices = {}
+        self.indices = _IndicesClient(self)
+
+    async def _call(self, operation):
+        self.calls[operation] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _index(self, name, create=False):
+        if name not in self._indices:
+            if not create:
+                raise NotFoundError(404, "index_not_found_exception", name)
+            self._indices[name] = _Index()
+        return self._indices[name]
+
+    def documents(self, index):
+        """All stored sources of an index (test helper)"""
+        return dict(self._indices[index].docs) if index in self._indices else {}
+
+    async def close(self):
+        pass
+
+    async def index(self, index, body, id=None, op_type=None, **kwargs):
+        await self._call("index")
+        target = self._index(index, create=True)
+        doc_id = str(id) if id is not None else f"auto-{len(target.docs)}"
+        if op_type == "create" and doc_id in target.docs:
+            raise ConflictError(409, "version_conflict_engine_exception", {"_index": index, "_id": doc_id})
+        created = target.put(doc_id, copy.deepcopy(body))
+        return {
+            "_index": index,
+            "_id": doc_id,
+            "result": "created" if created else "updated",
+            "_seq_no": target.version,
+            "_primary_term": 1,
+        }
+
+    async def get(self, index, id, **kwargs):
+        await self._call("get")
+        target = self._index(index)
+        source = target.docs.get(str(id))
+        if source is None:
+            raise NotFoundError(404, "not_found", {"_index": index, "_id": id, "found": False})
+        return {
+            "_index": index,
+            "_id": str(id),
+            "found": True,
+            "_source": copy.deepcopy(source),
+            "_seq_no": target.version,
+            "_primary_term": 1,
+        }
+
+    async def exists(self, index, id, **kwargs):
+        await self._call("exists")
+        return index in self._indices and str(id) in self._indices[index].docs
+
+    async def delete(self, index, id, **kwargs):
+        await self._call("delete")
+        if not self._index(index).remove(str(id)):
+            raise NotFoundError(404, "not_found", {"_index": index, "_id": id})
+        return {"_index": index, "_id": str(id), "result": "deleted"}
+
+    async def count(self, index, body=None, **kwargs):
+        await self._call("count")
+        if index not in self._indices:
+            return {"count": 0}
+        return {"count": len(self._matching(index, (body or {}).get("query")))}
+
+    async def bulk(self, body, index=None, **kwargs):
+        await self._call("bulk")
+        if isinstance(body, (str, bytes)):
+            body = [json.loads(line) for line in body.splitlines() if line.strip()]
+        items, errors, position = [], False, 0
+        while position < len(body):
+            (action, meta), = body[position].items()
+            position += 1
+            target = meta.get("_index", index)
+            doc_id = str(meta.get("_id", f"auto-{position}"))
+            status = 200
+            if action in ("index", "create"):
+                source = body[position]
+                position += 1
+                if action == "create" and doc_id in self._index(target, True).docs:
+                    status = 409
+                else:
+                    status = 201 if self._index(target, True).put(doc_id, copy.deepcopy(source)) else 200
+            elif action == "update":
+                partial = body[position]
+                position += 1
+                current = self._index(target, True).docs.get(doc_id)
+                if current is None:
+                    status = 404
+                else:
+                    self._index(target).put(doc_id, {**current, **copy.deepcopy(partial.get("doc", {}))})
+            elif action == "delete":
+                status = 200 if target in self._indices and self._indices[target].remove(doc_id) else 404
+            item = {"_index": target, "_id": doc_id, "status": status}
+            if status >= 300:
+                errors = True
+                item["error"] = {"type": "version_conflict_engine_exception" if status == 409 else "not_found"}
+            items.append({action: item})
+        return {"took": 0, "errors": errors, "items": items}
+
+    async def delete_by_query(self, index, body, **kwargs):
+        await self._call("delete_by_query")
+        if index not in self._indices:
+            raise NotFoundError(404, "index_not_found_exception", index)
+        matched = self._matching(index, body.get("query"))
+        for doc_id, _ in matched:
+            self._indices[index].remove(doc_id)
+        return {"deleted": len(matched), "failures": []}
+
+    def _matching(self, index, query):
+        target = self._indices[index]
+        search = _Search(target)
+        matched = []
+        for doc_id, source in target.docs.items():
+            score = search.match(query, doc_id, source)
+            if score is not None:
+                matched.append((doc_id, score))
+        return matched
+
+    async def search(self, index=None, body=None, params=None, size=None, **kwargs):
+        await self._call("search")
+        body = body or {}
+        if index not in self._indices:
+            raise NotFoundError(404, "index_not_found_exception", index)
+        target = self._indices[index]
+        matched = self._matching(index, body.get("query"))
+        min_score = body.get("min_score")
+        if min_score is not None:
+            matched = [(doc_id, score) for doc_id, score in matched if score >= min_score]
+
+        sort = body.get("sort")
+        if sort:
+            for spec in reversed(sort if isinstance(sort, list) else [sort]):
+                name, order = (spec, "asc") if isinstance(spec, str) else next(iter(spec.items()))
+                order = order.get("order", "asc") if isinstance(order, dict) else order
+                if name == "_score":
+                    matched.sort(key=lambda item: item[1], reverse=order == "desc")
+                else:
+                    matched.sort(
+                        key=lambda item: (_field(target.docs[item[0]], name) is None, _field(target.docs[item[0]], name) or 0),
+                        reverse=order == "desc",
+                    )
+        else:
+            matched.sort(key=lambda item: -item[1])
+
+        start = int(body.get("from", 0))
+        count = int(body.get("size", size if size is not None else 10))
+        includes = body.get("_source", True)
+        if isinstance(includes, dict):
+            includes = includes.get("includes", True)
+
+        hits = []
+        for doc_id, score in matched[start : start + count]:
+            source = target.docs[doc_id]
+            if includes is False:
+                source = None
+            elif isinstance(includes, list):
+                source = {name: source[name] for name in includes if name in source}
+            hit = {"_index": index, "_id": doc_id, "_score": score}
+            if source is not None:
+                hit["_source"] = copy.deepcopy(source)
+            hits.append(hit)
+
+        response = {
+            "took": 0,
+            "timed_out": False,
+            "hits": {
+                "total": {"value": len(matched), "relation": "eq"},
+                "max_score": max((score for _, score in matched), default=None),
+                "hits": hits,
+            },
+        }
+        aggs = body.get("aggs") or body.get("aggregations")
+        if aggs:
+            docs = [target.docs[doc_id] for doc_id, _ in matched]
+            response["aggregations"] = {name: self._aggregate(spec, docs) for name, spec in aggs.items()}
+        return response
+
+    @staticmethod
+    def _aggregate(spec, docs):
+        if "terms" in spec:
+            counts = Counter(
+                value for source in docs for value in _values(source, spec["terms"]["field"])
+                if not isinstance(value, (dict, list))
+            )
+            buckets = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+            size = int(spec["terms"].get("size", 10))
+            return {
+                "doc_count_error_upper_bound": 0,
+                "sum_other_doc_count": sum(count for _, count in buckets[size:]),
+                "buckets": [{"key": key, "doc_count": count} for key, count in buckets[:size]],
+            }
+        if "cardinality" in spec:
+            return {"value": len({str(v) for source in docs for v in _values(source, spec["cardinality"]["field"])})}
+        if "value_count" in spec:
+            return {"value": sum(len(_values(source, spec["value_count"]["field"])) for source in docs)}
+        raise RequestError(400, "parsing_exception", f"unsupported aggregation {list(spec)}")
@@ -0,0 +1,42 @@
+"""The baseline comparison flags an injected slowdown in the search path and nothing on a clean rerun"""
+
+import time
+
+import pytest
+
+from .harness import BenchmarkResults, Metric, compare, percentile
+from .test_search_latency import run_search_benchmark
+
+CHUNKS = 300
+RUNS = 40
+
+
+def summarize(samples) -> BenchmarkResults:
+    results = BenchmarkResults()
+    results.record("search", {"p50_ms": Metric(percentile(samples, 50) * 1000, "ms")})
+    return results
+
+
+@pytest.mark.asyncio
+async def test_injected_search_slowdown_is_detected(offline_backend, opensearch, embeddings, monkeypatch):
+    from services.search_service import SearchService
+
+    baseline = summarize(await run_search_benchmark(offline_backend, opensearch, embeddings, CHUNKS, RUNS))
+
+    rerun = summarize(await run_search_benchmark(offline_backend, opensearch, embeddings, CHUNKS, RUNS))
+    assert compare(rerun, baseline, threshold=0.25) == []
+
+    # Block the event loop for as long as a whole baseline search takes
+    delay = baseline.scenarios["search"]["p50_ms"].value / 1000
+    search = SearchService._search
+
+    async def slow_search(self, *args, **kwargs):
+        time.sleep(delay)
+        return await search(self, *args, **kwargs)
+
+    monkeypatch.setattr(SearchService, "_search", slow_search)
+    slowed = summarize(await run_search_benchmark(offline_backend, opensearch, embeddings, CHUNKS, RUNS))
+
+    regressions = compare(slowed, baseline, threshold=0.25)
+    assert [(r.scenario, r.metric) for r in regressions] == [("search", "p50_ms")]
+    assert regressions[0].ratio > 1.5
@@ -0,0 +1,69 @@
+"""Chat streaming: per-chunk overhead of relaying a Responses API stream"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from .corpus import VOCABULARY
+from .harness import Metric, latency_metrics, percentile, sample_latencies
+
+CHUNKS_PER_RESPONSE = 500
+RUNS = 40
+
+
+class _Event:
+    def __init__(self, data):
+        self._data = data
+
+    def model_dump(self):
+        return dict(self._data)
+
+
+class FakeResponsesClient:
+    """``responses.create(stream=True)`` yielding text deltas as fast as they are consumed"""
+
+    def __init__(self, chunks: int):
+        rng = random.Random(0)
+        self.words = [rng.choice(VOCABULARY) + " " for _ in range(chunks)]
+        self.default_headers = {}
+        self.api_key = "bench-key"
+        self.responses = SimpleNamespace(create=self._create)
+
+    async def _create(self, **params):
+        async def events():
+            yield _Event({"type": "response.created", "id": "resp_bench"})
+            for word in self.words:
+                yield _Event({"type": "response.output_text.delta", "delta": word})
+            yield _Event({"type": "response.completed", "id": "resp_bench", "output_text": ""})
+
+        return events()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_overhead(benchmark_results):
+    from agent import async_langflow_stream
+
+    client = FakeResponsesClient(CHUNKS_PER_RESPONSE)
+    received = []
+
+    async def stream(i):
+        count = 0
+        async for chunk in async_langflow_stream(client, "bench-flow", "What changed?", extra_headers={}):
+            assert chunk.endswith(b"\n")
+            count += 1
+        received.append(count)
+
+    samples = await sample_latencies(stream, RUNS)
+    assert set(received) == {CHUNKS_PER_RESPONSE + 2}  # created + deltas + completed
+
+    events = CHUNKS_PER_RESPONSE + 2
+    median = percentile(samples, 50)
+    benchmark_results.record(
+        "chat_streaming",
+        {
+            **latency_metrics(samples, "response_"),
+            "per_chunk_overhead_us": Metric(median / events * 1e6, "us"),
+            "chunks_per_s": Metric(events / median, "chunks/s", better="higher"),
+        },
+    )
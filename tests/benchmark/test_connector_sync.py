@@ -0,0 +1,98 @@
+"""Connector sync: re-ingesting connector documents through the Langflow ingestion flow"""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from .conftest import EMBEDDING_MODEL
+from .corpus import paragraphs
+from .harness import Metric, latency_metrics, throughput
+from .langflow_standin import FakeLangflow
+
+DOCUMENTS = 80
+CONCURRENCY = 4
+
+
+def connector_documents(count: int):
+    from connectors.base import ConnectorDocument, DocumentACL
+
+    rng = random.Random(0)
+    now = datetime.now()
+    return [
+        ConnectorDocument(
+            id=f"drive-{index:04d}",
+            filename=f"drive-{index:04d}.txt",
+            mimetype="text/plain",
+            content="\n\n".join(paragraphs(rng, rng.randint(2, 8))).encode("utf-8"),
+            source_url=f"https://drive.example/{index}",
+            acl=DocumentACL(owner="bench-user", allowed_users=["bench-user"]),
+            modified_time=now,
+            created_time=now,
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connector_sync_throughput(offline_backend, opensearch, embeddings, monkeypatch, benchmark_results):
+    import config.settings as settings
+    from connectors.langflow_connector_service import LangflowConnectorService
+    from utils.embedding_fields import get_embedding_field_name
+
+    langflow = FakeLangflow(
+        opensearch,
+        embeddings,
+        index_name=settings.get_index_name(),
+        embedding_field=get_embedding_field_name(EMBEDDING_MODEL),
+        latency=0.001,
+        run_latency=0.005,
+    )
+
+    async def api_key(force_regenerate=False):
+        return "bench-key"
+
+    monkeypatch.setattr(settings, "get_langflow_api_key", api_key)
+    monkeypatch.setattr(settings.clients, "langflow_http_client", langflow.client())
+
+    service = LangflowConnectorService(task_service=None, session_manager=offline_backend)
+    service.langflow_service.flow_id_ingest = "bench-ingest-flow"
+    documents = connector_documents(DOCUMENTS)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    samples = []
+
+    async def sync(document):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await service.process_connector_document(
+                document, "bench-user", "google_drive", jwt_token="bench-token", owner_name="Bench User"
+            )
+            samples.append(time.perf_counter() - started)
+            return result
+
+    # The second pass re-syncs every document, deleting its previous chunks first
+    elapsed = []
+    for _ in range(2):
+        started = time.perf_counter()
+        results = await asyncio.gather(*(sync(document) for document in documents))
+        elapsed.append(time.perf_counter() - started)
+        assert all(result["status"] == "indexed" for result in results)
+    await settings.clients.langflow_http_client.aclose()
+
+    assert not langflow.files, "uploaded files should be deleted after ingestion"
+    chunks = (await opensearch.count(index=settings.get_index_name()))["count"]
+    assert chunks == sum(-(-len(document.content) // langflow.chunk_chars) for document in documents)
+
+    megabytes = sum(len(document.content) for document in documents) / 1e6
+    benchmark_results.record(
+        "connector_sync",
+        {
+            "documents_per_s": throughput(DOCUMENTS, elapsed[0], "docs/s"),
+            "resync_documents_per_s": throughput(DOCUMENTS, elapsed[1], "docs/s"),
+            "mb_per_s": throughput(megabytes, elapsed[0], "MB/s"),
+            "langflow_requests_per_doc": Metric(sum(langflow.requests.values()) / (2 * DOCUMENTS), "requests"),
+            **latency_metrics(samples, "document_"),
+        },
+    )
@@ -0,0 +1,60 @@
+"""Upload ingest: conversion, chunking, embedding and indexing through the standard processor"""
+
+import asyncio
+import hashlib
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from .conftest import EMBEDDING_MODEL
+from .corpus import generate_corpus
+from .harness import Metric, latency_metrics, throughput
+
+DOCUMENTS = 60
+CONCURRENCY = 4
+
+
+@pytest.mark.asyncio
+async def test_upload_ingest_throughput(offline_backend, opensearch, embeddings, converter, tmp_path, benchmark_results):
+    from models.processors import TaskProcessor
+
+    corpus = generate_corpus(tmp_path / "corpus", DOCUMENTS)
+    processor = TaskProcessor(document_service=SimpleNamespace(session_manager=offline_backend))
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    samples = []
+
+    async def ingest(document):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await processor.process_document_standard(
+                file_path=str(document.path),
+                file_hash=hashlib.sha256(document.path.read_bytes()).hexdigest(),
+                owner_user_id="bench-user",
+                original_filename=document.path.name,
+                file_size=document.size,
+                embedding_model=EMBEDDING_MODEL,
+            )
+            samples.append(time.perf_counter() - started)
+            return result
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(ingest(document) for document in corpus))
+    elapsed = time.perf_counter() - started
+
+    assert all(result["status"] == "indexed" for result in results)
+    chunks = await opensearch.count(index="documents")
+    assert chunks["count"] >= DOCUMENTS
+    assert converter.conversions == DOCUMENTS - DOCUMENTS // 3  # .txt bypasses docling
+
+    megabytes = sum(document.size for document in corpus) / 1e6
+    benchmark_results.record(
+        "upload_ingest",
+        {
+            "documents_per_s": throughput(DOCUMENTS, elapsed, "docs/s"),
+            "chunks_per_s": throughput(chunks["count"], elapsed, "chunks/s"),
+            "mb_per_s": throughput(megabytes, elapsed, "MB/s"),
+            "embedding_requests_per_doc": Metric(embeddings.requests / DOCUMENTS, "requests"),
+            **latency_metrics(samples, "document_"),
+        },
+    )
@@ -0,0 +1,46 @@
+"""Search latency: query embedding, model detection and the hybrid query, per corpus size"""
+
+import random
+
+import pytest
+
+from .conftest import EMBEDDING_MODEL, index_chunks
+from .corpus import sentences
+from .harness import latency_metrics, sample_latencies
+
+RUNS = 100
+
+
+async def run_search_benchmark(session_manager, opensearch, embeddings, chunks: int, runs: int = RUNS):
+    """Seed ``chunks`` chunks and return per-query latencies of ``SearchService.search``"""
+    from services.search_service import SearchService
+
+    await index_chunks(opensearch, embeddings, chunks)
+    service = SearchService(session_manager=session_manager)
+    queries = [sentence.rstrip(".") for sentence in sentences(random.Random(1), 32, words=5)]
+    hits = []
+
+    async def search(i):
+        result = await service.search(
+            queries[i % len(queries)],
+            user_id="bench-user",
+            jwt_token="bench-token",
+            limit=10,
+            embedding_model=EMBEDDING_MODEL,
+        )
+        hits.append(len(result["results"]))
+
+    samples = await sample_latencies(search, runs)
+    assert all(hits), "every query should return results"
+    return samples
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunks,runs", [(1_000, RUNS), (10_000, RUNS // 4)])
+async def test_search_latency(offline_backend, opensearch, embeddings, benchmark_results, chunks, runs):
+    samples = await run_search_benchmark(offline_backend, opensearch, embeddings, chunks, runs)
+
+    benchmark_results.record(
+        f"search_latency_{chunks}",
+        latency_metrics(samples),
+    )
@@ -0,0 +1,81 @@
+"""Task status polling with many tracked tasks: single lookups, the task list and batch status requests"""
+
+import random
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from .harness import latency_metrics, sample_latencies
+
+TASKS = 300
+FILES_PER_TASK = 40
+BATCH = 100
+USER_ID = "bench-user"
+
+
+def populate(task_service):
+    from models.tasks import FileTask, TaskStatus, UploadTask
+
+    rng = random.Random(0)
+    statuses = list(TaskStatus)
+    store = task_service.task_store.setdefault(USER_ID, {})
+    for t in range(TASKS):
+        files = {
+            f"/uploads/task{t}/file{f}.pdf": FileTask(
+                file_path=f"/uploads/task{t}/file{f}.pdf",
+                status=rng.choice(statuses),
+                filename=f"file{f}.pdf",
+            )
+            for f in range(FILES_PER_TASK)
+        }
+        store[f"task-{t:04d}"] = UploadTask(
+            task_id=f"task-{t:04d}", total_files=FILES_PER_TASK, file_tasks=files, status=TaskStatus.RUNNING
+        )
+    return list(store)
+
+
+def status_app(task_service):
+    from api.v1.documents import task_statuses_endpoint
+
+    async def endpoint(request):
+        request.state.user = SimpleNamespace(user_id=USER_ID)
+        return await task_statuses_endpoint(request, task_service, session_manager=None)
+
+    return Starlette(routes=[Route("/v1/tasks/status", endpoint, methods=["POST"])])
+
+
+@pytest.mark.asyncio
+async def test_task_polling(benchmark_results):
+    from services.task_service import TaskService
+
+    task_service = TaskService(document_service=Mock(), process_pool=Mock())
+    task_ids = populate(task_service)
+
+    async def single(i):
+        assert await task_service.get_task_status(USER_ID, task_ids[i % TASKS]) is not None
+
+    async def list_all(i):
+        assert len(await task_service.get_all_tasks(USER_ID)) == TASKS
+
+    transport = httpx.ASGITransport(app=status_app(task_service))
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend.test") as client:
+
+        async def batch(i):
+            start = (i * BATCH) % TASKS
+            response = await client.post("/v1/tasks/status", json={"task_ids": (task_ids * 2)[start : start + BATCH]})
+            assert len(response.json()["tasks"]) == BATCH
+
+        batch_samples = await sample_latencies(batch, 50)
+
+    benchmark_results.record(
+        "task_polling",
+        {
+            **latency_metrics(await sample_latencies(single, 500), "status_"),
+            **latency_metrics(await sample_latencies(list_all, 30), "list_"),
+            **latency_metrics(batch_samples, f"batch{BATCH}_"),
+        },
+    )
@@ -0,0 +1,63 @@
+"""Watson News ETL: HTML cleaning, enrichment and indexing of crawled articles"""
+
+import random
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from .corpus import html_article
+from .embeddings import HashEmbeddings
+from .harness import Metric, throughput
+
+ARTICLES = 120
+
+
+def crawled_articles(count: int):
+    from connectors.base import ConnectorDocument, DocumentACL
+
+    rng = random.Random(0)
+    now = datetime.now(tz=timezone.utc)
+    return [
+        ConnectorDocument(
+            id=f"ibm-{index:04d}",
+            filename=f"article-{index:04d}.html",
+            mimetype="text/html",
+            content=html_article(rng, f"Quarterly update {index}").encode("utf-8"),
+            source_url=f"https://newsroom.example/articles/{index}",
+            acl=DocumentACL(),
+            modified_time=now,
+            created_time=now,
+            metadata={"language": "en", "source_type": "ibm_crawl", "crawl_target": "newsroom"},
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_watson_news_etl_throughput(opensearch, monkeypatch, benchmark_results):
+    from connectors.watson_news import enricher, etl_pipeline
+
+    # Clean inline so the measurement does not include process-pool start-up
+    monkeypatch.setenv("WATSON_NEWS_CLEAN_WORKERS", "0")
+    watsonx = HashEmbeddings(dimensions=768, latency=0.002)
+    monkeypatch.setattr(enricher, "_client", watsonx)
+    docs = crawled_articles(ARTICLES)
+
+    started = time.perf_counter()
+    processed = await etl_pipeline._index_crawled_docs(opensearch, docs)
+    elapsed = time.perf_counter() - started
+
+    assert processed == ARTICLES
+    enriched = opensearch.documents(etl_pipeline.IDX_NEWS_ENRICHED)
+    assert len(enriched) == ARTICLES
+    assert all(len(record["vector"]) == 768 for record in enriched.values())
+
+    benchmark_results.record(
+        "watson_news_etl",
+        {
+            "articles_per_s": throughput(ARTICLES, elapsed, "articles/s"),
+            "ms_per_article": Metric(elapsed / ARTICLES * 1000, "ms"),
+            "model_requests_per_article": Metric(watsonx.requests / ARTICLES, "requests"),
+        },
+    )
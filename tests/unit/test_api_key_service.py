@@ -0,0 +1,151 @@
+"""
+Tests for API key validation caching
+Covers cache hits, invalidation on revoke/delete, TTL expiry and batched last_used_at writes
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from config.settings import clients
+from services.api_key_service import APIKeyService
+
+
+class FakeOpenSearch:
+    def __init__(self):
+        self.docs = {}
+        self.searches = 0
+        self.bulk_bodies = []
+        self.updates = []
+
+    async def search(self, index, body):
+        self.searches += 1
+        key_hash = body["query"]["bool"]["must"][0]["term"]["key_hash"]
+        hits = [
+            {"_source": doc} for doc in self.docs.values()
+            if doc["key_hash"] == key_hash and not doc["revoked"]
+        ]
+        return {"hits": {"hits": hits[:1]}}
+
+    async def index(self, index, id, body, refresh=None):
+        self.docs[id] = dict(body)
+        return {"result": "created"}
+
+    async def get(self, index, id):
+        return {"_source": self.docs[id]}
+
+    async def update(self, index, id, body, refresh=None):
+        self.updates.append((id, body))
+        self.docs[id].update(body["doc"])
+        return {"result": "updated"}
+
+    async def delete(self, index, id, refresh=None):
+        del self.docs[id]
+        return {"result": "deleted"}
+
+    async def bulk(self, body):
+        self.bulk_bodies.append(body)
+        return {"errors": False}
+
+
+@pytest.fixture
+def fake_os():
+    fake = FakeOpenSearch()
+    with patch.object(clients, "opensearch", fake):
+        yield fake
+
+
+async def _create(service):
+    created = await service.create_key("alice", "alice@example.com", "ci")
+    return created["api_key"], created["key_id"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_validation_uses_cache_and_batches_last_used(fake_os):
+    service = APIKeyService(flush_interval=3600)
+    api_key, key_id = await _create(service)
+
+    for _ in range(100):
+        info = await service.validate_key(api_key)
+        assert info["user_id"] == "alice"
+
+    assert fake_os.searches == 1
+    assert fake_os.updates == []
+    assert service.get_cache_stats()["hits"] == 99
+
+    assert await service.flush_last_used() == 1
+    assert len(fake_os.bulk_bodies) == 1
+    action, doc = fake_os.bulk_bodies[0]
+    assert action["update"]["_id"] == key_id
+    assert "last_used_at" in doc["doc"]
+    assert await service.flush_last_used() == 0
+
+
+@pytest.mark.asyncio
+async def test_revoke_and_delete_invalidate_immediately(fake_os):
+    service = APIKeyService(flush_interval=3600)
+    revoked_key, revoked_id = await _create(service)
+    deleted_key, deleted_id = await _create(service)
+    assert await service.validate_key(revoked_key) is not None
+    assert await service.validate_key(deleted_key) is not None
+
+    assert (await service.revoke_key("alice", revoked_id))["success"]
+    assert (await service.delete_key("alice", deleted_id))["success"]
+
+    assert await service.validate_key(revoked_key) is None
+    assert await service.validate_key(deleted_key) is None
+    # Pending usage of removed keys is not written
+    assert await service.flush_last_used() == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_revalidated(fake_os):
+    service = APIKeyService(cache_ttl=10, flush_interval=3600)
+    api_key, _ = await _create(service)
+
+    with patch("services.api_key_service.time.monotonic", return_value=0.0):
+        await service.validate_key(api_key)
+        await service.validate_key(api_key)
+    with patch("services.api_key_service.time.monotonic", return_value=11.0):
+        await service.validate_key(api_key)
+
+    assert fake_os.searches == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_updates_for_next_attempt(fake_os):
+    service = APIKeyService(flush_interval=3600)
+    api_key, _ = await _create(service)
+    await service.validate_key(api_key)
+
+    async def failing_bulk(body):
+        raise ConnectionError("down")
+
+    with patch.object(fake_os, "bulk", side_effect=failing_bulk):
+        assert await service.flush_last_used() == 0
+    assert await service.flush_last_used() == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduled_flush_is_retried_after_a_failure(fake_os):
+    service = APIKeyService(flush_interval=0.01)
+    api_key, key_id = await _create(service)
+    calls = []
+
+    async def flaky_bulk(body):
+        calls.append(body)
+        if len(calls) == 1:
+            raise ConnectionError("down")
+        return {"errors": False}
+
+    with patch.object(fake_os, "bulk", side_effect=flaky_bulk):
+        await service.validate_key(api_key)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(calls) == 2 and service._flush_task.done():
+                break
+
+    assert len(calls) == 2
+    assert calls[1][0]["update"]["_id"] == key_id
+    assert "+00:00" in calls[1][1]["doc"]["last_used_at"]
+    assert service.get_cache_stats()["pending_last_used"] == 0
@@ -0,0 +1,166 @@
+"""
+Tests for the memory-bounded conversation thread cache
+Covers byte budgets, TTL eviction, spilling to the store and rehydration
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from services.conversation_cache import ConversationCache, decode_thread, encode_thread, estimate_size
+from services.conversation_store import ConversationStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _thread(text: str, size: int = 1000):
+    return {
+        "messages": [
+            {"role": "user", "content": text, "timestamp": datetime(2025, 1, 1, 12, 0)},
+            {"role": "assistant", "content": "x" * size, "response_data": {"output": [1, 2]}},
+        ],
+        "created_at": datetime(2025, 1, 1, 12, 0),
+        "last_activity": datetime(2025, 1, 1, 12, 5),
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ConversationStore(str(tmp_path / "conversations.db"))
+
+
+def test_encode_round_trip_preserves_datetimes():
+    thread = _thread("hello")
+    restored = decode_thread(encode_thread(thread))
+
+    assert restored == thread
+    assert isinstance(restored["messages"][0]["timestamp"], datetime)
+
+
+@pytest.mark.asyncio
+async def test_global_byte_budget_spills_least_recently_used(store):
+    size = estimate_size(_thread("t0"))
+    cache = ConversationCache(max_bytes=size * 3, user_max_bytes=size * 10, store=store)
+
+    for i in range(5):
+        await cache.put(f"user-{i}", f"r{i}", _thread(f"t{i}"))
+
+    assert cache.total_bytes <= size * 3
+    assert ("user-0", "r0") not in cache
+    assert ("user-4", "r4") in cache
+    assert cache.spilled == 2
+
+
+@pytest.mark.asyncio
+async def test_per_user_budget_only_evicts_that_users_threads(store):
+    size = estimate_size(_thread("t0"))
+    cache = ConversationCache(max_bytes=size * 100, user_max_bytes=size * 2, store=store)
+
+    await cache.put("bob", "b0", _thread("b0"))
+    for i in range(4):
+        await cache.put("alice", f"a{i}", _thread(f"a{i}"))
+
+    assert sorted(cache.user_conversations("alice")) == ["a2", "a3"]
+    assert list(cache.user_conversations("bob")) == ["b0"]
+
+
+@pytest.mark.asyncio
+async def test_idle_threads_expire_after_ttl(store):
+    clock = FakeClock()
+    cache = ConversationCache(max_bytes=10**9, user_max_bytes=10**9, ttl_seconds=60, store=store, clock=clock)
+
+    await cache.put("alice", "old", _thread("old"))
+    clock.now = 30
+    await cache.put("alice", "recent", _thread("recent"))
+    clock.now = 90
+    await cache.put("alice", "new", _thread("new"))
+
+    assert sorted(cache.user_conversations("alice")) == ["new", "recent"]
+
+
+@pytest.mark.asyncio
+async def test_stored_threads_are_pruned_after_ttl(store):
+    cache = ConversationCache(ttl_seconds=60, store=store, write_through=True)
+
+    with patch("services.conversation_store.time.time", return_value=1000.0):
+        await cache.put("alice", "old", _thread("old"))
+    with patch("services.conversation_store.time.time", return_value=1050.0):
+        await cache.put("alice", "recent", _thread("recent"))
+
+    with patch("services.conversation_cache.time.time", return_value=1100.0):
+        assert await cache.prune_store() == 1
+
+    assert store.load_thread("alice", "old") is None
+    assert store.load_thread("alice", "recent") is not None
+    assert cache.stats()["pruned"] == 1
+
+
+@pytest.mark.asyncio
+async def test_spilled_thread_rehydrates_on_access(store):
+    size = estimate_size(_thread("t0"))
+    cache = ConversationCache(max_bytes=size, user_max_bytes=size, store=store)
+
+    await cache.put("alice", "first", _thread("first"))
+    await cache.put("alice", "second", _thread("second"))
+    assert ("alice", "first") not in cache
+
+    restored = await cache.get("alice", "first")
+
+    assert restored["messages"][0]["content"] == "first"
+    assert isinstance(restored["last_activity"], datetime)
+    assert cache.rehydrated == 1
+    assert ("alice", "first") in cache
+
+
+@pytest.mark.asyncio
+async def test_pop_removes_memory_and_spilled_copies(store):
+    size = estimate_size(_thread("t0"))
+    cache = ConversationCache(max_bytes=size, user_max_bytes=size, store=store)
+    await cache.put("alice", "first", _thread("first"))
+    await cache.put("alice", "second", _thread("second"))
+
+    assert await cache.pop("alice", "first") is True
+    assert await cache.pop("alice", "second") is True
+    assert await cache.pop("alice", "missing") is False
+    assert await cache.get("alice", "first") is None
+    assert cache.total_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_growing_thread_is_measured_incrementally(store, monkeypatch):
+    import services.conversation_cache as conversation_cache
+
+    cache = ConversationCache(max_bytes=10**9, user_max_bytes=10**9, store=store)
+    state = _thread("hello")
+    await cache.put("alice", "r1", state)
+
+    measured = []
+    real_json_size = conversation_cache._json_size
+    monkeypatch.setattr(conversation_cache, "_json_size", lambda value: measured.append(value) or real_json_size(value))
+    state["messages"].append({"role": "user", "content": "next"})
+    await cache.put("alice", "r2", state)
+
+    # Only the new message and the thread metadata are serialized
+    assert len(measured) == 2
+    assert cache._entries[("alice", "r2")].size == estimate_size(state)
+
+
+@pytest.mark.asyncio
+async def test_user_threads_include_spilled_threads_without_rehydrating(store):
+    size = estimate_size(_thread("t0"))
+    cache = ConversationCache(max_bytes=size, user_max_bytes=size, store=store)
+    await cache.put("alice", "first", _thread("first"))
+    await cache.put("alice", "second", _thread("second"))
+
+    threads = await cache.user_threads("alice")
+
+    assert sorted(threads) == ["first", "second"]
+    assert threads["first"]["messages"][0]["content"] == "first"
+    assert ("alice", "first") not in cache
+    assert await cache.user_threads("bob") == {}
@@ -0,0 +1,242 @@
+"""
+Tests for the SQLite conversation metadata store
+Covers single-record upserts, coalesced writes, legacy JSON migration and session ownership
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services.conversation_persistence_service import ConversationPersistenceService
+from services.conversation_store import ConversationStore
+from services.session_ownership_service import SessionOwnershipService
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "conversations.db")
+
+
+def _persistence(db_path, legacy_file=None):
+    service = ConversationPersistenceService(storage_file=db_path, legacy_file=legacy_file)
+    # Each test gets its own store instance so state does not leak between tests
+    service.store = ConversationStore(db_path)
+    return service
+
+
+def _ownership(db_path, legacy_file=None, flush_interval=60):
+    service = SessionOwnershipService(
+        storage_file=db_path, legacy_file=legacy_file, flush_interval=flush_interval
+    )
+    service.store = ConversationStore(db_path)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_each_turn_upserts_only_its_own_record(db_path):
+    service = _persistence(db_path)
+    for i in range(20):
+        await service.store_conversation_thread("user-1", f"r{i}", {"title": f"t{i}"})
+
+    written = []
+    original = service.store.upsert_conversations
+
+    def spy(records):
+        records = list(records)
+        written.append(len(records))
+        return original(records)
+
+    with patch.object(service.store, "upsert_conversations", side_effect=spy):
+        await service.store_conversation_thread("user-1", "r20", {"title": "t20"})
+
+    assert written == [1]
+    reloaded = _persistence(db_path)
+    assert len(reloaded.get_user_conversations("user-1")) == 21
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_are_coalesced(db_path):
+    service = _persistence(db_path)
+    transactions = []
+    original = service.store.upsert_conversations
+
+    def spy(records):
+        transactions.append(list(records))
+        return original(transactions[-1])
+
+    with patch.object(service.store, "upsert_conversations", side_effect=spy):
+        await asyncio.gather(*(
+            service.store_conversation_thread("user-1", f"r{i}", {"title": f"t{i}"})
+            for i in range(50)
+        ))
+
+    assert sum(len(batch) for batch in transactions) == 50
+    assert len(transactions) < 50
+    assert len(_persistence(db_path).get_user_conversations("user-1")) == 50
+
+
+@pytest.mark.asyncio
+async def test_conversations_are_scoped_per_user_and_deletable(db_path):
+    service = _persistence(db_path)
+    await service.store_conversation_thread("alice", "a1", {"title": "a"})
+    await service.store_conversation_thread("bob", "b1", {"title": "b"})
+
+    assert await service.delete_conversation_thread("alice", "a1") is True
+    assert await service.delete_conversation_thread("alice", "a1") is False
+
+    reloaded = _persistence(db_path)
+    assert reloaded.get_user_conversations("alice") == {}
+    assert list(reloaded.get_user_conversations("bob")) == ["b1"]
+    assert reloaded.get_storage_stats()["total_conversations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_conversation_write_is_retried(db_path):
+    service = _persistence(db_path)
+    original = service.store.upsert_conversations
+    calls = []
+
+    def flaky(records):
+        calls.append(list(records))
+        if len(calls) == 1:
+            raise OSError("database is locked")
+        return original(calls[-1])
+
+    with patch("services.conversation_persistence_service.CONVERSATION_FLUSH_RETRY_SECONDS", 0.01), \
+            patch.object(service.store, "upsert_conversations", side_effect=flaky):
+        await service.store_conversation_thread("alice", "a1", {"title": "a"})
+        await asyncio.sleep(0.1)
+
+    assert len(calls) == 2
+    assert list(_persistence(db_path).get_user_conversations("alice")) == ["a1"]
+
+
+def test_legacy_json_is_migrated_once(db_path, tmp_path):
+    legacy = tmp_path / "conversations.json"
+    legacy.write_text(json.dumps({"alice": {"a1": {"title": "old", "last_activity": "2025-01-01"}}}))
+
+    service = _persistence(db_path, legacy_file=str(legacy))
+
+    assert service.get_user_conversations("alice")["a1"]["title"] == "old"
+    assert not legacy.exists()
+    assert os.path.exists(f"{legacy}.migrated")
+
+
+@pytest.mark.asyncio
+async def test_ownership_claims_persist_and_touches_are_coalesced(db_path):
+    service = _ownership(db_path)
+    service.claim_session("alice", "s1")
+    service.claim_session("alice", "s2")
+    await asyncio.sleep(0.05)  # immediate writes run in the executor
+
+    writes = []
+    original = service.store.write_ownership
+
+    def spy(changes):
+        writes.append(dict(changes))
+        return original(changes)
+
+    with patch.object(service.store, "write_ownership", side_effect=spy):
+        for _ in range(100):
+            service.claim_session("alice", "s1")
+            service.claim_session("alice", "s2")
+        await asyncio.sleep(0.05)
+        assert writes == []  # last_accessed updates wait for the flush window
+        service.flush()
+
+    assert len(writes) == 1 and set(writes[0]) == {"s1", "s2"}
+
+    reloaded = _ownership(db_path)
+    assert sorted(reloaded.get_user_sessions("alice")) == ["s1", "s2"]
+    assert reloaded.get_session_owner("s1") == "alice"
+
+
+@pytest.mark.asyncio
+async def test_ownership_preload_reads_the_store_off_the_loop(db_path):
+    writer = _ownership(db_path)
+    writer.claim_session("alice", "s1")
+    writer.flush()
+
+    service = _ownership(db_path)
+    loop_thread = threading.get_ident()
+    read_threads = []
+    original = service.store.get_all_ownership
+
+    def spy():
+        read_threads.append(threading.get_ident())
+        return original()
+
+    with patch.object(service.store, "get_all_ownership", side_effect=spy):
+        await service.preload()
+        assert service.get_session_owner("s1") == "alice"
+        await service.preload()
+
+    assert len(read_threads) == 1 and read_threads[0] != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_ownership_writes_land_in_order(db_path):
+    service = _ownership(db_path)
+    original = service.store.write_ownership
+
+    def slow(changes):
+        # A slow first write must not let the later release overtake it
+        if any(record is not None for record in changes.values()):
+            time.sleep(0.05)
+        return original(changes)
+
+    with patch.object(service.store, "write_ownership", side_effect=slow):
+        service.claim_session("alice", "s1")
+        await asyncio.sleep(0.01)
+        assert service.release_session("alice", "s1") is True
+        await asyncio.sleep(0.2)
+
+    assert _ownership(db_path).get_session_owner("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_ownership_flush_is_retried(db_path):
+    service = _ownership(db_path, flush_interval=0.01)
+    original = service.store.write_ownership
+    calls = []
+
+    def flaky(changes):
+        calls.append(dict(changes))
+        if len(calls) == 1:
+            raise OSError("database is locked")
+        return original(changes)
+
+    with patch.object(service.store, "write_ownership", side_effect=flaky):
+        service.claim_session("alice", "s1")
+        await asyncio.sleep(0.1)
+
+    assert len(calls) == 2
+    assert _ownership(db_path).get_session_owner("s1") == "alice"
+
+
+def test_release_removes_ownership_without_event_loop(db_path):
+    service = _ownership(db_path)
+    service.claim_session("alice", "s1")
+
+    assert service.release_session("bob", "s1") is False
+    assert service.release_session("alice", "s1") is True
+
+    reloaded = _ownership(db_path)
+    assert reloaded.get_user_sessions("alice") == []
+    assert reloaded.get_ownership_stats()["total_tracked_sessions"] == 0
+
+
+def test_legacy_ownership_json_is_migrated(db_path, tmp_path):
+    legacy = tmp_path / "session_ownership.json"
+    legacy.write_text(json.dumps({
+        "s1": {"user_id": "alice", "created_at": "2025-01-01", "last_accessed": "2025-01-02"}
+    }))
+
+    service = _ownership(db_path, legacy_file=str(legacy))
+
+    assert service.get_user_session_activity("alice") == {"s1": "2025-01-02"}
+    assert not legacy.exists()
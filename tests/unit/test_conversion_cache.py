@@ -0,0 +1,162 @@
+"""
+Tests for the docling conversion result cache
+"""
+import multiprocessing
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import utils.conversion_cache as conversion_cache
+from utils.conversion_cache import ConversionCache, pipeline_fingerprint
+from utils.document_processing import convert_and_extract
+from utils.metrics import DOCLING_CACHE_BYTES_SAVED, DOCLING_CACHE_HITS, DOCLING_CACHE_MISSES
+
+CONTENT_HASH = "q1w2e3r4t5y6u7i8o9p0"
+PAYLOAD = {
+    "id": "binary-hash",
+    "filename": "report.pdf",
+    "mimetype": "application/pdf",
+    "chunks": [{"page": 1, "type": "text", "text": "x" * 2000}],
+}
+
+
+class StubConverter:
+    """Counts conversions and returns a fixed docling document"""
+
+    def __init__(self, **options):
+        self.openrag_pipeline_options = {"do_ocr": False, "do_table_structure": True, **options}
+        self.conversions = 0
+
+    def convert(self, source):
+        self.conversions += 1
+        document = {
+            "origin": {"binary_hash": "binary-hash", "filename": "report.pdf", "mimetype": "application/pdf"},
+            "texts": [
+                {"text": "Quarterly results", "prov": [{"page_no": 1}]},
+                {"text": "Revenue grew", "prov": [{"page_no": 2}]},
+            ],
+        }
+        return SimpleNamespace(document=SimpleNamespace(export_to_dict=lambda: document))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(conversion_cache, "DOCLING_CACHE_ENABLED", True)
+    monkeypatch.setattr(conversion_cache, "_cache", cache)
+    return cache
+
+
+def test_identical_bytes_and_options_convert_once(cache, tmp_path):
+    source = tmp_path / "upload.pdf"
+    source.write_bytes(b"%PDF-1.7 " + b"0" * 4096)
+    converter = StubConverter()
+    hits, misses = DOCLING_CACHE_HITS.value(source="file"), DOCLING_CACHE_MISSES.value(source="file")
+    saved = DOCLING_CACHE_BYTES_SAVED.value(source="file")
+
+    first = convert_and_extract(converter, str(source), CONTENT_HASH)
+    second = convert_and_extract(converter, str(source), CONTENT_HASH)
+
+    assert converter.conversions == 1
+    assert second == first
+    assert [chunk["page"] for chunk in second["chunks"]] == [1, 2]
+    assert DOCLING_CACHE_HITS.value(source="file") == hits + 1
+    assert DOCLING_CACHE_MISSES.value(source="file") == misses + 1
+    assert DOCLING_CACHE_BYTES_SAVED.value(source="file") == saved + source.stat().st_size
+
+    # The filename follows the current upload, not the one that populated the cache
+    renamed = tmp_path / "renamed.pdf"
+    renamed.write_bytes(source.read_bytes())
+    assert convert_and_extract(converter, str(renamed), CONTENT_HASH)["filename"] == "renamed.pdf"
+    assert converter.conversions == 1
+
+
+def test_pipeline_option_change_is_a_miss(cache, tmp_path):
+    source = tmp_path / "scan.pdf"
+    source.write_bytes(b"%PDF-1.7 scanned")
+    plain, with_ocr = StubConverter(), StubConverter(do_ocr=True, ocr_engine="easyocr")
+
+    convert_and_extract(plain, str(source), CONTENT_HASH)
+    convert_and_extract(with_ocr, str(source), CONTENT_HASH)
+    convert_and_extract(with_ocr, str(source), CONTENT_HASH)
+
+    assert (plain.conversions, with_ocr.conversions) == (1, 1)
+    assert pipeline_fingerprint(plain.openrag_pipeline_options) != pipeline_fingerprint(
+        with_ocr.openrag_pipeline_options
+    )
+    # No content hash (or a disabled cache) always converts
+    convert_and_extract(plain, str(source))
+    assert plain.conversions == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), max_bytes=7_000)
+    payload = {**PAYLOAD, "chunks": [{"page": 1, "type": "text", "text": os.urandom(1500).hex()}]}
+    fingerprint = pipeline_fingerprint({})
+
+    for index in range(3):
+        cache.put(f"hash{index}", fingerprint, payload)
+        path = cache._path(f"hash{index}", fingerprint)
+        os.utime(path, (1000 + index, 1000 + index))
+    entry_size = os.path.getsize(cache._path("hash0", fingerprint))
+    assert 3 * entry_size < cache.max_bytes < 4 * entry_size
+
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get("hash0", fingerprint) == payload
+    cache.put("hash3", fingerprint, payload)
+
+    remaining = {name for name in ("hash0", "hash1", "hash2", "hash3") if cache.get(name, fingerprint)}
+    assert "hash1" not in remaining
+    assert {"hash0", "hash3"} <= remaining
+    assert cache._scan_size() <= cache.max_bytes
+
+
+def test_corrupt_entries_are_discarded(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    fingerprint = pipeline_fingerprint({})
+    path = cache._path(CONTENT_HASH, fingerprint)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(b"\x1f\x8b truncated")
+
+    assert cache.get(CONTENT_HASH, fingerprint) is None
+    assert not os.path.exists(path)
+
+
+def _write_same_key(directory, rounds):
+    cache = ConversionCache(directory)
+    for _ in range(rounds):
+        cache.put(CONTENT_HASH, "fingerprint", PAYLOAD, source_bytes=10)
+
+
+def _read_same_key(directory, rounds, results):
+    cache = ConversionCache(directory)
+    bad = 0
+    for _ in range(rounds):
+        entry = cache.get(CONTENT_HASH, "fingerprint")
+        if entry is not None and entry != PAYLOAD:
+            bad += 1
+    results.put(bad)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_writers_never_expose_a_partial_entry(tmp_path):
+    context = multiprocessing.get_context("fork")
+    directory = str(tmp_path / "cache")
+    results = context.Queue()
+    writers = [context.Process(target=_write_same_key, args=(directory, 50)) for _ in range(4)]
+    readers = [context.Process(target=_read_same_key, args=(directory, 200, results)) for _ in range(2)]
+
+    for process in writers + readers:
+        process.start()
+    for process in writers + readers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert [results.get(timeout=5) for _ in readers] == [0, 0]
+    cache = ConversionCache(directory)
+    assert cache.get(CONTENT_HASH, "fingerprint") == PAYLOAD
+    # Only the final entry remains; every temporary file was renamed into place
+    leftovers = [name for _, _, files in os.walk(directory) for name in files]
+    assert len(leftovers) == 1
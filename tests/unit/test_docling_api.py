@@ -0,0 +1,55 @@
+"""
+Tests for the docling health proxy endpoint
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api import docling
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    status = 200
+
+    def do_GET(self):
+        body = b'{"status": "ok"}'
+        self.send_response(self.status if self.path == "/health" else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def docling_url(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(docling, "DOCLING_SERVICE_URL", url)
+    monkeypatch.setattr(docling, "HOST_IP", "127.0.0.1")
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_health_reports_healthy_docling(docling_url):
+    response = await docling.health(None)
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {"status": "healthy", "host": "127.0.0.1"}
+
+
+@pytest.mark.asyncio
+async def test_health_reports_unhealthy_status(docling_url, monkeypatch):
+    monkeypatch.setattr(_HealthHandler, "status", 500)
+
+    response = await docling.health(None)
+
+    assert response.status_code == 503
+    assert json.loads(response.body)["message"] == "Health check failed with status: 500"
@@ -0,0 +1,209 @@
+"""
+Tests for the per-process embedding field mapping cache
+"""
+import asyncio
+
+import pytest
+from opensearchpy.exceptions import ConflictError, NotFoundError
+
+from utils.embedding_fields import (
+    EmbeddingDimensionMismatchError,
+    EmbeddingFieldRegistry,
+    ensure_embedding_field_exists,
+    get_embedding_field_name,
+)
+import utils.embedding_fields as embedding_fields
+
+INDEX = "documents"
+MODEL = "text-embedding-3-small"  # 1536 dimensions
+
+
+class FakeIndices:
+    def __init__(self, properties=None, put_error=None):
+        self.properties = dict(properties or {})
+        self.put_error = put_error
+        self.get_calls = 0
+        self.put_calls = 0
+
+    async def get_mapping(self, index):
+        self.get_calls += 1
+        await asyncio.sleep(0)
+        return {index: {"mappings": {"properties": dict(self.properties)}}}
+
+    async def put_mapping(self, index, body):
+        self.put_calls += 1
+        await asyncio.sleep(0.01)  # let concurrent callers pile up
+        if self.put_error:
+            raise self.put_error
+        self.properties.update(body["properties"])
+
+
+class FakeOpenSearch:
+    def __init__(self, **kwargs):
+        self.indices = FakeIndices(**kwargs)
+        self.documents = {}
+
+    async def index(self, index, id, body, op_type=None):
+        # Lock documents of utils.vector_profiles.meta_lock
+        if op_type == "create" and (index, id) in self.documents:
+            raise ConflictError(409, "version_conflict_engine_exception", {})
+        self.documents[(index, id)] = body
+        return {"_id": id, "_seq_no": len(self.documents), "_primary_term": 1}
+
+    async def get(self, index, id):
+        if (index, id) not in self.documents:
+            raise NotFoundError(404, "not_found", {})
+        return {"_id": id, "_source": self.documents[(index, id)], "_seq_no": 0, "_primary_term": 1}
+
+    async def delete(self, index, id, **kwargs):
+        self.documents.pop((index, id), None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    registry = EmbeddingFieldRegistry()
+    monkeypatch.setattr(embedding_fields, "embedding_field_registry", registry)
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_one_mapping_check_for_many_chunks():
+    client = FakeOpenSearch()
+
+    for _ in range(1000):
+        field = await ensure_embedding_field_exists(client, MODEL, INDEX)
+
+    assert field == get_embedding_field_name(MODEL)
+    # One check, then one re-read under the _meta lock before adding the field
+    assert client.indices.get_calls == 2
+    assert client.indices.put_calls == 1
+    assert client.documents == {}  # the lock was released
+    assert client.indices.properties[field]["dimension"] == 1536
+
+
+@pytest.mark.asyncio
+async def test_existing_field_is_not_put_again():
+    field = get_embedding_field_name(MODEL)
+    client = FakeOpenSearch(properties={field: {"type": "knn_vector", "dimension": 1536}})
+
+    for _ in range(10):
+        await ensure_embedding_field_exists(client, MODEL, INDEX)
+
+    assert client.indices.get_calls == 1
+    assert client.indices.put_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_calls_send_one_put_mapping():
+    client = FakeOpenSearch()
+
+    results = await asyncio.gather(
+        *[ensure_embedding_field_exists(client, MODEL, INDEX) for _ in range(50)]
+    )
+
+    assert len(set(results)) == 1
+    assert client.indices.put_calls == 1
+    assert client.indices.get_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_dimension_mismatch_raises_clear_error(fresh_registry):
+    field = get_embedding_field_name(MODEL)
+    client = FakeOpenSearch(properties={field: {"type": "knn_vector", "dimension": 768}})
+
+    with pytest.raises(EmbeddingDimensionMismatchError, match="dimension 768"):
+        await ensure_embedding_field_exists(client, MODEL, INDEX)
+
+    # A cached field requested with another dimension is rejected without I/O
+    await fresh_registry.ensure(FakeOpenSearch(), "other", "chunk_embedding_x", 384)
+    with pytest.raises(EmbeddingDimensionMismatchError):
+        await fresh_registry.ensure(client, "other", "chunk_embedding_x", 1024)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_put_conflict(fresh_registry):
+    client = FakeOpenSearch()
+    await ensure_embedding_field_exists(client, MODEL, INDEX)
+
+    fresh_registry.invalidate(INDEX)
+    await ensure_embedding_field_exists(client, MODEL, INDEX)
+    assert client.indices.get_calls == 3
+
+    conflict = FakeOpenSearch(
+        put_error=Exception("mapper [x] cannot be changed from dimension 768 to 1536")
+    )
+    with pytest.raises(EmbeddingDimensionMismatchError, match="different dimension"):
+        await ensure_embedding_field_exists(conflict, MODEL, "conflicting")
+    assert not fresh_registry.is_known("conflicting", get_embedding_field_name(MODEL))
+    assert fresh_registry._locks == {}
+
+
+@pytest.mark.asyncio
+async def test_unknown_model_trusts_the_live_mapping(monkeypatch):
+    ollama_model = "nomic-embed-text:latest"
+    field = get_embedding_field_name(ollama_model)
+    client = FakeOpenSearch(properties={field: {"type": "knn_vector", "dimension": 768}})
+
+    for _ in range(3):
+        assert await ensure_embedding_field_exists(client, ollama_model, INDEX) == field
+    assert client.indices.get_calls == 1
+    assert client.indices.put_calls == 0
+
+    # A missing field is sized by the configured provider, not the 1536 default
+    probed = []
+
+    async def resolve(model_name):
+        probed.append(model_name)
+        return 768
+
+    monkeypatch.setattr(embedding_fields, "_resolve_native_dimensions", resolve)
+    fresh = FakeOpenSearch()
+    await ensure_embedding_field_exists(fresh, ollama_model, "fresh")
+    assert probed == [ollama_model]
+    assert fresh.indices.properties[field]["dimension"] == 768
+
+
+@pytest.mark.asyncio
+async def test_unreadable_mapping_aborts_without_put():
+    client = FakeOpenSearch()
+
+    async def failing_get_mapping(index):
+        raise ConnectionError("cluster unavailable")
+
+    client.indices.get_mapping = failing_get_mapping
+    with pytest.raises(ConnectionError):
+        await ensure_embedding_field_exists(client, MODEL, INDEX)
+    assert client.indices.put_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_meta_written_during_dimension_lookup_is_kept(monkeypatch):
+    ollama_model = "nomic-embed-text:latest"
+    meta = {"owner": "ingest"}
+    client = FakeOpenSearch()
+    original_get = client.indices.get_mapping
+
+    async def get_mapping(index):
+        mapping = await original_get(index)
+        mapping[index]["mappings"]["_meta"] = dict(meta)
+        return mapping
+
+    async def resolve(model_name):
+        meta["other_field"] = "added by another worker"
+        return 768
+
+    puts = []
+    original_put = client.indices.put_mapping
+
+    async def put_mapping(index, body):
+        puts.append(body)
+        await original_put(index, body)
+
+    client.indices.get_mapping = get_mapping
+    client.indices.put_mapping = put_mapping
+    monkeypatch.setattr(embedding_fields, "_resolve_native_dimensions", resolve)
+
+    await ensure_embedding_field_exists(client, ollama_model, INDEX)
+
+    assert puts[0]["_meta"]["other_field"] == "added by another worker"
+    assert puts[0]["_meta"]["owner"] == "ingest"
@@ -0,0 +1,101 @@
+"""
+Tests for the shared pooled HTTP client registry
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.http_clients import HTTP_CLIENT_CONNECTIONS, HTTP_CLIENT_REQUESTS, HTTPClientRegistry
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=secret; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_upstream_and_verify_setting():
+    registry = HTTPClientRegistry(http2=False)
+
+    client = registry.get("openai")
+    assert registry.get("openai") is client
+    assert registry.get("openai", verify=False) is not client
+    assert registry.get("anthropic") is not client
+
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.get("openai") is not client
+    await registry.aclose()
+
+
+def test_clients_are_not_shared_across_event_loops():
+    registry = HTTPClientRegistry(http2=False)
+
+    async def get_client():
+        return registry.get("ollama")
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_client_from_another_loop_is_closed_when_replaced():
+    registry = HTTPClientRegistry(http2=False)
+    stale = {}
+
+    def on_other_loop():
+        async def get_client():
+            stale["client"] = registry.get("ollama")
+
+        asyncio.run(get_client())
+
+    thread = threading.Thread(target=on_other_loop)
+    thread.start()
+    thread.join()
+
+    client = registry.get("ollama")
+    assert client is not stale["client"]
+    await asyncio.sleep(0)
+    assert stale["client"].is_closed
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_and_counted(server_url):
+    registry = HTTPClientRegistry(http2=False)
+    upstream = "test-reuse"
+    client = registry.get(upstream)
+
+    for _ in range(5):
+        response = await client.get(f"{server_url}/models", timeout=5.0)
+        assert response.status_code == 200
+
+    assert HTTP_CLIENT_REQUESTS.value(upstream=upstream) == 5
+    assert HTTP_CLIENT_CONNECTIONS.value(upstream=upstream) == 1
+    assert registry.stats()[upstream]["reuse_ratio"] == 0.8
+    # Shared between users, so cookies from responses are never replayed
+    assert len(client.cookies.jar) == 0
+    await registry.aclose()
@@ -0,0 +1,272 @@
+"""
+Tests for index layout profiles, bulk-load mode and drift reporting
+"""
+import asyncio
+import os
+import socket
+from unittest.mock import Mock
+
+import pytest
+
+from services.index_layout_service import (
+    INDEX_LAYOUT_PROFILES,
+    TEMPLATE_NAME,
+    IndexLayoutError,
+    IndexLayoutService,
+    get_index_layout_profile,
+)
+from services.task_service import TaskService
+
+INDEX = "documents"
+ORIGINAL = {"index.refresh_interval": "30s", "index.number_of_replicas": "1"}
+
+
+class NotFound(Exception):
+    status_code = 404
+
+
+class RecordingIndices:
+    """Applies and records settings calls like OpenSearch with flat_settings"""
+
+    def __init__(self, settings=None):
+        self.settings = {INDEX: dict(settings if settings is not None else ORIGINAL)}
+        self.calls = []
+        self.templates = {}
+        self.fail_put = False
+
+    async def put_index_template(self, name, body):
+        self.calls.append(("put_index_template", name, body))
+        self.templates[name] = body
+
+    async def get_index_template(self, name):
+        if name not in self.templates:
+            raise NotFound(name)
+        return {"index_templates": [{"name": name, "index_template": self.templates[name]}]}
+
+    async def get_settings(self, index, flat_settings=False, include_defaults=False, **params):
+        self.calls.append(("get_settings", index))
+        names = [name for name in index.split(",") if name in self.settings]
+        response = {}
+        for name in names:
+            response[name] = {"settings": dict(self.settings[name])}
+            if include_defaults:
+                response[name]["defaults"] = {
+                    "index.refresh_interval": "1s",
+                    "index.translog.durability": "request",
+                    "index.codec": "default",
+                }
+        return response
+
+    async def put_settings(self, index, body):
+        self.calls.append(("put_settings", index, dict(body)))
+        if self.fail_put:
+            raise RuntimeError("cluster unavailable")
+        for key, value in body.items():
+            if value is None:
+                self.settings[index].pop(key, None)
+            else:
+                self.settings[index][key] = value
+
+    async def refresh(self, index):
+        self.calls.append(("refresh", index))
+
+
+class FakeOpenSearch:
+    def __init__(self, **kwargs):
+        self.indices = RecordingIndices(**kwargs)
+
+
+def make_service(tmp_path, client, **kwargs):
+    kwargs.setdefault("process_id", f"{socket.gethostname()}:{os.getpid()}:first")
+    kwargs.setdefault("documents_index", INDEX)
+    return IndexLayoutService(
+        opensearch_client=client,
+        profile=get_index_layout_profile("single-node"),
+        marker_path=str(tmp_path / "bulk_load.json"),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, shards, replicas, refresh, durability, codec",
+    [
+        ("dev", 1, 0, "1s", "async", "default"),
+        ("single-node", 1, 0, "1s", "request", "default"),
+        ("production", 3, 1, "5s", "request", "best_compression"),
+    ],
+)
+async def test_template_payload_per_profile(tmp_path, name, shards, replicas, refresh, durability, codec):
+    client = FakeOpenSearch()
+    service = make_service(tmp_path, client)
+    service.profile = INDEX_LAYOUT_PROFILES[name]
+
+    await service.install_templates()
+
+    [(call, template_name, body)] = client.indices.calls
+    assert (call, template_name) == ("put_index_template", TEMPLATE_NAME)
+    assert body["index_patterns"] == [INDEX, "knowledge_filters", "api_keys", "watson_news_*", "watson_box_*"]
+    assert body["template"]["settings"] == {
+        "index": {
+            "number_of_shards": shards,
+            "number_of_replicas": replicas,
+            "refresh_interval": refresh,
+            "translog": {"durability": durability},
+            "codec": codec,
+        }
+    }
+    assert body["_meta"]["profile"] == name
+
+    with pytest.raises(IndexLayoutError):
+        get_index_layout_profile("huge")
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_restores_settings_on_success(tmp_path):
+    client = FakeOpenSearch()
+    service = make_service(tmp_path, client)
+
+    async with service.bulk_load("task:1"):
+        assert client.indices.settings[INDEX] == {"index.refresh_interval": "-1", "index.number_of_replicas": "0"}
+        assert service.store.load()[INDEX]["previous"] == ORIGINAL
+
+    assert client.indices.settings[INDEX] == ORIGINAL
+    assert client.indices.calls[-1] == ("refresh", INDEX)
+    assert not os.path.exists(service.store.path)
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_restores_settings_on_exception(tmp_path):
+    client = FakeOpenSearch(settings={})  # Nothing set explicitly: restore resets to defaults
+    service = make_service(tmp_path, client)
+
+    with pytest.raises(ValueError):
+        async with service.bulk_load("task:1"):
+            raise ValueError("processor blew up")
+
+    assert client.indices.settings[INDEX] == {}
+    restore = [call for call in client.indices.calls if call[0] == "put_settings"][-1]
+    assert restore[2] == {"index.refresh_interval": None, "index.number_of_replicas": None}
+    assert service.store.load() == {}
+
+
+@pytest.mark.asyncio
+async def test_overlapping_tasks_restore_once_with_the_original_settings(tmp_path):
+    client = FakeOpenSearch()
+    service = make_service(tmp_path, client)
+    first_done = asyncio.Event()
+
+    async def first():
+        async with service.bulk_load("task:1"):
+            await first_done.wait()
+
+    first_task = asyncio.create_task(first())
+    await asyncio.sleep(0)
+    async with service.bulk_load("task:2"):
+        first_done.set()
+        await first_task
+        # The first task finished but the second still holds the bulk load
+        assert client.indices.settings[INDEX]["index.refresh_interval"] == "-1"
+
+    assert client.indices.settings[INDEX] == ORIGINAL
+    assert [call[0] for call in client.indices.calls].count("get_settings") == 1
+
+
+@pytest.mark.asyncio
+async def test_restart_finds_marker_and_restores(tmp_path):
+    client = FakeOpenSearch()
+    crashed = make_service(tmp_path, client)
+    await crashed.enter_bulk_load(INDEX, "task:1")  # ... and the process dies mid-task
+    assert client.indices.settings[INDEX]["index.number_of_replicas"] == "0"
+
+    # The restarted backend has the same pid (as in a container) but a new process id
+    restarted = make_service(tmp_path, client, process_id=f"{socket.gethostname()}:{os.getpid()}:second")
+    assert await restarted.recover() == [INDEX]
+
+    assert client.indices.settings[INDEX] == ORIGINAL
+    assert restarted.store.load() == {}
+
+
+@pytest.mark.asyncio
+async def test_recovery_keeps_live_holders_and_retries_failed_restores(tmp_path):
+    client = FakeOpenSearch()
+    now = [1000.0]
+    running = make_service(tmp_path, client, clock=lambda: now[0])
+    await running.enter_bulk_load(INDEX, "task:1")
+
+    # Another host's task is still renewing its lease
+    other_host = make_service(tmp_path, client, process_id="elsewhere:1:abc", clock=lambda: now[0])
+    assert await other_host.recover() == []
+    assert client.indices.settings[INDEX]["index.refresh_interval"] == "-1"
+
+    # The lease is not renewed anymore; the first restore attempt fails and is retried
+    now[0] += 600
+    client.indices.fail_put = True
+    assert await other_host.recover() == []
+    assert INDEX in other_host.store.load()
+    client.indices.fail_put = False
+    assert await other_host.recover() == [INDEX]
+    assert client.indices.settings[INDEX] == ORIGINAL
+
+
+@pytest.mark.asyncio
+async def test_template_is_installed_once_per_client_and_layout(tmp_path):
+    client = FakeOpenSearch()
+    service = make_service(tmp_path, client)
+
+    await service.install_templates()
+    await make_service(tmp_path, client).install_templates()
+    assert len(client.indices.calls) == 1
+
+    # A renamed documents index changes the patterns, so the template is updated
+    await make_service(tmp_path, client, documents_index="renamed").install_templates()
+    await service.install_templates(force=True)
+    assert len(client.indices.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_drift_report(tmp_path):
+    client = FakeOpenSearch()
+    service = make_service(tmp_path, client)
+
+    report = await service.drift_report()
+    assert report["template"] == {"name": TEMPLATE_NAME, "installed": False, "up_to_date": False}
+    drift = {entry["setting"]: entry for entry in report["indices"][INDEX]["drift"]}
+    # number_of_shards is not set on the fake index at all
+    assert set(drift) == {"index.number_of_shards", "index.number_of_replicas", "index.refresh_interval"}
+    assert (drift["index.refresh_interval"]["expected"], drift["index.refresh_interval"]["actual"]) == ("1s", "30s")
+    assert report["drift"] is True
+
+    await service.install_templates()
+    client.indices.settings[INDEX] = {"index.number_of_shards": "1", "index.number_of_replicas": "0"}
+    report = await service.drift_report()
+    assert report["template"]["up_to_date"] is True
+    assert report["indices"][INDEX]["drift"] == []
+    assert report["drift"] is False
+
+    # Bulk-load settings are expected while a bulk load runs
+    async with service.bulk_load("task:1"):
+        report = await service.drift_report()
+        assert report["indices"][INDEX]["bulk_load"] is True
+        assert report["drift"] is False
+
+
+@pytest.mark.asyncio
+async def test_large_tasks_run_in_bulk_load_mode(tmp_path):
+    client = FakeOpenSearch()
+    layout = make_service(tmp_path, client, bulk_load_min_files=3)
+    task_service = TaskService(process_pool=Mock(), index_layout=layout)
+    seen = []
+
+    class Processor:
+        async def process_item(self, upload_task, item, file_task):
+            seen.append(client.indices.settings[INDEX]["index.refresh_interval"])
+            file_task.status = file_task.status.COMPLETED
+
+    small = await task_service.create_custom_task("user-1", ["a", "b"], Processor())
+    await task_service.task_store["user-1"][small].background_task
+    large = await task_service.create_custom_task("user-1", ["c", "d", "e"], Processor())
+    await task_service.task_store["user-1"][large].background_task
+
+    assert seen == ["30s", "30s", "-1", "-1", "-1"]
+    assert client.indices.settings[INDEX] == ORIGINAL
@@ -0,0 +1,287 @@
+"""
+Tests for in-process knowledge filter subscription matching
+"""
+import asyncio
+import json
+import random
+
+import pytest
+
+from services.knowledge_filter_matcher import (
+    KnowledgeFilterMatcher,
+    QueueNotificationSink,
+    compile_filter,
+)
+
+FILENAMES = [f"report-{i}.pdf" for i in range(2_000)]
+MIMETYPES = ["application/pdf", "text/plain", "text/html", "application/msword", "image/png"]
+OWNERS = [f"user-{i}" for i in range(50)]
+CONNECTORS = ["local", "google_drive", "sharepoint", "onedrive"]
+VOCABULARY = [f"word{i}" for i in range(2_000)]
+
+
+def random_query_data(rng):
+    """Most filters narrow on a source, an owner or query terms; about one in a hundred matches everything"""
+    if rng.random() < 0.01:
+        return json.dumps({"query": "", "filters": {}})
+
+    def pick(values, probability):
+        if rng.random() > probability:
+            return ["*"]
+        return rng.sample(values, rng.randint(1, 3))
+
+    query = " ".join(rng.sample(VOCABULARY, rng.randint(1, 2))) if rng.random() < 0.4 else ""
+    filters = {
+        "data_sources": pick(FILENAMES, 0.4),
+        "document_types": pick(MIMETYPES, 0.5),
+        "owners": pick(OWNERS, 0.3),
+        "connector_types": pick(CONNECTORS, 0.3),
+    }
+    if not query and filters["data_sources"] == ["*"] and filters["owners"] == ["*"]:
+        filters["owners"] = [rng.choice(OWNERS)]
+    return json.dumps({"query": query, "filters": filters})
+
+
+def random_chunk(rng, index):
+    owner = rng.choice(OWNERS)
+    return (
+        f"doc-{index}_0",
+        {
+            "document_id": f"doc-{index}",
+            "filename": rng.choice(FILENAMES),
+            "mimetype": rng.choice(MIMETYPES),
+            "owner": owner,
+            "owner_name": owner.replace("user", "User "),
+            "allowed_users": [rng.choice(OWNERS)],
+            "connector_type": rng.choice(CONNECTORS),
+            "text": " ".join(rng.choices(VOCABULARY, k=40)),
+        },
+    )
+
+
+def filter_doc(filter_id, query_data, subscribers):
+    return {
+        "id": filter_id,
+        "name": f"Filter {filter_id}",
+        "query_data": query_data,
+        "owner": subscribers[0],
+        "subscriptions": [
+            {"subscription_id": f"{filter_id}-{user}", "user_id": user, "created_at": "2024-01-01T00:00:00"}
+            for user in subscribers
+        ],
+    }
+
+
+def brute_force(filters, chunk):
+    """Evaluate every ``(filter document, parsed query data)`` pair directly"""
+    words = set(chunk["text"].lower().split())
+    chunk_values = {
+        "data_sources": {chunk["filename"]},
+        "document_types": {chunk["mimetype"]},
+        "owners": {chunk["owner"], chunk["owner_name"]},
+        "connector_types": {chunk["connector_type"]},
+    }
+    matched = set()
+    for doc, data in filters:
+        constraints = data.get("filters", {})
+        if any(
+            "*" not in constraints.get(key, ["*"]) and not values & set(constraints[key])
+            for key, values in chunk_values.items()
+        ):
+            continue
+        if not set(data["query"].lower().split()) <= words:
+            continue
+        for subscription in doc["subscriptions"]:
+            user = subscription["user_id"]
+            if chunk["owner"] == user or user in chunk["allowed_users"]:
+                matched.add(subscription["subscription_id"])
+    return matched
+
+
+def make_matcher(filters, **kwargs):
+    matcher = KnowledgeFilterMatcher(sink=QueueNotificationSink(maxlen=None), **kwargs)
+    for doc in filters:
+        matcher.register_filter(doc)
+    return matcher
+
+
+def synthetic_filters(rng, count):
+    return [filter_doc(f"kf{i}", random_query_data(rng), [rng.choice(OWNERS)]) for i in range(count)]
+
+
+def test_matches_agree_with_brute_force_and_cost_is_sublinear():
+    rng = random.Random(42)
+    filters = synthetic_filters(rng, 10_000)
+    chunks = [random_chunk(rng, i) for i in range(10_000)]
+    matcher = make_matcher(filters)
+    assert len(matcher.index) == 10_000
+
+    matched = {chunk_id: {s.subscription_id for s in matcher.index.match(chunk)} for chunk_id, chunk in chunks}
+    evaluations_per_chunk = matcher.index.evaluations / len(chunks)
+
+    # Brute force over every filter is too slow for all 10,000 chunks; check a sample
+    parsed = [(doc, json.loads(doc["query_data"])) for doc in filters]
+    for chunk_id, chunk in rng.sample(chunks, 100):
+        assert matched[chunk_id] == brute_force(parsed, chunk)
+    assert sum(len(found) for found in matched.values()) > 1_000
+
+    # Each chunk is checked against a small candidate set, not every subscription
+    assert evaluations_per_chunk < 0.05 * len(filters)
+
+
+def test_filter_semantics():
+    chunk = {
+        "filename": "plan.pdf",
+        "mimetype": "application/pdf",
+        "owner": "alice",
+        "owner_name": "Alice",
+        "connector_type": "local",
+        "text": "Quarterly revenue plan for 2025",
+    }
+    values = {
+        "filename": {"plan.pdf"},
+        "mimetype": {"application/pdf"},
+        "owner": {"alice", "Alice"},
+        "connector_type": {"local"},
+    }
+    terms = {"quarterly", "revenue", "plan", "for", "2025"}
+
+    def matches(query_data):
+        return compile_filter(query_data).matches(values, terms)
+
+    assert matches({})  # Everything defaults to "*"
+    assert matches({"query": "Revenue PLAN", "filters": {"owners": ["Alice"]}})
+    assert not matches({"query": "revenue forecast"})
+    assert not matches({"filters": {"data_sources": []}})  # An empty list matches nothing
+    assert matches(json.dumps({"query": "*", "filters": {"document_types": ["text/plain", "application/pdf"]}}))
+    assert not matches({"filters": {"connector_types": ["sharepoint"]}})
+
+    matcher = make_matcher([filter_doc("kf", json.dumps({"query": "revenue"}), ["bob"])])
+    assert matcher.index.match(chunk) == []  # bob cannot see alice's chunk
+    assert len(matcher.index.match({**chunk, "allowed_users": ["bob"]})) == 1
+
+
+@pytest.mark.asyncio
+async def test_matches_are_coalesced_per_subscription_and_window():
+    rng = random.Random(7)
+    now = [1000.0]
+    filters = synthetic_filters(rng, 2_000)
+    matcher = make_matcher(filters, clock=lambda: now[0], window_seconds=3600)
+    sink = matcher.coalescer.sink
+
+    chunks = [random_chunk(rng, i) for i in range(2_000)]
+    first_matches = matcher.notify_indexed(chunks[:1_000])
+    pending = matcher.coalescer.pending
+    assert first_matches > pending > 0  # Several chunks per subscription
+
+    now[0] += 60
+    assert await matcher.flush() == pending
+    notifications = sink.drain()
+    assert len(notifications) == pending
+    assert len({n["subscription_id"] for n in notifications}) == pending
+    assert sum(n["match_count"] for n in notifications) == first_matches
+    assert all(n["window_end"] - n["window_start"] == 60 for n in notifications)
+
+    # The next window gets its own notification per subscription
+    second_matches = matcher.notify_indexed(chunks[1_000:])
+    await matcher.flush()
+    notifications = sink.drain()
+    assert len({n["subscription_id"] for n in notifications}) == len(notifications)
+    assert sum(n["match_count"] for n in notifications) == second_matches
+
+
+@pytest.mark.asyncio
+async def test_window_timer_delivers_and_unsubscribe_stops_matches():
+    matcher = make_matcher(
+        [filter_doc("kf", json.dumps({"filters": {"data_sources": ["a.pdf"]}}), ["alice", "bob"])],
+        window_seconds=0.01,
+    )
+    chunk = {"filename": "a.pdf", "owner": "alice", "allowed_users": ["bob"], "text": ""}
+
+    assert matcher.notify_indexed([("c1", chunk), ("c2", chunk)]) == 4
+    await asyncio.sleep(0.05)
+    notifications = matcher.coalescer.sink.drain()
+    assert sorted(n["subscription_id"] for n in notifications) == ["kf-alice", "kf-bob"]
+    assert [m["chunk_id"] for m in notifications[0]["matches"]] == ["c1", "c2"]
+
+    assert matcher.unsubscribe("kf-bob")
+    assert matcher.notify_indexed([("c3", chunk)]) == 1
+    assert matcher.remove_filter("kf") == 1
+    assert matcher.notify_indexed([("c4", chunk)]) == 0
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_are_reloaded_from_the_filter_index():
+    stored = [
+        filter_doc("kf1", json.dumps({"query": "revenue"}), ["alice"]),
+        # Subscriptions made before user ids were recorded belong to the filter owner
+        {**filter_doc("kf2", json.dumps({"filters": {"owners": ["bob"]}}), ["bob"]),
+         "subscriptions": [{"subscription_id": "legacy", "monitor_id": "m1"}]},
+    ]
+
+    class FakeOpenSearch:
+        async def search(self, index, body):
+            assert index == "knowledge_filters"
+            return {"hits": {"hits": [{"_id": doc["id"], "_source": doc} for doc in stored]}}
+
+    matcher = KnowledgeFilterMatcher(sink=QueueNotificationSink())
+    assert await matcher.load(FakeOpenSearch()) == 2
+    assert matcher.index.subscriptions["legacy"].user_id == "bob"
+    assert matcher.notify_indexed([("c1", {"owner": "bob", "text": "revenue"})]) == 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_indexed_by_the_langflow_flow_are_read_back_and_matched():
+    old_chunk = {"_id": "old_0", "_source": {"document_id": "doc-1", "filename": "a.pdf", "owner": "alice", "text": "revenue"}}
+    new_chunks = [
+        {"_id": "doc-1_0", "_source": {"document_id": "doc-1", "filename": "a.pdf", "owner": "alice", "text": "q3 revenue"}},
+        {"_id": "doc-1_1", "_source": {"document_id": "doc-1", "filename": "a.pdf", "owner": "alice", "text": "costs"}},
+    ]
+
+    class FakeOpenSearch:
+        def __init__(self):
+            self.searchable = [old_chunk]
+            self.queries = []
+
+        async def search(self, index, body):
+            self.queries.append(body["query"])
+            return {"hits": {"hits": list(self.searchable)}}
+
+    client = FakeOpenSearch()
+    matcher = KnowledgeFilterMatcher(sink=QueueNotificationSink())
+    matcher.read_back_delays = (0, 0, 0)
+    # Without subscriptions nothing is read back
+    assert matcher.watch_ingest(client, document_id="doc-1") is None
+    assert client.queries == []
+
+    matcher.register_filter(filter_doc("kf", json.dumps({"query": "revenue"}), ["alice"]))
+    watch = matcher.watch_ingest(client, document_id="doc-1")
+    await asyncio.sleep(0)
+    assert client.queries == [{"term": {"document_id": "doc-1"}}]
+
+    # The flow run returns before the index refreshed; later read-backs find the new chunks
+    reads = 0
+
+    async def search(index, body):
+        nonlocal reads
+        if body["_source"] is False:
+            return {"hits": {"hits": [{"_id": hit["_id"]} for hit in client.searchable]}}
+        reads += 1
+        if reads == 2:
+            client.searchable += new_chunks
+        assert "text" in body["_source"]
+        return {"hits": {"hits": list(client.searchable)}}
+
+    client.search = search
+    assert await watch.finish() == 1
+    assert reads == 2
+    assert not hasattr(client, "indices")  # never forces a refresh
+
+    watch = matcher.watch_ingest(client, filename="a.md", owner="alice")
+    assert watch.query == {"bool": {"filter": [{"term": {"filename": "a.md"}}, {"term": {"owner": "alice"}}]}}
+    assert await watch.finish() == 0  # nothing new since the run started
+    assert reads == 2 + len(matcher.read_back_delays)
+
+    await matcher.close()
+    [notification] = matcher.coalescer.sink.drain()
+    assert [m["chunk_id"] for m in notification["matches"]] == ["doc-1_0"]
@@ -0,0 +1,143 @@
+"""
+Tests for user-scoped, paged Langflow history retrieval
+Covers bounded concurrency, per-session message caching and invalidation
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.chat_service import ChatService
+from services.langflow_history_service import LangflowHistoryService
+
+
+def _langflow_message(session_id: str, text: str, sender: str = "User"):
+    return {
+        "id": f"{session_id}-{text}",
+        "session_id": session_id,
+        "flow_id": "flow-1",
+        "sender": sender,
+        "text": text,
+        "timestamp": "2025-01-01T00:00:00",
+    }
+
+
+class FakeLangflow:
+    """Records Langflow monitor API calls and tracks in-flight requests"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, method, path, params=None, **kwargs):
+        self.calls.append((method, path, dict(params or {})))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        response = MagicMock()
+        response.status_code = 200
+        if path.endswith("/sessions"):
+            response.json.return_value = ["all-1", "all-2"]
+        else:
+            session_id = params["session_id"]
+            response.json.return_value = [_langflow_message(session_id, f"hello {session_id}")]
+        return response
+
+    def message_calls(self):
+        return [call for call in self.calls if call[1] == "/api/v1/monitor/messages"]
+
+
+@pytest.fixture
+def fake_langflow():
+    fake = FakeLangflow(delay=0.01)
+    with patch("services.langflow_history_service.clients") as mock_clients:
+        mock_clients.langflow_request = fake
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_history_fetches_only_given_sessions_with_bounded_concurrency(fake_langflow):
+    service = LangflowHistoryService(max_concurrency=3)
+    session_ids = [f"s{i}" for i in range(20)]
+
+    history = await service.get_user_conversation_history("user-1", session_ids=session_ids)
+
+    assert len(history["conversations"]) == 20
+    assert not any(call[1].endswith("/sessions") for call in fake_langflow.calls)
+    assert len(fake_langflow.message_calls()) == 20
+    assert fake_langflow.max_in_flight <= 3
+
+
+@pytest.mark.asyncio
+async def test_session_messages_are_cached_until_version_changes(fake_langflow):
+    service = LangflowHistoryService()
+
+    await service.get_session_messages("user-1", "s1", version="t1")
+    await service.get_session_messages("user-1", "s1", version="t1")
+    assert len(fake_langflow.message_calls()) == 1
+
+    await service.get_session_messages("user-1", "s1", version="t2")
+    assert len(fake_langflow.message_calls()) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_session_forces_refetch(fake_langflow):
+    service = LangflowHistoryService()
+
+    await service.get_session_messages("user-1", "s1")
+    service.invalidate_session("s1")
+    await service.get_session_messages("user-1", "s1")
+
+    assert len(fake_langflow.message_calls()) == 2
+
+
+@pytest.mark.asyncio
+async def test_chat_service_pages_through_users_own_sessions(fake_langflow):
+    service = LangflowHistoryService(max_concurrency=4)
+    metadata = {
+        f"s{i}": {"title": f"chat {i}", "last_activity": f"2025-01-01T00:00:{i:02d}"}
+        for i in range(10)
+    }
+    ownership = MagicMock()
+    ownership.get_user_session_activity.return_value = {"owned-only": "2025-01-02T00:00:00"}
+
+    with (
+        patch("services.langflow_history_service.langflow_history_service", service),
+        patch("agent.get_user_conversations", new=AsyncMock(return_value=metadata)),
+        patch("services.session_ownership_service.session_ownership_service", ownership),
+    ):
+        first = await ChatService().get_langflow_history("user-1", page=1, page_size=4)
+        second = await ChatService().get_langflow_history("user-1", page=3, page_size=4)
+
+    assert {c["response_id"] for c in first["conversations"]} == {"owned-only", "s9", "s8", "s7"}
+    assert first["has_more"] is True
+    assert first["total_sessions"] == 11
+    assert [c["response_id"] for c in second["conversations"]] == ["s2", "s1", "s0"]
+    assert second["has_more"] is False
+    # Only the requested pages were fetched from Langflow
+    assert len(fake_langflow.message_calls()) == 7
+
+
+@pytest.mark.asyncio
+async def test_chat_service_single_session_requires_ownership(fake_langflow):
+    service = LangflowHistoryService()
+    ownership = MagicMock()
+    ownership.get_user_session_activity.return_value = {}
+
+    with (
+        patch("services.langflow_history_service.langflow_history_service", service),
+        patch("agent.get_user_conversations", new=AsyncMock(return_value={"mine": {"title": "t"}})),
+        patch("services.session_ownership_service.session_ownership_service", ownership),
+    ):
+        mine = await ChatService().get_langflow_history("user-1", session_id="mine")
+        other = await ChatService().get_langflow_history("user-1", session_id="someone-else")
+
+    assert [c["response_id"] for c in mine["conversations"]] == ["mine"]
+    assert other["conversations"] == []
+    assert len(fake_langflow.message_calls()) == 1
@@ -0,0 +1,126 @@
+"""
+Tests for latency metrics, the Prometheus exposition and the request timing middleware
+"""
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from metrics_middleware import MetricsMiddleware
+from utils.metrics import (
+    HTTP_REQUEST_SECONDS,
+    MetricsRegistry,
+    start_request_timings,
+    server_timing_header,
+    timed,
+)
+from utils.opensearch_connection import opensearch_operation
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test latency", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, op='say "hi"')
+
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{op="say \\"hi\\"",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{op="say \\"hi\\"",le="1"} 3' in text
+    assert 'test_seconds_bucket{op="say \\"hi\\"",le="+Inf"} 4' in text
+    assert 'test_seconds_count{op="say \\"hi\\""} 4' in text
+    assert histogram.snapshot(op='say "hi"')["sum"] == 4.25
+
+
+def test_registry_rejects_conflicting_definitions():
+    registry = MetricsRegistry()
+    first = registry.counter("test_total", "Test", ("a",))
+    assert registry.counter("test_total", "Test", ("a",)) is first
+    try:
+        registry.histogram("test_total", "Test", ("a",))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_timed_adds_phases_to_request_breakdown():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("phase_seconds", "Phase", phase="opensearch")
+
+    async def request():
+        timings = start_request_timings()
+        with timed(histogram):
+            await asyncio.sleep(0.01)
+        with timed(histogram):
+            pass
+        return timings
+
+    timings = asyncio.run(request())
+    seconds, count = timings["opensearch"]
+    assert count == 2 and seconds >= 0.01
+    assert histogram.snapshot()["count"] == 2
+    assert server_timing_header(timings).startswith('opensearch;dur=')
+
+
+def test_opensearch_operation_labels():
+    assert opensearch_operation("POST", "/documents/_search?size=10") == "POST _search"
+    assert opensearch_operation("PUT", "/documents/_doc/abc123") == "PUT _doc"
+    assert opensearch_operation("POST", "/_bulk") == "POST _bulk"
+    assert opensearch_operation("HEAD", "/documents") == "HEAD index"
+    assert opensearch_operation("GET", "/") == "GET root"
+
+
+def _build_app():
+    phase = MetricsRegistry().histogram("endpoint_seconds", "Endpoint", phase="search")
+
+    async def get_item(request):
+        with timed(phase):
+            await asyncio.sleep(0)
+        return JSONResponse({"id": request.path_params["item_id"]})
+
+    async def stream(request):
+        async def body():
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                yield f"{i}\n"
+        return StreamingResponse(body(), media_type="text/plain")
+
+    routes = [
+        Route("/metrics-test/items/{item_id}", get_item, methods=["GET"]),
+        Route("/metrics-test/stream", stream, methods=["GET"]),
+    ]
+    app = Starlette(routes=routes)
+    app.add_middleware(MetricsMiddleware, routes=routes, timing_header=True)
+    return app
+
+
+def test_middleware_labels_route_template_and_sets_server_timing():
+    client = TestClient(_build_app())
+    before = HTTP_REQUEST_SECONDS.snapshot(
+        method="GET", route="/metrics-test/items/{item_id}", status="200"
+    )["count"]
+
+    response = client.get("/metrics-test/items/42")
+    client.get("/metrics-test/items/43")
+    client.get("/metrics-test/nowhere")
+
+    assert response.json() == {"id": "42"}
+    timing = response.headers["server-timing"]
+    assert "search;dur=" in timing and "total;dur=" in timing
+    after = HTTP_REQUEST_SECONDS.snapshot(
+        method="GET", route="/metrics-test/items/{item_id}", status="200"
+    )["count"]
+    assert after - before == 2
+    assert HTTP_REQUEST_SECONDS.snapshot(method="GET", route="unmatched", status="404")["count"] >= 1
+
+
+def test_middleware_times_streamed_body():
+    client = TestClient(_build_app())
+    response = client.get("/metrics-test/stream")
+
+    assert response.text == "0\n1\n2\n"
+    snapshot = HTTP_REQUEST_SECONDS.snapshot(method="GET", route="/metrics-test/stream", status="200")
+    assert snapshot["count"] >= 1 and snapshot["sum"] >= 0.03
@@ -0,0 +1,246 @@
+"""
+Tests for the pipelined bulk ingest of the Langflow OpenSearch multimodal component
+
+The component runs inside Langflow, so only its Langflow-independent module-level
+helpers are loaded here.
+"""
+import ast
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from opensearchpy.serializer import JSONSerializer
+
+COMPONENT = Path(__file__).resolve().parents[2] / "flows" / "components" / "opensearch_multimodal.py"
+HELPERS = {
+    "EMBEDDING_PROVIDER_RATE_LIMITS",
+    "RETRYABLE_BULK_STATUSES",
+    "TokenBucket",
+    "_bulk_item_error",
+    "embedding_provider",
+    "pipelined_bulk_ingest",
+}
+
+
+def load_helpers():
+    tree = ast.parse(COMPONENT.read_text())
+    body = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            module = node.module if isinstance(node, ast.ImportFrom) else node.names[0].name
+            if not (module or "").startswith("lfx"):
+                body.append(node)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in HELPERS:
+            body.append(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if any(isinstance(target, ast.Name) and target.id in HELPERS for target in targets):
+                body.append(node)
+    namespace = {"__name__": "opensearch_multimodal_helpers"}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(COMPONENT), "exec"), namespace)
+    return namespace
+
+
+helpers = load_helpers()
+TokenBucket = helpers["TokenBucket"]
+pipelined_bulk_ingest = helpers["pipelined_bulk_ingest"]
+
+
+class Timeline:
+    """Thread-safe record of (kind, start, end) intervals"""
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def record(self, kind, start, end):
+        with self._lock:
+            self.events.append((kind, start, end))
+
+    def of(self, kind):
+        return sorted((start, end) for k, start, end in self.events if k == kind)
+
+
+class FakeEmbedder:
+    def __init__(self, timeline, latency=0.02, limiter=None, fail_batches=()):
+        self.timeline = timeline
+        self.latency = latency
+        self.limiter = limiter
+        self.fail_batches = set(fail_batches)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, batch):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        start = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        self.timeline.record("embed", start, time.perf_counter())
+        if batch[0] in self.fail_batches:
+            raise RuntimeError("model unavailable")
+        return [[float(len(text)), 1.0] for text in batch]
+
+
+class FakeBulkSink:
+    """OpenSearch client whose bulk() parses NDJSON and answers per item"""
+
+    def __init__(self, timeline, latency=0.005, responses=None):
+        self.transport = SimpleNamespace(serializer=JSONSerializer())
+        self.timeline = timeline
+        self.latency = latency
+        # text -> list of statuses to answer on successive attempts (then 201)
+        self.responses = {text: list(statuses) for text, statuses in (responses or {}).items()}
+        self.documents = {}
+        self.requests = 0
+
+    def bulk(self, body, *args, **kwargs):
+        start = time.perf_counter()
+        time.sleep(self.latency)
+        lines = body.strip().split("\n")
+        items = []
+        for header, source in zip(lines[::2], lines[1::2]):
+            meta = json.loads(header)["index"]
+            doc = json.loads(source)
+            statuses = self.responses.get(doc["text"])
+            status = statuses.pop(0) if statuses else 201
+            if status < 300:
+                self.documents[meta["_id"]] = doc
+                items.append({"index": {"_id": meta["_id"], "status": status}})
+            else:
+                error = {"type": "es_rejected_execution_exception" if status == 429 else "mapper_parsing_exception"}
+                items.append({"index": {"_id": meta["_id"], "status": status, "error": error}})
+        self.requests += 1
+        self.timeline.record("bulk", start, time.perf_counter())
+        return {"errors": any("error" in item["index"] for item in items), "items": items}
+
+
+def build_actions(texts):
+    def build(start, vectors):
+        return [
+            {"_index": "documents", "_id": f"doc-{start + offset}", "text": texts[start + offset], "vector": vector}
+            for offset, vector in enumerate(vectors)
+        ]
+
+    return build
+
+
+def run(texts, embedder, sink, **kwargs):
+    kwargs.setdefault("batch_size", 50)
+    kwargs.setdefault("sleep", lambda seconds: None)
+    return pipelined_bulk_ingest(sink, texts, embedder, build_actions(texts), **kwargs)
+
+
+def test_wall_clock_drops_with_concurrency():
+    texts = [f"chunk {i}" for i in range(5_000)]
+    durations = {}
+    for concurrency in (1, 8):
+        timeline = Timeline()
+        sink = FakeBulkSink(timeline)
+        started = time.perf_counter()
+        report = run(texts, FakeEmbedder(timeline), sink, concurrency=concurrency)
+        durations[concurrency] = time.perf_counter() - started
+        assert len(report["indexed"]) == 5_000 and report["failed"] == []
+        assert len(sink.documents) == 5_000
+
+    # 100 embedding calls of 20 ms: ~2 s sequentially, ~0.25 s with eight in flight
+    assert durations[1] / durations[8] > 4
+
+
+def test_embedding_and_writing_overlap_within_a_bounded_window():
+    texts = [f"chunk {i}" for i in range(2_000)]
+    timeline = Timeline()
+    embedder = FakeEmbedder(timeline)
+    sink = FakeBulkSink(timeline)
+
+    report = run(texts, embedder, sink, concurrency=2, max_in_flight=4, chunk_size=100)
+
+    assert len(report["indexed"]) == 2_000
+    embeds, bulks = timeline.of("embed"), timeline.of("bulk")
+    # Writing starts long before the last batch is embedded ...
+    assert bulks[0][0] < embeds[-1][0]
+    # ... and some bulk request runs while an embedding call is in progress
+    assert any(e_start < b_end and b_start < e_end for b_start, b_end in bulks for e_start, e_end in embeds)
+    assert embedder.max_in_flight <= 2
+
+
+def test_token_bucket_never_exceeds_the_rate():
+    now = [0.0]
+    acquired = []
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(10):
+        bucket.acquire()
+        acquired.append(now[0])
+
+    assert acquired == pytest.approx([i * 0.5 for i in range(10)])
+
+
+def test_pipeline_respects_the_limiter():
+    texts = [f"chunk {i}" for i in range(120)]
+    timeline = Timeline()
+    rate = 40.0
+    embedder = FakeEmbedder(timeline, latency=0.001, limiter=TokenBucket(rate))
+
+    run(texts, embedder, FakeBulkSink(timeline), batch_size=1, concurrency=8)
+
+    starts = [start for start, _ in timeline.of("embed")]
+    assert len(starts) == 120
+    window = 0.5
+    for index, start in enumerate(starts):
+        in_window = sum(1 for other in starts[index:] if other < start + window)
+        # One token of burst, plus one for the scheduling delay between acquire() and the call
+        assert in_window <= rate * window + 2
+    assert starts[-1] - starts[0] >= (len(starts) - 1) / rate * 0.95
+
+
+def test_failed_items_are_retried_and_reported():
+    texts = [f"chunk {i}" for i in range(300)]
+    timeline = Timeline()
+    sink = FakeBulkSink(
+        timeline,
+        responses={"chunk 7": [429, 429], "chunk 8": [503], "chunk 9": [400], "chunk 10": [429, 429, 429, 429]},
+    )
+    backoffs = []
+
+    report = run(
+        texts,
+        FakeEmbedder(timeline, latency=0, fail_batches={"chunk 100"}),
+        sink,
+        max_retries=3,
+        initial_backoff=1.0,
+        sleep=backoffs.append,
+    )
+
+    failed = {entry["position"]: entry for entry in report["failed"]}
+    assert set(failed) == {9, 10, *range(100, 150)}
+    assert (failed[9]["stage"], failed[9]["status"]) == ("bulk", 400)
+    assert "mapper_parsing_exception" in failed[9]["error"]
+    assert (failed[10]["stage"], failed[10]["status"]) == ("bulk", 429)
+    assert failed[120] == {"position": 120, "stage": "embedding", "status": None, "error": "model unavailable"}
+    assert {"doc-7", "doc-8"} <= set(sink.documents)
+    assert len(report["indexed"]) == 300 - len(failed)
+    assert backoffs == [1.0, 2.0, 4.0]
+
+
+def test_provider_rate_limits():
+    class WatsonxEmbeddings:
+        pass
+
+    assert helpers["embedding_provider"]("ibm/slate-125m-english-rtrvr", None) == "watsonx"
+    assert helpers["embedding_provider"]("custom", WatsonxEmbeddings()) == "watsonx"
+    assert "watsonx" in helpers["EMBEDDING_PROVIDER_RATE_LIMITS"]
+    assert helpers["embedding_provider"]("text-embedding-3-small", object()) not in helpers[
+        "EMBEDDING_PROVIDER_RATE_LIMITS"
+    ]
@@ -0,0 +1,303 @@
+"""
+Tests for the resumable re-embedding service
+"""
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from opensearchpy.exceptions import ConflictError
+
+import utils.embedding_fields as embedding_fields
+from models.tasks import TaskStatus
+from services.reembedding_service import ReembeddingService
+from services.task_service import TaskService
+from utils.embedding_fields import EmbeddingFieldRegistry, get_embedding_field_name
+
+INDEX = "documents"
+OLD_MODEL = "text-embedding-3-small"
+NEW_MODEL = "text-embedding-3-large"
+OLD_FIELD = get_embedding_field_name(OLD_MODEL)
+NEW_FIELD = get_embedding_field_name(NEW_MODEL)
+USER_ID = "user-1"
+
+
+def _matches_clause(source, clause):
+    if "wildcard" in clause:
+        # A "*" wildcard on a text field matches documents with at least one indexed term
+        (field,) = clause["wildcard"]
+        return bool(str(source.get(field) or "").split())
+    return clause["exists"]["field"] in source
+
+
+def _matches(source, query):
+    clauses = query["bool"]
+    return all(_matches_clause(source, clause) for clause in clauses.get("filter", [])) and not any(
+        _matches_clause(source, clause) for clause in clauses.get("must_not", [])
+    )
+
+
+class FakeIndices:
+    def __init__(self):
+        self.properties = {OLD_FIELD: {"type": "knn_vector", "dimension": 1536}}
+
+    async def get_mapping(self, index):
+        return {index: {"mappings": {"properties": dict(self.properties)}}}
+
+    async def put_mapping(self, index, body):
+        self.properties.update(body["properties"])
+
+    async def refresh(self, index):
+        pass
+
+
+class FakeOpenSearch:
+    """Point-in-time search, counts, partial bulk updates and update_by_query"""
+
+    def __init__(self, count):
+        self.docs = {
+            f"chunk-{i:05d}": {"text": f"chunk {i}", "embedding_model": OLD_MODEL, OLD_FIELD: [0.0]}
+            for i in range(count)
+        }
+        self.indices = FakeIndices()
+        self.writes = {}
+        self.pits = {}
+        self.update_by_query_calls = []
+        self.locks = {}
+
+    async def index(self, index, id, body, op_type=None):
+        # Lock documents of utils.vector_profiles.meta_lock
+        if op_type == "create" and (index, id) in self.locks:
+            raise ConflictError(409, "version_conflict_engine_exception", {})
+        self.locks[(index, id)] = body
+        return {"_id": id, "_seq_no": 0, "_primary_term": 1}
+
+    async def delete(self, index, id, **kwargs):
+        self.locks.pop((index, id), None)
+
+    async def create_pit(self, index, keep_alive):
+        pit_id = f"pit-{len(self.pits)}"
+        self.pits[pit_id] = {doc_id: dict(source) for doc_id, source in self.docs.items()}
+        return {"pit_id": pit_id}
+
+    async def delete_pit(self, body):
+        for pit_id in body["pit_id"]:
+            self.pits.pop(pit_id)
+
+    async def search(self, body):
+        snapshot = self.pits[body["pit"]["id"]]
+        ids = sorted(doc_id for doc_id, source in snapshot.items() if _matches(source, body["query"]))
+        if "search_after" in body:
+            ids = [doc_id for doc_id in ids if doc_id > body["search_after"][0]]
+        hits = [
+            {"_id": doc_id, "_source": {"text": snapshot[doc_id]["text"]}, "sort": [doc_id]}
+            for doc_id in ids[: body["size"]]
+        ]
+        await asyncio.sleep(0)
+        return {"pit_id": body["pit"]["id"], "hits": {"hits": hits}}
+
+    async def count(self, index, body):
+        return {"count": sum(1 for source in self.docs.values() if _matches(source, body["query"]))}
+
+    async def bulk(self, body):
+        items = []
+        for action, partial in zip(body[::2], body[1::2]):
+            doc_id = action["update"]["_id"]
+            self.docs[doc_id].update(partial["doc"])
+            self.writes[doc_id] = self.writes.get(doc_id, 0) + 1
+            items.append({"update": {"_id": doc_id, "status": 200}})
+        await asyncio.sleep(0)
+        return {"errors": False, "items": items}
+
+    async def update_by_query(self, index, body, params):
+        self.update_by_query_calls.append((body, params))
+        script_params = body["script"]["params"]
+        for source in self.docs.values():
+            source["embedding_model"] = script_params["model"]
+            for field in script_params["remove"]:
+                source.pop(field, None)
+        return {"updated": len(self.docs)}
+
+
+def make_embedder():
+    calls = []
+
+    async def embed(model, texts):
+        calls.append(len(texts))
+        await asyncio.sleep(0)
+        return [[float(len(text)), float(sum(map(ord, text)) % 97)] for text in texts]
+
+    return embed, calls
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_field_registry(monkeypatch):
+    monkeypatch.setattr(embedding_fields, "embedding_field_registry", EmbeddingFieldRegistry())
+
+
+@pytest.fixture
+def task_service():
+    return TaskService(process_pool=Mock())
+
+
+def make_service(tmp_path, client, embed, task_service=None, **kwargs):
+    kwargs.setdefault("docs_per_second", 0)
+    return ReembeddingService(
+        task_service=task_service,
+        opensearch_client=client,
+        embed=embed,
+        checkpoint_path=str(tmp_path / "reembedding.json"),
+        page_size=500,
+        batch_size=64,
+        **kwargs,
+    )
+
+
+async def start(service, **kwargs):
+    return await service.start(USER_ID, target_model=NEW_MODEL, index_name=INDEX, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_migrates_every_chunk_once_and_finalizes(tmp_path, task_service):
+    client = FakeOpenSearch(10_000)
+    embed, calls = make_embedder()
+    service = make_service(tmp_path, client, embed, task_service)
+
+    progress = await start(service, remove_old_fields=True)
+    assert progress["total"] == 10_000
+    await service._task
+
+    assert len(client.writes) == 10_000
+    assert set(client.writes.values()) == {1}
+    assert max(calls) == 64
+    assert all(NEW_FIELD in source and OLD_FIELD not in source for source in client.docs.values())
+    assert {source["embedding_model"] for source in client.docs.values()} == {NEW_MODEL}
+    assert NEW_FIELD in client.indices.properties
+    assert client.pits == {}
+
+    progress = service.progress()
+    assert progress["status"] == "completed"
+    assert progress["finalized"] is True
+    assert progress["coverage"] == 1.0
+    assert (progress["updated"], progress["failed"]) == (10_000, 0)
+    body, _ = client.update_by_query_calls[0]
+    assert body["script"]["params"]["remove"] == [OLD_FIELD]
+    assert body["script"]["params"]["dimensions"] == 2
+
+    # Progress is reported with the same shape as ingestion tasks
+    task = await task_service.get_task_status(USER_ID, progress["job_id"])
+    assert task["status"] == TaskStatus.COMPLETED.value
+    assert (task["total_files"], task["processed_files"], task["successful_files"]) == (10_000, 10_000, 10_000)
+
+
+@pytest.mark.asyncio
+async def test_blank_chunks_do_not_block_finalization(tmp_path):
+    client = FakeOpenSearch(100)
+    for i in range(10):
+        client.docs[f"chunk-{i:05d}"]["text"] = "" if i % 2 else "  \n "
+    embed, _ = make_embedder()
+    service = make_service(tmp_path, client, embed)
+
+    progress = await start(service, remove_old_fields=True)
+    assert progress["total"] == 90
+    await service._task
+
+    progress = service.progress()
+    assert progress["status"] == "completed"
+    assert progress["finalized"] is True
+    assert (progress["remaining"], progress["coverage"]) == (0, 1.0)
+    assert len(client.writes) == 90
+
+
+@pytest.mark.asyncio
+async def test_resumes_after_a_crash_without_writing_twice(tmp_path):
+    client = FakeOpenSearch(10_000)
+    embed, calls = make_embedder()
+    service = make_service(tmp_path, client, embed)
+
+    async def crashing_embed(model, texts):
+        if len(calls) == 84:  # Mid-page, about 5,250 chunks in
+            # The process dies: nothing after this point reaches the checkpoint file
+            service.store.save = lambda state: None
+            raise asyncio.CancelledError()
+        return await embed(model, texts)
+
+    service.embed = crashing_embed
+    await start(service)
+    with pytest.raises(asyncio.CancelledError):
+        await service._task
+    written_before_crash = len(client.writes)
+    assert 5_000 < written_before_crash < 10_000
+
+    restarted = make_service(tmp_path, client, embed)
+    assert restarted.progress()["status"] == "running"
+    assert await restarted.resume_interrupted() is True
+    await restarted._task
+
+    assert len(client.writes) == 10_000
+    assert set(client.writes.values()) == {1}
+    progress = restarted.progress()
+    assert progress["status"] == "completed"
+    assert progress["remaining"] == 0
+    assert progress["processed"] >= 10_000 - written_before_crash
+
+
+@pytest.mark.asyncio
+async def test_pause_and_resume(tmp_path, task_service):
+    client = FakeOpenSearch(3_000)
+    embed, calls = make_embedder()
+    reached = asyncio.Event()
+    gate = asyncio.Event()
+
+    async def gated_embed(model, texts):
+        if len(calls) == 20:
+            reached.set()
+            await gate.wait()
+        return await embed(model, texts)
+
+    service = make_service(tmp_path, client, gated_embed, task_service)
+    await start(service)
+    await reached.wait()
+
+    progress = await service.pause()
+    assert progress["status"] == "paused"
+    assert not service.is_running()
+    paused_task = await task_service.get_task_status(USER_ID, progress["job_id"])
+    assert paused_task["status"] == TaskStatus.PENDING.value
+    assert service.store.load()["status"] == "paused"
+    assert await service.resume_interrupted() is False
+
+    gate.set()
+    await service.resume()
+    await service._task
+
+    assert len(client.writes) == 3_000
+    assert set(client.writes.values()) == {1}
+    assert service.progress()["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_throughput_stays_within_budget(tmp_path):
+    client = FakeOpenSearch(2_000)
+    embed, _ = make_embedder()
+    clock = FakeClock()
+    service = make_service(
+        tmp_path, client, embed, docs_per_second=200, clock=clock, sleep=clock.sleep
+    )
+
+    await start(service)
+    await service._task
+
+    rate = 2_000 / clock.now
+    assert 180 <= rate <= 220
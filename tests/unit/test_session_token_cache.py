@@ -0,0 +1,65 @@
+"""
+Tests for the verified JWT cache in SessionManager
+Covers signature checks per token, expiry bounds, rejection and LRU limits
+"""
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+from session_manager import SessionManager, User, VerifiedTokenCache
+
+
+@pytest.fixture
+def session_manager(monkeypatch):
+    monkeypatch.setenv("JWT_SIGNING_KEY", "unit-test-signing-key-with-enough-length")
+    monkeypatch.delenv("OPENSEARCH_JWT_TOKEN", raising=False)
+    sm = SessionManager()
+    sm.users["alice"] = User(user_id="alice", email="alice@example.com", name="Alice")
+    return sm
+
+
+def test_signature_is_verified_once_per_token(session_manager):
+    token = session_manager.create_jwt_token(session_manager.users["alice"])
+
+    with patch("session_manager.jwt.decode", wraps=jwt.decode) as decode:
+        for _ in range(100):
+            assert session_manager.get_user_from_token(token).user_id == "alice"
+        assert session_manager.verify_token(token)["email"] == "alice@example.com"
+
+    assert decode.call_count == 1
+    assert session_manager.token_cache.stats()["hits"] == 100
+
+
+def test_cached_token_is_rejected_after_expiry(session_manager):
+    token = session_manager.create_jwt_token(session_manager.users["alice"])
+    payload = session_manager.verify_token(token)
+
+    with patch("session_manager.time.time", return_value=payload["exp"] + 1), \
+            patch("session_manager.jwt.decode", side_effect=jwt.ExpiredSignatureError):
+        assert session_manager.verify_token(token) is None
+
+    assert session_manager.token_cache.stats()["expired"] == 1
+
+
+def test_invalid_tokens_are_not_cached(session_manager):
+    token = session_manager.create_jwt_token(session_manager.users["alice"])
+    tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+
+    assert session_manager.verify_token(tampered) is None
+    assert session_manager.verify_token(tampered) is None
+    assert session_manager.token_cache.stats()["size"] == 0
+
+
+def test_cache_is_bounded_lru():
+    cache = VerifiedTokenCache(max_size=2)
+    for name in ("a", "b"):
+        cache.put(name, {"exp": 2**31})
+    cache.get("a")
+    cache.put("c", {"exp": 2**31})
+    cache.put("no-exp", {"sub": "x"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get("no-exp") is None
+    assert cache.stats()["evicted"] == 1
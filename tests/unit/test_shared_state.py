@@ -0,0 +1,239 @@
+"""
+Tests for multi-worker shared state
+Covers the SQLite key/value store, leader leases and cross-worker visibility of
+tasks, users and conversation threads
+"""
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from models.tasks import TaskStatus
+from services.conversation_cache import ConversationCache
+from services.conversation_store import ConversationStore
+from services.shared_state import LeaderElector, SharedStateStore
+from services.task_service import TaskService
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedStateStore(str(tmp_path / "shared_state.db"))
+
+
+class OneShotProcessor:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def process_item(self, upload_task, item, file_task):
+        await self.release.wait()
+        file_task.status = TaskStatus.COMPLETED
+        upload_task.successful_files += 1
+
+
+def _task_service(store):
+    return TaskService(document_service=Mock(), process_pool=Mock(), shared_state=store)
+
+
+def test_store_round_trip_and_purge(store):
+    store.put("tasks:alice", "t1", {"status": "running"})
+    store.put_many("tasks:bob", [("t2", {"status": "completed"}), ("t3", {"status": "failed"})])
+
+    assert store.get("tasks:alice", "t1") == {"status": "running"}
+    assert set(store.items("tasks:bob")) == {"t2", "t3"}
+
+    with patch("services.shared_state.time.time", return_value=10**10):
+        store.put("tasks:bob", "t3", {"status": "failed"})
+    assert store.purge("tasks:", older_than=10**10 - 1) == 2
+    assert store.items("tasks:bob") == {"t3": {"status": "failed"}}
+
+
+def test_get_many_reads_only_the_requested_keys(store):
+    store.put_many("tasks:alice", [(f"t{i}", {"n": i}) for i in range(1200)])
+
+    assert store.get_many("tasks:alice", ["t3", "missing", "t3"]) == {"t3": {"n": 3}}
+    wanted = [f"t{i}" for i in range(0, 1200, 2)]
+    assert store.get_many("tasks:alice", wanted) == {key: {"n": int(key[1:])} for key in wanted}
+
+
+def test_lease_is_exclusive_until_expiry(store):
+    with patch("services.shared_state.time.time", return_value=1000.0):
+        assert store.acquire_lease("leader", "a", ttl=30)
+        assert not store.acquire_lease("leader", "b", ttl=30)
+        assert store.acquire_lease("leader", "a", ttl=30)  # renewal
+    with patch("services.shared_state.time.time", return_value=1031.0):
+        assert store.acquire_lease("leader", "b", ttl=30)
+        assert store.lease_owner("leader") == "b"
+
+        store.release_lease("leader", "a")  # not the owner: no effect
+        assert store.lease_owner("leader") == "b"
+
+
+@pytest.mark.asyncio
+async def test_only_one_elector_runs_leader_jobs(store):
+    events = []
+
+    def make(owner, candidate=True):
+        async def elected():
+            events.append(("elected", owner))
+
+        async def demoted():
+            events.append(("demoted", owner))
+
+        return LeaderElector(
+            "backend-leader", store, on_elected=elected, on_demoted=demoted,
+            owner=owner, candidate=candidate,
+        )
+
+    first, second, api_only = make("w1"), make("w2"), make("api", candidate=False)
+    for elector in (first, second, api_only):
+        await elector.elect()
+
+    assert (first.is_leader, second.is_leader, api_only.is_leader) == (True, False, False)
+
+    # The leader stops; the next candidate takes over right away
+    await first.stop()
+    await second.elect()
+    assert second.is_leader
+    assert events == [("elected", "w1"), ("elected", "w2")]
+
+
+@pytest.mark.asyncio
+async def test_task_status_is_visible_from_other_workers(store):
+    owner, other = _task_service(store), _task_service(store)
+    processor = OneShotProcessor()
+
+    task_id = await owner.create_custom_task("alice", ["a.pdf"], processor)
+    await asyncio.sleep(0)
+    await owner.wait_published()
+
+    status = await other.get_task_status("alice", task_id)
+    assert status["task_id"] == task_id
+    assert status["total_files"] == 1
+    assert [t["task_id"] for t in await other.get_all_tasks("alice")] == [task_id]
+    assert await other.get_task_status("bob", task_id) is None
+
+    processor.release.set()
+    await asyncio.gather(*owner.background_tasks)
+    await owner.wait_published()
+
+    status = await other.get_task_status("alice", task_id)
+    assert status["status"] == "completed"
+    assert status["successful_files"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_summaries_are_compact_and_read_in_one_batch(store):
+    from models.tasks import FileTask, UploadTask
+
+    owner, other = _task_service(store), _task_service(store)
+    statuses = [TaskStatus.COMPLETED, TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.FAILED]
+    for n in range(3):
+        files = {
+            f"/f{n}-{i}": FileTask(file_path=f"/f{n}-{i}", status=statuses[i % 4]) for i in range(40)
+        }
+        owner.track_task("alice", UploadTask(task_id=f"t{n}", total_files=40, file_tasks=files))
+    await owner.wait_published()
+
+    with patch.object(store, "items", side_effect=AssertionError("namespace scan")), \
+            patch.object(store, "get_many", wraps=store.get_many) as get_many:
+        found = await other.get_task_statuses("alice", ["t0", "t2", "missing"])
+
+    assert set(found) == {"t0", "t2"}
+    assert get_many.call_count == 2  # the user's namespace, then the anonymous one
+    summary = found["t0"]
+    assert (summary["pending_files"], summary["running_files"]) == (10, 10)
+    assert {f["status"] for f in summary["files"].values()} == {"running", "failed"}
+    assert len(summary["files"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_batch_status_endpoint_reads_shared_store_once_per_namespace(store):
+    from types import SimpleNamespace
+
+    from api.v1.documents import task_statuses_endpoint
+    from models.tasks import UploadTask
+
+    owner, other = _task_service(store), _task_service(store)
+    for n in range(300):
+        owner.track_task("alice", UploadTask(task_id=f"t{n}", total_files=1))
+    await owner.wait_published()
+
+    class FakeRequest:
+        state = SimpleNamespace(user=SimpleNamespace(user_id="alice"))
+
+        async def json(self):
+            return {"task_ids": [f"t{n}" for n in range(300)] + ["missing"]}
+
+    with patch.object(store, "get_many", wraps=store.get_many) as get_many:
+        response = await task_statuses_endpoint(FakeRequest(), other, session_manager=None)
+
+    body = json.loads(response.body)
+    assert len(body["tasks"]) == 300
+    assert body["missing"] == ["missing"]
+    assert get_many.call_count == 2
+
+
+def test_users_and_threads_are_shared_between_workers(store, tmp_path):
+    from session_manager import SessionManager, User
+
+    with patch.dict("os.environ", {"JWT_SIGNING_KEY": "unit-test-signing-key-with-enough-length"}):
+        login_worker, other_worker = SessionManager(), SessionManager()
+    login_worker.shared_state = other_worker.shared_state = store
+
+    user = User(user_id="alice", email="alice@example.com", name="Alice")
+    login_worker.users["alice"] = user
+    login_worker._publish_user(user)
+
+    shared_user = other_worker.get_user("alice")
+    assert shared_user.email == "alice@example.com"
+    assert shared_user.created_at == user.created_at
+
+    conversations = ConversationStore(str(tmp_path / "conversations.db"))
+    writer = ConversationCache(store=conversations, write_through=True)
+    reader = ConversationCache(store=conversations)
+    asyncio.run(writer.put("alice", "r1", {"messages": [{"role": "user", "content": "hi"}]}))
+
+    assert asyncio.run(reader.get("alice", "r1"))["messages"][0]["content"] == "hi"
+
+
+@pytest.mark.asyncio
+async def test_resident_thread_is_refreshed_when_another_worker_stored_a_newer_copy(tmp_path):
+    conversations = ConversationStore(str(tmp_path / "conversations.db"))
+    worker_a = ConversationCache(store=conversations, write_through=True)
+    worker_b = ConversationCache(store=conversations, write_through=True)
+
+    await worker_a.put("alice", "r1", {"messages": [{"role": "user", "content": "turn 1"}]})
+    state = await worker_b.get("alice", "r1")
+    state["messages"].append({"role": "user", "content": "turn 2"})
+    await worker_b.put("alice", "r1", state)
+
+    refreshed = await worker_a.get("alice", "r1")
+    assert [m["content"] for m in refreshed["messages"]] == ["turn 1", "turn 2"]
+    assert worker_a.stale == 1
+    # Unchanged in the store: served from memory
+    assert await worker_a.get("alice", "r1") is refreshed
+    assert worker_a.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_ownership_reload_runs_in_the_background(tmp_path):
+    from services.session_ownership_service import SessionOwnershipService
+
+    db_path = str(tmp_path / "conversations.db")
+    worker_a = SessionOwnershipService(storage_file=db_path, legacy_file=None, reload_interval=0)
+    worker_b = SessionOwnershipService(storage_file=db_path, legacy_file=None, reload_interval=0)
+    assert worker_b.get_session_owner("s1") is None  # loads the (empty) view
+    worker_a.claim_session("alice", "s1")
+    await asyncio.sleep(0.1)
+
+    # The stale view is served while the reload runs off the event loop
+    assert worker_b.get_session_owner("s1") is None
+    assert worker_b._reload_task is not None
+    # A claim made during the reload survives it
+    worker_b.claim_session("bob", "s2")
+    await asyncio.sleep(0.1)
+
+    assert worker_b._reload_task is None
+    assert worker_b._loaded_data["s1"]["user_id"] == "alice"
+    assert worker_b._loaded_data["s2"]["user_id"] == "bob"
@@ -0,0 +1,128 @@
+"""
+Tests for typed chat stream events
+Covers single serialization, SSE transformation without re-parsing and stream metrics
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+import agent
+from api.v1.chat import _transform_stream_to_sse
+from utils.stream_events import StreamEvent, StreamMetrics, delta_text, event_data
+
+
+class FakeChunk:
+    def __init__(self, data):
+        self._data = data
+
+    def model_dump(self):
+        return dict(self._data)
+
+
+class FakeResponses:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def create(self, **kwargs):
+        async def stream():
+            for chunk in self._chunks:
+                yield FakeChunk(chunk)
+        return stream()
+
+
+class FakeClient:
+    default_headers = {}
+
+    def __init__(self, chunks):
+        self.responses = FakeResponses(chunks)
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+def test_stream_event_is_the_json_line_and_keeps_payload():
+    event = StreamEvent({"type": "response.output_text.delta", "delta": "hi"})
+
+    assert bytes(event) == b'{"type": "response.output_text.delta", "delta": "hi"}\n'
+    assert event.decode("utf-8").strip() and json.loads(event) == event.data
+
+
+def test_event_data_does_not_reparse_stream_events():
+    event = StreamEvent({"delta": "hi"})
+
+    with patch("utils.stream_events.json.loads") as loads:
+        assert event_data(event) == {"delta": "hi"}
+    loads.assert_not_called()
+
+    assert event_data(b'{"delta": "raw"}\n') == {"delta": "raw"}
+    assert event_data(b"plain text") is None
+    assert event_data(b"  ") is None
+
+
+def test_delta_text_formats():
+    assert delta_text({"delta": {"content": "a"}}) == "a"
+    assert delta_text({"delta": {"text": "b"}}) == "b"
+    assert delta_text({"delta": "c"}) == "c"
+    assert delta_text({"type": "done"}) == ""
+
+
+def test_metrics_summary_records_ttft_and_throughput():
+    with patch("utils.stream_events.time.perf_counter", side_effect=[0.2, 1.2]):
+        metrics = StreamMetrics("test", started_at=0.0)
+        metrics.observe("")
+        metrics.observe("a")
+        for _ in range(9):
+            metrics.observe("b")
+        summary = metrics.finish()
+
+    assert summary["chunks"] == 11
+    assert summary["delta_events"] == 10
+    assert summary["ttft_ms"] == 200.0
+    assert summary["tokens_per_second"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_sse_transform_handles_events_and_raw_chunks():
+    async def stream():
+        yield StreamEvent({"id": "resp-1", "delta": {"content": "Hello"}})
+        yield StreamEvent({"output_text": " world"})
+        yield b'{"delta": "!"}'
+        yield b"raw tail"
+
+    container = {}
+    events = await _collect(_transform_stream_to_sse(stream(), container))
+    payloads = [json.loads(e[len("data: "):]) for e in events]
+
+    assert [p.get("delta") for p in payloads[:-1]] == ["Hello", " world", "!", "raw tail"]
+    assert payloads[-1] == {"type": "done", "chat_id": "resp-1"}
+    assert container["chat_id"] == "resp-1"
+
+
+@pytest.mark.asyncio
+async def test_response_stream_yields_serialized_events_without_per_chunk_info_logs():
+    chunks = [{"type": "response.output_text.delta", "delta": f"t{i}"} for i in range(50)]
+    client = FakeClient(chunks)
+
+    with patch.object(agent, "STREAM_DEBUG", False), patch.object(agent.logger, "info") as info:
+        events = await _collect(agent.async_response_stream(client, "q", "model"))
+
+    assert all(isinstance(e, StreamEvent) for e in events)
+    assert [e.data["delta"] for e in events] == [c["delta"] for c in chunks]
+    # Prompt, per-stream summary and final response only; nothing per chunk
+    assert info.call_count <= 3
+
+
+@pytest.mark.asyncio
+async def test_response_stream_records_metrics_when_closed_early():
+    chunks = [{"type": "response.output_text.delta", "delta": f"t{i}"} for i in range(10)]
+    client = FakeClient(chunks)
+
+    with patch.object(agent.StreamMetrics, "finish", autospec=True) as finish:
+        stream = agent.async_response_stream(client, "q", "model")
+        await stream.__anext__()
+        await stream.aclose()  # client disconnected
+
+    finish.assert_called_once()
+    assert finish.call_args.kwargs == {"completed": False}
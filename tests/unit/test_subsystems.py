@@ -0,0 +1,127 @@
+"""
+Tests for lazily loaded subsystems and the startup import profiler
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from utils.process_pool import LazyProcessPool
+from utils.startup_profile import ImportProfiler
+from utils.subsystems import SubsystemRegistry
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+
+
+def test_subsystem_loads_once_on_first_use():
+    calls = []
+    registry = SubsystemRegistry()
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register("heavy", loader)
+    assert registry.readiness()["heavy"]["status"] == "not_loaded"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("heavy"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+    status = registry.readiness()["heavy"]
+    assert status["status"] == "ready" and status["load_seconds"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_reported_and_retried():
+    registry = SubsystemRegistry()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ImportError("docling not installed")
+        return "converter"
+
+    registry.register("docling", flaky)
+    await registry.preload(["docling", "unknown"])
+
+    status = registry.readiness()["docling"]
+    assert status["status"] == "failed"
+    assert status["error"] == "docling not installed"
+    assert registry.get("docling") == "converter"
+    assert registry.readiness()["docling"]["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_aget_waits_for_a_running_preload_off_the_event_loop():
+    registry = SubsystemRegistry()
+    registry.register("docling", lambda: time.sleep(0.2) or "converter")
+
+    preload = asyncio.create_task(registry.preload(["docling"]))
+    await asyncio.sleep(0.05)  # the preload now holds the subsystem lock
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while not preload.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    value, _ = await asyncio.gather(registry.aget("docling"), tick())
+
+    assert value == "converter"
+    assert ticks >= 5  # the loop kept running while the load finished
+    await preload
+
+
+def test_process_pool_is_not_created_until_used():
+    pool = LazyProcessPool()
+    pool.shutdown()  # nothing to shut down yet
+
+    from utils.subsystems import subsystems
+    assert not subsystems.is_loaded("process_pool")
+
+
+def test_import_profiler_times_modules(tmp_path, monkeypatch):
+    (tmp_path / "profiled_leaf.py").write_text("import time\ntime.sleep(0.02)\n")
+    (tmp_path / "profiled_root.py").write_text("import profiled_leaf\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = ImportProfiler()
+    sys.meta_path.insert(0, profiler)
+    try:
+        import profiled_root  # noqa: F401
+    finally:
+        sys.meta_path.remove(profiler)
+        sys.modules.pop("profiled_root", None)
+        sys.modules.pop("profiled_leaf", None)
+
+    root_total, root_self = profiler.timings["profiled_root"]
+    leaf_total, _ = profiler.timings["profiled_leaf"]
+    assert leaf_total >= 0.02
+    assert root_total >= leaf_total and root_self < leaf_total
+    assert profiler.report(top=1)["slowest"][0]["module"] == "profiled_root"
+
+
+def test_connector_sdks_are_not_imported_eagerly():
+    code = (
+        "import sys, connectors.connection_manager, connectors.service; "
+        "print(any(m.split('.')[0] in ('googleapiclient', 'msal', 'boto3', 'torch', 'docling') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": os.path.abspath(SRC_DIR)},
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False", result.stderr[-2000:]
@@ -0,0 +1,242 @@
+"""
+Tests for compact vector storage profiles
+"""
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from opensearchpy.exceptions import ConflictError, NotFoundError
+
+import utils.embedding_fields as embedding_fields
+from utils.embedding_fields import (
+    EmbeddingFieldRegistry,
+    ensure_embedding_field_exists,
+    get_embedding_field_name,
+)
+from utils.vector_profiles import (
+    META_KEY,
+    META_LOCK_INDEX_SUFFIX,
+    MetaLockTimeoutError,
+    VectorCodec,
+    VectorCodecRegistry,
+    VectorProfile,
+    VectorProfileMismatchError,
+    knn_vector_mapping,
+    meta_lock,
+)
+
+INDEX = "documents"
+MODEL = "text-embedding-3-small"  # 1536 dimensions
+
+
+def synthetic_embeddings(count, dimensions=256, seed=7):
+    """Unit vectors whose variance decays along the dimensions, like Matryoshka embeddings"""
+    rng = np.random.default_rng(seed)
+    scale = 1.0 / np.sqrt(1.0 + np.arange(dimensions) / 16.0)
+    vectors = rng.standard_normal((count, dimensions)).astype(np.float32) * scale
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(vectors, queries, profile, k=10):
+    """recall@k of exact search over encoded vectors against exact float32 search"""
+    codec = VectorCodec(profile)
+    codec.calibrate(vectors)
+    stored = np.asarray(codec.encode(vectors), dtype=np.float32)
+    encoded_queries = np.asarray(codec.encode(queries), dtype=np.float32)
+
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+    found = np.argsort(-(encoded_queries @ stored.T), axis=1)[:, :k]
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return hits / truth.size
+
+
+class FakeIndices:
+    def __init__(self, properties=None, meta=None):
+        self.properties = dict(properties or {})
+        self.meta = dict(meta or {})
+        self.put_bodies = []
+
+    async def get_mapping(self, index):
+        await asyncio.sleep(0)
+        return {index: {"mappings": {"_meta": dict(self.meta), "properties": dict(self.properties)}}}
+
+    async def put_mapping(self, index, body):
+        self.put_bodies.append(body)
+        self.properties.update(body.get("properties", {}))
+        if "_meta" in body:
+            self.meta = body["_meta"]
+
+
+class FakeOpenSearch:
+    def __init__(self, **kwargs):
+        self.indices = FakeIndices(**kwargs)
+        self.documents = {}
+
+    async def index(self, index, id, body, op_type=None):
+        # Lock documents of utils.vector_profiles.meta_lock
+        if op_type == "create" and (index, id) in self.documents:
+            raise ConflictError(409, "version_conflict_engine_exception", {})
+        self.documents[(index, id)] = body
+        return {"_id": id, "_seq_no": len(self.documents), "_primary_term": 1}
+
+    async def get(self, index, id):
+        if (index, id) not in self.documents:
+            raise NotFoundError(404, "not_found", {})
+        return {"_id": id, "_source": self.documents[(index, id)], "_seq_no": 0, "_primary_term": 1}
+
+    async def delete(self, index, id, **kwargs):
+        self.documents.pop((index, id), None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(embedding_fields, "embedding_field_registry", EmbeddingFieldRegistry())
+
+
+def test_fields_and_mappings_per_profile():
+    assert get_embedding_field_name(MODEL, VectorProfile()) == get_embedding_field_name(MODEL)
+    assert get_embedding_field_name(MODEL, VectorProfile("int8", 512)).endswith("_int8_d512")
+    assert get_embedding_field_name(MODEL, VectorProfile("fp16")).endswith("_fp16")
+
+    assert knn_vector_mapping(512, VectorProfile())["method"]["engine"] == "jvector"
+    fp16 = knn_vector_mapping(512, VectorProfile("fp16"))
+    assert fp16["method"]["engine"] == "faiss"
+    assert fp16["method"]["parameters"]["encoder"]["parameters"]["type"] == "fp16"
+    int8 = knn_vector_mapping(512, VectorProfile("int8", 512))
+    assert (int8["data_type"], int8["method"]["engine"], int8["dimension"]) == ("byte", "lucene", 512)
+
+    assert VectorProfile("int8", 512).bytes_per_vector(1536) == 512
+    assert VectorProfile("fp16").bytes_per_vector(1536) == 1536 * 2
+    with pytest.raises(ValueError):
+        VectorProfile("int4")
+
+
+def test_encodings_round_trip_within_tolerance():
+    vectors = synthetic_embeddings(200)
+
+    fp16 = VectorCodec(VectorProfile("fp16"))
+    assert np.abs(np.asarray(fp16.encode(vectors)) - vectors).max() < 1e-3
+
+    int8 = VectorCodec(VectorProfile("int8"))
+    int8.calibrate(vectors)
+    encoded = np.asarray(int8.encode(vectors))
+    assert encoded.min() >= -128 and encoded.max() <= 127
+    assert encoded.dtype.kind == "i"
+    step = (int8.max_value - int8.min_value) / 255.0
+    assert np.abs(np.asarray(int8.decode(encoded)) - vectors).max() <= step / 2 + 1e-6
+
+    with pytest.raises(RuntimeError, match="calibration"):
+        VectorCodec(VectorProfile("int8")).encode(vectors)
+
+
+def test_truncation_renormalizes_the_prefix():
+    vectors = synthetic_embeddings(10)
+    encoded = np.asarray(VectorCodec(VectorProfile("float32", 64)).encode(vectors))
+
+    assert encoded.shape == (10, 64)
+    np.testing.assert_allclose(np.linalg.norm(encoded, axis=1), 1.0, rtol=1e-5)
+    prefix = vectors[:, :64] / np.linalg.norm(vectors[:, :64], axis=1, keepdims=True)
+    np.testing.assert_allclose(encoded, prefix, rtol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_profile_is_recorded_and_mismatches_are_rejected():
+    client = FakeOpenSearch(meta={"owner": "openrag"})
+    profile = VectorProfile("int8", 512)
+
+    field = await ensure_embedding_field_exists(client, MODEL, INDEX, profile=profile)
+
+    assert client.indices.properties[field]["dimension"] == 512
+    assert client.indices.meta["owner"] == "openrag"  # other _meta keys survive
+    recorded = client.indices.meta[META_KEY][field]
+    assert recorded == {"model": MODEL, "encoding": "int8", "dimensions": 512, "truncated": True}
+
+    # Another process configured with a different profile for the same field name
+    stale = FakeOpenSearch(
+        properties={field: {"type": "knn_vector", "dimension": 512}},
+        meta={META_KEY: {field: {**recorded, "encoding": "fp16"}}},
+    )
+    with pytest.raises(VectorProfileMismatchError, match="fp16"):
+        await ensure_embedding_field_exists(stale, MODEL, "other-index", profile=profile)
+
+
+@pytest.mark.asyncio
+async def test_int8_calibration_is_recorded_once_and_reused():
+    registry = VectorCodecRegistry()
+    profile = VectorProfile("int8")
+    field = get_embedding_field_name(MODEL, profile)
+    client = FakeOpenSearch(
+        properties={field: {"type": "knn_vector", "dimension": 256}},
+        meta={META_KEY: {field: profile.to_meta(MODEL, 256)}},
+    )
+
+    writer = await registry.get(client, INDEX, field, profile, sample=synthetic_embeddings(50))
+    calibration = client.indices.meta[META_KEY][field]["calibration"]
+    assert calibration == writer.calibration_meta()
+
+    # A second process (and its queries) adopts the recorded range instead of recalibrating
+    other = VectorCodecRegistry()
+    reader = await other.get(client, INDEX, field, profile, sample=synthetic_embeddings(50, seed=3))
+    assert reader.calibration_meta() == calibration
+    assert len(client.indices.put_bodies) == 1
+
+    fields = await other.fields(client, INDEX)
+    assert [(f.name, f.codec.profile) for f in fields] == [(field, profile)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_encode_with_one_recorded_range():
+    profile = VectorProfile("int8")
+    field = get_embedding_field_name(MODEL, profile)
+    other_field = get_embedding_field_name(MODEL, VectorProfile("fp16"))
+    client = FakeOpenSearch(
+        properties={field: {"type": "knn_vector", "dimension": 256}},
+        meta={META_KEY: {field: profile.to_meta(MODEL, 256)}},
+    )
+
+    # Two processes calibrate at once while a third records another field's profile
+    codecs = await asyncio.gather(
+        VectorCodecRegistry().get(client, INDEX, field, profile, sample=synthetic_embeddings(50, seed=1)),
+        VectorCodecRegistry().get(client, INDEX, field, profile, sample=synthetic_embeddings(50, seed=2) * 3),
+        ensure_embedding_field_exists(client, MODEL, INDEX, profile=VectorProfile("fp16")),
+    )
+
+    assert codecs[0].calibration_meta() == codecs[1].calibration_meta()
+    recorded = client.indices.meta[META_KEY]
+    assert recorded[field]["calibration"] == codecs[0].calibration_meta()
+    assert recorded[other_field]["encoding"] == "fp16"
+    assert client.documents == {}
+
+
+@pytest.mark.asyncio
+async def test_meta_lock_of_a_dead_process_expires():
+    client = FakeOpenSearch()
+    await client.index(index=INDEX + META_LOCK_INDEX_SUFFIX, id=INDEX, body={"owner": "dead", "expires_at": 0})
+
+    async with meta_lock(client, INDEX, wait_seconds=1):
+        assert client.documents[(INDEX + META_LOCK_INDEX_SUFFIX, INDEX)]["owner"] != "dead"
+
+    await client.index(
+        index=INDEX + META_LOCK_INDEX_SUFFIX, id=INDEX, body={"owner": "alive", "expires_at": time.time() + 60}
+    )
+    with pytest.raises(MetaLockTimeoutError):
+        async with meta_lock(client, INDEX, wait_seconds=0.2):
+            pass
+
+
+@pytest.mark.parametrize(
+    "profile, minimum_recall",
+    [
+        (VectorProfile("fp16"), 0.99),
+        (VectorProfile("int8"), 0.9),
+        # Truncation loss depends on how much variance the dropped half carries
+        (VectorProfile("int8", 128), 0.6),
+    ],
+)
+def test_recall_against_brute_force(profile, minimum_recall):
+    # scripts/benchmark_vector_profiles.py runs the same comparison at full scale
+    vectors = synthetic_embeddings(5_000)
+    queries = synthetic_embeddings(50, seed=11)
+
+    assert recall_at_k(vectors, queries, profile) >= minimum_recall
@@ -0,0 +1,191 @@
+"""
+Tests for coalescing and de-duplication of connector webhook notifications
+"""
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from connectors.base import CHANGE_DELETE, CHANGE_FOLDER, CHANGE_UPDATE, WebhookChange
+from connectors.webhook_intake import WebhookBufferStore, WebhookIntake
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingDispatcher:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    async def __call__(self, batch):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("task service unavailable")
+        self.batches.append(batch)
+        return f"task-{len(self.batches)}"
+
+
+def make_intake(clock, dispatcher, **kwargs):
+    return WebhookIntake(dispatcher, clock=clock, quiet_seconds=10, max_delay_seconds=120, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_notifications_is_dispatched_as_one_batch():
+    clock, dispatcher = FakeClock(), RecordingDispatcher()
+    intake = make_intake(clock, dispatcher)
+    rng = random.Random(0)
+    files = [f"file-{i}" for i in range(50)]
+    order = files + [rng.choice(files) for _ in range(950)]
+    rng.shuffle(order)
+
+    for file_id in order:
+        counts = intake.enqueue("conn-1", [WebhookChange(file_id)])
+        assert counts["received"] == 1
+        clock.now += 0.005
+        # Still receiving notifications: nothing is ready
+        assert await intake.flush() == 0
+
+    assert intake.pending == 50
+    clock.now += 10
+    assert await intake.flush() == 50
+
+    assert len(dispatcher.batches) == 1
+    batch = dispatcher.batches[0]
+    assert sorted(batch.updates) == sorted(files)
+    assert batch.deletes == []
+    assert batch.notifications == 1_000
+    assert intake.stats == {"received": 1_000, "coalesced": 950, "dispatched": 50, "batches": 1}
+    assert intake.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_supersedes_pending_updates_and_connections_batch_separately():
+    clock, dispatcher = FakeClock(), RecordingDispatcher()
+    intake = make_intake(clock, dispatcher)
+
+    for _ in range(3):
+        intake.enqueue("conn-1", [WebhookChange("a"), WebhookChange("b")])
+    intake.enqueue("conn-1", [WebhookChange("a", CHANGE_DELETE)])
+    intake.enqueue("conn-2", [WebhookChange("a")])
+
+    clock.now += 10
+    assert await intake.flush() == 3
+    batches = {batch.connection_id: batch for batch in dispatcher.batches}
+    assert batches["conn-1"].updates == ["b"]
+    assert batches["conn-1"].deletes == ["a"]
+    assert batches["conn-2"].updates == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_folders_are_expanded_once_and_deduplicated_against_pending_files():
+    clock, dispatcher = FakeClock(), RecordingDispatcher()
+    expansions = []
+
+    async def expand(connection_id, folder_ids):
+        expansions.append(sorted(folder_ids))
+        return ["child-1", "child-2", "child-3", "child-2"]
+
+    intake = make_intake(clock, dispatcher, expand=expand)
+    for _ in range(5):
+        intake.enqueue("conn-1", [WebhookChange("folder", CHANGE_FOLDER)])
+    intake.enqueue("conn-1", [WebhookChange("child-1", CHANGE_DELETE), WebhookChange("other")])
+
+    clock.now += 10
+    await intake.flush()
+
+    assert expansions == [["folder"]]
+    batch = dispatcher.batches[0]
+    assert sorted(batch.updates) == ["child-2", "child-3", "other"]
+    assert batch.deletes == ["child-1"]
+
+
+@pytest.mark.asyncio
+async def test_pending_buffer_is_recovered_after_restart(tmp_path):
+    store = WebhookBufferStore(str(tmp_path / "connector_webhooks.json"))
+    clock = FakeClock()
+    before = make_intake(clock, RecordingDispatcher(), store=store, process_id="host:42:before")
+    before.enqueue("conn-1", [WebhookChange(f"file-{i}") for i in range(20)])
+    before.enqueue("conn-1", [WebhookChange("file-3", CHANGE_DELETE)])
+    # A live worker on another host keeps its own items
+    WebhookBufferStore(store.path).save(
+        "elsewhere:7:other", [before.pending_for("conn-1")[0]]
+    )
+    await before.stop()  # Simulated crash: nothing was dispatched
+
+    dispatcher = RecordingDispatcher()
+    after = make_intake(clock, dispatcher, store=store, process_id="host:42:after")
+    assert await after.start() == 20
+
+    clock.now += 10
+    assert await after.flush() == 20
+    batch = dispatcher.batches[0]
+    assert len(batch.updates) == 19
+    assert batch.deletes == ["file-3"]
+    # Only the other host's items remain in the buffer file
+    assert [item.file_id for item in store.claim("elsewhere:7:other")] == ["file-0"]
+
+
+@pytest.mark.asyncio
+async def test_failed_dispatch_keeps_items_and_retries_after_quiet_period():
+    clock, dispatcher = FakeClock(), RecordingDispatcher(fail_times=1)
+    intake = make_intake(clock, dispatcher)
+    intake.enqueue("conn-1", [WebhookChange("a"), WebhookChange("b")])
+
+    clock.now += 10
+    assert await intake.flush() == 0
+    assert intake.pending == 2
+    intake.enqueue("conn-1", [WebhookChange("b", CHANGE_DELETE)])
+
+    clock.now += 5
+    assert await intake.flush() == 0
+    clock.now += 5
+    assert await intake.flush() == 2
+    assert dispatcher.batches[0].updates == ["a"]
+    assert dispatcher.batches[0].deletes == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_flush_timer_dispatches_without_explicit_flush():
+    dispatcher = RecordingDispatcher()
+    intake = WebhookIntake(dispatcher, quiet_seconds=0.01, max_delay_seconds=1)
+
+    intake.enqueue("conn-1", [WebhookChange("a", CHANGE_UPDATE)])
+    for _ in range(100):
+        if dispatcher.batches:
+            break
+        await asyncio.sleep(0.01)
+
+    assert [batch.updates for batch in dispatcher.batches] == [["a"]]
+    await intake.stop()
+
+
+@pytest.mark.asyncio
+async def test_buffer_writes_run_off_the_loop_and_coalesce(tmp_path):
+    store = WebhookBufferStore(str(tmp_path / "connector_webhooks.json"))
+    saves = []
+    original = store.save
+
+    def slow_save(process_id, items):
+        saves.append(threading.current_thread() is threading.main_thread())
+        time.sleep(0.02)
+        original(process_id, items)
+
+    store.save = slow_save
+    intake = make_intake(FakeClock(), RecordingDispatcher(), store=store, process_id="host:42:burst")
+    for i in range(50):
+        intake.enqueue("conn-1", [WebhookChange(f"file-{i}")])
+        await asyncio.sleep(0.001)
+    await intake.stop()
+
+    # Changes made while a write runs share the next write
+    assert 1 < len(saves) < 25
+    assert not any(saves)  # never written on the event loop thread
+    assert len(WebhookBufferStore(store.path).claim("host:42:burst")) == 50
@@ -2,9 +2,11 @@
 Watson News テスト専用の conftest。
 
 1. テスト環境にインストールできないパッケージ（langdetect 等）をスタブに差し替える。
-2. グローバルの `onboard_system` autouse fixture（Langflow 接続が必要）を
+2. HTML クリーニング用プロセスプールを無効化する（WATSON_NEWS_CLEAN_WORKERS=0）。
+3. グローバルの `onboard_system` autouse fixture（Langflow 接続が必要）を
    no-op でオーバーライドし、Watson News 単体テストが外部サービスなしで動くようにする。
 """
+import os
 import sys
 import types
 
@@ -31,6 +33,11 @@ except (ImportError, Exception):
     ld.detect = lambda text: "en"
 
 
+# HTML クリーニング用プロセスプールを無効化し、テスト中はインラインで実行する
+# （モックした関数をワーカープロセスへ pickle できないため）
+os.environ.setdefault("WATSON_NEWS_CLEAN_WORKERS", "0")
+
+
 # ---------------------------------------------------------------------------
 # Fixture overrides
 # ---------------------------------------------------------------------------
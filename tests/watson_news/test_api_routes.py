@@ -179,6 +179,10 @@ class TestSearchArticles:
         r = _CLIENT.post("/search", content=b"not-json", headers={"content-type": "application/json"})
         assert r.status_code == 400
 
+    def test_returns_400_on_unknown_search_mode(self):
+        r = _CLIENT.post("/search", json={"query": "test", "mode": "fuzzy"})
+        assert r.status_code == 400
+
     def test_returns_500_on_service_error(self):
         with patch("api.watson_news.routes.search_watson_news", new=AsyncMock(side_effect=Exception("OS error"))):
             r = _CLIENT.post("/search", json={"query": "test"})
@@ -6,6 +6,8 @@ IBM公式サイトクローラーが以下の倫理要件を満たすことを
 3. robots.txt の取得が失敗しても fail-open（許可）で動作する
 4. respect_robots_txt=False のターゲットは robots.txt をチェックしない
 5. リクエストインターバルを待機する（asyncio.sleep が呼ばれること）
+6. robots.txt の Crawl-delay がリクエストインターバルより長ければそちらを守る
+7. 異なるホストのターゲットは互いのインターバルを待たずに並列でクロールされる
 """
 
 from __future__ import annotations
@@ -18,7 +20,9 @@ import pytest
 import respx
 
 from connectors.watson_news.ibm_crawl_connector import (
+    CrawlEngine,
     CrawlTarget,
+    HostPolitenessScheduler,
     RobotsTxtCache,
     crawl_target,
 )
@@ -150,6 +154,27 @@ class TestRobotsTxtCache:
         # robots.txt へのリクエストは 1 回のみであるべき
         assert route.call_count == 1
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_concurrent_checks_share_one_robots_txt_fetch(self):
+        """同じホストへの並行チェックは robots.txt の取得を 1 回だけ行う。"""
+
+        async def slow_robots(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text="User-agent: *\nDisallow: /blocked/")
+
+        route = respx.get("https://www.ibm.com/robots.txt").mock(side_effect=slow_robots)
+
+        cache = RobotsTxtCache()
+        results = await asyncio.gather(
+            *(cache.can_fetch(f"https://www.ibm.com/news/{i}", "bot") for i in range(10)),
+            cache.can_fetch("https://www.ibm.com/blocked/x", "bot"),
+        )
+
+        assert results == [True] * 10 + [False]
+        assert route.call_count == 1
+        assert cache._inflight == {}
+
 
 # ---------------------------------------------------------------------------
 # crawl_target: robots.txt 遵守テスト
@@ -266,10 +291,11 @@ class TestCrawlTargetRobotsCompliance:
         ):
             await crawl_target(target, known_urls=set())
 
-        # 記事が 2 件 → sleep が 2 回、各 5 秒
+        # 記事が 2 件 → sleep が 2 回、各 約5 秒
+        # （待機時間は同一ホストへの前回リクエスト完了時刻から計算される）
         assert len(sleep_calls) == 2
         for s in sleep_calls:
-            assert s == 5
+            assert s == pytest.approx(5, abs=0.5)
 
     @pytest.mark.asyncio
     @respx.mock
@@ -295,3 +321,112 @@ class TestCrawlTargetRobotsCompliance:
 
         assert len(docs) == 1
         assert docs[0].source_url == "https://www.ibm.com/news/article-2"
+
+
+# ---------------------------------------------------------------------------
+# ホスト単位のポライトネス制御
+# ---------------------------------------------------------------------------
+
+class TestHostPoliteness:
+    @pytest.mark.asyncio
+    @respx.mock
+    @_FRESH_CACHE_PATCH
+    async def test_robots_crawl_delay_overrides_shorter_interval(self, _mock_cache):
+        """robots.txt の Crawl-delay がインターバルより長い場合は Crawl-delay を守る。"""
+        robots_txt = "User-agent: *\nCrawl-delay: 12\nAllow: /"
+        target = _target(respect=True, interval=1)
+
+        respx.get("https://www.ibm.com/announcements").mock(
+            return_value=httpx.Response(200, text=_INDEX_HTML)
+        )
+        respx.get("https://www.ibm.com/robots.txt").mock(
+            return_value=httpx.Response(200, text=robots_txt)
+        )
+        respx.get(url__regex=r"https://www\.ibm\.com/news/article-\d").mock(
+            return_value=httpx.Response(200, text=_ARTICLE_HTML)
+        )
+
+        sleep_calls: list[float] = []
+
+        async def mock_sleep(seconds: float) -> None:
+            sleep_calls.append(seconds)
+
+        with patch(
+            "connectors.watson_news.ibm_crawl_connector.asyncio.sleep",
+            side_effect=mock_sleep,
+        ):
+            docs = await crawl_target(target, known_urls=set())
+
+        assert len(docs) == 2
+        assert len(sleep_calls) == 2
+        for s in sleep_calls:
+            assert s == pytest.approx(12, abs=0.5)
+
+    @pytest.mark.asyncio
+    async def test_same_host_requests_are_spaced(self):
+        """同一ホストへの連続リクエストは指定間隔だけ空けて実行される。"""
+        scheduler = HostPolitenessScheduler()
+        loop = asyncio.get_running_loop()
+        started: list[float] = []
+
+        async def request() -> None:
+            async with scheduler.slot("https://www.ibm.com/a", delay=0.05):
+                started.append(loop.time())
+
+        await asyncio.gather(request(), request(), request())
+
+        gaps = [b - a for a, b in zip(started, started[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+
+    @pytest.mark.asyncio
+    async def test_different_hosts_do_not_wait_for_each_other(self):
+        """別ホストのスロットは並列に取得できる。"""
+        scheduler = HostPolitenessScheduler()
+        loop = asyncio.get_running_loop()
+
+        async def two_requests(url: str) -> None:
+            for _ in range(2):
+                async with scheduler.slot(url, delay=0.2):
+                    pass
+
+        start = loop.time()
+        await asyncio.gather(
+            two_requests("https://www.ibm.com/a"),
+            two_requests("https://research.ibm.com/b"),
+            two_requests("https://newsroom.ibm.com/c"),
+        )
+        elapsed = loop.time() - start
+
+        # 直列なら 3 × 0.2 秒以上かかる。並列ならホスト 1 つ分（約 0.2 秒）で終わる
+        assert elapsed < 0.45
+
+    @pytest.mark.asyncio
+    @respx.mock
+    @_FRESH_CACHE_PATCH
+    async def test_engine_does_not_fetch_same_article_twice(self, _mock_cache):
+        """同一エンジン内で複数ターゲットが同じ記事を指しても 1 回だけ取得する。"""
+        respx.get("https://www.ibm.com/robots.txt").mock(
+            return_value=httpx.Response(200, text="User-agent: *\nAllow: /")
+        )
+        respx.get("https://www.ibm.com/announcements").mock(
+            return_value=httpx.Response(200, text=_INDEX_HTML)
+        )
+        respx.get("https://www.ibm.com/announcements-ja").mock(
+            return_value=httpx.Response(200, text=_INDEX_HTML)
+        )
+        article_route = respx.get(url__regex=r"https://www\.ibm\.com/news/article-\d").mock(
+            return_value=httpx.Response(200, text=_ARTICLE_HTML)
+        )
+
+        async with CrawlEngine() as engine:
+            first, second = await asyncio.gather(
+                crawl_target(_target(name="a"), set(), engine=engine),
+                crawl_target(
+                    _target(name="b", index_url="https://www.ibm.com/announcements-ja"),
+                    set(),
+                    engine=engine,
+                ),
+            )
+
+        assert len(first) + len(second) == 2
+        assert article_route.call_count == 2
@@ -33,7 +33,7 @@ async def test_run_gdelt_pipeline_skips_known_urls():
 
     with (
         patch("connectors.watson_news.etl_pipeline.GdeltConnector") as mock_connector_cls,
-        patch("connectors.watson_news.etl_pipeline._make_opensearch") as mock_os_factory,
+        patch("connectors.watson_news.etl_pipeline.get_opensearch") as mock_os_factory,
         patch("connectors.watson_news.etl_pipeline._get_known_urls", new=AsyncMock(return_value={"https://example.com/known"})),
         patch("connectors.watson_news.etl_pipeline._upsert_doc", new=AsyncMock()),
         patch("connectors.watson_news.etl_pipeline.clean_news_article", return_value=None),
@@ -65,3 +65,20 @@ async def test_run_full_pipeline_runs_both_pipelines():
         result = await run_full_pipeline()
         assert result["gdelt"] == 5
         assert result["ibm_crawl"] == 3
+
+
+@pytest.mark.asyncio
+async def test_raw_record_keeps_title_when_cleaning_drops_the_article():
+    """Articles the cleaner rejects are still stored raw with their crawled title."""
+    doc = _make_doc("https://www.ibm.com/new/short", source_type="ibm_crawl")
+    upsert = AsyncMock()
+    with (
+        patch("connectors.watson_news.etl_pipeline._upsert_doc", new=upsert),
+        patch("connectors.watson_news.etl_pipeline.clean_news_article", return_value=None),
+    ):
+        from connectors.watson_news.etl_pipeline import _index_crawled_docs
+        assert await _index_crawled_docs(AsyncMock(), [doc]) == 0
+
+    (_, index, _, body), = [c.args for c in upsert.await_args_list]
+    assert index == "watson_news_raw"
+    assert body["title"] == "Test Article"
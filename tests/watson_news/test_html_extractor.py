@@ -0,0 +1,101 @@
+"""シングルパス HTML 抽出ステージのテスト。"""
+
+import pytest
+
+from connectors.watson_news import html_extractor
+from connectors.watson_news.html_extractor import (
+    ExtractedPage,
+    _extract_with_bs4,
+    _extract_with_lxml,
+    extract_page,
+    run_cpu_bound,
+)
+
+
+ARTICLE_HTML = """
+<html>
+<head>
+  <title>IBM unveils new AI chip</title>
+  <script>var tracking = "should not appear";</script>
+  <style>.x { color: red; }</style>
+</head>
+<body>
+  <header><nav><a href="/menu">Menu</a></nav></header>
+  <article>
+    <h1>IBM unveils new AI chip</h1>
+    <p>Some <b>bold</b> text about the chip.</p>
+    <p>Second paragraph<br>with a line break.</p>
+    <a href="/news/related?utm=1#top">Related</a>
+  </article>
+  <footer>Copyright IBM</footer>
+</body>
+</html>
+"""
+
+_BACKENDS = [pytest.param(_extract_with_bs4, id="html.parser")]
+if html_extractor._lxml_html is not None:
+    _BACKENDS.append(pytest.param(_extract_with_lxml, id="lxml"))
+
+
+@pytest.mark.parametrize("extract", _BACKENDS)
+def test_extracts_title_body_and_links_in_one_pass(extract):
+    page = extract(ARTICLE_HTML, "https://www.ibm.com/news/chip", None)
+
+    assert page.title == "IBM unveils new AI chip"
+    # インライン要素で単語が分断されない
+    assert "Some bold text about the chip." in page.text
+    assert "Second paragraph\nwith a line break." in page.text
+    # スクリプト・スタイル・ナビゲーション・フッターは本文から除外される
+    assert "tracking" not in page.text
+    assert "color" not in page.text
+    assert "Copyright" not in page.text
+    # リンクはページ全体から抽出し、絶対 URL に正規化する
+    assert "https://www.ibm.com/menu" in page.links
+    assert "https://www.ibm.com/news/related" in page.links
+
+
+@pytest.mark.parametrize("extract", _BACKENDS)
+def test_link_selector_limits_links(extract):
+    html = """
+    <html><body>
+      <a class="article-link" href="/a">A</a>
+      <a href="/b">B</a>
+    </body></html>
+    """
+    page = extract(html, "https://www.ibm.com", "a.article-link")
+    assert page.links == ["https://www.ibm.com/a"]
+
+
+@pytest.mark.parametrize("extract", _BACKENDS)
+def test_title_falls_back_to_h1(extract):
+    page = extract("<html><body><h1>Heading</h1><p>Body</p></body></html>", None, None)
+    assert page.title == "Heading"
+
+
+def test_extract_page_handles_empty_input():
+    assert extract_page("") == ExtractedPage(title="", text="", links=[])
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_runs_inline_when_pool_disabled(monkeypatch):
+    monkeypatch.setenv("WATSON_NEWS_CLEAN_WORKERS", "0")
+    monkeypatch.setattr(html_extractor, "_pool", None)
+
+    page = await run_cpu_bound(extract_page, ARTICLE_HTML)
+
+    assert page.title == "IBM unveils new AI chip"
+    assert html_extractor._pool is None
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_uses_process_pool(monkeypatch):
+    monkeypatch.setenv("WATSON_NEWS_CLEAN_WORKERS", "1")
+    monkeypatch.setattr(html_extractor, "_pool", None)
+    try:
+        page = await run_cpu_bound(extract_page, ARTICLE_HTML, "https://www.ibm.com/news/chip")
+        assert html_extractor._pool is not None
+    finally:
+        html_extractor.shutdown_pool()
+
+    assert page.title == "IBM unveils new AI chip"
+    assert "https://www.ibm.com/news/related" in page.links
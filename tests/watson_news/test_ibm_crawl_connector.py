@@ -1,10 +1,15 @@
 """Unit tests for IbmCrawlConnector helpers."""
 
+import httpx
 import pytest
+import respx
 
 from connectors.watson_news.ibm_crawl_connector import (
+    CrawlEngine,
     CrawlTarget,
+    IndexPageCache,
     _extract_article_urls,
+    _html_to_connector_document,
 )
 
 
@@ -65,3 +70,42 @@ def test_crawl_target_defaults():
     assert t.respect_robots_txt is True
     assert t.max_articles_per_run == 100
     assert t.request_interval_seconds == 5
+
+
+def test_connector_document_carries_the_page_title():
+    url = "https://www.ibm.com/new/announcements/2026/ibm-ai-launch"
+    doc = _html_to_connector_document("<title> IBM &amp; AI\n launch </title><p>x</p>", url, _make_target())
+    assert doc.metadata["title"] == "IBM & AI launch"
+
+    untitled = _html_to_connector_document("<p>no title here</p>", url, _make_target())
+    assert untitled.metadata["title"] == url
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_index_page_uses_conditional_get():
+    """2 回目のインデックス取得は ETag / Last-Modified を送り、304 ならキャッシュ本文を使う。"""
+    index_url = "https://www.ibm.com/new/announcements"
+    route = respx.get(index_url).mock(
+        side_effect=[
+            httpx.Response(
+                200,
+                text=SAMPLE_HTML,
+                headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2026 00:00:00 GMT"},
+            ),
+            httpx.Response(304),
+        ]
+    )
+    target = _make_target(respect_robots_txt=False, request_interval_seconds=0)
+    cache = IndexPageCache()
+
+    async with CrawlEngine(index_cache=cache) as engine:
+        first = await engine.fetch_index(target)
+    async with CrawlEngine(index_cache=cache) as engine:
+        second = await engine.fetch_index(target)
+
+    assert first == SAMPLE_HTML
+    assert second == SAMPLE_HTML
+    conditional_request = route.calls[1].request
+    assert conditional_request.headers["If-None-Match"] == '"v1"'
+    assert conditional_request.headers["If-Modified-Since"] == "Mon, 01 Jan 2026 00:00:00 GMT"
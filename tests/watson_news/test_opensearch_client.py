@@ -0,0 +1,107 @@
+"""Watson News 共有 OpenSearch クライアントのテスト。"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from connectors.watson_news import opensearch_client
+
+
+@pytest.fixture(autouse=True)
+def _reset_client():
+    opensearch_client._client = None
+    opensearch_client._client_loop = None
+    yield
+    opensearch_client._client = None
+    opensearch_client._client_loop = None
+
+
+def _fake_client() -> MagicMock:
+    client = MagicMock()
+    client.ping = AsyncMock(return_value=True)
+    client.close = AsyncMock()
+    client.get = AsyncMock(return_value={"_id": "a1", "_source": {"title": "t", "vector": [0.1]}})
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_opensearch_reuses_single_client():
+    with patch.object(opensearch_client, "_create_client", side_effect=_fake_client) as factory:
+        first = opensearch_client.get_opensearch()
+        second = opensearch_client.get_opensearch()
+
+    assert first is second
+    factory.assert_called_once()
+
+
+def test_create_client_applies_pool_size():
+    with patch.object(opensearch_client, "WATSON_NEWS_OS_POOL_MAXSIZE", 7):
+        client = opensearch_client._create_client()
+    assert client.transport.kwargs["maxsize"] == 7
+
+
+@pytest.mark.asyncio
+async def test_start_opensearch_warms_connections():
+    fake = _fake_client()
+    with (
+        patch.object(opensearch_client, "_create_client", return_value=fake),
+        patch.object(opensearch_client, "WATSON_NEWS_OS_WARM_CONNECTIONS", 3),
+    ):
+        client = await opensearch_client.start_opensearch()
+
+    assert client is fake
+    assert fake.ping.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_start_opensearch_tolerates_unreachable_cluster():
+    fake = _fake_client()
+    fake.ping = AsyncMock(side_effect=ConnectionError("down"))
+    with patch.object(opensearch_client, "_create_client", return_value=fake):
+        client = await opensearch_client.start_opensearch()
+
+    assert client is fake
+
+
+@pytest.mark.asyncio
+async def test_close_opensearch_closes_and_resets():
+    fake = _fake_client()
+    with patch.object(opensearch_client, "_create_client", side_effect=[fake, _fake_client()]):
+        opensearch_client.get_opensearch()
+        await opensearch_client.close_opensearch()
+        fake.close.assert_awaited_once()
+
+        # 閉じた後は新しいクライアントが作られる
+        assert opensearch_client.get_opensearch() is not fake
+
+
+@pytest.mark.asyncio
+async def test_service_calls_do_not_close_shared_client():
+    fake = _fake_client()
+    with patch.object(opensearch_client, "_create_client", return_value=fake):
+        from services.watson_news_service import get_article
+
+        first = await get_article("a1")
+        second = await get_article("a1")
+
+    assert first["id"] == "a1" and "vector" not in first
+    assert second["id"] == "a1"
+    assert fake.get.await_count == 2
+    fake.close.assert_not_awaited()
+
+
+def test_client_replaced_on_a_new_loop_is_closed():
+    import asyncio
+
+    old, new = _fake_client(), _fake_client()
+    with patch.object(opensearch_client, "_create_client", side_effect=[old, new]):
+        async def use():
+            client = opensearch_client.get_opensearch()
+            await asyncio.sleep(0)
+            return client
+
+        assert asyncio.run(use()) is old  # this loop is closed afterwards
+        assert asyncio.run(use()) is new
+
+    old.close.assert_awaited_once()
+    assert not opensearch_client._closing
@@ -0,0 +1,146 @@
+"""Watson News スケジューラーのジョブモデルのテスト。"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from connectors.watson_news import scheduler
+from connectors.watson_news.ibm_crawl_connector import CrawlTarget
+
+
+def _target(name: str, interval: int = 2) -> CrawlTarget:
+    return CrawlTarget(
+        name=name,
+        index_url=f"https://www.ibm.com/{name}",
+        language="en",
+        site_category="test",
+        interval_hours=interval,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_scheduler_state():
+    scheduler._job_states.clear()
+    scheduler._job_budget = None
+    yield
+    scheduler._job_states.clear()
+    scheduler._job_budget = None
+
+
+def test_register_jobs_creates_one_job_per_target_crawling_only_that_target():
+    targets = [_target("a", 2), _target("b", 4)]
+    sched = AsyncIOScheduler()
+
+    with patch.object(scheduler, "load_crawl_targets", return_value=targets):
+        scheduler.register_jobs(sched)
+
+    jobs = {job.id: job for job in sched.get_jobs()}
+    assert set(jobs) == {
+        scheduler.GDELT_JOB_ID,
+        "watson_news_ibm_crawl_a",
+        "watson_news_ibm_crawl_b",
+    }
+    for target in targets:
+        job = jobs[f"watson_news_ibm_crawl_{target.name}"]
+        job_id, pipeline, job_targets = job.args
+        assert pipeline is scheduler.run_ibm_crawl_pipeline
+        # 各ジョブは自分のターゲットだけをクロールする
+        assert job_targets == [target]
+        assert job.trigger.jitter == scheduler.WATSON_NEWS_JOB_JITTER_SECONDS
+
+
+def test_register_jobs_removes_jobs_for_dropped_targets():
+    sched = AsyncIOScheduler()
+    with patch.object(scheduler, "load_crawl_targets", return_value=[_target("a"), _target("b")]):
+        scheduler.register_jobs(sched)
+    with patch.object(scheduler, "load_crawl_targets", return_value=[_target("a")]):
+        scheduler.register_jobs(sched)
+
+    ids = {job.id for job in sched.get_jobs()}
+    assert "watson_news_ibm_crawl_b" not in ids
+    assert "watson_news_ibm_crawl_a" in ids
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_success_and_failure():
+    ok = AsyncMock(return_value=7)
+    await scheduler._run_job("job_ok", ok, "arg")
+    ok.assert_awaited_once_with("arg")
+
+    failing = AsyncMock(side_effect=RuntimeError("boom"))
+    result = await scheduler._run_job("job_fail", failing)
+    assert result is None
+
+    states = scheduler.get_job_states()
+    assert states["job_ok"]["runs"] == 1
+    assert states["job_ok"]["last_status"] == "success"
+    assert states["job_ok"]["last_processed"] == 7
+    assert states["job_ok"]["total_processed"] == 7
+    assert states["job_ok"]["last_finished_at"] is not None
+    assert states["job_fail"]["failures"] == 1
+    assert states["job_fail"]["last_status"] == "failed"
+    assert states["job_fail"]["last_error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_crawl_job_with_a_failed_target_is_recorded_as_failed():
+    from connectors.watson_news import etl_pipeline
+
+    async def crawl(target, known_urls, engine=None):
+        if target.name == "broken":
+            raise RuntimeError("index page returned 500")
+        return ["doc"] * 3
+
+    with (
+        patch.object(etl_pipeline, "get_opensearch"),
+        patch.object(etl_pipeline, "_get_known_urls", new=AsyncMock(return_value=set())),
+        patch.object(etl_pipeline, "crawl_target", new=crawl),
+        patch.object(etl_pipeline, "_index_crawled_docs", new=AsyncMock(side_effect=lambda _, docs: len(docs))),
+    ):
+        result = await scheduler._run_job(
+            "crawl", etl_pipeline.run_ibm_crawl_pipeline, [_target("ok"), _target("broken")]
+        )
+
+    assert result is None
+    state = scheduler.get_job_states()["crawl"]
+    assert state["last_status"] == "failed"
+    assert state["failures"] == 1
+    assert "broken: index page returned 500" in state["last_error"]
+    # The target that succeeded is still counted
+    assert state["last_processed"] == 3
+    assert state["total_processed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_run_job_respects_shared_concurrency_budget(monkeypatch):
+    monkeypatch.setattr(scheduler, "WATSON_NEWS_MAX_CONCURRENT_JOBS", 2)
+    active = 0
+    peak = 0
+
+    async def pipeline() -> int:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return 1
+
+    await asyncio.gather(*(scheduler._run_job(f"job_{i}", pipeline) for i in range(6)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_etl_status_reports_per_job_state():
+    from services.watson_news_service import get_etl_status
+
+    await scheduler._run_job(scheduler.GDELT_JOB_ID, AsyncMock(return_value=3))
+    await scheduler._run_job("watson_news_ibm_crawl_a", AsyncMock(return_value=1))
+
+    status = get_etl_status()
+
+    assert status.gdelt_last_run == status.jobs[scheduler.GDELT_JOB_ID].last_finished_at
+    assert status.ibm_crawl_last_run == status.jobs["watson_news_ibm_crawl_a"].last_finished_at
+    assert status.jobs[scheduler.GDELT_JOB_ID].last_processed == 3
@@ -0,0 +1,280 @@
+"""Watson News ハイブリッド検索（BM25 + kNN）のテスト。
+
+OpenSearch と watsonx.ai はフェイクで置き換え、融合・キャッシュ・ページングの挙動を検証する。
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from models.watson_news import WatsonNewsSearchRequest
+from services import watson_news_service as svc
+
+
+def _hit(doc_id: str, score: float, title: str = "", index: str = "watson_news_enriched") -> dict:
+    return {
+        "_index": index,
+        "_id": doc_id,
+        "_score": score,
+        "_source": {"source_type": "gdelt", "title": title or doc_id},
+    }
+
+
+class _FakeOpenSearch:
+    """kNN クエリとキーワードクエリで別々の結果を返すフェイク。
+
+    Point in Time 付きの検索では sort 値 ``[score, 位置]`` による search_after を再現する。
+    """
+
+    def __init__(self, keyword_hits: list[dict], vector_hits: list[dict]) -> None:
+        self.keyword_hits = keyword_hits
+        self.vector_hits = vector_hits
+        self.bodies: list[dict] = []
+        self.open_pits: set[str] = set()
+        self.pits_created = 0
+
+    async def create_pit(self, index: str, keep_alive: str) -> dict:
+        self.pits_created += 1
+        pit_id = f"pit-{self.pits_created}"
+        self.open_pits.add(pit_id)
+        return {"pit_id": pit_id}
+
+    async def delete_pit(self, body: dict) -> dict:
+        for pit_id in body["pit_id"]:
+            self.open_pits.discard(pit_id)
+        return {}
+
+    async def search(self, body: dict, index: str | None = None) -> dict:
+        self.bodies.append(body)
+        knn = body["query"].get("knn")
+        hits = self.vector_hits if knn else self.keyword_hits
+        if knn:
+            hits = hits[: knn["vector"]["k"]]
+        if "pit" not in body:
+            return {"hits": {"hits": hits[: body["size"]], "total": {"value": len(hits)}}}
+
+        assert index is None and body["pit"]["id"] in self.open_pits
+        ordered = [{**hit, "sort": [hit["_score"], pos]} for pos, hit in enumerate(hits)]
+        if "search_after" in body:
+            after = (-body["search_after"][0], body["search_after"][1])
+            ordered = [hit for hit in ordered if (-hit["sort"][0], hit["sort"][1]) > after]
+        return {
+            "pit_id": body["pit"]["id"],
+            "hits": {"hits": ordered[: body["size"]], "total": {"value": len(hits)}},
+        }
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    svc._query_vector_cache.clear()
+    yield
+    svc._query_vector_cache.clear()
+
+
+@pytest.fixture
+def embedder():
+    client = MagicMock()
+    client.embed = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
+    with patch.object(svc, "get_watsonx_client", return_value=client):
+        yield client
+
+
+def _use(fake: _FakeOpenSearch):
+    return patch.object(svc, "get_opensearch", return_value=fake)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_rrf_ranks_documents_found_by_both_retrievers_first(embedder):
+    fake = _FakeOpenSearch(
+        keyword_hits=[_hit("exact-name", 12.0), _hit("both", 8.0)],
+        vector_hits=[_hit("semantic", 0.9), _hit("both", 0.8)],
+    )
+    with _use(fake):
+        resp = await svc.search_watson_news(WatsonNewsSearchRequest(query="watsonx Orchestrate"))
+
+    ids = [r.id for r in resp.results]
+    assert ids[0] == "both"
+    assert set(ids) == {"both", "exact-name", "semantic"}
+    assert resp.mode == "hybrid"
+    assert {"embed", "keyword", "vector", "fusion", "total"} <= resp.timings_ms.keys()
+    # 大きなフィールドは返さない
+    assert all("vector" in body["_source"]["excludes"] for body in fake.bodies)
+
+
+@pytest.mark.asyncio
+async def test_keyword_query_uses_title_summary_body_and_phrase_boost(embedder):
+    fake = _FakeOpenSearch(keyword_hits=[], vector_hits=[])
+    with _use(fake):
+        await svc.search_watson_news(
+            WatsonNewsSearchRequest(query="日本アイ・ビー・エム", mode="keyword", language="ja")
+        )
+
+    (body,) = fake.bodies
+    should = body["query"]["bool"]["should"]
+    assert {"title^3", "summary^2", "clean_body"} <= set(should[0]["multi_match"]["fields"])
+    assert should[1]["multi_match"]["type"] == "phrase"
+    assert {"term": {"language": "ja"}} in body["query"]["bool"]["filter"]
+
+
+@pytest.mark.asyncio
+async def test_keyword_mode_skips_embedding(embedder):
+    fake = _FakeOpenSearch(keyword_hits=[_hit("a", 3.0)], vector_hits=[_hit("b", 1.0)])
+    with _use(fake):
+        resp = await svc.search_watson_news(WatsonNewsSearchRequest(query="IBM", mode="keyword"))
+
+    embedder.embed.assert_not_awaited()
+    assert [r.id for r in resp.results] == ["a"]
+    assert resp.results[0].score == 3.0
+
+
+@pytest.mark.asyncio
+async def test_query_vector_is_cached(embedder):
+    fake = _FakeOpenSearch(keyword_hits=[], vector_hits=[_hit("a", 0.5)])
+    with _use(fake):
+        first = await svc.search_watson_news(WatsonNewsSearchRequest(query="IBM  Quantum"))
+        second = await svc.search_watson_news(WatsonNewsSearchRequest(query="IBM Quantum"))
+
+    embedder.embed.assert_awaited_once()
+    assert first.embedding_cache_hit is False
+    assert second.embedding_cache_hit is True
+
+
+def test_query_vector_cache_evicts_least_recently_used():
+    cache = svc.QueryVectorCache(maxsize=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") == [1.0]
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_search_after_pages_through_fused_results_without_duplicates(embedder):
+    keyword = [_hit(f"k{i}", 20.0 - i) for i in range(15)]
+    vector = [_hit(f"v{i}", 1.0 - i / 100) for i in range(15)]
+    fake = _FakeOpenSearch(keyword_hits=keyword, vector_hits=vector)
+
+    seen: list[str] = []
+    cursor = None
+    with _use(fake):
+        for _ in range(10):
+            resp = await svc.search_watson_news(
+                WatsonNewsSearchRequest(query="IBM", top_k=7, search_after=cursor)
+            )
+            seen.extend(r.id for r in resp.results)
+            cursor = resp.next_search_after
+            if cursor is None:
+                break
+
+    assert len(seen) == 30
+    assert len(set(seen)) == 30
+
+
+async def _page_all(fake: _FakeOpenSearch, **request) -> tuple[list[str], list]:
+    seen: list[str] = []
+    responses = []
+    cursor = None
+    with _use(fake):
+        while True:
+            resp = await svc.search_watson_news(WatsonNewsSearchRequest(search_after=cursor, **request))
+            responses.append(resp)
+            seen.extend(r.id for r in resp.results)
+            cursor = resp.next_search_after
+            if cursor is None:
+                return seen, responses
+
+
+@pytest.mark.asyncio
+async def test_keyword_pages_reach_past_the_search_window_with_a_pit(embedder):
+    fake = _FakeOpenSearch(
+        keyword_hits=[_hit(f"k{i}", 50.0 - i) for i in range(40)],
+        vector_hits=[],
+    )
+    with patch.object(svc, "WATSON_NEWS_SEARCH_WINDOW", 10):
+        seen, responses = await _page_all(fake, query="IBM", mode="keyword", top_k=7)
+
+    assert seen == [f"k{i}" for i in range(40)]
+    assert responses[-1].total == 40
+    # 1 つの PIT を使い回し、最後のページで閉じる
+    assert fake.pits_created == 1
+    assert not fake.open_pits
+    assert all(body["size"] == 8 for body in fake.bodies)
+
+
+@pytest.mark.asyncio
+async def test_vector_pages_grow_knn_k_with_the_depth(embedder):
+    fake = _FakeOpenSearch(
+        keyword_hits=[],
+        vector_hits=[_hit(f"v{i}", 1.0 - i / 100) for i in range(30)],
+    )
+    with patch.object(svc, "WATSON_NEWS_SEARCH_WINDOW", 5):
+        seen, _ = await _page_all(fake, query="IBM", mode="vector", top_k=4)
+
+    assert seen == [f"v{i}" for i in range(30)]
+    ks = [body["query"]["knn"]["vector"]["k"] for body in fake.bodies]
+    assert ks == sorted(ks) and ks[-1] > 5
+    embedder.embed.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_window_widens_past_the_configured_window(embedder):
+    fake = _FakeOpenSearch(
+        keyword_hits=[_hit(f"k{i}", 50.0 - i) for i in range(40)],
+        vector_hits=[],
+    )
+    with patch.object(svc, "WATSON_NEWS_SEARCH_WINDOW", 10):
+        seen, responses = await _page_all(fake, query="IBM", top_k=4)
+
+    assert seen == [f"k{i}" for i in range(40)]
+    assert responses[0].search_window == 10
+    assert responses[-1].search_window > 10
+    assert responses[0].total == 40
+
+
+@pytest.mark.asyncio
+async def test_cursor_from_another_mode_is_rejected(embedder):
+    fake = _FakeOpenSearch(keyword_hits=[_hit(f"k{i}", 9.0 - i) for i in range(5)], vector_hits=[])
+    with _use(fake):
+        first = await svc.search_watson_news(WatsonNewsSearchRequest(query="IBM", top_k=2))
+        with pytest.raises(ValueError):
+            await svc.search_watson_news(
+                WatsonNewsSearchRequest(query="IBM", mode="keyword", search_after=first.next_search_after)
+            )
+
+
+@pytest.mark.asyncio
+async def test_blend_fusion_respects_keyword_weight(embedder):
+    fake = _FakeOpenSearch(
+        keyword_hits=[_hit("kw", 10.0), _hit("kw-low", 1.0)],
+        vector_hits=[_hit("vec", 0.9), _hit("vec-low", 0.1)],
+    )
+    with _use(fake):
+        keyword_heavy = await svc.search_watson_news(
+            WatsonNewsSearchRequest(query="q", fusion="blend", keyword_weight=0.9)
+        )
+        vector_heavy = await svc.search_watson_news(
+            WatsonNewsSearchRequest(query="q", fusion="blend", keyword_weight=0.1)
+        )
+
+    assert keyword_heavy.results[0].id == "kw"
+    assert vector_heavy.results[0].id == "vec"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_falls_back_to_keyword_when_embedding_fails(embedder):
+    embedder.embed.side_effect = RuntimeError("watsonx down")
+    fake = _FakeOpenSearch(keyword_hits=[_hit("a", 2.0)], vector_hits=[_hit("b", 1.0)])
+    with _use(fake):
+        resp = await svc.search_watson_news(WatsonNewsSearchRequest(query="IBM"))
+
+    assert [r.id for r in resp.results] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        await svc.search_watson_news(WatsonNewsSearchRequest(query="IBM", mode="fuzzy"))